@@ -0,0 +1,44 @@
+"""stamp embedding_cache rows with the generation that published them
+
+Revision ID: a6b7c8d9e0f1
+Revises: z5a6b7c8d9e0
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a6b7c8d9e0f1"
+down_revision: str | None = "z5a6b7c8d9e0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("embedding_cache", sa.Column("generation", sa.BigInteger(), nullable=True))
+    # Existing rows are already covered by their model's current generation.
+    op.execute(
+        """
+        UPDATE embedding_cache
+        SET generation = coalesce(
+            (SELECT g.generation FROM embedding_cache_generations g WHERE g.model_name = embedding_cache.model_name),
+            0
+        )
+        """
+    )
+    op.create_index("ix_embedding_cache_model_generation", "embedding_cache", ["model_name", "generation"])
+    op.drop_column("embedding_cache_generations", "eviction_generation")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "embedding_cache_generations",
+        sa.Column("eviction_generation", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.drop_index("ix_embedding_cache_model_generation", table_name="embedding_cache")
+    op.drop_column("embedding_cache", "generation")
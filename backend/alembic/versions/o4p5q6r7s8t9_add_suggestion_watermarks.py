@@ -0,0 +1,35 @@
+"""add suggestion_watermarks table
+
+Revision ID: o4p5q6r7s8t9
+Revises: n3o4p5q6r7s8
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "o4p5q6r7s8t9"
+down_revision: str | None = "n3o4p5q6r7s8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "suggestion_watermarks",
+        sa.Column("algorithm", sa.String(length=50), nullable=False),
+        sa.Column("watermark", sa.DateTime(), nullable=False),
+        sa.Column("last_run_at", sa.DateTime(), nullable=False),
+        sa.Column("last_run_stats", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.PrimaryKeyConstraint("algorithm"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("suggestion_watermarks")
@@ -0,0 +1,87 @@
+"""store embedding_cache.embedding as packed float32 bytes
+
+Revision ID: p5q6r7s8t9u0
+Revises: o4p5q6r7s8t9
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+import json
+from collections.abc import Sequence
+
+import numpy as np
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "p5q6r7s8t9u0"
+down_revision: str | None = "o4p5q6r7s8t9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BATCH_SIZE = 1000
+EMBEDDING_DTYPE = np.dtype("<f4")
+
+
+def _convert_rows(source: str, target: str, convert, target_type=None) -> None:
+    """Copy *source* into *target* (bound as *target_type*) for every row, BATCH_SIZE rows at a time."""
+    bind = op.get_bind()
+    table = sa.table("embedding_cache", sa.column("id"), sa.column(source), sa.column(target, target_type))
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, table.c[source]).where(table.c[target].is_(None)).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+        updates, invalid = [], []
+        for row_id, value in rows:
+            converted = convert(value)
+            if converted is None:
+                invalid.append(row_id)
+            else:
+                updates.append({"row_id": row_id, "value": converted})
+        if updates:
+            bind.execute(
+                table.update().where(table.c.id == sa.bindparam("row_id")).values({target: sa.bindparam("value")}),
+                updates,
+            )
+        if invalid:
+            # Unparseable rows are cache misses anyway — drop them rather than block the migration.
+            bind.execute(table.delete().where(table.c.id.in_(invalid)))
+
+
+def _json_to_float32(value):
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    if not isinstance(value, list) or not value:
+        return None
+    return np.asarray(value, dtype=EMBEDDING_DTYPE).tobytes()
+
+
+def _float32_to_list(value):
+    return np.frombuffer(value, dtype=EMBEDDING_DTYPE).tolist()
+
+
+def upgrade() -> None:
+    op.add_column("embedding_cache", sa.Column("embedding_f32", sa.LargeBinary(), nullable=True))
+    _convert_rows("embedding", "embedding_f32", _json_to_float32)
+    with op.batch_alter_table("embedding_cache") as batch_op:
+        batch_op.drop_column("embedding")
+        batch_op.alter_column(
+            "embedding_f32", new_column_name="embedding", existing_type=sa.LargeBinary(), nullable=False
+        )
+
+
+def downgrade() -> None:
+    op.add_column("embedding_cache", sa.Column("embedding_json", postgresql.JSONB(), nullable=True))
+    _convert_rows("embedding", "embedding_json", _float32_to_list, postgresql.JSONB())
+    with op.batch_alter_table("embedding_cache") as batch_op:
+        batch_op.drop_column("embedding")
+        batch_op.alter_column(
+            "embedding_json", new_column_name="embedding", existing_type=postgresql.JSONB(), nullable=False
+        )
@@ -0,0 +1,29 @@
+"""add embedding_cache.last_accessed_at
+
+Revision ID: q6r7s8t9u0v1
+Revises: p5q6r7s8t9u0
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "q6r7s8t9u0v1"
+down_revision: str | None = "p5q6r7s8t9u0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("embedding_cache", sa.Column("last_accessed_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_embedding_cache_model_accessed", "embedding_cache", ["model_name", "last_accessed_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_embedding_cache_model_accessed", table_name="embedding_cache")
+    op.drop_column("embedding_cache", "last_accessed_at")
@@ -0,0 +1,39 @@
+"""add embedding_outbox
+
+Revision ID: s8t9u0v1w2x3
+Revises: r7s8t9u0v1w2
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "s8t9u0v1w2x3"
+down_revision: str | None = "r7s8t9u0v1w2"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_outbox",
+        sa.Column("id", sa.Integer(), autoincrement=True, primary_key=True),
+        sa.Column("entity_type", sa.String(length=20), nullable=False),
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("enqueued_at", sa.DateTime(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.UniqueConstraint("entity_type", "entity_id", name="uq_embedding_outbox_entity"),
+    )
+    op.create_index("ix_embedding_outbox_enqueued_at", "embedding_outbox", ["enqueued_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_embedding_outbox_enqueued_at", table_name="embedding_outbox")
+    op.drop_table("embedding_outbox")
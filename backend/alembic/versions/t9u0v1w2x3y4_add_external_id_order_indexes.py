@@ -0,0 +1,37 @@
+"""add external_id keyset order indexes
+
+Revision ID: t9u0v1w2x3y4
+Revises: s8t9u0v1w2x3
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "t9u0v1w2x3y4"
+down_revision: str | None = "s8t9u0v1w2x3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_requirements_external_id_order",
+        "requirements",
+        [sa.text("coalesce(external_id, '')"), "id"],
+    )
+    op.create_index(
+        "ix_test_cases_external_id_order",
+        "test_cases",
+        [sa.text("coalesce(external_id, '')"), "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_test_cases_external_id_order", table_name="test_cases")
+    op.drop_index("ix_requirements_external_id_order", table_name="requirements")
@@ -0,0 +1,50 @@
+"""add report_exports
+
+Revision ID: u0v1w2x3y4z5
+Revises: t9u0v1w2x3y4
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "u0v1w2x3y4z5"
+down_revision: str | None = "t9u0v1w2x3y4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "report_exports",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("report_type", sa.String(length=50), nullable=False),
+        sa.Column("format", sa.String(length=10), nullable=False),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("pending", "running", "completed", "failed", name="reportexportstatus"),
+            nullable=False,
+            server_default="pending",
+        ),
+        sa.Column("storage_key", sa.String(length=500), nullable=True),
+        sa.Column("size_bytes", sa.Integer(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("requested_by", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_report_exports_lookup", "report_exports", ["report_type", "format", "fingerprint"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_report_exports_lookup", table_name="report_exports")
+    op.drop_table("report_exports")
+    # Drop the enum type on PostgreSQL (no-op on other dialects).
+    op.execute("DROP TYPE IF EXISTS reportexportstatus")
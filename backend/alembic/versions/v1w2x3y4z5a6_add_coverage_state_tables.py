@@ -0,0 +1,105 @@
+"""add coverage state tables
+
+Revision ID: v1w2x3y4z5a6
+Revises: u0v1w2x3y4z5
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "v1w2x3y4z5a6"
+down_revision: str | None = "u0v1w2x3y4z5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+ACCEPTED_SOURCES = "('manual', 'ai_confirmed', 'imported')"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "requirement_coverage",
+        sa.Column("requirement_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("link_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("accepted_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_requirement_coverage_status", "requirement_coverage", ["status"])
+    op.create_table(
+        "test_case_coverage",
+        sa.Column("test_case_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("link_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_table(
+        "coverage_counters",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("total_requirements", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("covered_requirements", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("partially_covered_requirements", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("uncovered_requirements", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_test_cases", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("orphan_test_cases", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+    # Backfill from the links table so the counters are exact from the first read.
+    op.execute(
+        f"""
+        INSERT INTO requirement_coverage (requirement_id, link_count, accepted_count, status, updated_at)
+        SELECT r.id,
+               COALESCE(s.link_count, 0),
+               COALESCE(s.accepted_count, 0),
+               CASE WHEN s.accepted_count > 0 THEN 'covered'
+                    WHEN s.link_count > 0 THEN 'partially_covered'
+                    ELSE 'uncovered' END,
+               now()
+        FROM requirements r
+        LEFT JOIN (
+            SELECT requirement_id,
+                   count(*) AS link_count,
+                   count(*) FILTER (WHERE link_source::text IN {ACCEPTED_SOURCES}) AS accepted_count
+            FROM requirement_test_case_links
+            GROUP BY requirement_id
+        ) s ON s.requirement_id = r.id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO test_case_coverage (test_case_id, link_count, updated_at)
+        SELECT t.id, COUNT(l.id), now()
+        FROM test_cases t
+        LEFT JOIN requirement_test_case_links l ON l.test_case_id = t.id
+        GROUP BY t.id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO coverage_counters (
+            id, total_requirements, covered_requirements, partially_covered_requirements,
+            uncovered_requirements, total_test_cases, orphan_test_cases, updated_at
+        )
+        SELECT 1,
+               (SELECT count(*) FROM requirement_coverage),
+               (SELECT count(*) FROM requirement_coverage WHERE status = 'covered'),
+               (SELECT count(*) FROM requirement_coverage WHERE status = 'partially_covered'),
+               (SELECT count(*) FROM requirement_coverage WHERE status = 'uncovered'),
+               (SELECT count(*) FROM test_case_coverage),
+               (SELECT count(*) FROM test_case_coverage WHERE link_count = 0),
+               now()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("coverage_counters")
+    op.drop_table("test_case_coverage")
+    op.drop_index("ix_requirement_coverage_status", table_name="requirement_coverage")
+    op.drop_table("requirement_coverage")
@@ -0,0 +1,42 @@
+"""add coverage_snapshots
+
+Revision ID: x3y4z5a6b7c8
+Revises: w2x3y4z5a6b7
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "x3y4z5a6b7c8"
+down_revision: str | None = "w2x3y4z5a6b7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "coverage_snapshots",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("captured_at", sa.DateTime(), nullable=False),
+        sa.Column("total_requirements", sa.Integer(), nullable=False),
+        sa.Column("covered_requirements", sa.Integer(), nullable=False),
+        sa.Column("partially_covered_requirements", sa.Integer(), nullable=False),
+        sa.Column("uncovered_requirements", sa.Integer(), nullable=False),
+        sa.Column("total_test_cases", sa.Integer(), nullable=False),
+        sa.Column("orphan_test_cases", sa.Integer(), nullable=False),
+        sa.Column("coverage_percentage", sa.Float(), nullable=False),
+        sa.Column("modules", postgresql.JSONB(), nullable=True),
+    )
+    op.create_index("ix_coverage_snapshots_captured_at", "coverage_snapshots", ["captured_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_coverage_snapshots_captured_at", table_name="coverage_snapshots")
+    op.drop_table("coverage_snapshots")
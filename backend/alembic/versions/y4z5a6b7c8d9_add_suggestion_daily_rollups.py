@@ -0,0 +1,71 @@
+"""add suggestion_daily_rollups
+
+Revision ID: y4z5a6b7c8d9
+Revises: x3y4z5a6b7c8
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "y4z5a6b7c8d9"
+down_revision: str | None = "x3y4z5a6b7c8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "suggestion_daily_rollups",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("suggestion_method", sa.String(length=50), primary_key=True),
+        sa.Column("status", sa.String(length=20), primary_key=True),
+        sa.Column("score_bucket", sa.Integer(), primary_key=True),
+        sa.Column("suggestion_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("score_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("reviewed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("review_hours_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+
+    # Backfill from link_suggestions so the analytics are exact from the first read
+    # (score buckets mirror CONFIDENCE_BINS in app.crud.suggestion_rollup).
+    op.execute(
+        """
+        INSERT INTO suggestion_daily_rollups (
+            day, suggestion_method, status, score_bucket,
+            suggestion_count, score_sum, reviewed_count, review_hours_sum, updated_at
+        )
+        SELECT day, suggestion_method, status, score_bucket,
+               count(*),
+               sum(similarity_score),
+               count(*) FILTER (WHERE reviewed_at IS NOT NULL),
+               COALESCE(sum(EXTRACT(epoch FROM reviewed_at - created_at) / 3600.0), 0),
+               now()
+        FROM (
+            SELECT created_at::date AS day,
+                   suggestion_method::text AS suggestion_method,
+                   status::text AS status,
+                   CASE WHEN similarity_score >= 0.0 AND similarity_score < 0.2 THEN 0
+                        WHEN similarity_score >= 0.2 AND similarity_score < 0.4 THEN 1
+                        WHEN similarity_score >= 0.4 AND similarity_score < 0.6 THEN 2
+                        WHEN similarity_score >= 0.6 AND similarity_score < 0.8 THEN 3
+                        WHEN similarity_score >= 0.8 AND similarity_score <= 1.0 THEN 4
+                        ELSE -1 END AS score_bucket,
+                   similarity_score,
+                   created_at,
+                   reviewed_at
+            FROM link_suggestions
+        ) s
+        GROUP BY day, suggestion_method, status, score_bucket
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("suggestion_daily_rollups")
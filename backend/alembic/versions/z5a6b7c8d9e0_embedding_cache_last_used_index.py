@@ -0,0 +1,35 @@
+"""index embedding_cache by last use
+
+Revision ID: z5a6b7c8d9e0
+Revises: y4z5a6b7c8d9
+Create Date: 2026-10-20 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "z5a6b7c8d9e0"
+down_revision: str | None = "y4z5a6b7c8d9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Compaction orders each model's rows by coalesce(last_accessed_at, updated_at), which the
+    # (model_name, last_accessed_at) index cannot serve.
+    op.drop_index("ix_embedding_cache_model_accessed", table_name="embedding_cache")
+    op.create_index(
+        "ix_embedding_cache_model_last_used",
+        "embedding_cache",
+        ["model_name", sa.text("coalesce(last_accessed_at, updated_at)"), "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_embedding_cache_model_last_used", table_name="embedding_cache")
+    op.create_index("ix_embedding_cache_model_accessed", "embedding_cache", ["model_name", "last_accessed_at"])
@@ -3,6 +3,12 @@
 import hashlib
 import re
 from collections import Counter
+from typing import Any
+
+import numpy as np
+
+# Query texts embedded and scored together by LLMEmbeddingSimilarity.aiter_score_rows
+QUERY_BLOCK_ROWS = 32
 
 
 def compute_text_hash(text: str) -> str:
@@ -348,23 +354,65 @@ class HybridSimilarity(SimilarityAlgorithm):
 
 
 class LLMEmbeddingSimilarity(SimilarityAlgorithm):
-    """LLM-based embedding similarity using OpenAI or HuggingFace"""
+    """LLM-based embedding similarity using OpenAI, HuggingFace or offline feature hashing"""
 
     def __init__(
-        self, provider: str = "openai", model: str = None, cache_embeddings: bool = True, batch_size: int = 2048
+        self,
+        provider: str = "openai",
+        model: str = None,
+        cache_embeddings: bool = True,
+        batch_size: int = 2048,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 0.5,
+        memory_cache=None,
+        quantization: str = "none",
+        rescore_margin: float | None = None,
+        micro_batch_window_ms: float = 5.0,
     ):
         """
         Args:
-            provider: 'openai' or 'huggingface'
+            provider: 'openai', 'huggingface' or 'hashing' (deterministic, offline)
             model: Model name (e.g., 'text-embedding-3-small' for OpenAI,
-                'sentence-transformers/all-MiniLM-L6-v2' for HF)
+                'sentence-transformers/all-MiniLM-L6-v2' for HF, 'hashing-384' for hashing)
             cache_embeddings: Whether to cache embeddings in memory for performance
             batch_size: Maximum number of texts per batch embedding API call
+            max_concurrency: Maximum number of embedding API calls in flight at once
+                (local HuggingFace inference always runs one chunk at a time)
+            max_retries: Retries per chunk for transient API failures
+            retry_backoff_seconds: Initial retry delay, doubled on every further retry
+            memory_cache: ``EmbeddingLRUCache`` to keep embeddings in. Defaults to the
+                process-wide cache shared by every engine instance in the worker.
+            quantization: First-pass scoring representation for :meth:`aiter_score_rows`:
+                'none' (float32), 'int8' or 'binary'
+            rescore_margin: Score distance below the threshold within which quantized
+                candidates are rescored exactly (defaults to a per-mode margin)
+            micro_batch_window_ms: When positive, :meth:`aget_embeddings_batch` pools
+                uncached texts with concurrent callers of the same provider and model
+                for up to this long, up to ``batch_size`` texts (0 disables)
         """
+        from app.ai_suggestions.quantization import DEFAULT_RESCORE_MARGINS, QUANTIZATION_MODES
+
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unsupported quantization: {quantization}")
         self.provider = provider.lower()
         self.cache_embeddings = cache_embeddings
         self.batch_size = batch_size
-        self._embedding_cache = {} if cache_embeddings else None
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.quantization = quantization
+        self.micro_batch_window_ms = micro_batch_window_ms
+        self.rescore_margin = (
+            rescore_margin if rescore_margin is not None else DEFAULT_RESCORE_MARGINS.get(quantization, 0.0)
+        )
+        self.last_scoring_stats: dict | None = None
+        self._local_executor = None
+        # Identifies the provider credentials without holding them (see ``get_embedding_broker``)
+        self._credential_fingerprint: str | None = None
+        # Vectors of the current engine run, held outside the bounded LRU so that
+        # evicting part of a large working set never sends it back to the provider
+        self._run_embeddings: dict[str, Any] = {}
 
         if self.provider == "openai":
             self.model = model or "text-embedding-3-small"
@@ -374,9 +422,21 @@ class LLMEmbeddingSimilarity(SimilarityAlgorithm):
             # or full path like 'sentence-transformers/all-MiniLM-L6-v2'
             self.model = model or "all-MiniLM-L6-v2"
             self._init_huggingface()
+        elif self.provider == "hashing":
+            self.model = model or "hashing-384"
+            self._init_hashing()
         else:
             raise ValueError(f"Unsupported provider: {provider}")
 
+        # Text-keyed view over (model, text_hash) entries of the shared LRU cache
+        self._embedding_cache = None
+        if cache_embeddings:
+            from app.ai_suggestions.memory_cache import EmbeddingCacheView, get_shared_embedding_cache
+
+            self._embedding_cache = EmbeddingCacheView(
+                memory_cache if memory_cache is not None else get_shared_embedding_cache(), self.model
+            )
+
     def _init_openai(self):
         """Initialize OpenAI client"""
         try:
@@ -388,6 +448,7 @@ class LLMEmbeddingSimilarity(SimilarityAlgorithm):
             if not api_key:
                 raise ValueError("OPENAI_API_KEY environment variable not set")
             self.client = OpenAI(api_key=api_key)
+            self._credential_fingerprint = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
         except ImportError:
             raise ImportError("OpenAI library not installed. Run: pip install openai")
 
@@ -400,10 +461,29 @@ class LLMEmbeddingSimilarity(SimilarityAlgorithm):
         except ImportError:
             raise ImportError("sentence-transformers not installed. Run: pip install sentence-transformers")
 
+    def _init_hashing(self):
+        """Initialize the offline feature-hashing embedder"""
+        from app.ai_suggestions.hashing_embedder import HashingEmbedder, dimensions_for_model
+
+        self.model_instance = HashingEmbedder(dimensions=dimensions_for_model(self.model))
+
+    def _get_embedding(self, text: str):
+        """Get the embedding for *text* from the current run, the cache or the configured provider"""
+        held = self._run_embeddings.get(text)
+        if held is not None:
+            return held
+        if self.provider == "openai":
+            return self._get_embedding_openai(text)
+        if self.provider == "hashing":
+            return self._get_embedding_hashing(text)
+        return self._get_embedding_huggingface(text)
+
     def _get_embedding_openai(self, text: str) -> list[float]:
         """Get embedding from OpenAI"""
-        if self.cache_embeddings and self._embedding_cache is not None and text in self._embedding_cache:
-            return self._embedding_cache[text]
+        if self.cache_embeddings and self._embedding_cache is not None:
+            cached = self._embedding_cache.get(text)
+            if cached is not None:
+                return cached
 
         response = self.client.embeddings.create(input=text, model=self.model)
         embedding = response.data[0].embedding
@@ -415,8 +495,10 @@ class LLMEmbeddingSimilarity(SimilarityAlgorithm):
 
     def _get_embedding_huggingface(self, text: str) -> list[float]:
         """Get embedding from HuggingFace"""
-        if self.cache_embeddings and self._embedding_cache is not None and text in self._embedding_cache:
-            return self._embedding_cache[text]
+        if self.cache_embeddings and self._embedding_cache is not None:
+            cached = self._embedding_cache.get(text)
+            if cached is not None:
+                return cached
 
         embedding = self.model_instance.encode(text).tolist()
 
@@ -425,6 +507,20 @@ class LLMEmbeddingSimilarity(SimilarityAlgorithm):
 
         return embedding
 
+    def _get_embedding_hashing(self, text: str) -> np.ndarray:
+        """Get embedding from the feature-hashing embedder"""
+        if self.cache_embeddings and self._embedding_cache is not None:
+            cached = self._embedding_cache.get(text)
+            if cached is not None:
+                return cached
+
+        embedding = self.model_instance.embed([text])[0]
+
+        if self.cache_embeddings and self._embedding_cache is not None:
+            self._embedding_cache[text] = embedding
+
+        return embedding
+
     def get_embeddings_batch(self, texts: list[str]) -> list[list[float]]:
         """
         Get embeddings for a batch of texts, using cache where available.
@@ -446,9 +542,10 @@ class LLMEmbeddingSimilarity(SimilarityAlgorithm):
 
         # Populate from cache first
         if self._embedding_cache is not None:
-            for t in texts:
-                if t in self._embedding_cache:
-                    result_map[t] = self._embedding_cache[t]
+            for t in dict.fromkeys(texts):
+                cached = self._embedding_cache.get(t)
+                if cached is not None:
+                    result_map[t] = cached
 
         # Collect unique uncached texts (preserve order with dict.fromkeys)
         unique_uncached = list(dict.fromkeys(t for t in texts if t not in result_map))
@@ -458,49 +555,184 @@ class LLMEmbeddingSimilarity(SimilarityAlgorithm):
             chunk_size = self.batch_size
             for i in range(0, len(unique_uncached), chunk_size):
                 chunk = unique_uncached[i : i + chunk_size]
-                if self.provider == "openai":
-                    response = self.client.embeddings.create(input=chunk, model=self.model)
-                    new_embeddings = [item.embedding for item in response.data]
-                else:  # huggingface
-                    new_embeddings = [vec.tolist() for vec in self.model_instance.encode(chunk)]
+                self._store_embeddings(chunk, self._embed_chunk(chunk), result_map)
 
-                for text, embedding in zip(chunk, new_embeddings):
-                    result_map[text] = embedding
-                    if self.cache_embeddings and self._embedding_cache is not None:
-                        self._embedding_cache[text] = embedding
+        return [result_map[t] for t in texts]
+
+    async def aget_embeddings_batch(self, texts: list[str]) -> list[list[float]]:
+        """
+        Async variant of :meth:`get_embeddings_batch` that does not block the event loop.
+
+        Uncached texts are embedded through an :class:`AsyncEmbeddingPipeline`:
+        OpenAI chunks are sent concurrently (up to ``max_concurrency``) from the
+        default thread pool with retry and exponential backoff, while local
+        HuggingFace inference runs one chunk at a time on a dedicated worker thread.
+        With ``micro_batch_window_ms`` set, they go through the shared
+        :class:`EmbeddingBroker` so concurrent callers share provider batches.
+
+        Args:
+            texts: List of text strings to embed
+
+        Returns:
+            List of embedding vectors in the same order as the input texts
+        """
+        if not texts:
+            return []
 
+        result_map, _ = await self.aembed_texts(texts)
         return [result_map[t] for t in texts]
 
+    async def aembed_texts(self, texts: list[str]) -> tuple[dict[str, Any], list[str]]:
+        """
+        Embed *texts* like :meth:`aget_embeddings_batch`, returning a map instead of a list.
+
+        Returns:
+            The ``text → embedding`` map for every distinct text, and the texts
+            that were not in the in-memory cache and had to be computed.
+        """
+        result_map: dict[str, Any] = {}
+        if self._embedding_cache is not None:
+            for t in dict.fromkeys(texts):
+                cached = self._embedding_cache.get(t)
+                if cached is not None:
+                    result_map[t] = cached
+
+        unique_uncached = list(dict.fromkeys(t for t in texts if t not in result_map))
+        if unique_uncached:
+            if self.micro_batch_window_ms > 0:
+                from app.ai_suggestions.embedding_broker import get_embedding_broker
+
+                broker = get_embedding_broker(
+                    self.provider,
+                    self.model,
+                    max_batch_size=self.batch_size,
+                    max_wait_seconds=self.micro_batch_window_ms / 1000,
+                    options=(
+                        self._credential_fingerprint,
+                        self.max_concurrency,
+                        self.max_retries,
+                        self.retry_backoff_seconds,
+                    ),
+                )
+                embeddings = await broker.embed(unique_uncached, lambda batch: self._build_pipeline().embed(batch))
+            else:
+                embeddings = await self._build_pipeline().embed(unique_uncached)
+            self._store_embeddings(unique_uncached, embeddings, result_map)
+
+        return result_map, unique_uncached
+
+    def hold_run_embeddings(self, embeddings: dict[str, Any]) -> None:
+        """Score from *embeddings* (the current run's vectors) before the LRU cache or the provider."""
+        self._run_embeddings = embeddings
+
+    def release_run_embeddings(self) -> None:
+        """Drop the vectors held by :meth:`hold_run_embeddings`."""
+        self._run_embeddings = {}
+
+    def _embed_chunk(self, chunk: list[str]) -> list[list[float]]:
+        """Embed one chunk of texts with a single provider call (blocking)."""
+        if self.provider == "openai":
+            response = self.client.embeddings.create(input=chunk, model=self.model)
+            return [item.embedding for item in response.data]
+        if self.provider == "hashing":
+            return list(self.model_instance.embed(chunk))
+        # huggingface
+        return [vec.tolist() for vec in self.model_instance.encode(chunk)]
+
+    def _store_embeddings(
+        self, chunk: list[str], embeddings: list[list[float]], result_map: dict[str, list[float]]
+    ) -> None:
+        for text, embedding in zip(chunk, embeddings):
+            result_map[text] = embedding
+            if self.cache_embeddings and self._embedding_cache is not None:
+                self._embedding_cache[text] = embedding
+
+    def _build_pipeline(self):
+        from app.ai_suggestions.embedding_pipeline import AsyncEmbeddingPipeline
+
+        if self.provider == "openai":
+            return AsyncEmbeddingPipeline(
+                self._embed_chunk,
+                batch_size=self.batch_size,
+                max_concurrency=self.max_concurrency,
+                max_retries=self.max_retries,
+                backoff_seconds=self.retry_backoff_seconds,
+            )
+
+        # Local inference (HuggingFace or hashing) is CPU/GPU bound: running chunks
+        # in parallel only oversubscribes it, so use a single dedicated worker
+        # thread (native code releases the GIL while encoding).
+        if self._local_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._local_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding")
+        return AsyncEmbeddingPipeline(
+            self._embed_chunk,
+            batch_size=self.batch_size,
+            max_concurrency=1,
+            max_retries=0,
+            executor=self._local_executor,
+        )
+
     def precompute_embeddings(self, texts: list[str]) -> None:
         """Pre-compute and cache embeddings for a list of texts in a single batched API call."""
         self.get_embeddings_batch(texts)
 
-    async def load_cached_embeddings(self, db: object, texts: list[str]) -> dict[str, list[float]]:
+    async def load_cached_embeddings(self, db: object, texts: list[str]) -> dict[str, np.ndarray]:
         """
         Load embeddings from the persistent DB cache into the in-memory cache.
 
         For each text whose SHA-256 hash is found in the ``embedding_cache`` table,
         the embedding is stored in ``self._embedding_cache`` so that subsequent
         calls to :meth:`precompute_embeddings` / :meth:`get_embeddings_batch` will
-        skip the API call entirely.
+        skip the API call entirely.  Texts already in the in-memory cache are not
+        looked up.  When ``EMBEDDING_SNAPSHOT_DIR`` is set, the memory-mapped
+        snapshot is synced and consulted first, and the DB is only queried if the
+        snapshot could not be brought up to date.
 
         Args:
             db: An async SQLAlchemy ``AsyncSession``.
             texts: Texts to look up.
 
         Returns:
-            Mapping of ``text → embedding`` for every cache hit.
+            Mapping of ``text → embedding`` (float32 array) for every DB cache hit.
         """
         if not texts or self._embedding_cache is None:
             return {}
 
-        try:
-            from app.crud.embedding_cache import get_cached_embeddings_batch
-
-            hash_to_text = {compute_text_hash(t): t for t in texts}
-            hits = await get_cached_embeddings_batch(db, list(hash_to_text.keys()), self.model)
+        from app.ai_suggestions.embedding_snapshot import get_embedding_snapshot
+        from app.crud.embedding_cache import access_tracker, get_cached_embeddings_batch
+
+        # Texts already held by the in-memory cache need no DB round trip, but
+        # their DB rows still count as used so compaction keeps them.
+        missing = []
+        served_from_memory = []
+        for t in dict.fromkeys(texts):
+            if t in self._embedding_cache:
+                served_from_memory.append(compute_text_hash(t))
+            else:
+                missing.append(t)
+        access_tracker.record(self.model, served_from_memory)
+        if not missing:
+            return {}
 
-            result: dict[str, list[float]] = {}
+        try:
+            hash_to_text = {compute_text_hash(t): t for t in missing}
+            hits: dict[str, np.ndarray] = {}
+            snapshot_is_current = False
+            snapshot = get_embedding_snapshot(self.model)
+            if snapshot is not None:
+                snapshot_is_current = await snapshot.sync(db)
+                hits = snapshot.lookup(list(hash_to_text.keys()))
+                access_tracker.record(self.model, hits.keys())
+            # A snapshot that mirrors the current cache generation already holds
+            # every cached row, so its misses are DB misses too.
+            if not snapshot_is_current:
+                remaining = [h for h in hash_to_text if h not in hits]
+                if remaining:
+                    hits.update(await get_cached_embeddings_batch(db, remaining, self.model))
+
+            result: dict[str, np.ndarray] = {}
             for text_hash, embedding in hits.items():
                 text = hash_to_text[text_hash]
                 self._embedding_cache[text] = embedding
@@ -513,19 +745,22 @@ class LLMEmbeddingSimilarity(SimilarityAlgorithm):
             logging.getLogger(__name__).warning("DB embedding cache unavailable; using in-memory cache only.")
             return {}
 
-    async def save_embeddings_to_db(self, db: object, texts: list[str]) -> None:
+    async def save_embeddings_to_db(
+        self, db: object, texts: list[str], embeddings: dict[str, Any] | None = None
+    ) -> None:
         """
-        Persist embeddings for *texts* that are already in the in-memory cache to the DB.
+        Persist embeddings for *texts* to the DB.
 
-        Only texts present in ``self._embedding_cache`` are saved — this is called
-        after :meth:`precompute_embeddings` so all freshly computed embeddings are
-        written through to the persistent store.
+        The vectors are read from *embeddings* when given (the engine passes the
+        run's own map, which the bounded LRU may no longer fully hold), and
+        otherwise from the in-memory cache; texts found in neither are skipped.
 
         Args:
             db: An async SQLAlchemy ``AsyncSession``.
             texts: Texts whose embeddings should be saved.
+            embeddings: Optional ``text → embedding`` map to read the vectors from.
         """
-        if not texts or self._embedding_cache is None:
+        if not texts or (embeddings is None and self._embedding_cache is None):
             return
 
         try:
@@ -533,7 +768,7 @@ class LLMEmbeddingSimilarity(SimilarityAlgorithm):
 
             entries = []
             for text in texts:
-                embedding = self._embedding_cache.get(text)
+                embedding = embeddings.get(text) if embeddings is not None else self._embedding_cache.peek(text)
                 if embedding is not None:
                     entries.append(
                         {
@@ -550,18 +785,163 @@ class LLMEmbeddingSimilarity(SimilarityAlgorithm):
 
             logging.getLogger(__name__).warning("Failed to persist embeddings to DB cache; continuing without save.")
 
-    def _cosine_similarity(self, vec1: list[float], vec2: list[float]) -> float:
-        """Compute cosine similarity between two vectors"""
-        import math
+    def _cosine_similarity(self, vec1, vec2) -> float:
+        """Compute cosine similarity between two vectors (float lists or numpy arrays)"""
+        a = np.asarray(vec1, dtype=np.float64)
+        b = np.asarray(vec2, dtype=np.float64)
+        magnitude = np.linalg.norm(a) * np.linalg.norm(b)
 
-        dot_product = sum(a * b for a, b in zip(vec1, vec2))
-        magnitude1 = math.sqrt(sum(a * a for a in vec1))
-        magnitude2 = math.sqrt(sum(b * b for b in vec2))
-
-        if magnitude1 == 0 or magnitude2 == 0:
+        if magnitude == 0:
             return 0.0
 
-        return dot_product / (magnitude1 * magnitude2)
+        return float(np.dot(a, b) / magnitude)
+
+    async def _load_persisted(self, db: object, texts: list[str]) -> dict[str, np.ndarray]:
+        """Read the embeddings of *texts* from the snapshot, then the DB cache, bypassing the in-memory cache."""
+        from app.ai_suggestions.embedding_snapshot import get_embedding_snapshot
+        from app.crud.embedding_cache import access_tracker, get_cached_embeddings_batch
+
+        hash_to_text = {compute_text_hash(t): t for t in texts}
+        try:
+            hits: dict[str, np.ndarray] = {}
+            snapshot = get_embedding_snapshot(self.model)
+            if snapshot is not None:
+                hits = snapshot.lookup(list(hash_to_text))
+                access_tracker.record(self.model, hits.keys())
+            remaining = [h for h in hash_to_text if h not in hits]
+            if remaining:
+                hits.update(await get_cached_embeddings_batch(db, remaining, self.model))
+        except Exception:
+            import logging
+
+            logging.getLogger(__name__).warning("DB embedding cache unavailable; embedding the texts instead.")
+            return {}
+        return {hash_to_text[h]: embedding for h, embedding in hits.items()}
+
+    async def _aembeddings(self, texts: list[str], db: object = None) -> dict[str, Any]:
+        """
+        Return ``text → embedding`` for the non-blank *texts*.
+
+        Vectors come from the current run (:meth:`hold_run_embeddings`), then the
+        persisted cache when *db* is given, then :meth:`aembed_texts`; texts whose
+        embedding fails are left out.
+        """
+        wanted = [t for t in dict.fromkeys(texts) if t.strip()]
+        found = {t: vector for t in wanted if (vector := self._run_embeddings.get(t)) is not None}
+        missing = [t for t in wanted if t not in found]
+        if missing and db is not None:
+            found.update(await self._load_persisted(db, missing))
+            missing = [t for t in missing if t not in found]
+        if missing:
+            try:
+                embedded, _ = await self.aembed_texts(missing)
+                found.update(embedded)
+            except Exception as e:
+                import logging
+
+                logging.error(f"Error computing LLM similarity: {e}")
+        return found
+
+    @staticmethod
+    def _normalized_matrix(texts: list[str], embeddings: dict[str, Any]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return L2-normalized float32 embeddings for *texts* and a mask of usable rows.
+
+        Texts missing from *embeddings* (blank, or their embedding failed) are masked
+        out and left as zero rows, matching the 0.0 score :meth:`compute_similarity`
+        gives them.
+        """
+        vectors = [
+            None if (vector := embeddings.get(text)) is None else np.asarray(vector, dtype=np.float32) for text in texts
+        ]
+        dimensions = next((v.shape[0] for v in vectors if v is not None), 0)
+        matrix = np.zeros((len(texts), dimensions), dtype=np.float32)
+        valid = np.zeros(len(texts), dtype=bool)
+        for row, vector in enumerate(vectors):
+            if vector is not None and vector.shape[0] == dimensions:
+                norm = np.linalg.norm(vector)
+                if norm > 0:
+                    matrix[row] = vector / norm
+                valid[row] = True
+        return matrix, valid
+
+    async def aiter_score_rows(
+        self, query_texts: list[str], candidate_texts: list[str], threshold: float, db: object = None
+    ):
+        """
+        Yield, for each query text in order, its scores against every candidate text.
+
+        With ``quantization='none'`` scores are exact.  Otherwise candidates are first
+        scored from int8 or binary codes, and only those scoring at least
+        ``threshold - rescore_margin`` are rescored with the float32 embeddings.
+        The others keep their approximate score, which lies below the threshold.
+
+        With *db* (the candidates' embeddings already persisted), quantized scoring
+        drops the candidates' float32 vectors from the run once they are encoded and
+        loads the ones each query block rescores from the snapshot or DB cache in one
+        batch.  Missing vectors are embedded through the async provider path.
+
+        Scores use the same ``(cosine + 1) / 2`` scale as :meth:`compute_similarity`.
+        """
+        from app.ai_suggestions.quantization import SCORE_BLOCK_ROWS, QuantizedEmbeddingMatrix
+
+        self.last_scoring_stats = {
+            "quantization": self.quantization,
+            "index_bytes": 0,
+            "float32_bytes": 0,
+            "pairs_rescored": 0,
+        }
+        if not candidate_texts:
+            for _ in query_texts:
+                yield np.zeros(0, dtype=np.float32)
+            return
+
+        quantized = self.quantization != "none"
+        index_parts, candidate_valid, candidate_floats = [], [], []
+        for start in range(0, len(candidate_texts), SCORE_BLOCK_ROWS):
+            block = candidate_texts[start : start + SCORE_BLOCK_ROWS]
+            matrix, valid = self._normalized_matrix(block, await self._aembeddings(block, db))
+            candidate_valid.append(valid)
+            if quantized:
+                index_parts.append(QuantizedEmbeddingMatrix(matrix, self.quantization))
+            else:
+                candidate_floats.append(matrix)
+        candidate_valid = np.concatenate(candidate_valid)
+        if quantized:
+            index = QuantizedEmbeddingMatrix.stack(index_parts)
+            self.last_scoring_stats["index_bytes"] = index.nbytes
+            self.last_scoring_stats["float32_bytes"] = index.rows * index.dimensions * 4
+            if db is not None:
+                queries_kept = set(query_texts)
+                for text in candidate_texts:
+                    if text not in queries_kept:
+                        self._run_embeddings.pop(text, None)
+        else:
+            floats = np.concatenate(candidate_floats)
+            self.last_scoring_stats["index_bytes"] = self.last_scoring_stats["float32_bytes"] = floats.nbytes
+
+        cutoff = 2.0 * (threshold - self.rescore_margin) - 1.0  # in cosine units
+        for start in range(0, len(query_texts), QUERY_BLOCK_ROWS):
+            block = query_texts[start : start + QUERY_BLOCK_ROWS]
+            queries, query_valid = self._normalized_matrix(block, await self._aembeddings(block, db))
+            if quantized:
+                cosines = index.approximate_cosine(QuantizedEmbeddingMatrix(queries, self.quantization))
+                rows, cols = np.nonzero(cosines >= cutoff)
+                if rows.size:
+                    unique_cols, positions = np.unique(cols, return_inverse=True)
+                    rescored = [candidate_texts[c] for c in unique_cols]
+                    exact, _ = self._normalized_matrix(rescored, await self._aembeddings(rescored, db))
+                    cosines[rows, cols] = np.einsum(
+                        "ij,ij->i", queries[rows].astype(np.float64), exact[positions].astype(np.float64)
+                    )
+                    self.last_scoring_stats["pairs_rescored"] += int(rows.size)
+            else:
+                cosines = queries @ floats.T
+            scores = (np.clip(cosines, -1.0, 1.0) + 1.0) / 2.0
+            scores[~query_valid, :] = 0.0
+            scores[:, ~candidate_valid] = 0.0
+            for row in scores:
+                yield row
 
     def compute_similarity(self, text1: str, text2: str) -> float:
         """
@@ -574,12 +954,8 @@ class LLMEmbeddingSimilarity(SimilarityAlgorithm):
             return 0.0
 
         try:
-            if self.provider == "openai":
-                emb1 = self._get_embedding_openai(text1)
-                emb2 = self._get_embedding_openai(text2)
-            else:  # huggingface
-                emb1 = self._get_embedding_huggingface(text1)
-                emb2 = self._get_embedding_huggingface(text2)
+            emb1 = self._get_embedding(text1)
+            emb2 = self._get_embedding(text2)
 
             # Cosine similarity returns -1 to 1, normalize to 0 to 1
             similarity = self._cosine_similarity(emb1, emb2)
@@ -614,6 +990,12 @@ def get_algorithm(algorithm_name: str, config=None) -> SimilarityAlgorithm:
                 "model": getattr(config, "llm_model", None),
                 "cache_embeddings": getattr(config, "llm_cache_embeddings", True),
                 "batch_size": getattr(config, "llm_batch_size", 2048),
+                "max_concurrency": getattr(config, "llm_max_concurrency", 4),
+                "max_retries": getattr(config, "llm_max_retries", 3),
+                "retry_backoff_seconds": getattr(config, "llm_retry_backoff_seconds", 0.5),
+                "quantization": getattr(config, "llm_quantization", "none"),
+                "rescore_margin": getattr(config, "llm_rescore_margin", None),
+                "micro_batch_window_ms": getattr(config, "llm_micro_batch_window_ms", 5.0),
             }
         return LLMEmbeddingSimilarity(**kwargs)
 
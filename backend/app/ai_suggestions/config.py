@@ -1,5 +1,7 @@
 """Configuration for AI Suggestion Engine"""
 
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -36,11 +38,16 @@ class SuggestionConfig(BaseModel):
     )
 
     # LLM embedding settings
-    llm_provider: str = Field(default="openai", description="LLM provider: 'openai' or 'huggingface'")
+    llm_provider: str = Field(
+        default="openai", description="LLM provider: 'openai', 'huggingface' or 'hashing' (offline, deterministic)"
+    )
 
     llm_model: str | None = Field(
         default=None,
-        description="Model name (defaults: 'text-embedding-3-small' for OpenAI, 'all-MiniLM-L6-v2' for HF)",
+        description=(
+            "Model name (defaults: 'text-embedding-3-small' for OpenAI, 'all-MiniLM-L6-v2' for HF, "
+            "'hashing-384' for hashing)"
+        ),
     )
 
     llm_cache_embeddings: bool = Field(default=True, description="Cache embeddings in memory for performance")
@@ -49,6 +56,45 @@ class SuggestionConfig(BaseModel):
 
     llm_batch_size: int = Field(default=2048, description="Maximum number of texts per batch embedding API call")
 
+    llm_max_concurrency: int = Field(
+        default=4, ge=1, description="Maximum number of embedding API calls in flight at once"
+    )
+
+    llm_max_retries: int = Field(default=3, ge=0, description="Retries per chunk for transient embedding API failures")
+
+    llm_retry_backoff_seconds: float = Field(
+        default=0.5, ge=0.0, description="Initial retry delay in seconds, doubled on every further retry"
+    )
+
+    llm_micro_batch_window_ms: float = Field(
+        default=5.0,
+        ge=0.0,
+        description=(
+            "Pool uncached texts from concurrent engine runs for up to this many milliseconds "
+            "(or llm_batch_size texts) into one provider call; 0 disables"
+        ),
+    )
+
+    llm_quantization: Literal["none", "int8", "binary"] = Field(
+        default="none",
+        description=(
+            "First-pass scoring representation: 'none' (float32), 'int8' (~4x less memory) or 'binary' "
+            "(~32x less memory); candidates near the threshold are rescored with float32 embeddings"
+        ),
+    )
+
+    llm_rescore_margin: float | None = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        description="Rescore quantized candidates scoring at least threshold minus this margin (default per mode)",
+    )
+
+    # Instrumentation
+    profile_dir: str | None = Field(
+        default=None, description="Directory to write a cProfile dump of each generation run to (disabled if unset)"
+    )
+
     class Config:
         frozen = False
 
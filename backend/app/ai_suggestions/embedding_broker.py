@@ -0,0 +1,171 @@
+"""Micro-batching of embedding requests across concurrent callers
+
+Event-driven generation runs one engine per created or updated entity, so a
+bulk import fires many tasks that each need a handful of embeddings.  Instead of
+one provider call per task, the broker holds requests for a few milliseconds
+(or until ``max_batch_size`` texts are waiting), embeds them in one batch and
+resolves every caller's futures.  A text already waiting or in flight is
+attached to the existing future rather than embedded twice.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+EmbedBatchFn = Callable[[list[str]], Awaitable[Sequence[Any]]]
+
+
+class EmbeddingBroker:
+    """
+    Collects texts from concurrent :meth:`embed` calls into shared provider batches.
+
+    Args:
+        embed_batch: Coroutine function embedding a list of texts, returning one
+            vector per text in order (e.g. ``AsyncEmbeddingPipeline.embed``).  Callers
+            may pass their own to :meth:`embed` instead; a batch is embedded with the
+            function of the latest caller that added a text to it.
+        max_batch_size: Flush as soon as this many distinct texts are waiting.
+        max_wait_seconds: Flush at the latest this long after the first text arrived.
+    """
+
+    def __init__(
+        self,
+        embed_batch: EmbedBatchFn | None = None,
+        *,
+        max_batch_size: int = 2048,
+        max_wait_seconds: float = 0.005,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.embed_batch = embed_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.loop = asyncio.get_running_loop()
+        self._futures: dict[str, asyncio.Future] = {}  # waiting or in flight
+        self._pending: list[str] = []
+        self._pending_embed: EmbedBatchFn | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task] = set()
+        self.requests = 0
+        self.texts_requested = 0
+        self.texts_deduplicated = 0
+        self.batches = 0
+        self.texts_embedded = 0
+
+    async def embed(self, texts: list[str], embed_batch: EmbedBatchFn | None = None) -> list[Any]:
+        """Embed *texts* as part of the next shared batch, returning vectors in input order."""
+        if not texts:
+            return []
+        embed_batch = embed_batch or self.embed_batch
+        if embed_batch is None:
+            raise ValueError("No embed_batch function given to the broker or the call")
+        self.requests += 1
+        self.texts_requested += len(texts)
+        futures = []
+        for text in texts:
+            future = self._futures.get(text)
+            if future is None:
+                future = self._futures[text] = self.loop.create_future()
+                self._pending.append(text)
+                self._pending_embed = embed_batch
+            else:
+                self.texts_deduplicated += 1
+            futures.append(future)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._pending and self._timer is None:
+            self._timer = self.loop.call_later(self.max_wait_seconds, self._flush)
+
+        # Shield the shared futures: one caller being cancelled must not fail the others.
+        return list(await asyncio.gather(*(asyncio.shield(f) for f in futures)))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        # Hand the function to the batch, so the broker keeps no caller alive between batches.
+        embed_batch, self._pending_embed = self._pending_embed, None
+        if not batch:
+            return
+        task = self.loop.create_task(self._run_batch(batch, embed_batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: list[str], embed_batch: EmbedBatchFn) -> None:
+        self.batches += 1
+        self.texts_embedded += len(batch)
+        try:
+            vectors = await embed_batch(batch)
+            if len(vectors) != len(batch):
+                raise ValueError(f"Embedding provider returned {len(vectors)} vectors for {len(batch)} texts")
+        except asyncio.CancelledError:
+            for text in batch:
+                self._futures.pop(text).cancel()
+            raise
+        except Exception as exc:
+            logger.warning("Embedding batch of %d texts failed: %s", len(batch), exc)
+            for text in batch:
+                future = self._futures.pop(text)
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for text, vector in zip(batch, vectors):
+            future = self._futures.pop(text)
+            if not future.done():
+                future.set_result(vector)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "texts_requested": self.texts_requested,
+            "texts_deduplicated": self.texts_deduplicated,
+            "batches": self.batches,
+            "texts_embedded": self.texts_embedded,
+            "average_batch_size": round(self.texts_embedded / self.batches, 2) if self.batches else None,
+        }
+
+
+_brokers: dict[tuple, EmbeddingBroker] = {}
+
+
+def get_embedding_broker(
+    provider: str,
+    model: str,
+    *,
+    max_batch_size: int,
+    max_wait_seconds: float,
+    options: tuple[Hashable, ...] = (),
+) -> EmbeddingBroker:
+    """
+    Return the broker shared by every caller embedding with the same settings on the running loop.
+
+    Brokers are keyed by *provider*, *model*, the batching limits and *options*
+    (whatever else decides how a batch is embedded, such as the credentials
+    and retry policy), so callers configured differently never share one.  The
+    broker holds no embed function: callers pass theirs to
+    :meth:`EmbeddingBroker.embed`.
+    """
+    key = (provider, model, max_batch_size, max_wait_seconds, options)
+    broker = _brokers.get(key)
+    if broker is None or broker.loop is not asyncio.get_running_loop() or broker.loop.is_closed():
+        broker = _brokers[key] = EmbeddingBroker(max_batch_size=max_batch_size, max_wait_seconds=max_wait_seconds)
+    return broker
+
+
+def broker_stats() -> dict[str, dict[str, Any]]:
+    """Counters of the brokers in the process, summed per ``provider/model``."""
+    totals: dict[str, dict[str, Any]] = {}
+    for (provider, model, *_), broker in _brokers.items():
+        stats = broker.stats()
+        total = totals.setdefault(f"{provider}/{model}", dict.fromkeys(stats, 0))
+        for name, value in stats.items():
+            if name != "average_batch_size":
+                total[name] += value
+    for total in totals.values():
+        total["average_batch_size"] = round(total["texts_embedded"] / total["batches"], 2) if total["batches"] else None
+    return totals
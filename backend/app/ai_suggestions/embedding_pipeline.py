@@ -0,0 +1,116 @@
+"""Non-blocking batched embedding pipeline
+
+Provider calls (the OpenAI client, ``SentenceTransformer.encode``) are
+synchronous.  The pipeline runs them in an executor so the event loop stays
+responsive, sends chunks concurrently under a semaphore, and retries transient
+failures (rate limits, 5xx, connection errors) with exponential backoff.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable, Sequence
+from concurrent.futures import Executor
+
+logger = logging.getLogger(__name__)
+
+EmbedChunkFn = Callable[[list[str]], Sequence[Sequence[float]]]
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and any 5xx.
+_RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+# Transient error types of the OpenAI and httpx clients, matched by name so neither library is required.
+_RETRYABLE_ERROR_NAMES = {
+    "APIConnectionError",
+    "APITimeoutError",
+    "RateLimitError",
+    "InternalServerError",
+    "ConnectError",
+    "ConnectTimeout",
+    "ReadTimeout",
+    "RemoteProtocolError",
+}
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """Return True if *exc* looks like a transient provider failure."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status in _RETRYABLE_STATUS_CODES or status >= 500
+    return isinstance(exc, (ConnectionError, TimeoutError)) or type(exc).__name__ in _RETRYABLE_ERROR_NAMES
+
+
+class AsyncEmbeddingPipeline:
+    """
+    Embed texts in chunks without blocking the event loop.
+
+    Args:
+        embed_chunk: Synchronous function embedding one chunk of texts, returning
+            one vector per text in order.
+        batch_size: Maximum number of texts per ``embed_chunk`` call.
+        max_concurrency: Maximum number of chunks in flight at once.
+        max_retries: Retries per chunk for transient failures (0 disables retrying).
+        backoff_seconds: Delay before the first retry; doubled on every further retry.
+        executor: Executor to run ``embed_chunk`` in. ``None`` uses the loop's
+            default thread pool.
+        is_retryable: Predicate deciding whether a failure is transient.
+    """
+
+    def __init__(
+        self,
+        embed_chunk: EmbedChunkFn,
+        *,
+        batch_size: int = 2048,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.5,
+        executor: Executor | None = None,
+        is_retryable: Callable[[BaseException], bool] = is_retryable_error,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.embed_chunk = embed_chunk
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.executor = executor
+        self.is_retryable = is_retryable
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """Embed *texts*, returning vectors in input order."""
+        if not texts:
+            return []
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        chunks = [texts[i : i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        results = await asyncio.gather(*(self._embed_with_retry(chunk, semaphore) for chunk in chunks))
+        return [list(vector) for chunk_vectors in results for vector in chunk_vectors]
+
+    async def _embed_with_retry(self, chunk: list[str], semaphore: asyncio.Semaphore) -> Sequence[Sequence[float]]:
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        async with semaphore:
+            while True:
+                try:
+                    vectors = await loop.run_in_executor(self.executor, self.embed_chunk, chunk)
+                except Exception as exc:
+                    if attempt >= self.max_retries or not self.is_retryable(exc):
+                        raise
+                    delay = self.backoff_seconds * (2**attempt)
+                    attempt += 1
+                    logger.warning(
+                        "Embedding chunk of %d texts failed (%s); retry %d/%d in %.2fs",
+                        len(chunk),
+                        exc,
+                        attempt,
+                        self.max_retries,
+                        delay,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                if len(vectors) != len(chunk):
+                    raise ValueError(f"Embedding provider returned {len(vectors)} vectors for {len(chunk)} texts")
+                return vectors
@@ -0,0 +1,346 @@
+"""Memory-mapped on-disk snapshot of the embedding cache
+
+A cold worker would otherwise load every embedding it needs from the
+``embedding_cache`` table.  Instead each model gets three files in
+``EMBEDDING_SNAPSHOT_DIR``:
+
+- ``<model>.vectors.npy`` — float32 matrix, one row per embedding, with spare capacity
+- ``<model>.hashes.npy`` — text hash of each row (fixed-width bytes)
+- ``<model>.meta.json`` — rows written, dimensions and the cache generation the files mirror
+
+Both arrays are opened with ``np.memmap``, so the OS pages rows in lazily and
+nothing is parsed.  The snapshot is validated against the per-model generation
+counter in ``embedding_cache_generations``: when it matches, the snapshot holds
+every cached embedding and misses need no DB lookup.  Every cache row is
+stamped with the generation that published it, in commit order, so a sync
+appends exactly the rows stamped after the snapshot's generation (capacity
+doubles when full).  Files are append-only: rows below the published count
+never change, so workers reading them concurrently never see a half-written
+vector, and a re-embedded text gets a new row that later reloads prefer.
+Evictions advance the generation too; a snapshot holding more embeddings
+than the DB has published — rows were evicted — or mostly superseded rows
+is rebuilt into new files that are renamed into place.  File IO runs in
+worker threads.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.embedding_cache import publish_embedding_writes
+from app.models.embedding_cache import EMBEDDING_DTYPE, EmbeddingCache
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+HASH_DTYPE = np.dtype("S64")
+MIN_CAPACITY = 1024
+
+
+def _file_stem(model_name: str) -> str:
+    readable = re.sub(r"[^A-Za-z0-9._-]+", "_", model_name).strip("._")[:80]
+    digest = hashlib.sha256(model_name.encode("utf-8")).hexdigest()[:12]
+    return f"{readable}-{digest}"
+
+
+class EmbeddingSnapshot:
+    """On-disk, memory-mapped mirror of one model's rows in the embedding cache."""
+
+    def __init__(self, directory: str | Path, model_name: str) -> None:
+        self.directory = Path(directory)
+        self.model_name = model_name
+        stem = _file_stem(model_name)
+        self._vectors_path = self.directory / f"{stem}.vectors.npy"
+        self._hashes_path = self.directory / f"{stem}.hashes.npy"
+        self._meta_path = self.directory / f"{stem}.meta.json"
+        self._lock_path = self.directory / f"{stem}.lock"
+        self._meta: dict[str, Any] | None = None
+        self._meta_mtime: int | None = None
+        self._vectors: np.memmap | None = None
+        self._hashes: np.memmap | None = None
+        self._index: dict[str, int] = {}
+        self._sync_lock = asyncio.Lock()
+
+    # -- reading ---------------------------------------------------------
+
+    @property
+    def generation(self) -> int | None:
+        return self._meta["generation"] if self._meta else None
+
+    @property
+    def count(self) -> int:
+        """Distinct embeddings in the snapshot (a re-embedded text's older rows are not counted)."""
+        return len(self._index)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get(self, text_hash: str) -> np.ndarray | None:
+        """Return the memory-mapped row for *text_hash*, or None if it is not in the snapshot."""
+        self._reload_if_changed()
+        row = self._index.get(text_hash)
+        return None if row is None else self._vectors[row]
+
+    def lookup(self, text_hashes: list[str]) -> dict[str, np.ndarray]:
+        self._reload_if_changed()
+        return {h: self._vectors[row] for h in text_hashes if (row := self._index.get(h)) is not None}
+
+    def _reload_if_changed(self) -> None:
+        """(Re)open the files if another worker or an earlier run has updated them."""
+        state = self._read_files()
+        if state is not None:
+            self._apply(state)
+
+    async def _areload_if_changed(self) -> None:
+        state = await asyncio.to_thread(self._read_files)
+        if state is not None:
+            self._apply(state)
+
+    def _read_files(self) -> tuple | None:
+        """Return the state to apply for the files on disk, or None if they are unchanged."""
+        try:
+            mtime = self._meta_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return (None, None, None, None, {})
+        if mtime == self._meta_mtime:
+            return None
+        try:
+            meta = json.loads(self._meta_path.read_text())
+            if meta.get("model") == self.model_name and meta["count"] == 0 and not meta["dimensions"]:
+                # Empty snapshot: nothing was cached for the model when it was synced.
+                return (meta, mtime, None, None, {})
+            vectors = np.load(self._vectors_path, mmap_mode="r")
+            hashes = np.load(self._hashes_path, mmap_mode="r")
+            if (
+                meta.get("model") != self.model_name
+                or vectors.dtype != EMBEDDING_DTYPE
+                or vectors.ndim != 2
+                or vectors.shape[1] != meta["dimensions"]
+                or hashes.shape[0] != vectors.shape[0]
+                or meta["count"] > vectors.shape[0]
+            ):
+                raise ValueError("snapshot files do not match their metadata")
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("Ignoring unreadable embedding snapshot for %s: %s", self.model_name, exc)
+            return (None, None, None, None, {})
+        # A re-embedded text was appended again; its latest row wins.
+        index = {h.decode("ascii"): row for row, h in enumerate(hashes[: meta["count"]].tolist())}
+        return (meta, mtime, vectors, hashes, index)
+
+    def _apply(self, state: tuple) -> None:
+        # One assignment, so readers never pair an index with another file's vectors.
+        self._meta, self._meta_mtime, self._vectors, self._hashes, self._index = state
+
+    def _close(self) -> None:
+        self._apply((None, None, None, None, {}))
+
+    # -- syncing ---------------------------------------------------------
+
+    async def sync(self, db: AsyncSession) -> bool:
+        """
+        Bring the snapshot up to date with the DB cache.
+
+        Returns True if, afterwards, the snapshot mirrors the DB generation —
+        i.e. a hash missing from the snapshot is not in the DB cache either.
+        Returns False if another worker holds the snapshot lock; callers
+        should then fall back to the DB for misses.
+        """
+        generation = await publish_embedding_writes(db, self.model_name)
+        async with self._sync_lock:
+            await self._areload_if_changed()
+            if self._meta is not None and self._meta["generation"] == generation:
+                return True
+            with self._file_lock() as acquired:
+                if not acquired:
+                    return False
+                await self._areload_if_changed()
+                if self._meta is not None and self._meta["generation"] == generation:
+                    return True
+                if self._meta is None or self._meta["generation"] > generation:
+                    await self._rebuild(db, generation)
+                else:
+                    await self._append_published(db, generation)
+        return True
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[bool]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self._lock_path, "a+") as lock_file:
+            if fcntl is None:
+                yield True
+                return
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _rows_query(self):
+        return select(EmbeddingCache.text_hash, EmbeddingCache.embedding, EmbeddingCache.dimensions).where(
+            EmbeddingCache.model_name == self.model_name
+        )
+
+    async def _published_count(self, db: AsyncSession, generation: int) -> int:
+        result = await db.execute(
+            select(func.count()).where(
+                EmbeddingCache.model_name == self.model_name, EmbeddingCache.generation <= generation
+            )
+        )
+        return result.scalar_one()
+
+    async def _rebuild(self, db: AsyncSession, generation: int) -> None:
+        """Write a fresh snapshot of every row published up to *generation* and swap it in atomically."""
+        total = await self._published_count(db, generation)
+        dimensions: int | None = None
+        vectors = hashes = None
+        count = 0
+        result = await db.stream(self._rows_query().where(EmbeddingCache.generation <= generation))
+        async for row in result:
+            if row.embedding.shape[0] != row.dimensions:
+                continue
+            if vectors is None:
+                dimensions = row.dimensions
+                vectors, hashes = await asyncio.to_thread(
+                    self._create_files, ".tmp", max(MIN_CAPACITY, total), dimensions
+                )
+            if row.dimensions != dimensions:
+                continue
+            vectors[count] = row.embedding
+            hashes[count] = row.text_hash.encode("ascii")
+            count += 1
+        await result.close()
+
+        if vectors is None:
+            # Nothing cached for this model yet: keep an empty snapshot so later syncs are incremental.
+            await asyncio.to_thread(self._write_meta, generation, 0, 0)
+            await asyncio.to_thread(self._remove_data_files)
+            await self._areload_if_changed()
+            return
+        await asyncio.to_thread(self._commit_files, vectors, hashes, ".tmp")
+        await asyncio.to_thread(self._write_meta, generation, count, dimensions)
+        await self._areload_if_changed()
+        logger.info("Rebuilt embedding snapshot for %s: %d rows", self.model_name, count)
+
+    async def _append_published(self, db: AsyncSession, generation: int) -> None:
+        """Append the rows published after the snapshot's generation, up to *generation*."""
+        result = await db.execute(
+            self._rows_query().where(
+                EmbeddingCache.generation > self._meta["generation"], EmbeddingCache.generation <= generation
+            )
+        )
+        rows = [row for row in result if row.embedding.shape[0] == row.dimensions]
+
+        dimensions = self._meta["dimensions"]
+        if rows and (not dimensions or any(row.dimensions != dimensions for row in rows)):
+            # First rows for an empty snapshot, or the model's dimensions changed.
+            await self._rebuild(db, generation)
+            return
+
+        distinct = len(self._index) + sum(row.text_hash not in self._index for row in rows)
+        count = self._meta["count"] + len(rows)
+        if distinct > await self._published_count(db, generation):
+            # The snapshot would hold rows the DB no longer has: some were evicted.
+            await self._rebuild(db, generation)
+            return
+        if count > MIN_CAPACITY and count > 2 * distinct:
+            # Mostly superseded rows of re-embedded texts: compact.
+            await self._rebuild(db, generation)
+            return
+        if rows:
+            await asyncio.to_thread(self._write_rows, rows, count)
+        await asyncio.to_thread(self._write_meta, generation, count, dimensions)
+        await self._areload_if_changed()
+
+    def _write_rows(self, rows: list, count: int) -> None:
+        """
+        Append *rows* after the snapshot's rows, growing the files to hold *count* rows.
+
+        Only slots past the published count are written, which no reader has
+        indexed; the new rows become visible with the next metadata write.
+        """
+        if count > self._vectors.shape[0]:
+            self._grow(count)
+        vectors = np.load(self._vectors_path, mmap_mode="r+")
+        hashes = np.load(self._hashes_path, mmap_mode="r+")
+        for position, row in enumerate(rows, start=self._meta["count"]):
+            vectors[position] = row.embedding
+            hashes[position] = row.text_hash.encode("ascii")
+        vectors.flush()
+        hashes.flush()
+
+    def _grow(self, required: int) -> None:
+        """Copy the snapshot into files with at least double the capacity."""
+        capacity = self._vectors.shape[0]
+        while capacity < required:
+            capacity *= 2
+        count = self._meta["count"]
+        vectors, hashes = self._create_files(".grow", capacity, self._meta["dimensions"])
+        vectors[:count] = self._vectors[:count]
+        hashes[:count] = self._hashes[:count]
+        self._commit_files(vectors, hashes, ".grow")
+
+    # -- files -----------------------------------------------------------
+
+    def _create_files(self, suffix: str, capacity: int, dimensions: int) -> tuple[np.memmap, np.memmap]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        vectors = np.lib.format.open_memmap(
+            f"{self._vectors_path}{suffix}", mode="w+", dtype=EMBEDDING_DTYPE, shape=(capacity, dimensions)
+        )
+        hashes = np.lib.format.open_memmap(
+            f"{self._hashes_path}{suffix}", mode="w+", dtype=HASH_DTYPE, shape=(capacity,)
+        )
+        return vectors, hashes
+
+    def _commit_files(self, vectors: np.memmap, hashes: np.memmap, suffix: str) -> None:
+        vectors.flush()
+        hashes.flush()
+        # Workers that still map the old files keep reading their (unchanged) inodes.
+        os.replace(f"{self._vectors_path}{suffix}", self._vectors_path)
+        os.replace(f"{self._hashes_path}{suffix}", self._hashes_path)
+
+    def _remove_data_files(self) -> None:
+        for path in (self._vectors_path, self._hashes_path):
+            path.unlink(missing_ok=True)
+
+    def _write_meta(self, generation: int, count: int, dimensions: int) -> None:
+        meta = {"model": self.model_name, "generation": generation, "count": count, "dimensions": dimensions}
+        tmp_path = self._meta_path.with_name(self._meta_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(meta))
+        os.replace(tmp_path, self._meta_path)
+        # Force the next reload even on filesystems with coarse mtimes.
+        self._meta_mtime = None
+
+
+_snapshots: dict[tuple[str, str], EmbeddingSnapshot] = {}
+
+
+def get_embedding_snapshot(model_name: str) -> EmbeddingSnapshot | None:
+    """Return the process-wide snapshot for *model_name*, or None when ``EMBEDDING_SNAPSHOT_DIR`` is unset."""
+    from app.config import settings
+
+    if not settings.EMBEDDING_SNAPSHOT_DIR:
+        return None
+    key = (settings.EMBEDDING_SNAPSHOT_DIR, model_name)
+    snapshot = _snapshots.get(key)
+    if snapshot is None:
+        snapshot = _snapshots[key] = EmbeddingSnapshot(settings.EMBEDDING_SNAPSHOT_DIR, model_name)
+    return snapshot
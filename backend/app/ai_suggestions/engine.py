@@ -1,26 +1,103 @@
 """Core Suggestion Engine"""
 
+import cProfile
+import json
 import logging
+from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any
 from uuid import UUID
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
+from app.crud.suggestion_rollup import apply_suggestion_rollup, suggestion_rollup_deltas
 from app.models.link import RequirementTestCaseLink
 from app.models.requirement import Requirement
 from app.models.suggestion import LinkSuggestion, SuggestionMethod, SuggestionStatus
 from app.models.test_case import TestCase
 from app.schemas.link import SuggestionCreate
+from app.services.operational_metrics import record_suggestion_run
 
 from .algorithms import LLMEmbeddingSimilarity, get_algorithm
 from .config import SuggestionConfig, default_config
+from .profiling import StageProfiler, rate
 
 logger = logging.getLogger(__name__)
 
 BATCH_SIZE = 100
 
 
+def requirement_text(requirement: Requirement) -> str:
+    """
+    Combine requirement fields into a single text for analysis
+
+    Shared with write-time embedding precomputation so both embed (and cache)
+    exactly the same text.
+
+    Args:
+        requirement: Requirement model instance
+
+    Returns:
+        Combined text string
+    """
+    parts = [
+        requirement.title or "",
+        requirement.description or "",
+    ]
+
+    # Add module as context if available
+    if requirement.module:
+        parts.append(requirement.module)
+
+    # Add tags as context if available
+    if requirement.tags:
+        parts.extend(requirement.tags)
+
+    return " ".join(parts)
+
+
+def test_case_text(test_case: TestCase) -> str:
+    """
+    Combine test case fields into a single text for analysis
+
+    Args:
+        test_case: TestCase model instance
+
+    Returns:
+        Combined text string
+    """
+    parts = [
+        test_case.title or "",
+        test_case.description or "",
+    ]
+
+    # Add preconditions and postconditions
+    if test_case.preconditions:
+        parts.append(test_case.preconditions)
+
+    if test_case.postconditions:
+        parts.append(test_case.postconditions)
+
+    # Add module as context if available
+    if test_case.module:
+        parts.append(test_case.module)
+
+    # Add tags as context if available
+    if test_case.tags:
+        parts.extend(test_case.tags)
+
+    # Add steps if available
+    if test_case.steps:
+        if isinstance(test_case.steps, list):
+            parts.extend([str(step) for step in test_case.steps])
+        elif isinstance(test_case.steps, dict):
+            parts.extend([str(v) for v in test_case.steps.values()])
+
+    return " ".join(parts)
+
+
 class SuggestionEngine:
     """
     AI-powered suggestion engine for requirement-test case links.
@@ -40,68 +117,12 @@ class SuggestionEngine:
         self.algorithm = get_algorithm(self.config.default_algorithm, self.config)
 
     def _combine_text(self, requirement: Requirement) -> str:
-        """
-        Combine requirement fields into a single text for analysis
-
-        Args:
-            requirement: Requirement model instance
-
-        Returns:
-            Combined text string
-        """
-        parts = [
-            requirement.title or "",
-            requirement.description or "",
-        ]
-
-        # Add module as context if available
-        if requirement.module:
-            parts.append(requirement.module)
-
-        # Add tags as context if available
-        if requirement.tags:
-            parts.extend(requirement.tags)
-
-        return " ".join(parts)
+        """Combine requirement fields into a single text for analysis"""
+        return requirement_text(requirement)
 
     def _combine_test_case_text(self, test_case: TestCase) -> str:
-        """
-        Combine test case fields into a single text for analysis
-
-        Args:
-            test_case: TestCase model instance
-
-        Returns:
-            Combined text string
-        """
-        parts = [
-            test_case.title or "",
-            test_case.description or "",
-        ]
-
-        # Add preconditions and postconditions
-        if test_case.preconditions:
-            parts.append(test_case.preconditions)
-
-        if test_case.postconditions:
-            parts.append(test_case.postconditions)
-
-        # Add module as context if available
-        if test_case.module:
-            parts.append(test_case.module)
-
-        # Add tags as context if available
-        if test_case.tags:
-            parts.extend(test_case.tags)
-
-        # Add steps if available
-        if test_case.steps:
-            if isinstance(test_case.steps, list):
-                parts.extend([str(step) for step in test_case.steps])
-            elif isinstance(test_case.steps, dict):
-                parts.extend([str(v) for v in test_case.steps.values()])
-
-        return " ".join(parts)
+        """Combine test case fields into a single text for analysis"""
+        return test_case_text(test_case)
 
     def compute_similarity(self, requirement: Requirement, test_case: TestCase) -> float:
         """
@@ -175,44 +196,94 @@ class SuggestionEngine:
             - pairs_analyzed: Number of requirement-test case pairs analyzed
             - suggestions_created: Number of new suggestions created
             - suggestions_skipped: Number of pairs skipped (existing link/suggestion or below threshold)
+            - timings: Wall and CPU milliseconds per stage (load_entities, build_text, embed, score, insert)
+            - pairs_per_second / rows_inserted_per_second: Scoring and insert throughput
+            - embedding_cache_hit_ratio: Share of texts served from the embedding caches (LLM only)
+            - quantization: Mode, index and float32 bytes and pairs rescored (quantized LLM scoring only)
+            - profile_path: Path of the cProfile dump, when a profile directory is configured
         """
-        # Fetch requirements
-        if requirement_ids:
-            req_query = select(Requirement).where(Requirement.id.in_(requirement_ids))
-        else:
-            req_query = select(Requirement)
-
-        req_result = await db.execute(req_query)
-        requirements = list(req_result.scalars().all())
-
-        # Fetch test cases
-        if test_case_ids:
-            tc_query = select(TestCase).where(TestCase.id.in_(test_case_ids))
-        else:
-            tc_query = select(TestCase)
-
-        tc_result = await db.execute(tc_query)
-        test_cases = list(tc_result.scalars().all())
-
-        # Get existing links and suggestions to avoid duplicates (scoped to relevant requirements)
-        existing_links = await self._get_existing_links(db, requirement_ids=requirement_ids)
-        existing_suggestions = await self._get_existing_suggestions(db, requirement_ids=requirement_ids)
-
-        # Pre-compute text representations once to avoid redundant work
-        req_texts = {req.id: self._combine_text(req) for req in requirements}
-        tc_texts = {tc.id: self._combine_test_case_text(tc) for tc in test_cases}
-
-        # Pre-embed all texts in a single batched API call when using the LLM algorithm
+        profiler = StageProfiler()
+        profile_dir = self.config.profile_dir or settings.SUGGESTION_PROFILE_DIR
+        cprofile = cProfile.Profile() if profile_dir else None
+        if cprofile is not None:
+            cprofile.enable()
+        try:
+            stats = await self._generate(db, profiler, requirement_ids, test_case_ids)
+        finally:
+            # Never leave the profiler running on the event-loop thread after a failed run
+            if cprofile is not None:
+                cprofile.disable()
+            if isinstance(self.algorithm, LLMEmbeddingSimilarity):
+                self.algorithm.release_run_embeddings()
+
+        if cprofile is not None:
+            profile_path = self._dump_profile(cprofile, profile_dir)
+            if profile_path is not None:
+                stats["profile_path"] = profile_path
+
+        record_suggestion_run(self.config.default_algorithm, stats["pairs_analyzed"], profiler.wall_seconds("score"))
+        logger.info("suggestion_engine.run %s", json.dumps(stats, sort_keys=True))
+        return stats
+
+    async def _generate(
+        self,
+        db: AsyncSession,
+        profiler: StageProfiler,
+        requirement_ids: list[UUID] | None,
+        test_case_ids: list[UUID] | None,
+    ) -> dict[str, Any]:
+        """Run the generation stages under *profiler* and return the statistics (see ``generate_suggestions``)."""
+        with profiler.stage("load_entities"):
+            # Fetch requirements
+            if requirement_ids:
+                req_query = select(Requirement).where(Requirement.id.in_(requirement_ids))
+            else:
+                req_query = select(Requirement)
+
+            req_result = await db.execute(req_query)
+            requirements = list(req_result.scalars().all())
+
+            # Fetch test cases
+            if test_case_ids:
+                tc_query = select(TestCase).where(TestCase.id.in_(test_case_ids))
+            else:
+                tc_query = select(TestCase)
+
+            tc_result = await db.execute(tc_query)
+            test_cases = list(tc_result.scalars().all())
+
+            # Get existing links and suggestions to avoid duplicates (scoped to relevant requirements)
+            existing_links = await self._get_existing_links(db, requirement_ids=requirement_ids)
+            existing_suggestions = await self._get_existing_suggestions(db, requirement_ids=requirement_ids)
+
+        with profiler.stage("build_text"):
+            # Pre-compute text representations once to avoid redundant work
+            req_texts = {req.id: self._combine_text(req) for req in requirements}
+            tc_texts = {tc.id: self._combine_test_case_text(tc) for tc in test_cases}
+
+        embedding_cache_hit_ratio: float | None = None
+
+        # Pre-embed all texts in batched API calls when using the LLM algorithm
         if self.config.default_algorithm == "llm" and isinstance(self.algorithm, LLMEmbeddingSimilarity):
-            all_texts = list({*req_texts.values(), *tc_texts.values()})
-            if getattr(self.config, "llm_db_cache_enabled", True):
-                # Step 1: Load existing embeddings from DB cache
-                await self.algorithm.load_cached_embeddings(db, all_texts)
-            # Step 2: Compute remaining embeddings via API (only uncached ones)
-            self.algorithm.precompute_embeddings(all_texts)
-            if getattr(self.config, "llm_db_cache_enabled", True):
-                # Step 3: Persist newly computed embeddings to DB
-                await self.algorithm.save_embeddings_to_db(db, all_texts)
+            with profiler.stage("embed"):
+                all_texts = list({*req_texts.values(), *tc_texts.values()})
+                use_db_cache = getattr(self.config, "llm_db_cache_enabled", True)
+                run_embeddings: dict[str, Any] = {}
+                if use_db_cache:
+                    # Step 1: Load existing embeddings from DB cache
+                    run_embeddings.update(await self.algorithm.load_cached_embeddings(db, all_texts))
+                # Step 2: Take the rest from memory or compute them via API off the event loop
+                remaining = [text for text in all_texts if text not in run_embeddings]
+                embedded, computed_texts = await self.algorithm.aembed_texts(remaining)
+                run_embeddings.update(embedded)
+                if all_texts:
+                    embedding_cache_hit_ratio = round(1 - len(computed_texts) / len(all_texts), 4)
+                if use_db_cache:
+                    # Step 3: Persist newly computed embeddings to DB
+                    await self.algorithm.save_embeddings_to_db(db, computed_texts, run_embeddings)
+                # Score from the run's own vectors: a working set larger than the
+                # LRU budget would otherwise be re-fetched from the provider per pair
+                self.algorithm.hold_run_embeddings(run_embeddings)
 
         pairs_analyzed = 0
         suggestions_created = 0
@@ -228,64 +299,114 @@ class SuggestionEngine:
         suggestion_method = method_map.get(self.config.default_algorithm, SuggestionMethod.HEURISTIC)
 
         batch: list[LinkSuggestion] = []
+        # Rollup deltas of the inserted batches, applied once right before the commit
+        rollup_deltas: list[dict] = []
+
+        # Quantized LLM scoring scores each requirement against all test cases at once
+        score_rows = None
+        if isinstance(self.algorithm, LLMEmbeddingSimilarity) and self.algorithm.quantization != "none":
+            # With the DB cache the run's embeddings are persisted by now, so rescoring can reload them from there
+            score_rows = self.algorithm.aiter_score_rows(
+                [req_texts[req.id] for req in requirements],
+                [tc_texts[tc.id] for tc in test_cases],
+                self.config.min_confidence_threshold,
+                db=db if getattr(self.config, "llm_db_cache_enabled", True) else None,
+            )
 
         # Analyze all requirement-test case pairs
-        for requirement in requirements:
-            req_text = req_texts[requirement.id]
-            for test_case in test_cases:
-                pairs_analyzed += 1
-
-                if pairs_analyzed % 1000 == 0:
-                    logger.info("Suggestion engine progress: %d pairs analyzed", pairs_analyzed)
-
-                # Skip if already linked
-                if (requirement.id, test_case.id) in existing_links:
-                    suggestions_skipped += 1
-                    continue
-
-                # Skip if suggestion already exists
-                if (requirement.id, test_case.id) in existing_suggestions:
-                    suggestions_skipped += 1
-                    continue
-
-                # Compute similarity using pre-computed texts
-                tc_text = tc_texts[test_case.id]
-                similarity_score = self.algorithm.compute_similarity(req_text, tc_text)
-
-                # Check threshold
-                if similarity_score < self.config.min_confidence_threshold:
-                    suggestions_skipped += 1
-                    continue
-
-                # Collect suggestion for batch insert
-                suggestion_data = SuggestionCreate(
-                    requirement_id=requirement.id,
-                    test_case_id=test_case.id,
-                    similarity_score=similarity_score,
-                    suggestion_method=suggestion_method,
-                    suggestion_reason=f"Similarity score: {similarity_score:.3f} using {self.config.default_algorithm}",
-                    suggestion_metadata={
-                        "algorithm": self.config.default_algorithm,
-                        "threshold": self.config.min_confidence_threshold,
-                    },
-                )
-                batch.append(LinkSuggestion(**suggestion_data.model_dump()))
-                suggestions_created += 1
-
-                if len(batch) >= BATCH_SIZE:
-                    db.add_all(batch)
-                    await db.flush()
-                    batch = []
+        with profiler.stage("score"):
+            for requirement in requirements:
+                req_text = req_texts[requirement.id]
+                row_scores = await anext(score_rows) if score_rows is not None else None
+                for tc_index, test_case in enumerate(test_cases):
+                    pairs_analyzed += 1
+
+                    if pairs_analyzed % 1000 == 0:
+                        logger.info("Suggestion engine progress: %d pairs analyzed", pairs_analyzed)
+
+                    # Skip if already linked
+                    if (requirement.id, test_case.id) in existing_links:
+                        suggestions_skipped += 1
+                        continue
+
+                    # Skip if suggestion already exists
+                    if (requirement.id, test_case.id) in existing_suggestions:
+                        suggestions_skipped += 1
+                        continue
+
+                    # Compute similarity using pre-computed texts
+                    if row_scores is not None:
+                        similarity_score = float(row_scores[tc_index])
+                    else:
+                        similarity_score = self.algorithm.compute_similarity(req_text, tc_texts[test_case.id])
+
+                    # Check threshold
+                    if similarity_score < self.config.min_confidence_threshold:
+                        suggestions_skipped += 1
+                        continue
+
+                    # Collect suggestion for batch insert
+                    suggestion_data = SuggestionCreate(
+                        requirement_id=requirement.id,
+                        test_case_id=test_case.id,
+                        similarity_score=similarity_score,
+                        suggestion_method=suggestion_method,
+                        suggestion_reason=(
+                            f"Similarity score: {similarity_score:.3f} using {self.config.default_algorithm}"
+                        ),
+                        suggestion_metadata={
+                            "algorithm": self.config.default_algorithm,
+                            "threshold": self.config.min_confidence_threshold,
+                        },
+                    )
+                    batch.append(LinkSuggestion(**suggestion_data.model_dump()))
+                    suggestions_created += 1
+
+                    if len(batch) >= BATCH_SIZE:
+                        with profiler.stage("insert"):
+                            db.add_all(batch)
+                            await db.flush()
+                            rollup_deltas += await suggestion_rollup_deltas(
+                                db, LinkSuggestion.id.in_([item.id for item in batch])
+                            )
+                        batch = []
+            if score_rows is not None:
+                await score_rows.aclose()
 
         # Insert any remaining suggestions
-        if batch:
-            db.add_all(batch)
-        await db.commit()
-
-        return {
+        with profiler.stage("insert"):
+            if batch:
+                db.add_all(batch)
+                await db.flush()
+                rollup_deltas += await suggestion_rollup_deltas(db, LinkSuggestion.id.in_([item.id for item in batch]))
+            await apply_suggestion_rollup(db, rollup_deltas)
+            await db.commit()
+
+        stats = {
             "pairs_analyzed": pairs_analyzed,
             "suggestions_created": suggestions_created,
             "suggestions_skipped": suggestions_skipped,
             "algorithm_used": self.config.default_algorithm,
             "threshold": self.config.min_confidence_threshold,
+            "timings": profiler.as_dict(),
+            "total_wall_ms": round(profiler.total_wall_seconds * 1000, 3),
+            "pairs_per_second": rate(pairs_analyzed, profiler.wall_seconds("score")),
+            "rows_inserted_per_second": rate(suggestions_created, profiler.wall_seconds("insert")),
+            "embedding_cache_hit_ratio": embedding_cache_hit_ratio,
         }
+        if score_rows is not None and self.algorithm.last_scoring_stats is not None:
+            stats["quantization"] = self.algorithm.last_scoring_stats
+        return stats
+
+    def _dump_profile(self, cprofile: cProfile.Profile, profile_dir: str) -> str | None:
+        """Write the cProfile stats for a run to *profile_dir*, returning the file path."""
+        try:
+            directory = Path(profile_dir)
+            directory.mkdir(parents=True, exist_ok=True)
+            stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+            path = directory / f"suggestions-{self.config.default_algorithm}-{stamp}.prof"
+            cprofile.dump_stats(str(path))
+            return str(path)
+        except OSError:
+            logger.warning("Could not write suggestion engine profile to %s", profile_dir)
+            return None
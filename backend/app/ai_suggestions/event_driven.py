@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.ai_suggestions.config import SuggestionConfig
 from app.ai_suggestions.engine import SuggestionEngine
 from app.config import settings
+from app.services.operational_metrics import BACKGROUND_TASKS
 
 logger = logging.getLogger(__name__)
 
@@ -33,32 +34,33 @@ async def generate_suggestions_for_requirement(
         algorithm: Optional algorithm override. Uses settings if not provided.
         threshold: Optional threshold override. Uses settings if not provided.
     """
-    try:
-        logger.info(f"Starting auto-suggestion generation for requirement {requirement_id}")
+    with BACKGROUND_TASKS.track_in_progress(queue="auto_suggestions"):
+        try:
+            logger.info(f"Starting auto-suggestion generation for requirement {requirement_id}")
 
-        # Create config with overrides from settings or parameters
-        config = SuggestionConfig(
-            default_algorithm=algorithm or settings.AUTO_SUGGESTIONS_ALGORITHM,
-            min_confidence_threshold=threshold or settings.AUTO_SUGGESTIONS_THRESHOLD,
-        )
+            # Create config with overrides from settings or parameters
+            config = SuggestionConfig(
+                default_algorithm=algorithm or settings.AUTO_SUGGESTIONS_ALGORITHM,
+                min_confidence_threshold=threshold or settings.AUTO_SUGGESTIONS_THRESHOLD,
+            )
 
-        # Initialize engine
-        engine = SuggestionEngine(config=config)
+            # Initialize engine
+            engine = SuggestionEngine(config=config)
 
-        # Generate suggestions for this specific requirement
-        result = await engine.generate_suggestions(
-            db,
-            requirement_ids=[requirement_id],
-            test_case_ids=None,  # All test cases
-        )
+            # Generate suggestions for this specific requirement
+            result = await engine.generate_suggestions(
+                db,
+                requirement_ids=[requirement_id],
+                test_case_ids=None,  # All test cases
+            )
 
-        logger.info(
-            f"Auto-suggestion completed for requirement {requirement_id}: "
-            f"{result['suggestions_created']} created, {result['suggestions_skipped']} skipped"
-        )
+            logger.info(
+                f"Auto-suggestion completed for requirement {requirement_id}: "
+                f"{result['suggestions_created']} created, {result['suggestions_skipped']} skipped"
+            )
 
-    except Exception as e:
-        logger.error(f"Error generating suggestions for requirement {requirement_id}: {str(e)}")
+        except Exception as e:
+            logger.error(f"Error generating suggestions for requirement {requirement_id}: {str(e)}")
 
 
 async def generate_suggestions_for_test_case(
@@ -78,29 +80,30 @@ async def generate_suggestions_for_test_case(
         algorithm: Optional algorithm override. Uses settings if not provided.
         threshold: Optional threshold override. Uses settings if not provided.
     """
-    try:
-        logger.info(f"Starting auto-suggestion generation for test case {test_case_id}")
-
-        # Create config with overrides from settings or parameters
-        config = SuggestionConfig(
-            default_algorithm=algorithm or settings.AUTO_SUGGESTIONS_ALGORITHM,
-            min_confidence_threshold=threshold or settings.AUTO_SUGGESTIONS_THRESHOLD,
-        )
-
-        # Initialize engine
-        engine = SuggestionEngine(config=config)
-
-        # Generate suggestions for this specific test case
-        result = await engine.generate_suggestions(
-            db,
-            requirement_ids=None,  # All requirements
-            test_case_ids=[test_case_id],
-        )
-
-        logger.info(
-            f"Auto-suggestion completed for test case {test_case_id}: "
-            f"{result['suggestions_created']} created, {result['suggestions_skipped']} skipped"
-        )
-
-    except Exception as e:
-        logger.error(f"Error generating suggestions for test case {test_case_id}: {str(e)}")
+    with BACKGROUND_TASKS.track_in_progress(queue="auto_suggestions"):
+        try:
+            logger.info(f"Starting auto-suggestion generation for test case {test_case_id}")
+
+            # Create config with overrides from settings or parameters
+            config = SuggestionConfig(
+                default_algorithm=algorithm or settings.AUTO_SUGGESTIONS_ALGORITHM,
+                min_confidence_threshold=threshold or settings.AUTO_SUGGESTIONS_THRESHOLD,
+            )
+
+            # Initialize engine
+            engine = SuggestionEngine(config=config)
+
+            # Generate suggestions for this specific test case
+            result = await engine.generate_suggestions(
+                db,
+                requirement_ids=None,  # All requirements
+                test_case_ids=[test_case_id],
+            )
+
+            logger.info(
+                f"Auto-suggestion completed for test case {test_case_id}: "
+                f"{result['suggestions_created']} created, {result['suggestions_skipped']} skipped"
+            )
+
+        except Exception as e:
+            logger.error(f"Error generating suggestions for test case {test_case_id}: {str(e)}")
@@ -0,0 +1,81 @@
+"""Offline, deterministic embeddings from hashed text features
+
+Backs the ``hashing`` provider of ``LLMEmbeddingSimilarity`` so the embedding
+code paths (batching, caches, snapshots, quantized scoring) can run without a
+network or a model download — e.g. on air-gapped CI runners.
+
+Each text is tokenized into lowercase words and word bigrams, hashed with
+CRC32 into ``n_features`` buckets, and weighted with sublinear term frequency
+(``1 + log tf``).  The sparse vector is projected to ``dimensions`` with a fixed
+seeded ±1 random matrix and L2-normalized.  There is no IDF term: an embedding
+must not depend on which other texts happen to share its batch, or cached
+vectors would disagree with fresh ones.
+"""
+
+import math
+import re
+import zlib
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+DEFAULT_DIMENSIONS = 384
+DEFAULT_FEATURES = 2**14
+MODEL_PATTERN = re.compile(r"^hashing-(\d+)$")
+# Texts embedded per dense (texts x distinct buckets) weight matrix
+EMBED_BLOCK_ROWS = 64
+
+
+@lru_cache(maxsize=4)
+def _projection(n_features: int, dimensions: int, seed: int) -> np.ndarray:
+    """Random ±1 projection matrix, shape ``(n_features, dimensions)``, identical in every process."""
+    rng = np.random.default_rng(seed)
+    # Kept as float32 (24 MiB at the defaults) so projecting is a plain BLAS matmul.
+    matrix = (rng.integers(0, 2, size=(n_features, dimensions), dtype=np.int8) * 2 - 1).astype(np.float32)
+    matrix.setflags(write=False)
+    return matrix
+
+
+def dimensions_for_model(model: str) -> int:
+    """Parse the embedding size from a ``hashing-<dimensions>`` model name."""
+    match = MODEL_PATTERN.match(model)
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"Hashing model must be named 'hashing-<dimensions>', got: {model}")
+    return int(match.group(1))
+
+
+class HashingEmbedder:
+    """Vectorised feature-hashing embedder; see the module docstring for the scheme."""
+
+    def __init__(self, dimensions: int = DEFAULT_DIMENSIONS, n_features: int = DEFAULT_FEATURES, seed: int = 0):
+        self.dimensions = dimensions
+        self.n_features = n_features
+        self.seed = seed
+
+    def _features(self, text: str) -> Counter:
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        terms = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return Counter(zlib.crc32(term.encode("utf-8")) % self.n_features for term in terms)
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Return L2-normalized float32 embeddings, shape ``(len(texts), dimensions)``; blank texts map to zeros."""
+        projection = _projection(self.n_features, self.dimensions, self.seed)
+        result = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for start in range(0, len(texts), EMBED_BLOCK_ROWS):
+            features = [self._features(text) for text in texts[start : start + EMBED_BLOCK_ROWS]]
+            # Only the buckets used in this block are gathered from the projection matrix.
+            buckets = sorted({bucket for counts in features for bucket in counts})
+            if not buckets:
+                continue
+            column = {bucket: i for i, bucket in enumerate(buckets)}
+            weights = np.zeros((len(features), len(buckets)), dtype=np.float32)
+            for row, counts in enumerate(features):
+                for bucket, count in counts.items():
+                    weights[row, column[bucket]] = 1.0 + math.log(count)
+            result[start : start + len(features)] = weights @ projection[buckets]
+
+        norms = np.linalg.norm(result, axis=1, keepdims=True)
+        np.divide(result, norms, out=result, where=norms > 0)
+        return result
@@ -0,0 +1,137 @@
+"""Incremental Watermark-Based Suggestion Generation
+
+Scores only the requirements and test cases whose ``updated_at`` is at or after
+the last successful watermark for an algorithm, each against the full opposite
+side.  Run periodically, this gives eventual consistency for changes whose
+event-driven background task was lost, at a fraction of the cost of a full run.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai_suggestions.config import SuggestionConfig
+from app.ai_suggestions.engine import SuggestionEngine
+from app.config import settings
+from app.models.requirement import Requirement
+from app.models.suggestion_watermark import SuggestionWatermark
+from app.models.test_case import TestCase
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def get_watermark(db: AsyncSession, algorithm: str) -> datetime | None:
+    """Return the last successful watermark for *algorithm*, or None if it never ran."""
+    result = await db.execute(select(SuggestionWatermark.watermark).where(SuggestionWatermark.algorithm == algorithm))
+    return result.scalar_one_or_none()
+
+
+async def _save_watermark(db: AsyncSession, algorithm: str, watermark: datetime, stats: dict[str, Any]) -> None:
+    existing = await db.get(SuggestionWatermark, algorithm)
+    now = _utcnow()
+    if existing is None:
+        db.add(SuggestionWatermark(algorithm=algorithm, watermark=watermark, last_run_at=now, last_run_stats=stats))
+    else:
+        existing.watermark = watermark
+        existing.last_run_at = now
+        existing.last_run_stats = stats
+    await db.commit()
+
+
+async def run_incremental_generation(
+    db: AsyncSession,
+    algorithm: str | None = None,
+    threshold: float | None = None,
+) -> dict[str, Any]:
+    """
+    Generate suggestions for entities changed since the algorithm's watermark.
+
+    The first run for an algorithm (no watermark yet) is a full run.  The new
+    watermark is the time the run *started*, less
+    ``INCREMENTAL_SUGGESTIONS_OVERLAP_SECONDS``: ``updated_at`` is stamped at
+    flush time, so a write flushed before the run started but committed after
+    its change queries is still picked up by the next run, as long as its
+    transaction is shorter than the overlap.  Entities re-read because of the
+    overlap are rescored harmlessly, existing suggestions are skipped.  The
+    watermark is only advanced after generation has committed successfully.
+
+    Args:
+        db: Database session
+        algorithm: Optional algorithm override. Uses settings if not provided.
+        threshold: Optional threshold override. Uses settings if not provided.
+
+    Returns:
+        Dictionary with the number of changed entities, the summed generation
+        statistics and the new watermark.
+    """
+    algorithm = (algorithm or settings.AUTO_SUGGESTIONS_ALGORITHM).lower()
+    config = SuggestionConfig(
+        default_algorithm=algorithm,
+        min_confidence_threshold=threshold if threshold is not None else settings.AUTO_SUGGESTIONS_THRESHOLD,
+    )
+    engine = SuggestionEngine(config=config)
+
+    run_started = _utcnow()
+    watermark = await get_watermark(db, algorithm)
+
+    stats: dict[str, Any] = {
+        "algorithm_used": algorithm,
+        "full_run": watermark is None,
+        "requirements_changed": 0,
+        "test_cases_changed": 0,
+        "pairs_analyzed": 0,
+        "suggestions_created": 0,
+        "suggestions_skipped": 0,
+    }
+
+    runs: list[dict[str, Any]] = []
+    if watermark is None:
+        runs.append(await engine.generate_suggestions(db))
+    else:
+        req_result = await db.execute(select(Requirement.id).where(Requirement.updated_at >= watermark))
+        changed_requirement_ids = list(req_result.scalars().all())
+        tc_result = await db.execute(select(TestCase.id).where(TestCase.updated_at >= watermark))
+        changed_test_case_ids = list(tc_result.scalars().all())
+        stats["requirements_changed"] = len(changed_requirement_ids)
+        stats["test_cases_changed"] = len(changed_test_case_ids)
+
+        # The engine treats an empty id list as "everything", so only run a side that actually changed.
+        if changed_requirement_ids:
+            runs.append(await engine.generate_suggestions(db, requirement_ids=changed_requirement_ids))
+        if changed_test_case_ids:
+            runs.append(await engine.generate_suggestions(db, test_case_ids=changed_test_case_ids))
+
+    for run in runs:
+        for key in ("pairs_analyzed", "suggestions_created", "suggestions_skipped"):
+            stats[key] += run[key]
+
+    new_watermark = run_started - timedelta(seconds=settings.INCREMENTAL_SUGGESTIONS_OVERLAP_SECONDS)
+    stats["watermark"] = new_watermark.isoformat()
+    await _save_watermark(db, algorithm, new_watermark, stats)
+
+    logger.info(
+        "Incremental suggestion generation (%s) since %s: %d requirements and %d test cases changed, "
+        "%d created, %d skipped",
+        algorithm,
+        watermark.isoformat() if watermark else "beginning",
+        stats["requirements_changed"],
+        stats["test_cases_changed"],
+        stats["suggestions_created"],
+        stats["suggestions_skipped"],
+    )
+    return stats
+
+
+async def scheduled_incremental_generation() -> dict[str, Any]:
+    """Entry point for the periodic scheduler — runs in its own database session."""
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        return await run_incremental_generation(db)
@@ -0,0 +1,166 @@
+"""Process-wide in-memory embedding cache
+
+Every ``SuggestionEngine`` builds its own ``LLMEmbeddingSimilarity``, and the
+event-driven hooks build a new engine per event.  Keeping embeddings in one
+bounded LRU shared by all of them means repeated runs in the same worker are
+served from memory instead of the DB cache or the provider.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+from app.ai_suggestions.algorithms import compute_text_hash
+
+# Rough per-entry bookkeeping cost (key tuple, hash string, OrderedDict node, array header).
+ENTRY_OVERHEAD_BYTES = 256
+
+
+class EmbeddingLRUCache:
+    """
+    Thread-safe LRU cache of embeddings keyed by ``(model, text_hash)``.
+
+    Vectors are stored as read-only float32 arrays and the cache evicts least
+    recently used entries once their total size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, str], np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _entry_size(vector: np.ndarray) -> int:
+        return vector.nbytes + ENTRY_OVERHEAD_BYTES
+
+    def get(self, model: str, text_hash: str) -> np.ndarray | None:
+        """Return the cached vector (marking it most recently used), counting a hit or miss."""
+        key = (model, text_hash)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def peek(self, model: str, text_hash: str) -> np.ndarray | None:
+        """Return the cached vector without touching recency or the counters."""
+        with self._lock:
+            return self._entries.get((model, text_hash))
+
+    def contains(self, model: str, text_hash: str) -> bool:
+        with self._lock:
+            return (model, text_hash) in self._entries
+
+    def put(self, model: str, text_hash: str, vector: Any) -> np.ndarray:
+        """Store *vector* as float32, evicting least recently used entries to stay within budget."""
+        array = np.array(vector, dtype=np.float32)
+        array.setflags(write=False)
+        size = self._entry_size(array)
+        key = (model, text_hash)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= self._entry_size(previous)
+            if size > self.max_bytes:
+                # Larger than the whole budget — hand it back without caching.
+                return array
+            self._entries[key] = array
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= self._entry_size(evicted)
+                self.evictions += 1
+        return array
+
+    def discard(self, model: str, text_hash: str) -> None:
+        with self._lock:
+            vector = self._entries.pop((model, text_hash), None)
+            if vector is not None:
+                self._bytes -= self._entry_size(vector)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+class EmbeddingCacheView:
+    """
+    Text-keyed view of one model's entries in an :class:`EmbeddingLRUCache`.
+
+    Supports the dict operations ``LLMEmbeddingSimilarity`` uses (``in``,
+    ``[]``, ``[]=``, ``get``) so callers can keep addressing embeddings by text.
+    """
+
+    def __init__(self, cache: EmbeddingLRUCache, model: str) -> None:
+        self.cache = cache
+        self.model = model
+
+    def __contains__(self, text: str) -> bool:
+        return self.cache.contains(self.model, compute_text_hash(text))
+
+    def __getitem__(self, text: str) -> np.ndarray:
+        vector = self.cache.get(self.model, compute_text_hash(text))
+        if vector is None:
+            raise KeyError(text)
+        return vector
+
+    def __setitem__(self, text: str, vector: Any) -> None:
+        self.cache.put(self.model, compute_text_hash(text), vector)
+
+    def __delitem__(self, text: str) -> None:
+        self.cache.discard(self.model, compute_text_hash(text))
+
+    def get(self, text: str, default: Any = None) -> Any:
+        vector = self.cache.get(self.model, compute_text_hash(text))
+        return default if vector is None else vector
+
+    def peek(self, text: str) -> np.ndarray | None:
+        return self.cache.peek(self.model, compute_text_hash(text))
+
+
+_shared_cache: EmbeddingLRUCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_embedding_cache() -> EmbeddingLRUCache:
+    """Return the process-wide embedding cache, creating it on first use."""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                from app.config import settings
+
+                _shared_cache = EmbeddingLRUCache(settings.EMBEDDING_MEMORY_CACHE_MAX_BYTES)
+    return _shared_cache
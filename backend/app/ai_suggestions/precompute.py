@@ -0,0 +1,175 @@
+"""Write-time Embedding Precomputation
+
+Creating or updating a requirement or test case enqueues an ``embedding_outbox``
+row in the same transaction.  A periodic worker drains the outbox: it builds the
+same text the suggestion engine would, embeds whatever is not yet in
+``embedding_cache`` and deletes the drained rows.  The first LLM generation run
+after a large import then finds its embeddings already cached.
+"""
+
+import logging
+import time
+from typing import Any
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai_suggestions.algorithms import LLMEmbeddingSimilarity, compute_text_hash, get_algorithm
+from app.ai_suggestions.config import SuggestionConfig
+from app.ai_suggestions.engine import requirement_text, test_case_text
+from app.config import settings
+from app.crud.embedding_cache import save_embeddings_batch
+from app.crud.embedding_outbox import REQUIREMENT, TEST_CASE, get_embedding_outbox_backlog
+from app.models.embedding_cache import EmbeddingCache
+from app.models.embedding_outbox import EmbeddingOutbox
+from app.models.requirement import Requirement
+from app.models.test_case import TestCase
+
+logger = logging.getLogger(__name__)
+
+
+def precompute_algorithm() -> LLMEmbeddingSimilarity:
+    """The embedding algorithm configured for precomputation (``EMBEDDING_PRECOMPUTE_PROVIDER`` / ``_MODEL``)."""
+    config = SuggestionConfig(
+        default_algorithm="llm",
+        llm_provider=settings.EMBEDDING_PRECOMPUTE_PROVIDER,
+        llm_model=settings.EMBEDDING_PRECOMPUTE_MODEL,
+    )
+    return get_algorithm("llm", config)
+
+
+async def _entity_texts(db: AsyncSession, rows: list[EmbeddingOutbox]) -> dict[int, str | None]:
+    """Map each outbox row id to its entity's text, or None if the entity no longer exists."""
+    requirement_ids = [row.entity_id for row in rows if row.entity_type == REQUIREMENT]
+    test_case_ids = [row.entity_id for row in rows if row.entity_type == TEST_CASE]
+    texts: dict[tuple[str, Any], str] = {}
+    if requirement_ids:
+        result = await db.execute(select(Requirement).where(Requirement.id.in_(requirement_ids)))
+        texts.update(((REQUIREMENT, req.id), requirement_text(req)) for req in result.scalars())
+    if test_case_ids:
+        result = await db.execute(select(TestCase).where(TestCase.id.in_(test_case_ids)))
+        texts.update(((TEST_CASE, tc.id), test_case_text(tc)) for tc in result.scalars())
+    return {row.id: texts.get((row.entity_type, row.entity_id)) for row in rows}
+
+
+async def drain_embedding_outbox(
+    db: AsyncSession,
+    *,
+    batch_size: int | None = None,
+    algorithm: LLMEmbeddingSimilarity | None = None,
+) -> dict[str, Any]:
+    """
+    Embed the oldest batch of outbox entries and remove them from the outbox.
+
+    Texts already in ``embedding_cache`` for the algorithm's model are not
+    embedded again.  Entries whose entity was deleted are dropped.  If the
+    provider fails, the batch stays queued with ``attempts`` incremented;
+    entries reaching ``EMBEDDING_PRECOMPUTE_MAX_ATTEMPTS`` are no longer retried
+    (they still count in the backlog as ``failed``).  An entry re-enqueued
+    while its batch was being embedded is kept for the next drain.  On
+    PostgreSQL the batch is claimed with ``FOR UPDATE SKIP LOCKED``, so
+    concurrent drains (one per worker) take disjoint batches.
+
+    Returns:
+        Dictionary with the entries processed, texts embedded, texts already
+        cached, entries whose entity was gone and whether the batch failed.
+    """
+    batch_size = batch_size or settings.EMBEDDING_PRECOMPUTE_BATCH_SIZE
+    result = await db.execute(
+        select(EmbeddingOutbox)
+        .where(EmbeddingOutbox.attempts < settings.EMBEDDING_PRECOMPUTE_MAX_ATTEMPTS)
+        .order_by(EmbeddingOutbox.enqueued_at, EmbeddingOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    rows = list(result.scalars().all())
+    report = {"processed": len(rows), "embedded": 0, "already_cached": 0, "missing_entities": 0, "failed": False}
+    if not rows:
+        return report
+    # Identify each row by (id, enqueued_at) so a concurrent re-enqueue is not lost when the batch is deleted.
+    claimed = [{"row_id": row.id, "row_enqueued_at": row.enqueued_at} for row in rows]
+
+    row_texts = await _entity_texts(db, rows)
+    report["missing_entities"] = sum(text is None for text in row_texts.values())
+    hash_to_text = {compute_text_hash(text): text for text in row_texts.values() if text and text.strip()}
+
+    try:
+        algorithm = algorithm or precompute_algorithm()
+        cached = await db.execute(
+            select(EmbeddingCache.text_hash).where(
+                EmbeddingCache.model_name == algorithm.model, EmbeddingCache.text_hash.in_(list(hash_to_text))
+            )
+        )
+        cached_hashes = set(cached.scalars().all())
+        missing = [text for text_hash, text in hash_to_text.items() if text_hash not in cached_hashes]
+        report["already_cached"] = len(cached_hashes)
+        if missing:
+            embeddings = await algorithm.aget_embeddings_batch(missing)
+            await save_embeddings_batch(
+                db,
+                [
+                    {
+                        "text_hash": compute_text_hash(text),
+                        "embedding": embedding,
+                        "model_name": algorithm.model,
+                        "provider": algorithm.provider,
+                    }
+                    for text, embedding in zip(missing, embeddings)
+                ],
+            )
+            report["embedded"] = len(missing)
+    except Exception as exc:
+        await db.rollback()
+        logger.warning("Embedding precomputation failed for %d outbox entries: %s", len(rows), exc)
+        outbox = EmbeddingOutbox.__table__
+        await db.execute(
+            update(outbox)
+            .where(outbox.c.id == bindparam("row_id"), outbox.c.enqueued_at == bindparam("row_enqueued_at"))
+            .values(attempts=outbox.c.attempts + 1, last_error=str(exc)[:1000]),
+            claimed,
+        )
+        await db.commit()
+        report["failed"] = True
+        return report
+
+    outbox = EmbeddingOutbox.__table__
+    await db.execute(
+        outbox.delete().where(outbox.c.id == bindparam("row_id"), outbox.c.enqueued_at == bindparam("row_enqueued_at")),
+        claimed,
+    )
+    await db.commit()
+    return report
+
+
+async def scheduled_embedding_precompute() -> dict[str, Any]:
+    """Entry point for the periodic scheduler — drains the outbox batch by batch in its own session."""
+    from app.db.session import AsyncSessionLocal
+
+    started = time.perf_counter()
+    totals = {"batches": 0, "processed": 0, "embedded": 0, "already_cached": 0, "missing_entities": 0, "failed": 0}
+    async with AsyncSessionLocal() as db:
+        while True:
+            report = await drain_embedding_outbox(db)
+            if not report["processed"]:
+                break
+            totals["batches"] += 1
+            for key in ("processed", "embedded", "already_cached", "missing_entities"):
+                totals[key] += report[key]
+            if report["failed"]:
+                totals["failed"] += report["processed"]
+                break
+            if report["processed"] < settings.EMBEDDING_PRECOMPUTE_BATCH_SIZE:
+                break
+        totals["backlog"] = await get_embedding_outbox_backlog(db)
+    totals["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+    if totals["processed"]:
+        logger.info(
+            "Embedding precompute: %d entries in %d batches, %d embedded, %d already cached, %d pending",
+            totals["processed"],
+            totals["batches"],
+            totals["embedded"],
+            totals["already_cached"],
+            totals["backlog"]["pending"],
+        )
+    return totals
@@ -0,0 +1,57 @@
+"""Stage instrumentation for the suggestion engine"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+
+class StageProfiler:
+    """
+    Accumulates wall-clock and CPU time per named stage.
+
+    Stages may be entered repeatedly (times are summed) and may nest; a nested
+    stage's time is attributed to the inner stage only, so the per-stage times
+    add up to the total instrumented time.  CPU time is process CPU time, so it
+    also includes work done by other tasks interleaved on the event loop.
+    """
+
+    def __init__(self) -> None:
+        self._wall: dict[str, float] = {}
+        self._cpu: dict[str, float] = {}
+        # Each frame: [name, wall_start, cpu_start, child_wall, child_cpu]
+        self._stack: list[list] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        frame = [name, time.perf_counter(), time.process_time(), 0.0, 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            wall = time.perf_counter() - frame[1]
+            cpu = time.process_time() - frame[2]
+            self._wall[name] = self._wall.get(name, 0.0) + wall - frame[3]
+            self._cpu[name] = self._cpu.get(name, 0.0) + cpu - frame[4]
+            if self._stack:
+                self._stack[-1][3] += wall
+                self._stack[-1][4] += cpu
+
+    def wall_seconds(self, name: str) -> float:
+        return self._wall.get(name, 0.0)
+
+    @property
+    def total_wall_seconds(self) -> float:
+        return sum(self._wall.values())
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        """Return ``{stage: {"wall_ms": ..., "cpu_ms": ...}}`` in the order stages first ran."""
+        return {
+            name: {"wall_ms": round(self._wall[name] * 1000, 3), "cpu_ms": round(self._cpu[name] * 1000, 3)}
+            for name in self._wall
+        }
+
+
+def rate(count: int, seconds: float) -> float:
+    """Return *count* per second, or 0.0 when no measurable time elapsed."""
+    return round(count / seconds, 2) if seconds > 0 else 0.0
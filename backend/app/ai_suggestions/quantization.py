@@ -0,0 +1,103 @@
+"""Quantized embedding matrices for first-pass similarity scoring
+
+Scoring every requirement against every test case needs all test-case
+embeddings in memory.  At 1536 float32 dimensions that is ~6 KB per text;
+the codes here shrink it to:
+
+- ``int8`` — one signed byte per dimension plus a float32 scale per vector (~4x smaller)
+- ``binary`` — one sign bit per dimension (~32x smaller)
+
+Both produce *approximate* cosine similarities.  Callers pick the candidates
+whose approximate score lies within a margin of the threshold and rescore
+them with the full-precision vectors.
+"""
+
+from collections.abc import Iterable
+
+import numpy as np
+
+QUANTIZATION_MODES = ("none", "int8", "binary")
+
+# Default rescoring margin per mode, in suggestion-score units ((cosine + 1) / 2).
+# int8 cosines are accurate to ~1e-3; sign codes only estimate the angle.
+DEFAULT_RESCORE_MARGINS = {"int8": 0.02, "binary": 0.1}
+
+# Test-case rows scored per block, bounding the float32 scratch space per query block.
+SCORE_BLOCK_ROWS = 4096
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+class QuantizedEmbeddingMatrix:
+    """
+    Row-wise quantized, L2-normalized embedding matrix.
+
+    ``int8`` rows store ``round(v / max|v| * 127)`` and the per-row scale
+    ``max|v| / 127``; ``binary`` rows store the packed sign bits.
+    """
+
+    def __init__(self, vectors: np.ndarray | Iterable, mode: str) -> None:
+        if mode not in ("int8", "binary"):
+            raise ValueError(f"Unsupported quantization mode: {mode}")
+        self.mode = mode
+        normalized = _normalize(np.atleast_2d(np.asarray(vectors, dtype=np.float32)))
+        self.rows, self.dimensions = normalized.shape
+        # Zero vectors (failed or blank texts) score 0 against everything, as in the float path.
+        self._nonzero = normalized.any(axis=1)
+        if mode == "int8":
+            self.codes, self.scales = self._int8_codes(normalized)
+        else:
+            self.codes = np.packbits(normalized > 0, axis=1)
+            self.scales = None
+
+    @classmethod
+    def stack(cls, parts: list["QuantizedEmbeddingMatrix"]) -> "QuantizedEmbeddingMatrix":
+        """Concatenate matrices quantized chunk by chunk, so the float vectors never coexist in memory."""
+        if not parts:
+            raise ValueError("cannot stack an empty list of matrices")
+        stacked = cls.__new__(cls)
+        stacked.mode = parts[0].mode
+        stacked.dimensions = parts[0].dimensions
+        if any(part.mode != stacked.mode or part.dimensions != stacked.dimensions for part in parts):
+            raise ValueError("cannot stack matrices with different modes or dimensions")
+        stacked.rows = sum(part.rows for part in parts)
+        stacked._nonzero = np.concatenate([part._nonzero for part in parts])
+        stacked.codes = np.concatenate([part.codes for part in parts])
+        stacked.scales = None if stacked.mode == "binary" else np.concatenate([part.scales for part in parts])
+        return stacked
+
+    @staticmethod
+    def _int8_codes(normalized: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        peak = np.abs(normalized).max(axis=1, keepdims=True)
+        scales = np.where(peak > 0, peak / 127.0, 1.0).astype(np.float32)
+        codes = np.rint(normalized / scales).astype(np.int8)
+        return codes, scales[:, 0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def approximate_cosine(self, queries: "QuantizedEmbeddingMatrix") -> np.ndarray:
+        """Approximate cosine similarity of every query row against every row, shape ``(queries, rows)``."""
+        if queries.mode != self.mode or queries.dimensions != self.dimensions:
+            raise ValueError("query codes do not match the matrix mode and dimensions")
+        result = np.empty((queries.rows, self.rows), dtype=np.float32)
+        for start in range(0, self.rows, SCORE_BLOCK_ROWS):
+            block = slice(start, start + SCORE_BLOCK_ROWS)
+            if self.mode == "int8":
+                # Integer codes are exact in float32, so the dot products run through BLAS.
+                dots = queries.codes.astype(np.float32) @ self.codes[block].astype(np.float32).T
+                result[:, block] = dots * queries.scales[:, None] * self.scales[block][None, :]
+            else:
+                # Hamming distance between sign codes estimates the angle between the vectors.
+                differing = np.bitwise_count(queries.codes[:, None, :] ^ self.codes[block][None, :, :]).sum(
+                    axis=2, dtype=np.int32
+                )
+                result[:, block] = np.cos(np.pi * differing / self.dimensions)
+        result[~queries._nonzero, :] = 0.0
+        result[:, ~self._nonzero] = 0.0
+        return np.clip(result, -1.0, 1.0, out=result)
@@ -7,17 +7,34 @@ from typing import Any
 from fastapi import APIRouter, Depends, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.conditional import data_version_etag, versioned_cache_key
 from app.auth.dependencies import get_current_user
+from app.cache import get_result_cache
 from app.crud import traceability as traceability_crud
+from app.crud.data_version import LINKS, REQUIREMENTS, SUGGESTIONS, TEST_CASES, get_data_versions
 from app.db.session import get_db
 from app.models.user import User
 from app.services.analytics import SuggestionAnalytics
 
 router = APIRouter()
 
+# Suggestions are also removed by cascades from requirement and test case deletes.
+ANALYTICS_TABLES = (REQUIREMENTS, TEST_CASES, LINKS, SUGGESTIONS)
+ANALYTICS_ETAG = Depends(data_version_etag(*ANALYTICS_TABLES))
+
+
+async def _cached_analytics(db: AsyncSession, name: str, versions: dict[str, int]):
+    """Serve a ``SuggestionAnalytics`` result computed at *versions* from the result cache, computing it on a miss."""
+    return await get_result_cache().get_or_compute(
+        versioned_cache_key(f"analytics:{name}", versions),
+        lambda: getattr(SuggestionAnalytics(db), name)(),
+        tags=ANALYTICS_TABLES,
+    )
+
 
 @router.get("/analytics/acceptance-rates", response_model=list[dict[str, Any]])
 async def get_acceptance_rates(
+    versions: dict[str, int] = ANALYTICS_ETAG,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -27,12 +44,12 @@ async def get_acceptance_rates(
     Returns monthly periods with counts of accepted, rejected, and pending
     suggestions along with the acceptance rate percentage.
     """
-    analytics = SuggestionAnalytics(db)
-    return await analytics.get_acceptance_rates()
+    return await _cached_analytics(db, "get_acceptance_rates", versions)
 
 
 @router.get("/analytics/confidence-distribution", response_model=list[dict[str, Any]])
 async def get_confidence_distribution(
+    versions: dict[str, int] = ANALYTICS_ETAG,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -42,12 +59,12 @@ async def get_confidence_distribution(
     Returns counts and percentages for score ranges:
     0.0–0.2, 0.2–0.4, 0.4–0.6, 0.6–0.8, 0.8–1.0
     """
-    analytics = SuggestionAnalytics(db)
-    return await analytics.get_confidence_distribution()
+    return await _cached_analytics(db, "get_confidence_distribution", versions)
 
 
 @router.get("/analytics/generation-trends", response_model=list[dict[str, Any]])
 async def get_generation_trends(
+    versions: dict[str, int] = ANALYTICS_ETAG,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -56,12 +73,12 @@ async def get_generation_trends(
 
     Returns monthly counts of suggestions created.
     """
-    analytics = SuggestionAnalytics(db)
-    return await analytics.get_generation_trends()
+    return await _cached_analytics(db, "get_generation_trends", versions)
 
 
 @router.get("/analytics/review-velocity", response_model=dict[str, Any])
 async def get_review_velocity(
+    versions: dict[str, int] = ANALYTICS_ETAG,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -70,12 +87,12 @@ async def get_review_velocity(
 
     Returns average and median review time (in hours) and total reviewed count.
     """
-    analytics = SuggestionAnalytics(db)
-    return await analytics.get_review_velocity()
+    return await _cached_analytics(db, "get_review_velocity", versions)
 
 
 @router.get("/analytics/algorithm-comparison", response_model=list[dict[str, Any]])
 async def get_algorithm_comparison(
+    versions: dict[str, int] = ANALYTICS_ETAG,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -84,8 +101,7 @@ async def get_algorithm_comparison(
 
     Returns per-algorithm counts, acceptance rates, and average confidence scores.
     """
-    analytics = SuggestionAnalytics(db)
-    return await analytics.get_algorithm_comparison()
+    return await _cached_analytics(db, "get_algorithm_comparison", versions)
 
 
 @router.get("/metrics/export/csv")
@@ -97,7 +113,10 @@ async def export_metrics_csv(
     Export system metrics as CSV including coverage stats, suggestion counts by status,
     and algorithm breakdown.
     """
-    metrics = await traceability_crud.get_metrics(db)
+    versions = await get_data_versions(db, ANALYTICS_TABLES)
+    metrics = await get_result_cache().get_or_compute(
+        versioned_cache_key("metrics", versions), lambda: traceability_crud.get_metrics(db), tags=ANALYTICS_TABLES
+    )
 
     output = io.StringIO()
     writer = csv.writer(output)
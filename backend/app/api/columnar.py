@@ -0,0 +1,28 @@
+"""Shared response helper for the Arrow/Parquet export endpoints"""
+
+from collections.abc import AsyncIterator, Sequence
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.engine import Row
+
+from app.services.columnar_export import COLUMNAR_FORMATS, columnar_chunks, require_pyarrow
+
+
+def columnar_export_response(
+    partitions: AsyncIterator[Sequence[Row]],
+    columns: Sequence[tuple[str, str]],
+    format: str,
+    filename: str,
+) -> StreamingResponse:
+    """Stream *partitions* as an Arrow IPC stream or Parquet file; 501 if ``pyarrow`` is not installed."""
+    try:
+        require_pyarrow()
+    except ImportError as exc:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(exc))
+    media_type, extension = COLUMNAR_FORMATS[format]
+    return StreamingResponse(
+        columnar_chunks(partitions, columns, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}.{extension}"},
+    )
@@ -0,0 +1,57 @@
+"""Conditional GET support — ETags derived from the per-table data versions"""
+
+import hashlib
+from collections.abc import Awaitable, Callable, Mapping
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.dependencies import get_current_user
+from app.crud.data_version import get_data_versions
+from app.db.session import get_db
+from app.models.user import User
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of *etag* against an ``If-None-Match`` header (RFC 9110 §13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def versioned_cache_key(name: str, versions: Mapping[str, int]) -> str:
+    """Result cache key of *name* computed at *versions*, so a cached body is only served under its own tag."""
+    return f"{name}@" + ",".join(f"{table}={version}" for table, version in sorted(versions.items()))
+
+
+def data_version_etag(*tables: str) -> Callable[..., Awaitable[dict[str, int]]]:
+    """
+    Build a dependency that tags the response with an ETag of *tables*' data versions.
+
+    A request whose ``If-None-Match`` matches is answered with 304 before the
+    endpoint runs, so an unchanged poll costs one primary-key lookup.  The
+    current user is resolved first, so unauthenticated requests still get 401.
+    The dependency returns the versions the tag was derived from; endpoints
+    caching their result key it with :func:`versioned_cache_key`, so a worker
+    that missed an invalidation never serves an old body under a new tag.
+    """
+
+    async def dependency(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(get_current_user),
+    ) -> dict[str, int]:
+        versions = await get_data_versions(db, tables)
+        key = f"{request.url.path}?{request.url.query}|" + ",".join(f"{name}={versions[name]}" for name in tables)
+        etag = f'W/"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+        return versions
+
+    return dependency
@@ -7,6 +7,7 @@ Implements:
   POST   /external-results/case             – create a case result (BGSTM#303)
   PATCH  /external-results/case/{id}        – update a case result
   GET    /external-results/case/{id}        – read a case result
+  GET    /external-results/cases/export/{format} – Arrow/Parquet export of case results
   POST   /external-results/artifact         – upload an artifact (BGSTM#298)
 
 Audit-log integration  → BGSTM#297
@@ -16,6 +17,7 @@ import os
 import re
 import tempfile
 import uuid as _uuid_module
+from typing import Literal
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
@@ -23,6 +25,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from streaming_form_data import StreamingFormDataParser
 from streaming_form_data.targets import FileTarget, ValueTarget
 
+from app.api.columnar import columnar_export_response
 from app.auth.dependencies import (
     get_runner_or_user_auth,
     require_runner_scope,
@@ -34,6 +37,7 @@ from app.crud.external_case_results import (
     create_case_result,
     get_case_result,
     list_case_results_for_session,
+    stream_case_result_rows,
     update_case_result,
 )
 from app.crud.external_results import create_session, finish_session_db, get_session, list_sessions
@@ -52,6 +56,8 @@ from app.schemas.external_results import (
     SessionListResponse,
     SessionResponse,
 )
+from app.services.columnar_export import CASE_RESULT_COLUMNS
+from app.services.operational_metrics import record_artifact_upload
 from app.storage import get_storage
 
 router = APIRouter()
@@ -474,6 +480,22 @@ async def list_external_session_cases(
     )
 
 
+@router.get("/external-results/cases/export/{format}")
+async def export_external_case_results(
+    format: Literal["arrow", "parquet"],
+    session_id: UUID | None = Query(None, description="Only export the case results of this session"),
+    db: AsyncSession = Depends(get_db),
+    _auth=Depends(get_runner_or_user_auth),
+):
+    """Export case results as an Arrow IPC stream or Parquet file, streamed from a server-side cursor.
+
+    Requires the optional ``pyarrow`` dependency (501 otherwise).
+    """
+    return columnar_export_response(
+        stream_case_result_rows(db, session_id=session_id), CASE_RESULT_COLUMNS, format, "case_results"
+    )
+
+
 # ---------------------------------------------------------------------------
 # POST /external-results/artifact — upload an artifact
 # ---------------------------------------------------------------------------
@@ -718,6 +740,7 @@ async def upload_artifact(
 
     await db.commit()
     await db.refresh(artifact)
+    record_artifact_upload(artifact_kind.value, result.size_bytes)
 
     return ArtifactResponse(
         id=artifact.id,
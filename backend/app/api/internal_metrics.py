@@ -0,0 +1,32 @@
+"""Operational metrics endpoint for Prometheus scrapes"""
+
+import hmac
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.config import settings
+from app.services.operational_metrics import CONTENT_TYPE, render_metrics
+
+router = APIRouter()
+
+
+@router.get("/internal/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_internal_metrics(authorization: str | None = Header(None)):
+    """
+    Process-local operational metrics in the Prometheus text exposition format.
+
+    Scrapes must send ``INTERNAL_METRICS_TOKEN`` as a bearer token.  Without a
+    configured token the endpoint is not served (404), so the metrics are never
+    exposed unauthenticated.
+    """
+    token = settings.INTERNAL_METRICS_TOKEN
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not hmac.compare_digest(authorization or "", f"Bearer {token}"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return PlainTextResponse(render_metrics(), media_type=CONTENT_TYPE)
@@ -0,0 +1,87 @@
+"""API endpoints for Report Export jobs"""
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.dependencies import get_current_user
+from app.config import settings
+from app.crud.report_export import get_report_export
+from app.db.session import get_db
+from app.models.report_export import ReportExport, ReportExportStatus
+from app.models.user import User
+from app.schemas.report_export import ReportExportResponse
+from app.services.report_exports import CONTENT_TYPES, filename_for, open_report_file
+
+router = APIRouter()
+
+FILE_CHUNK_BYTES = 64 * 1024
+
+
+def report_export_response(export: ReportExport) -> ReportExportResponse:
+    """Serialize *export*, adding its download URL once the file is ready."""
+    response = ReportExportResponse.model_validate(export)
+    if export.status == ReportExportStatus.COMPLETED:
+        response.download_url = f"{settings.API_V1_PREFIX}/report-exports/{export.id}/download"
+    return response
+
+
+def report_file_response(export: ReportExport) -> StreamingResponse:
+    """Stream a completed export's stored file as an attachment; raises ``FileNotFoundError`` if it is gone."""
+    fp = open_report_file(export)
+
+    def chunks():
+        with fp:
+            while chunk := fp.read(FILE_CHUNK_BYTES):
+                yield chunk
+
+    return StreamingResponse(
+        chunks(),
+        media_type=CONTENT_TYPES[export.format],
+        headers={"Content-Disposition": f"attachment; filename={filename_for(export)}"},
+    )
+
+
+async def _get_export_or_404(db: AsyncSession, export_id: UUID) -> ReportExport:
+    export = await get_report_export(db, export_id)
+    if export is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report export not found")
+    return export
+
+
+@router.get("/report-exports/{export_id}", response_model=ReportExportResponse)
+async def get_report_export_status(
+    export_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get the status of a report export job.
+
+    ``download_url`` is set once the status is ``completed``.
+    """
+    return report_export_response(await _get_export_or_404(db, export_id))
+
+
+@router.get("/report-exports/{export_id}/download")
+async def download_report_export(
+    export_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Download the file of a completed report export.
+
+    Returns 409 while the export is still pending or running, or if it failed.
+    """
+    export = await _get_export_or_404(db, export_id)
+    if export.status != ReportExportStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=f"Report export is {export.status.value}, not completed"
+        )
+    try:
+        return report_file_response(export)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report file no longer exists") from exc
@@ -2,6 +2,7 @@
 
 import csv
 import io
+from typing import Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy import select
@@ -10,15 +11,43 @@ from sqlalchemy.orm import selectinload
 
 from app.ai_suggestions.config import SuggestionConfig
 from app.ai_suggestions.engine import SuggestionEngine
+from app.api.columnar import columnar_export_response
 from app.auth.dependencies import get_current_user, require_admin
 from app.crud.audit_log import create_audit_entry
+from app.crud.embedding_outbox import get_embedding_outbox_backlog
+from app.crud.link import stream_suggestion_rows
 from app.db.session import get_db
-from app.models.suggestion import LinkSuggestion, SuggestionStatus
+from app.models.suggestion import LinkSuggestion, SuggestionMethod, SuggestionStatus
 from app.models.user import User
+from app.services.columnar_export import SUGGESTION_COLUMNS
 
 router = APIRouter()
 
 
+def _parse_export_filters(
+    status: str | None, algorithm: str | None
+) -> tuple[SuggestionStatus | None, SuggestionMethod | None]:
+    """Parse the status and algorithm filters of the suggestion exports, 400 on unknown values."""
+    status_enum = method_enum = None
+    if status is not None:
+        try:
+            status_enum = SuggestionStatus(status.lower())
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid status '{status}'. Must be one of: pending, accepted, rejected.",
+            )
+    if algorithm is not None:
+        try:
+            method_enum = SuggestionMethod(algorithm.lower())
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid algorithm '{algorithm}'.",
+            )
+    return status_enum, method_enum
+
+
 @router.get("/suggestions/export/csv")
 async def export_suggestions_csv(
     status: str | None = Query(None, description="Filter by status: pending, accepted, rejected"),
@@ -33,32 +62,17 @@ async def export_suggestions_csv(
 
     Supports filtering by status, algorithm, and confidence score range.
     """
+    status_enum, method_enum = _parse_export_filters(status, algorithm)
     query = select(LinkSuggestion).options(
         selectinload(LinkSuggestion.requirement),
         selectinload(LinkSuggestion.test_case),
     )
 
-    if status is not None:
-        try:
-            status_enum = SuggestionStatus(status.lower())
-            query = query.where(LinkSuggestion.status == status_enum)
-        except ValueError:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid status '{status}'. Must be one of: pending, accepted, rejected.",
-            )
+    if status_enum is not None:
+        query = query.where(LinkSuggestion.status == status_enum)
 
-    if algorithm is not None:
-        from app.models.suggestion import SuggestionMethod
-
-        try:
-            method_enum = SuggestionMethod(algorithm.lower())
-            query = query.where(LinkSuggestion.suggestion_method == method_enum)
-        except ValueError:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid algorithm '{algorithm}'.",
-            )
+    if method_enum is not None:
+        query = query.where(LinkSuggestion.suggestion_method == method_enum)
 
     if min_score is not None:
         query = query.where(LinkSuggestion.similarity_score >= min_score)
@@ -109,6 +123,27 @@ async def export_suggestions_csv(
     )
 
 
+@router.get("/suggestions/export/{format}")
+async def export_suggestions_columnar(
+    format: Literal["arrow", "parquet"],
+    status: str | None = Query(None, description="Filter by status: pending, accepted, rejected"),
+    algorithm: str | None = Query(None, description="Filter by algorithm"),
+    min_score: float | None = Query(None, ge=0.0, le=1.0, description="Minimum confidence score"),
+    max_score: float | None = Query(None, ge=0.0, le=1.0, description="Maximum confidence score"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Export suggestions as an Arrow IPC stream or a Parquet file (requires ``pyarrow``).
+
+    Takes the same filters as the CSV export.  Rows are written as typed record
+    batches straight from a server-side cursor, oldest suggestion first.
+    """
+    status_enum, method_enum = _parse_export_filters(status, algorithm)
+    rows = stream_suggestion_rows(db, status=status_enum, method=method_enum, min_score=min_score, max_score=max_score)
+    return columnar_export_response(rows, SUGGESTION_COLUMNS, format, "suggestions")
+
+
 @router.post("/suggestions/generate", response_model=dict)
 async def generate_suggestions(
     algorithm: str | None = Query(
@@ -137,6 +172,7 @@ async def generate_suggestions(
         - suggestions_skipped: Number of pairs skipped (existing link/suggestion or below threshold)
         - algorithm_used: The similarity algorithm used
         - threshold: The confidence threshold applied
+        - timings, pairs_per_second, rows_inserted_per_second, embedding_cache_hit_ratio: Per-stage profiling
     """
     try:
         # Create config with optional overrides
@@ -191,3 +227,17 @@ async def generate_suggestions(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error generating suggestions: {str(e)}"
         )
+
+
+@router.get("/embeddings/backlog", response_model=dict)
+async def get_embedding_backlog(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Report the embedding precomputation backlog.
+
+    Counts the outbox entries still waiting to be embedded, per entity type,
+    the entries that exhausted their retries, and the age of the oldest entry.
+    """
+    return await get_embedding_outbox_backlog(db)
@@ -2,27 +2,51 @@
 
 import csv
 import io
-from datetime import datetime, timezone
+from collections.abc import AsyncIterator
+from datetime import datetime
 from typing import Literal
 
-from fastapi import APIRouter, Depends, Query, Response
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.columnar import columnar_export_response
+from app.api.conditional import data_version_etag, versioned_cache_key
+from app.api.report_exports import report_export_response, report_file_response
 from app.auth.dependencies import get_current_user
+from app.cache import get_result_cache
+from app.config import settings
 from app.crud import traceability as crud
+from app.crud.coverage_history import list_coverage_snapshots
+from app.crud.data_version import LINKS, REQUIREMENTS, SUGGESTIONS, TEST_CASES
 from app.db.session import get_db
+from app.models.link import LinkSource
+from app.models.report_export import ReportExportStatus
 from app.models.user import User
-from app.schemas.traceability import MetricsResponse, TraceabilityMatrixResponse
+from app.schemas.pagination import CursorPage
+from app.schemas.report_export import ReportExportResponse
+from app.schemas.traceability import (
+    CoverageHistoryResponse,
+    MetricsResponse,
+    OrphanTestCase,
+    RequirementCoverage,
+    TraceabilityMatrixResponse,
+    TraceabilityMatrixSummary,
+)
+from app.services import report_exports
+from app.services.columnar_export import TRACEABILITY_COLUMNS
 
 router = APIRouter()
 
+MATRIX_TABLES = (REQUIREMENTS, TEST_CASES, LINKS)
+METRICS_TABLES = (REQUIREMENTS, TEST_CASES, LINKS, SUGGESTIONS)
 
-@router.get("/traceability-matrix", response_model=TraceabilityMatrixResponse)
+# Polls are answered with 304 until one of the tables a read depends on is written.
+MATRIX_ETAG = Depends(data_version_etag(*MATRIX_TABLES))
+METRICS_ETAG = Depends(data_version_etag(*METRICS_TABLES))
+
+
+@router.get("/traceability-matrix", response_model=TraceabilityMatrixResponse, dependencies=[MATRIX_ETAG])
 async def get_traceability_matrix(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -39,8 +63,95 @@ async def get_traceability_matrix(
     return await crud.get_traceability_matrix(db)
 
 
+@router.get("/traceability-matrix/summary", response_model=TraceabilityMatrixSummary)
+async def get_traceability_summary(
+    versions: dict[str, int] = MATRIX_ETAG,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get the traceability totals without the matrix rows.
+
+    Returns:
+        - Overall coverage percentage
+        - Total, covered and uncovered requirement counts
+        - Total and orphan test case counts
+    """
+    return await get_result_cache().get_or_compute(
+        versioned_cache_key("traceability-summary", versions),
+        lambda: crud.get_traceability_summary(db),
+        tags=MATRIX_TABLES,
+    )
+
+
+@router.get("/traceability-matrix/requirements", response_model=CursorPage[RequirementCoverage])
+async def get_traceability_matrix_page(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    coverage_status: Literal["covered", "partially_covered", "uncovered"] | None = Query(None),
+    module: str | None = Query(None),
+    tags: list[str] | None = Query(None, description="Only requirements carrying every listed tag"),
+    link_source: LinkSource | None = Query(None, description="Only requirements with a link from this source"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get one page of the traceability matrix, ordered by requirement external ID.
+
+    Uses keyset pagination: pass the returned ``next_cursor`` as ``cursor`` to
+    fetch the next page; it is ``null`` on the last page.
+    """
+    try:
+        return await crud.get_traceability_matrix_page(
+            db,
+            limit=limit,
+            cursor=cursor,
+            coverage_status=coverage_status,
+            module=module,
+            tags=tags,
+            link_source=link_source,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+@router.get("/traceability-matrix/orphans", response_model=CursorPage[OrphanTestCase])
+async def get_orphan_test_cases_page(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get one page of orphan test cases (no linked requirements), ordered by external ID.
+    """
+    try:
+        return await crud.get_orphan_test_cases_page(db, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+@router.get("/traceability-matrix/coverage-history", response_model=CoverageHistoryResponse)
+async def get_coverage_history(
+    since: datetime | None = Query(None, description="Only snapshots captured at or after this time (UTC)"),
+    until: datetime | None = Query(None, description="Only snapshots captured at or before this time (UTC)"),
+    limit: int = Query(500, ge=1, le=5000, description="Most recent snapshots to return from the window"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get the coverage trend from the periodic coverage snapshots, oldest first.
+
+    Each snapshot carries the totals, coverage percentage and per-module
+    breakdown at the time it was captured; nothing is recomputed.
+    """
+    snapshots = await list_coverage_snapshots(db, since=since, until=until, limit=limit)
+    return CoverageHistoryResponse(threshold=settings.COVERAGE_DROP_THRESHOLD, snapshots=snapshots)
+
+
 @router.get("/metrics", response_model=MetricsResponse)
 async def get_metrics(
+    versions: dict[str, int] = METRICS_ETAG,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -54,242 +165,161 @@ async def get_metrics(
         - Breakdown by suggestion algorithm
         - Manual vs AI-suggested link counts
     """
-    return await crud.get_metrics(db)
+    return await get_result_cache().get_or_compute(
+        versioned_cache_key("metrics", versions), lambda: crud.get_metrics(db), tags=METRICS_TABLES
+    )
 
 
-@router.get("/traceability-matrix/export")
-async def export_traceability_matrix(
-    format: Literal["csv", "json", "pdf"] = Query(..., description="Export format: csv, json, or pdf"),
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    """
-    Export the traceability matrix in CSV, JSON, or PDF format.
+def _drain_csv(output: io.StringIO) -> str:
+    chunk = output.getvalue()
+    output.seek(0)
+    output.truncate(0)
+    return chunk
 
-    Args:
-        format: Export format (csv, json, or pdf)
 
-    Returns:
-        File download with appropriate content type
-    """
-    matrix_data = await crud.get_traceability_matrix(db)
+async def _traceability_matrix_csv_chunks(db: AsyncSession) -> AsyncIterator[str]:
+    """Render the matrix CSV one server-side cursor batch at a time, orphan section last."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(
+        [
+            "Requirement ID",
+            "Requirement External ID",
+            "Requirement Title",
+            "Coverage Status",
+            "Test Case ID",
+            "Test Case Title",
+            "Link Status",
+            "Link Type",
+            "Confidence Score",
+        ]
+    )
+    yield _drain_csv(output)
 
-    if format == "csv":
-        # Create CSV content
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Write header
-        writer.writerow(
-            [
-                "Requirement ID",
-                "Requirement External ID",
-                "Requirement Title",
-                "Coverage Status",
-                "Test Case ID",
-                "Test Case Title",
-                "Link Status",
-                "Link Type",
-                "Confidence Score",
+    async for rows in crud.stream_traceability_matrix_rows(db):
+        for row in rows:
+            requirement_columns = [
+                str(row.requirement_id),
+                row.external_id or "",
+                row.requirement_title,
+                row.coverage_status,
             ]
-        )
-
-        # Write data rows
-        for req_coverage in matrix_data.matrix:
-            if req_coverage.linked_test_cases:
-                for tc in req_coverage.linked_test_cases:
-                    writer.writerow(
-                        [
-                            str(req_coverage.requirement_id),
-                            req_coverage.external_id or "",
-                            req_coverage.requirement_title,
-                            req_coverage.coverage_status,
-                            str(tc.test_case_id),
-                            tc.title,
-                            tc.link_status,
-                            tc.link_type,
-                            tc.confidence_score if tc.confidence_score is not None else "",
-                        ]
-                    )
-            else:
+            if row.link_id is None:
                 # Requirement with no links
+                writer.writerow(requirement_columns + ["", "", "", "", ""])
+            else:
                 writer.writerow(
-                    [
-                        str(req_coverage.requirement_id),
-                        req_coverage.external_id or "",
-                        req_coverage.requirement_title,
-                        req_coverage.coverage_status,
-                        "",
-                        "",
-                        "",
-                        "",
-                        "",
+                    requirement_columns
+                    + [
+                        str(row.test_case_id),
+                        row.test_case_title,
+                        crud.link_status(row.link_source),
+                        row.link_type.value,
+                        row.confidence_score if row.confidence_score is not None else "",
                     ]
                 )
+        yield _drain_csv(output)
 
-        # Write orphan test cases section
-        if matrix_data.orphans:
+    orphan_section_started = False
+    async for rows in crud.stream_orphan_test_case_rows(db):
+        if not orphan_section_started:
             writer.writerow([])  # Empty row separator
             writer.writerow(["Orphan Test Cases (No Linked Requirements)"])
             writer.writerow(["Test Case ID", "Test Case External ID", "Test Case Title"])
-            for orphan in matrix_data.orphans:
-                writer.writerow([str(orphan.test_case_id), orphan.external_id or "", orphan.title])
+            orphan_section_started = True
+        for row in rows:
+            writer.writerow([str(row.test_case_id), row.external_id or "", row.title])
+        yield _drain_csv(output)
+
+
+@router.post(
+    "/traceability-matrix/export-jobs",
+    response_model=ReportExportResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_traceability_export_job(
+    response: Response,
+    format: Literal["pdf"] = Query("pdf", description="Export format: pdf"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Start rendering the traceability matrix report in the background.
+
+    Poll ``GET /report-exports/{id}`` until ``status`` is ``completed``, then
+    fetch ``download_url``.  If a report for the current data already exists
+    it is returned immediately with status 200.
+    """
+    export, created = await report_exports.request_traceability_export(db, format, requested_by=current_user.id)
+    if export.status == ReportExportStatus.COMPLETED:
+        response.status_code = status.HTTP_200_OK
+    elif created:
+        report_exports.start_report_export(export.id)
+    return report_export_response(export)
+
+
+@router.get("/traceability-matrix/export")
+async def export_traceability_matrix(
+    format: Literal["csv", "json", "pdf", "arrow", "parquet"] = Query(
+        ..., description="Export format: csv, json, pdf, arrow (IPC stream) or parquet"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Export the traceability matrix in CSV, JSON, PDF, Arrow or Parquet format.
 
-        csv_content = output.getvalue()
-        return Response(
-            content=csv_content,
+    Args:
+        format: Export format (csv, json, pdf, arrow or parquet)
+
+    The CSV is streamed batch by batch from a server-side cursor, so memory
+    stays flat and the first rows are sent before the last ones are read.
+    Arrow and Parquet (optional ``pyarrow`` dependency) stream the same
+    (requirement, link) rows as typed record batches; orphans are not included.
+    The PDF is rendered in a worker process and cached per data fingerprint;
+    use ``POST /traceability-matrix/export-jobs`` to render without waiting.
+    While a job for the current data is pending or running, the PDF request
+    returns 202 with that job (as the export-jobs endpoint does) instead of
+    rendering again.
+
+    Returns:
+        File download with appropriate content type
+    """
+    if format == "csv":
+        return StreamingResponse(
+            _traceability_matrix_csv_chunks(db),
             media_type="text/csv",
             headers={"Content-Disposition": "attachment; filename=traceability_matrix.csv"},
         )
 
-    elif format == "json":
-        # Export as formatted JSON
-        json_content = matrix_data.model_dump_json(indent=2)
-        return Response(
-            content=json_content,
-            media_type="application/json",
-            headers={"Content-Disposition": "attachment; filename=traceability_matrix.json"},
+    if format in ("arrow", "parquet"):
+        return columnar_export_response(
+            crud.stream_traceability_matrix_rows(db), TRACEABILITY_COLUMNS, format, "traceability_matrix"
         )
 
-    elif format == "pdf":
-        # Build PDF using reportlab
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.75 * inch, bottomMargin=0.75 * inch)
-        styles = getSampleStyleSheet()
-        elements = []
-
-        # Title
-        elements.append(Paragraph("BGSTM Traceability Matrix Report", styles["Title"]))
-        gen_date = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
-        elements.append(Paragraph(f"Generated: {gen_date}", styles["Normal"]))
-        elements.append(Spacer(1, 0.2 * inch))
-
-        # Coverage Summary
-        elements.append(Paragraph("Coverage Summary", styles["Heading2"]))
-        summary_data = [
-            ["Metric", "Value"],
-            ["Total Requirements", str(matrix_data.total_requirements)],
-            ["Covered Requirements", str(matrix_data.covered_requirements)],
-            ["Uncovered Requirements", str(matrix_data.uncovered_requirements)],
-            ["Coverage Percentage", f"{matrix_data.coverage_percentage:.1f}%"],
-            ["Total Test Cases", str(matrix_data.total_test_cases)],
-            ["Orphan Test Cases", str(matrix_data.orphan_test_cases)],
-        ]
-        summary_table = Table(summary_data, colWidths=[3 * inch, 2 * inch])
-        summary_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
-                    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-                ]
-            )
-        )
-        elements.append(summary_table)
-        elements.append(Spacer(1, 0.2 * inch))
-
-        # Gap Analysis
-        uncovered = [r for r in matrix_data.matrix if r.coverage_status == "uncovered"]
-        elements.append(Paragraph("Gap Analysis – Uncovered Requirements", styles["Heading2"]))
-        if uncovered:
-            gap_data = [["External ID", "Requirement Title"]]
-            for r in uncovered:
-                gap_data.append([r.external_id or "", r.requirement_title])
-            gap_table = Table(gap_data, colWidths=[1.5 * inch, 5 * inch])
-            gap_table.setStyle(
-                TableStyle(
-                    [
-                        ("BACKGROUND", (0, 0), (-1, 0), colors.red),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
-                        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-                    ]
-                )
+    if format == "pdf":
+        # Rendered in a worker process; unchanged data is served from the stored file.
+        export, created = await report_exports.request_traceability_export(db, "pdf", requested_by=current_user.id)
+        if export.status == ReportExportStatus.COMPLETED:
+            try:
+                return report_file_response(export)
+            except FileNotFoundError:
+                pass
+        elif not created:
+            # Another request is already rendering this data: hand out its job rather than rendering it twice.
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED, content=report_export_response(export).model_dump(mode="json")
             )
-            elements.append(gap_table)
-        else:
-            elements.append(Paragraph("No uncovered requirements.", styles["Normal"]))
-        elements.append(Spacer(1, 0.2 * inch))
-
-        # Full Matrix Table
-        elements.append(Paragraph("Requirements Coverage Matrix", styles["Heading2"]))
-        matrix_table_data = [["Req ID", "Requirement Title", "Coverage", "Test Case Title", "Link Type", "Score"]]
-        for req_coverage in matrix_data.matrix:
-            if req_coverage.linked_test_cases:
-                for i, tc in enumerate(req_coverage.linked_test_cases):
-                    score = f"{tc.confidence_score:.2f}" if tc.confidence_score is not None else "—"
-                    matrix_table_data.append(
-                        [
-                            req_coverage.external_id or "" if i == 0 else "",
-                            req_coverage.requirement_title if i == 0 else "",
-                            req_coverage.coverage_status.replace("_", " ").title() if i == 0 else "",
-                            tc.title,
-                            tc.link_type,
-                            score,
-                        ]
-                    )
-            else:
-                matrix_table_data.append(
-                    [
-                        req_coverage.external_id or "",
-                        req_coverage.requirement_title,
-                        req_coverage.coverage_status.replace("_", " ").title(),
-                        "—",
-                        "—",
-                        "—",
-                    ]
-                )
-        col_widths = [1.0 * inch, 2.2 * inch, 1.1 * inch, 2.0 * inch, 0.8 * inch, 0.6 * inch]
-        matrix_pdf_table = Table(matrix_table_data, colWidths=col_widths, repeatRows=1)
-        matrix_pdf_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.darkblue),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("FONTSIZE", (0, 0), (-1, -1), 8),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
-                    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-                ]
-            )
-        )
-        elements.append(matrix_pdf_table)
-        elements.append(Spacer(1, 0.2 * inch))
-
-        # Orphan Test Cases
-        if matrix_data.orphans:
-            elements.append(Paragraph("Orphan Test Cases (No Linked Requirements)", styles["Heading2"]))
-            orphan_data = [["External ID", "Test Case Title"]]
-            for orphan in matrix_data.orphans:
-                orphan_data.append([orphan.external_id or "", orphan.title])
-            orphan_table = Table(orphan_data, colWidths=[1.5 * inch, 5 * inch])
-            orphan_table.setStyle(
-                TableStyle(
-                    [
-                        ("BACKGROUND", (0, 0), (-1, 0), colors.orange),
-                        ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                        ("FONTSIZE", (0, 0), (-1, -1), 8),
-                        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                        ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
-                        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-                    ]
-                )
-            )
-            elements.append(orphan_table)
-
-        doc.build(elements)
-        pdf_bytes = buffer.getvalue()
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={"Content-Disposition": "attachment; filename=traceability_matrix.pdf"},
-        )
+        export = await report_exports.render_report_export(db, export)
+        if export.status != ReportExportStatus.COMPLETED:
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="PDF rendering failed")
+        return report_file_response(export)
+
+    # Export as formatted JSON
+    matrix_data = await crud.get_traceability_matrix(db)
+    json_content = matrix_data.model_dump_json(indent=2)
+    return Response(
+        content=json_content,
+        media_type="application/json",
+        headers={"Content-Disposition": "attachment; filename=traceability_matrix.json"},
+    )
@@ -0,0 +1,75 @@
+"""Result cache for aggregate reads (metrics, traceability summary, analytics).
+
+Public API
+----------
+``get_result_cache()``
+    Returns the process-wide :class:`~app.cache.result_cache.ResultCache`,
+    created on first use from the current settings.
+``invalidate_cached_results(tags)``
+    Drops every entry computed from one of the given tables.  Called from
+    the session ``after_commit`` hook in :mod:`app.crud.data_version`, so
+    every committed requirement, test case, link or suggestion write
+    invalidates the results depending on it.
+
+Backend selection
+-----------------
+Driven by ``RESULT_CACHE_BACKEND``: ``"memory"`` (per-process, the default)
+or ``"module:ClassName"`` naming a :class:`~app.cache.base.CacheBackend`
+subclass — a shared backend for multi-worker deployments, constructed with
+no arguments.  ``RESULT_CACHE_TTL_SECONDS=0`` disables caching.
+"""
+
+from __future__ import annotations
+
+import importlib
+import threading
+from collections.abc import Iterable
+
+from app.cache.base import CacheBackend
+from app.cache.memory import MemoryCacheBackend
+from app.cache.result_cache import ResultCache
+
+__all__ = [
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "ResultCache",
+    "get_result_cache",
+    "invalidate_cached_results",
+]
+
+_result_cache: ResultCache | None = None
+_result_cache_lock = threading.Lock()
+
+
+def _build_backend() -> CacheBackend:
+    from app.config import settings
+
+    backend = settings.RESULT_CACHE_BACKEND
+    if backend.lower() == "memory":
+        return MemoryCacheBackend(max_entries=settings.RESULT_CACHE_MAX_ENTRIES)
+    module_name, _, class_name = backend.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown RESULT_CACHE_BACKEND={backend!r}; expected 'memory' or 'module:ClassName'.")
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    if not (isinstance(backend_class, type) and issubclass(backend_class, CacheBackend)):
+        raise ValueError(f"RESULT_CACHE_BACKEND={backend!r} is not a CacheBackend subclass.")
+    return backend_class()
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide result cache, creating it on first use."""
+    global _result_cache
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                from app.config import settings
+
+                _result_cache = ResultCache(_build_backend(), ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS)
+    return _result_cache
+
+
+def invalidate_cached_results(tags: Iterable[str]) -> int:
+    """Drop the cached results computed from any of the tables in *tags*."""
+    if _result_cache is None:
+        return 0
+    return _result_cache.invalidate(tags)
@@ -0,0 +1,39 @@
+"""Result cache backend ABC (see :mod:`app.cache`)."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from typing import Any
+
+
+class CacheBackend(ABC):
+    """
+    Pluggable store for computed read results.
+
+    Entries expire after their TTL and carry *tags* — the names of the tables
+    they were computed from — so a write can drop every entry depending on a
+    table.  Methods are synchronous: invalidation runs from the session's
+    ``after_commit`` hook.  A shared backend (Redis, memcached, ...) must
+    serialize values itself; ``None`` is never stored.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        """Return the live value stored under *key*, or None on a miss or expiry."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, *, ttl_seconds: float, tags: Iterable[str] = ()) -> None:
+        """Store *value* under *key* for *ttl_seconds*, indexed by *tags*."""
+
+    @abstractmethod
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying one of *tags*; returns the number dropped (if known)."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop all entries."""
+
+    def stats(self) -> dict[str, Any]:
+        """Backend-specific counters for diagnostics."""
+        return {}
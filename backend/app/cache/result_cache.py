@@ -0,0 +1,120 @@
+"""Single-flight, tag-invalidated front end over a :class:`~app.cache.base.CacheBackend`"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any, TypeVar
+
+from app.cache.base import CacheBackend
+
+T = TypeVar("T")
+
+
+class ResultCache:
+    """
+    Cache of computed read results (metrics, summaries, analytics).
+
+    ``get_or_compute`` serves a live entry, or runs *compute* once per key no
+    matter how many requests miss concurrently: the others await the same
+    result.  A result computed while one of its tags was invalidated is
+    returned but not stored, so a write that commits mid-computation can never
+    be masked for a whole TTL.  Cached values are shared between requests and
+    must be treated as read-only.
+    """
+
+    def __init__(self, backend: CacheBackend, *, ttl_seconds: float) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._tag_generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def _generations(self, tags: Iterable[str]) -> tuple[int, ...]:
+        with self._lock:
+            return tuple(self._tag_generations.get(tag, 0) for tag in tags)
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[T]],
+        *,
+        tags: Iterable[str],
+        ttl_seconds: float | None = None,
+    ) -> T:
+        """Return the cached value of *key*, computing (and storing) it on a miss."""
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl_seconds <= 0:
+            return await compute()
+        value = self.backend.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight.get_loop() is loop:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The request computing the value was cancelled; compute it for ourselves.
+                return await compute()
+
+        self.misses += 1
+        tags = tuple(sorted(set(tags)))
+        generations = self._generations(tags)
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters re-raise it; don't report it as never retrieved
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        future.set_result(value)
+        if value is not None and self._generations(tags) == generations:
+            self.backend.set(key, value, ttl_seconds=ttl_seconds, tags=tags)
+        return value
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """Drop the entries computed from any of *tags* and discard results still being computed from them."""
+        tags = set(tags)
+        if not tags:
+            return 0
+        with self._lock:
+            for tag in tags:
+                self._tag_generations[tag] = self._tag_generations.get(tag, 0) + 1
+        self.invalidations += 1
+        return self.backend.invalidate_tags(tags)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self.backend.clear()
+        self.hits = self.misses = self.coalesced = self.invalidations = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "backend": type(self.backend).__name__,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else None,
+            **self.backend.stats(),
+        }
@@ -19,6 +19,55 @@ class Settings(BaseSettings):
     AUTO_SUGGESTIONS_ALGORITHM: str = "tfidf"  # 'tfidf', 'keyword', or 'hybrid'
     AUTO_SUGGESTIONS_THRESHOLD: float = 0.3  # Minimum confidence threshold (0.0-1.0)
 
+    # Scheduled incremental suggestions (only entities changed since the last watermark)
+    INCREMENTAL_SUGGESTIONS_ENABLED: bool = False
+    INCREMENTAL_SUGGESTIONS_INTERVAL_SECONDS: int = 900
+    # Each run re-reads changes stamped this long before the previous run started (writes committing late)
+    INCREMENTAL_SUGGESTIONS_OVERLAP_SECONDS: int = 300
+
+    # Memory budget of the process-wide LLM embedding cache shared by all engine instances
+    EMBEDDING_MEMORY_CACHE_MAX_BYTES: int = 268_435_456  # 256 MiB
+
+    # Persistent embedding cache compaction (least recently accessed rows are evicted first; unset = no limit)
+    EMBEDDING_CACHE_COMPACTION_ENABLED: bool = False
+    EMBEDDING_CACHE_COMPACTION_INTERVAL_SECONDS: int = 3600
+    EMBEDDING_CACHE_MAX_ROWS_PER_MODEL: int | None = None
+    EMBEDDING_CACHE_MAX_BYTES_PER_MODEL: int | None = None
+    EMBEDDING_CACHE_MAX_AGE_DAYS: int | None = None
+
+    # Write-time embedding precomputation (requirement / test case writes enqueue an outbox row)
+    EMBEDDING_PRECOMPUTE_ENABLED: bool = False
+    EMBEDDING_PRECOMPUTE_INTERVAL_SECONDS: int = 30
+    EMBEDDING_PRECOMPUTE_BATCH_SIZE: int = 500
+    EMBEDDING_PRECOMPUTE_MAX_ATTEMPTS: int = 5
+    EMBEDDING_PRECOMPUTE_PROVIDER: str = "openai"  # must match the provider/model of the LLM generation runs
+    EMBEDDING_PRECOMPUTE_MODEL: str | None = None
+
+    # Verification of the incrementally maintained coverage state against the links table
+    COVERAGE_RECONCILIATION_ENABLED: bool = True
+    COVERAGE_RECONCILIATION_INTERVAL_SECONDS: int = 3600
+
+    # Periodic coverage snapshots (history for trends) and the coverage-drop alert threshold (percent)
+    COVERAGE_SNAPSHOT_ENABLED: bool = True
+    COVERAGE_SNAPSHOT_INTERVAL_SECONDS: int = 3600
+    COVERAGE_SNAPSHOT_RETENTION_DAYS: int | None = 365
+    COVERAGE_DROP_THRESHOLD: float = 80.0
+
+    # Cache of aggregate reads (metrics, traceability summary, analytics), invalidated on committed writes
+    RESULT_CACHE_BACKEND: str = "memory"  # "memory" or "module:ClassName" of a CacheBackend subclass
+    RESULT_CACHE_TTL_SECONDS: float = 30.0  # 0 disables the cache
+    RESULT_CACHE_MAX_ENTRIES: int = 1024
+
+    # Prometheus operational metrics at /internal/metrics (served only when a bearer token is set)
+    INTERNAL_METRICS_ENABLED: bool = True
+    INTERNAL_METRICS_TOKEN: str | None = None
+
+    # Directory for memory-mapped per-model snapshots of the embedding cache (disabled if unset)
+    EMBEDDING_SNAPSHOT_DIR: str | None = None
+
+    # Write a cProfile dump of every suggestion generation run to this directory (disabled if unset)
+    SUGGESTION_PROFILE_DIR: str | None = None
+
     # Authentication
     SECRET_KEY: str = "change-me-in-production-use-a-real-secret-key"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
@@ -30,6 +79,10 @@ class Settings(BaseSettings):
     BGSTM_ARTIFACT_MAX_BYTES: int = 52_428_800  # 50 MiB
     BGSTM_ARTIFACT_URL_PREFIX: str = "http://localhost:8000/artifacts"
 
+    # Report exports (PDF rendering in a process pool, files cached in artifact storage)
+    REPORT_EXPORT_WORKERS: int = 2
+    REPORT_EXPORT_STALE_SECONDS: int = 900  # pending/running jobs older than this are retried
+
     class Config:
         env_file = ".env"
 
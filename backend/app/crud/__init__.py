@@ -1,8 +1,9 @@
 """CRUD operations for BGSTM AI Traceability"""
 
-from . import link, requirement, test_case
+from . import data_version, link, requirement, test_case
 
 __all__ = [
+    "data_version",
     "requirement",
     "test_case",
     "link",
@@ -0,0 +1,305 @@
+"""CRUD operations for the incrementally maintained coverage state"""
+
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import case, exists, func, or_, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.dialect import insert_for_dialect
+from app.models.coverage import CoverageCounters, RequirementCoverage, TestCaseCoverage
+from app.models.link import LinkSource, RequirementTestCaseLink
+from app.models.requirement import Requirement
+from app.models.test_case import TestCase
+
+ACCEPTED_LINK_SOURCES = (LinkSource.MANUAL, LinkSource.AI_CONFIRMED, LinkSource.IMPORTED)
+COVERAGE_STATUSES = ("covered", "partially_covered", "uncovered")
+COUNTERS_ID = 1
+
+COUNTER_FIELDS = (
+    "total_requirements",
+    "covered_requirements",
+    "partially_covered_requirements",
+    "uncovered_requirements",
+    "total_test_cases",
+    "orphan_test_cases",
+)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def coverage_status(link_count: int, accepted_count: int) -> str:
+    """Classify a requirement from its link counts (mirrors the SQL ``CASE`` of the traceability queries)."""
+    if accepted_count > 0:
+        return "covered"
+    if link_count > 0:
+        return "partially_covered"
+    return "uncovered"
+
+
+def _link_counts(key, ids: Iterable[UUID] | None = None):
+    """Grouped link counts per *key* column: all links and links from an accepted source."""
+    query = select(
+        key.label("entity_id"),
+        func.count().label("link_count"),
+        func.count().filter(RequirementTestCaseLink.link_source.in_(ACCEPTED_LINK_SOURCES)).label("accepted_count"),
+    ).group_by(key)
+    if ids is not None:
+        query = query.where(key.in_(list(ids)))
+    return query
+
+
+async def get_coverage_counters(db: AsyncSession, *, lock: bool = False) -> Row | None:
+    """
+    Read the global coverage counters — one primary-key lookup.
+
+    Returns None until the counters row exists (the migration backfills it; a
+    database created with ``create_all`` gets it on the first write or
+    reconciliation).  Read as a plain row so increments issued through Core
+    ``UPDATE`` statements in this session are never hidden by the identity map.
+    With ``lock`` the row is locked (``SELECT ... FOR UPDATE`` on PostgreSQL)
+    until the caller's transaction ends.
+    """
+    table = CoverageCounters.__table__
+    query = select(table).where(table.c.id == COUNTERS_ID)
+    result = await db.execute(query.with_for_update() if lock else query)
+    return result.one_or_none()
+
+
+async def _refresh_requirements(db: AsyncSession, requirement_ids: set[UUID], now: datetime) -> Counter:
+    state = RequirementCoverage.__table__
+    old_rows = await db.execute(
+        select(state.c.requirement_id, state.c.status)
+        .where(state.c.requirement_id.in_(requirement_ids))
+        .with_for_update()
+    )
+    old_status = dict(old_rows.all())
+    existing_rows = await db.execute(select(Requirement.id).where(Requirement.id.in_(requirement_ids)))
+    existing = set(existing_rows.scalars().all())
+    stats_rows = await db.execute(_link_counts(RequirementTestCaseLink.requirement_id, existing)) if existing else None
+    stats = {row.entity_id: (row.link_count, row.accepted_count) for row in stats_rows or ()}
+
+    deltas: Counter = Counter()
+    for status in old_status.values():
+        deltas["total_requirements"] -= 1
+        deltas[f"{status}_requirements"] -= 1
+
+    values = []
+    for requirement_id in existing:
+        link_count, accepted_count = stats.get(requirement_id, (0, 0))
+        status = coverage_status(link_count, accepted_count)
+        deltas["total_requirements"] += 1
+        deltas[f"{status}_requirements"] += 1
+        values.append(
+            {
+                "requirement_id": requirement_id,
+                "link_count": link_count,
+                "accepted_count": accepted_count,
+                "status": status,
+                "updated_at": now,
+            }
+        )
+    if values:
+        insert_stmt = insert_for_dialect(db)(state).values(values)
+        await db.execute(
+            insert_stmt.on_conflict_do_update(
+                index_elements=["requirement_id"],
+                set_={
+                    "link_count": insert_stmt.excluded.link_count,
+                    "accepted_count": insert_stmt.excluded.accepted_count,
+                    "status": insert_stmt.excluded.status,
+                    "updated_at": insert_stmt.excluded.updated_at,
+                },
+            )
+        )
+    gone = set(old_status) - existing
+    if gone:
+        await db.execute(state.delete().where(state.c.requirement_id.in_(gone)))
+    return deltas
+
+
+async def _refresh_test_cases(db: AsyncSession, test_case_ids: set[UUID], now: datetime) -> Counter:
+    state = TestCaseCoverage.__table__
+    old_rows = await db.execute(
+        select(state.c.test_case_id, state.c.link_count)
+        .where(state.c.test_case_id.in_(test_case_ids))
+        .with_for_update()
+    )
+    old_counts = dict(old_rows.all())
+    existing_rows = await db.execute(select(TestCase.id).where(TestCase.id.in_(test_case_ids)))
+    existing = set(existing_rows.scalars().all())
+    stats_rows = await db.execute(_link_counts(RequirementTestCaseLink.test_case_id, existing)) if existing else None
+    stats = {row.entity_id: row.link_count for row in stats_rows or ()}
+
+    deltas: Counter = Counter()
+    for link_count in old_counts.values():
+        deltas["total_test_cases"] -= 1
+        deltas["orphan_test_cases"] -= int(link_count == 0)
+
+    values = []
+    for test_case_id in existing:
+        link_count = stats.get(test_case_id, 0)
+        deltas["total_test_cases"] += 1
+        deltas["orphan_test_cases"] += int(link_count == 0)
+        values.append({"test_case_id": test_case_id, "link_count": link_count, "updated_at": now})
+    if values:
+        insert_stmt = insert_for_dialect(db)(state).values(values)
+        await db.execute(
+            insert_stmt.on_conflict_do_update(
+                index_elements=["test_case_id"],
+                set_={"link_count": insert_stmt.excluded.link_count, "updated_at": insert_stmt.excluded.updated_at},
+            )
+        )
+    gone = set(old_counts) - existing
+    if gone:
+        await db.execute(state.delete().where(state.c.test_case_id.in_(gone)))
+    return deltas
+
+
+async def refresh_coverage(
+    db: AsyncSession,
+    *,
+    requirement_ids: Iterable[UUID] = (),
+    test_case_ids: Iterable[UUID] = (),
+) -> None:
+    """
+    Recompute the coverage rows of the given entities from their links and adjust the counters.
+
+    Call it inside the writer's transaction, after the write is flushed, with
+    every requirement and test case whose links — or whose existence — changed.
+    Entities that no longer exist lose their row.  The old rows are locked
+    (``SELECT ... FOR UPDATE`` on PostgreSQL) and the counters are adjusted
+    with relative ``UPDATE``s, so concurrent writers touching different
+    entities never overwrite each other's deltas.
+    """
+    requirement_ids = {requirement_id for requirement_id in requirement_ids if requirement_id is not None}
+    test_case_ids = {test_case_id for test_case_id in test_case_ids if test_case_id is not None}
+    now = _utcnow()
+    deltas: Counter = Counter()
+    if requirement_ids:
+        deltas.update(await _refresh_requirements(db, requirement_ids, now))
+    if test_case_ids:
+        deltas.update(await _refresh_test_cases(db, test_case_ids, now))
+
+    changes = {field: delta for field, delta in deltas.items() if delta}
+    if not changes:
+        return
+    table = CoverageCounters.__table__
+    await db.execute(insert_for_dialect(db)(table).values(id=COUNTERS_ID).on_conflict_do_nothing(index_elements=["id"]))
+    await db.execute(
+        update(table)
+        .where(table.c.id == COUNTERS_ID)
+        .values(updated_at=now, **{field: table.c[field] + delta for field, delta in changes.items()})
+    )
+
+
+async def _true_counters(db: AsyncSession) -> dict[str, int]:
+    link_stats = _link_counts(RequirementTestCaseLink.requirement_id).subquery()
+    status = case(
+        (link_stats.c.accepted_count > 0, "covered"),
+        (link_stats.c.link_count > 0, "partially_covered"),
+        else_="uncovered",
+    )
+    result = await db.execute(
+        select(
+            func.count(Requirement.id),
+            *(func.count().filter(status == name) for name in COVERAGE_STATUSES),
+            select(func.count()).select_from(TestCase).scalar_subquery(),
+            select(func.count())
+            .select_from(TestCase)
+            .where(~exists().where(RequirementTestCaseLink.test_case_id == TestCase.id))
+            .scalar_subquery(),
+        )
+        .select_from(Requirement)
+        .outerjoin(link_stats, link_stats.c.entity_id == Requirement.id)
+    )
+    return dict(zip(COUNTER_FIELDS, result.one()))
+
+
+async def _drifted_requirement_ids(db: AsyncSession) -> set[UUID]:
+    state = RequirementCoverage.__table__
+    link_stats = _link_counts(RequirementTestCaseLink.requirement_id).subquery()
+    link_count = func.coalesce(link_stats.c.link_count, 0)
+    accepted_count = func.coalesce(link_stats.c.accepted_count, 0)
+    expected_status = case((accepted_count > 0, "covered"), (link_count > 0, "partially_covered"), else_="uncovered")
+    drifted = await db.execute(
+        select(Requirement.id)
+        .outerjoin(link_stats, link_stats.c.entity_id == Requirement.id)
+        .outerjoin(state, state.c.requirement_id == Requirement.id)
+        .where(
+            or_(
+                state.c.requirement_id.is_(None),
+                state.c.link_count != link_count,
+                state.c.accepted_count != accepted_count,
+                state.c.status != expected_status,
+            )
+        )
+    )
+    stray = await db.execute(
+        select(state.c.requirement_id).where(~exists().where(Requirement.id == state.c.requirement_id))
+    )
+    return set(drifted.scalars().all()) | set(stray.scalars().all())
+
+
+async def _drifted_test_case_ids(db: AsyncSession) -> set[UUID]:
+    state = TestCaseCoverage.__table__
+    link_stats = _link_counts(RequirementTestCaseLink.test_case_id).subquery()
+    link_count = func.coalesce(link_stats.c.link_count, 0)
+    drifted = await db.execute(
+        select(TestCase.id)
+        .outerjoin(link_stats, link_stats.c.entity_id == TestCase.id)
+        .outerjoin(state, state.c.test_case_id == TestCase.id)
+        .where(or_(state.c.test_case_id.is_(None), state.c.link_count != link_count))
+    )
+    stray = await db.execute(select(state.c.test_case_id).where(~exists().where(TestCase.id == state.c.test_case_id)))
+    return set(drifted.scalars().all()) | set(stray.scalars().all())
+
+
+async def reconcile_coverage(db: AsyncSession, *, repair: bool = True) -> dict[str, Any]:
+    """
+    Verify the coverage rows and counters against the links table.
+
+    With ``repair`` the drifted rows are recomputed and the counters are
+    overwritten with the true totals.  The counters row is locked before the
+    totals are computed — after the rows, the order ``refresh_coverage``
+    locks them in — so no concurrent writer's delta lands between the read and
+    the overwrite.  The caller commits.
+
+    Returns:
+        Dictionary with the drifted requirement and test case row counts, the
+        per-counter drift (stored minus true value) and whether it was repaired.
+    """
+    requirement_ids = await _drifted_requirement_ids(db)
+    test_case_ids = await _drifted_test_case_ids(db)
+    now = _utcnow()
+    if repair:
+        if requirement_ids:
+            await _refresh_requirements(db, requirement_ids, now)
+        if test_case_ids:
+            await _refresh_test_cases(db, test_case_ids, now)
+    stored = await get_coverage_counters(db, lock=repair)
+    truth = await _true_counters(db)
+    counter_drift = {
+        field: (getattr(stored, field) if stored else 0) - value
+        for field, value in truth.items()
+        if stored is None or getattr(stored, field) != value
+    }
+    # A missing counters row is drift even on an empty database: reads would fall back to the aggregate.
+    drifted = bool(requirement_ids or test_case_ids or counter_drift or stored is None)
+
+    if repair and drifted:
+        insert_stmt = insert_for_dialect(db)(CoverageCounters.__table__).values(id=COUNTERS_ID, updated_at=now, **truth)
+        await db.execute(insert_stmt.on_conflict_do_update(index_elements=["id"], set_={"updated_at": now, **truth}))
+
+    return {
+        "requirement_rows": len(requirement_ids),
+        "test_case_rows": len(test_case_ids),
+        "counter_drift": counter_drift,
+        "repaired": repair and drifted,
+    }
@@ -0,0 +1,82 @@
+"""CRUD operations for coverage snapshots — the stored coverage history"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.traceability import get_module_coverage_breakdown, get_traceability_summary
+from app.models.coverage import CoverageSnapshot
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    """Snapshots store naive UTC timestamps; convert timezone-aware bounds to match."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def capture_coverage_snapshot(db: AsyncSession, *, captured_at: datetime | None = None) -> CoverageSnapshot:
+    """
+    Record the current coverage totals and per-module breakdown as a snapshot.
+
+    Requirement totals are summed from the module breakdown so the two always
+    agree; test case totals come from the coverage counters.  The caller commits.
+    """
+    modules = await get_module_coverage_breakdown(db)
+    summary = await get_traceability_summary(db)
+    total = sum(entry["total"] for entry in modules)
+    covered = sum(entry["covered"] for entry in modules)
+    snapshot = CoverageSnapshot(
+        captured_at=captured_at or _utcnow(),
+        total_requirements=total,
+        covered_requirements=covered,
+        partially_covered_requirements=sum(entry["partially_covered"] for entry in modules),
+        uncovered_requirements=sum(entry["uncovered"] for entry in modules),
+        total_test_cases=summary.total_test_cases,
+        orphan_test_cases=summary.orphan_test_cases,
+        coverage_percentage=round(covered / total * 100, 2) if total > 0 else 0.0,
+        modules=modules,
+    )
+    db.add(snapshot)
+    await db.flush()
+    return snapshot
+
+
+async def get_latest_coverage_snapshot(db: AsyncSession) -> CoverageSnapshot | None:
+    """Return the most recent snapshot, or None before the first one is taken."""
+    result = await db.execute(select(CoverageSnapshot).order_by(CoverageSnapshot.captured_at.desc()).limit(1))
+    return result.scalar_one_or_none()
+
+
+async def list_coverage_snapshots(
+    db: AsyncSession,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int = 500,
+) -> list[CoverageSnapshot]:
+    """
+    Return the snapshots captured in ``[since, until]``, oldest first.
+
+    One range scan over the ``captured_at`` index; when the window holds more
+    than *limit* snapshots the most recent ones are returned.
+    """
+    since, until = _naive_utc(since), _naive_utc(until)
+    query = select(CoverageSnapshot)
+    if since is not None:
+        query = query.where(CoverageSnapshot.captured_at >= since)
+    if until is not None:
+        query = query.where(CoverageSnapshot.captured_at <= until)
+    result = await db.execute(query.order_by(CoverageSnapshot.captured_at.desc()).limit(limit))
+    return list(reversed(result.scalars().all()))
+
+
+async def delete_coverage_snapshots_before(db: AsyncSession, cutoff: datetime) -> int:
+    """Delete snapshots captured before *cutoff*; returns the number removed.  The caller commits."""
+    result = await db.execute(delete(CoverageSnapshot).where(CoverageSnapshot.captured_at < cutoff))
+    return result.rowcount or 0
@@ -0,0 +1,103 @@
+"""CRUD operations for the per-table data versions
+
+Importing this module installs two session event hooks that record every
+tracked table written through a session:
+
+- ``after_flush`` covers ORM unit-of-work writes (``add`` / attribute changes / ``delete``);
+- ``do_orm_execute`` covers ``insert`` / ``update`` / ``delete`` statements run
+  through ``Session.execute`` (bulk imports, suggestion batches, bulk reviews).
+
+Rows removed by database-level ``ON DELETE CASCADE`` are not seen; endpoints
+depending on a child table also list its parent tables.
+
+Once the transaction commits (``after_commit``), the versions of the written
+tables are bumped in a separate short transaction and the result cache entries
+computed from them are invalidated; a rollback discards them.  Bumping after
+the commit keeps long writers (a suggestion run) from holding the version rows
+locked, so concurrent writes to the same table never queue behind them; a
+poll racing the commit at worst re-reads data under the old tag.
+"""
+
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timezone
+from itertools import chain
+
+from sqlalchemy import Connection, event, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+from app.cache import invalidate_cached_results
+from app.models.data_version import DataVersion
+
+REQUIREMENTS = "requirements"
+TEST_CASES = "test_cases"
+LINKS = "requirement_test_case_links"
+SUGGESTIONS = "link_suggestions"
+TRACKED_TABLES = frozenset({REQUIREMENTS, TEST_CASES, LINKS, SUGGESTIONS})
+
+# session.info key of the tracked tables written in the current transaction
+_WRITTEN_TABLES = "data_version_written_tables"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def get_data_versions(db: AsyncSession, names: Sequence[str]) -> dict[str, int]:
+    """Return the version of each table in *names*; 0 for a table never written since tracking began."""
+    result = await db.execute(select(DataVersion.name, DataVersion.version).where(DataVersion.name.in_(names)))
+    versions = dict(result.all())
+    return {name: versions.get(name, 0) for name in names}
+
+
+def bump_data_versions(connection: Connection, names: Iterable[str]) -> None:
+    """Advance the version of each table (atomically, in the connection's transaction)."""
+    table = DataVersion.__table__
+    insert = postgresql_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    now = _utcnow()
+    # Sorted, so concurrent writers lock the rows in the same order.
+    for name in sorted(set(names)):
+        insert_stmt = insert(table).values(name=name, version=1, updated_at=now)
+        connection.execute(
+            insert_stmt.on_conflict_do_update(
+                index_elements=["name"],
+                set_={"version": table.c.version + 1, "updated_at": insert_stmt.excluded.updated_at},
+            )
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_tables(session: Session, flush_context: UOWTransaction) -> None:
+    modified = (obj for obj in session.dirty if session.is_modified(obj))
+    names = {
+        obj.__tablename__
+        for obj in chain(session.new, session.deleted, modified)
+        if getattr(obj, "__tablename__", None) in TRACKED_TABLES
+    }
+    if names:
+        session.info.setdefault(_WRITTEN_TABLES, set()).update(names)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_statement_table(orm_execute_state: ORMExecuteState) -> None:
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    name = getattr(getattr(orm_execute_state.statement, "table", None), "name", None)
+    if name in TRACKED_TABLES:
+        orm_execute_state.session.info.setdefault(_WRITTEN_TABLES, set()).add(name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_written_tables(session: Session) -> None:
+    names = session.info.pop(_WRITTEN_TABLES, None)
+    if names:
+        with session.get_bind().begin() as connection:
+            bump_data_versions(connection, names)
+        invalidate_cached_results(names)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_written_tables(session: Session) -> None:
+    session.info.pop(_WRITTEN_TABLES, None)
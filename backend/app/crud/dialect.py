@@ -0,0 +1,10 @@
+"""Dialect-specific statement constructors shared by the CRUD modules"""
+
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def insert_for_dialect(db: AsyncSession):
+    """Return the ``insert`` construct of *db*'s dialect, for ``ON CONFLICT`` upserts (PostgreSQL or SQLite)."""
+    return postgresql_insert if db.bind and db.bind.dialect.name == "postgresql" else sqlite_insert
@@ -1,48 +1,221 @@
 """CRUD operations for the persistent embedding cache"""
 
+import logging
+import threading
+import uuid
+from collections.abc import Iterable, Iterator
 from datetime import datetime, timedelta, timezone
+from typing import Any
 
-from sqlalchemy import delete, select
+import numpy as np
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.embedding_cache import EmbeddingCache
+from app.crud.dialect import insert_for_dialect
+from app.models.embedding_cache import EmbeddingCache, EmbeddingCacheGeneration
 
+logger = logging.getLogger(__name__)
 
-async def get_cached_embedding(db: AsyncSession, text_hash: str, model_name: str) -> list[float] | None:
+# Rows sent per executemany round trip when upserting.
+UPSERT_CHUNK_ROWS = 1000
+# Hashes per IN lookup — SQLite allows 32766 bound parameters per statement and asyncpg 32767.
+LOOKUP_CHUNK_SIZE = 10_000
+
+
+def _chunks(items: list, size: int) -> Iterator[list]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class EmbeddingAccessTracker:
+    """
+    Collects cache reads in memory and writes them back as ``last_accessed_at`` in batches.
+
+    Recording a read is a set insert, so cache lookups never turn into writes;
+    :meth:`flush` (run by the compaction job) issues one ``UPDATE`` per model per
+    ``LOOKUP_CHUNK_SIZE`` hashes.  Access times therefore have the resolution of
+    the flush interval.  At most ``max_pending`` distinct hashes are held between
+    flushes; further reads are dropped until the next flush.
+    """
+
+    def __init__(self, max_pending: int = 200_000) -> None:
+        self.max_pending = max_pending
+        self._pending: dict[str, set[str]] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def record(self, model_name: str, text_hashes: Iterable[str]) -> None:
+        with self._lock:
+            pending = self._pending.setdefault(model_name, set())
+            for text_hash in text_hashes:
+                if self._count >= self.max_pending:
+                    return
+                if text_hash not in pending:
+                    pending.add(text_hash)
+                    self._count += 1
+
+    @property
+    def pending(self) -> int:
+        return self._count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending = {}
+            self._count = 0
+
+    async def flush(self, db: AsyncSession) -> int:
+        """Write pending accesses to the DB and return how many hashes were touched."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._count = 0
+        now = _utcnow()
+        flushed = 0
+        for model_name, hashes in pending.items():
+            for chunk in _chunks(sorted(hashes), LOOKUP_CHUNK_SIZE):
+                await db.execute(
+                    update(EmbeddingCache)
+                    .where(EmbeddingCache.model_name == model_name, EmbeddingCache.text_hash.in_(chunk))
+                    .values(last_accessed_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+                flushed += len(chunk)
+        return flushed
+
+
+access_tracker = EmbeddingAccessTracker()
+
+
+async def get_cache_generation(db: AsyncSession, model_name: str) -> int:
+    """Return the latest published generation of *model_name*; 0 if nothing was ever published."""
+    result = await db.execute(
+        select(EmbeddingCacheGeneration.generation).where(EmbeddingCacheGeneration.model_name == model_name)
+    )
+    return result.scalar_one_or_none() or 0
+
+
+async def publish_embedding_writes(db: AsyncSession, model_name: str) -> int:
+    """
+    Stamp the model's committed, unpublished rows with a new generation and return the latest generation.
+
+    Writers leave ``embedding_cache.generation`` NULL and never touch the
+    generation row, so a long run holding its write transaction open does not
+    serialize other writers.  Publishing runs in its own short transaction on a
+    separate connection: it bumps the model's counter and stamps the rows in
+    one commit, so every row with ``generation <= g`` was committed before
+    ``g`` was handed out.  Rows still locked by an open writer are skipped on
+    PostgreSQL and published by a later call.
+    """
+    unpublished = (EmbeddingCache.model_name == model_name, EmbeddingCache.generation.is_(None))
+    async with AsyncSession(db.bind) as publisher, publisher.begin():
+        pending = await publisher.execute(select(EmbeddingCache.id).where(*unpublished).limit(1))
+        if pending.first() is None:
+            return await get_cache_generation(publisher, model_name)
+
+        table = EmbeddingCacheGeneration.__table__
+        insert_stmt = insert_for_dialect(publisher)(table).values(
+            model_name=model_name, generation=1, updated_at=_utcnow()
+        )
+        generation = (
+            await publisher.execute(
+                insert_stmt.on_conflict_do_update(
+                    index_elements=["model_name"],
+                    set_={"generation": table.c.generation + 1, "updated_at": insert_stmt.excluded.updated_at},
+                ).returning(table.c.generation)
+            )
+        ).scalar_one()
+        claimable = select(EmbeddingCache.id).where(*unpublished).with_for_update(skip_locked=True)
+        await publisher.execute(
+            update(EmbeddingCache)
+            .where(EmbeddingCache.id.in_(claimable))
+            .values(generation=generation)
+            .execution_options(synchronize_session=False)
+        )
+        return generation
+
+
+async def _advance_generations(db: AsyncSession, model_names: Iterable[str]) -> None:
+    """
+    Advance the generation of each model whose rows were evicted, in the caller's transaction.
+
+    Snapshots only look at the DB when the generation moves, so without this an
+    eviction that writes nothing new would leave them serving deleted rows.
+    Call it after the deletes: the generation row stays locked only until the
+    caller commits.
+    """
+    table = EmbeddingCacheGeneration.__table__
+    now = _utcnow()
+    # Sorted, so concurrent publishers and compactions lock the rows in the same order.
+    for model_name in sorted(set(model_names)):
+        insert_stmt = insert_for_dialect(db)(table).values(model_name=model_name, generation=1, updated_at=now)
+        await db.execute(
+            insert_stmt.on_conflict_do_update(
+                index_elements=["model_name"],
+                set_={"generation": table.c.generation + 1, "updated_at": insert_stmt.excluded.updated_at},
+            )
+        )
+
+
+def _valid_embedding(text_hash: str, embedding: np.ndarray, dimensions: int) -> bool:
+    if embedding.shape[0] != dimensions:
+        logger.warning(
+            "Ignoring corrupt cached embedding %s: %d values stored, %d expected",
+            text_hash[:16],
+            embedding.shape[0],
+            dimensions,
+        )
+        return False
+    return True
+
+
+async def get_cached_embedding(db: AsyncSession, text_hash: str, model_name: str) -> np.ndarray | None:
     """Return the cached embedding for a single (text_hash, model_name) pair, or None on miss."""
     result = await db.execute(
-        select(EmbeddingCache.embedding).where(
+        select(EmbeddingCache.embedding, EmbeddingCache.dimensions).where(
             EmbeddingCache.text_hash == text_hash,
             EmbeddingCache.model_name == model_name,
         )
     )
-    row = result.scalar_one_or_none()
-    return row
+    row = result.one_or_none()
+    if row is None or not _valid_embedding(text_hash, row.embedding, row.dimensions):
+        return None
+    return row.embedding
 
 
 async def get_cached_embeddings_batch(
     db: AsyncSession, text_hashes: list[str], model_name: str
-) -> dict[str, list[float]]:
+) -> dict[str, np.ndarray]:
     """
     Return a mapping of text_hash → embedding for all cache hits.
 
-    Any text_hash not present in the DB is simply omitted from the result.
+    Embeddings are read-only float32 arrays decoded without copying the stored
+    bytes.  Any text_hash not present in the DB, or whose stored vector does not
+    match its recorded ``dimensions``, is omitted from the result.  Hashes are
+    looked up ``LOOKUP_CHUNK_SIZE`` at a time to stay under the driver's
+    bound-parameter limit.  Hits are recorded with :data:`access_tracker`.
     """
-    if not text_hashes:
-        return {}
-    result = await db.execute(
-        select(EmbeddingCache.text_hash, EmbeddingCache.embedding).where(
-            EmbeddingCache.text_hash.in_(text_hashes),
-            EmbeddingCache.model_name == model_name,
+    hits: dict[str, np.ndarray] = {}
+    for chunk in _chunks(text_hashes, LOOKUP_CHUNK_SIZE):
+        result = await db.execute(
+            select(EmbeddingCache.text_hash, EmbeddingCache.embedding, EmbeddingCache.dimensions).where(
+                EmbeddingCache.text_hash.in_(chunk),
+                EmbeddingCache.model_name == model_name,
+            )
         )
-    )
-    return {row.text_hash: row.embedding for row in result}
+        for row in result:
+            if _valid_embedding(row.text_hash, row.embedding, row.dimensions):
+                hits[row.text_hash] = row.embedding
+    access_tracker.record(model_name, hits.keys())
+    return hits
 
 
 async def save_embedding(
     db: AsyncSession,
     text_hash: str,
-    embedding: list[float],
+    embedding: list[float] | np.ndarray,
     model_name: str,
     provider: str,
 ) -> None:
@@ -65,49 +238,151 @@ async def save_embeddings_batch(db: AsyncSession, entries: list[dict]) -> None:
     Upsert a batch of embeddings into the cache.
 
     Each entry dict must contain: text_hash, embedding, model_name, provider.
+    Embeddings may be float lists or numpy arrays; they are stored as float32.
     On conflict (text_hash, model_name) the embedding and updated_at are refreshed.
+    Written rows are unpublished until :func:`publish_embedding_writes` stamps them.
+
+    A single dialect-specific ``INSERT ... ON CONFLICT DO UPDATE`` is compiled
+    once and executed with ``executemany``, ``UPSERT_CHUNK_ROWS`` rows per round
+    trip, so no row is looked up first.  If the same key appears more than once
+    the last entry wins.
     """
     if not entries:
         return
 
-    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    now = _utcnow()
+    rows_by_key: dict[tuple[str, str], dict] = {}
     for entry in entries:
-        embedding: list[float] = entry["embedding"]
-        row = EmbeddingCache(
-            text_hash=entry["text_hash"],
-            embedding=embedding,
-            model_name=entry["model_name"],
-            provider=entry["provider"],
-            dimensions=len(embedding),
-            created_at=now,
-            updated_at=now,
-        )
-        # Use merge (upsert by unique constraint) — works across SQLite and PostgreSQL.
-        # SQLAlchemy's Session.merge matches on primary key, so we look up existing first.
-        existing_result = await db.execute(
-            select(EmbeddingCache).where(
-                EmbeddingCache.text_hash == entry["text_hash"],
-                EmbeddingCache.model_name == entry["model_name"],
-            )
-        )
-        existing = existing_result.scalar_one_or_none()
-        if existing is not None:
-            existing.embedding = embedding
-            existing.dimensions = len(embedding)
-            existing.updated_at = now
-        else:
-            db.add(row)
+        embedding = entry["embedding"]
+        rows_by_key[(entry["text_hash"], entry["model_name"])] = {
+            "id": uuid.uuid4(),
+            "text_hash": entry["text_hash"],
+            "embedding": embedding,
+            "model_name": entry["model_name"],
+            "provider": entry["provider"],
+            "dimensions": len(embedding),
+            "created_at": now,
+            "updated_at": now,
+            "generation": None,
+        }
+    rows = list(rows_by_key.values())
 
-    await db.flush()
+    insert_stmt = insert_for_dialect(db)(EmbeddingCache.__table__)
+    stmt = insert_stmt.on_conflict_do_update(
+        index_elements=["text_hash", "model_name"],
+        set_={
+            "embedding": insert_stmt.excluded.embedding,
+            "provider": insert_stmt.excluded.provider,
+            "dimensions": insert_stmt.excluded.dimensions,
+            "updated_at": insert_stmt.excluded.updated_at,
+            # A rewrite counts as a use: recency falls back to the new updated_at.
+            "last_accessed_at": None,
+            "generation": None,
+        },
+    )
+    for chunk in _chunks(rows, UPSERT_CHUNK_ROWS):
+        await db.execute(stmt, chunk)
+
+
+def _last_used():
+    """
+    When a row was last read or written — rows never read since written fall back to ``updated_at``.
+
+    Keep in step with the ``ix_embedding_cache_model_last_used`` expression index.
+    """
+    return func.coalesce(EmbeddingCache.last_accessed_at, EmbeddingCache.updated_at)
 
 
 async def delete_stale_embeddings(db: AsyncSession, older_than_days: int = 90) -> int:
     """
     Delete embeddings that haven't been accessed/updated in *older_than_days* days.
 
-    Returns the number of rows deleted.
+    Returns the number of rows deleted.  The generation of every model that
+    lost rows is advanced, so its snapshots are rebuilt.
     """
-    cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=older_than_days)
-    result = await db.execute(delete(EmbeddingCache).where(EmbeddingCache.updated_at < cutoff))
+    cutoff = _utcnow() - timedelta(days=older_than_days)
+    result = await db.execute(
+        delete(EmbeddingCache)
+        .where(_last_used() < cutoff)
+        .returning(EmbeddingCache.model_name)
+        .execution_options(synchronize_session=False)
+    )
+    model_names = result.scalars().all()
+    await _advance_generations(db, model_names)
+    await db.flush()
+    return len(model_names)
+
+
+async def compact_embedding_cache(
+    db: AsyncSession,
+    *,
+    max_rows_per_model: int | None = None,
+    max_bytes_per_model: int | None = None,
+    max_age_days: int | None = None,
+) -> dict[str, Any]:
+    """
+    Evict least recently used embeddings until every model is within budget.
+
+    Pending accesses are flushed first so recency is current.  For each model,
+    rows are visited oldest-first by last access (falling back to
+    ``updated_at``) and deleted while the model is over ``max_rows_per_model``
+    or ``max_bytes_per_model`` (stored vector bytes), or while rows are older
+    than ``max_age_days``.  ``None`` disables a limit.  The generation of every
+    model that lost rows is advanced, so its snapshots are rebuilt.  The caller
+    commits.
+
+    Returns:
+        Report with the accesses flushed, per-model ``rows``/``bytes`` before
+        compaction and ``rows_deleted``/``bytes_reclaimed``, plus totals.
+    """
+    report: dict[str, Any] = {
+        "accesses_flushed": await access_tracker.flush(db),
+        "models": {},
+        "rows_deleted": 0,
+        "bytes_reclaimed": 0,
+    }
+    size = func.length(EmbeddingCache.embedding)
+    cutoff = _utcnow() - timedelta(days=max_age_days) if max_age_days is not None else None
+
+    usage = await db.execute(
+        select(EmbeddingCache.model_name, func.count(), func.coalesce(func.sum(size), 0)).group_by(
+            EmbeddingCache.model_name
+        )
+    )
+    for model_name, rows, total_bytes in usage.all():
+        excess_rows = max(rows - max_rows_per_model, 0) if max_rows_per_model is not None else 0
+        excess_bytes = max(total_bytes - max_bytes_per_model, 0) if max_bytes_per_model is not None else 0
+
+        evict_ids: list = []
+        reclaimed = 0
+        if excess_rows or excess_bytes or cutoff is not None:
+            candidates = await db.stream(
+                select(EmbeddingCache.id, size.label("size"), _last_used().label("last_used"))
+                .where(EmbeddingCache.model_name == model_name)
+                .order_by(_last_used(), EmbeddingCache.id)
+            )
+            async for row in candidates:
+                expired = cutoff is not None and row.last_used < cutoff
+                if not (expired or len(evict_ids) < excess_rows or reclaimed < excess_bytes):
+                    break
+                evict_ids.append(row.id)
+                reclaimed += row.size
+            await candidates.close()
+
+        for chunk in _chunks(evict_ids, LOOKUP_CHUNK_SIZE):
+            await db.execute(
+                delete(EmbeddingCache).where(EmbeddingCache.id.in_(chunk)).execution_options(synchronize_session=False)
+            )
+
+        report["models"][model_name] = {
+            "rows": rows,
+            "bytes": total_bytes,
+            "rows_deleted": len(evict_ids),
+            "bytes_reclaimed": reclaimed,
+        }
+        report["rows_deleted"] += len(evict_ids)
+        report["bytes_reclaimed"] += reclaimed
+
+    await _advance_generations(db, (name for name, usage in report["models"].items() if usage["rows_deleted"]))
     await db.flush()
-    return result.rowcount  # type: ignore[attr-defined]
+    return report
@@ -0,0 +1,68 @@
+"""CRUD operations for the embedding outbox"""
+
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.crud.dialect import insert_for_dialect
+from app.models.embedding_outbox import EmbeddingOutbox
+
+REQUIREMENT = "requirement"
+TEST_CASE = "test_case"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def enqueue_embedding(db: AsyncSession, entity_type: str, entity_id: UUID) -> None:
+    """
+    Queue *entity_id* for write-time embedding, in the caller's transaction.
+
+    A no-op unless ``EMBEDDING_PRECOMPUTE_ENABLED`` is set.  An entity already
+    queued is re-armed (new ``enqueued_at``, attempts reset) rather than duplicated.
+    """
+    if not settings.EMBEDDING_PRECOMPUTE_ENABLED:
+        return
+    now = _utcnow()
+    insert_stmt = insert_for_dialect(db)(EmbeddingOutbox.__table__).values(
+        entity_type=entity_type, entity_id=entity_id, enqueued_at=now, attempts=0
+    )
+    await db.execute(
+        insert_stmt.on_conflict_do_update(
+            index_elements=["entity_type", "entity_id"],
+            set_={"enqueued_at": now, "attempts": 0, "last_error": None},
+        )
+    )
+
+
+async def get_embedding_outbox_backlog(db: AsyncSession) -> dict[str, Any]:
+    """Return the number of queued entities per type, how many gave up, and the age of the oldest entry."""
+    max_attempts = settings.EMBEDDING_PRECOMPUTE_MAX_ATTEMPTS
+    result = await db.execute(
+        select(
+            EmbeddingOutbox.entity_type,
+            func.count(),
+            func.count().filter(EmbeddingOutbox.attempts >= max_attempts),
+            func.min(EmbeddingOutbox.enqueued_at),
+        ).group_by(EmbeddingOutbox.entity_type)
+    )
+    by_type: dict[str, int] = {REQUIREMENT: 0, TEST_CASE: 0}
+    failed = 0
+    oldest: datetime | None = None
+    for entity_type, count, failed_count, oldest_enqueued in result.all():
+        by_type[entity_type] = count
+        failed += failed_count
+        if oldest is None or oldest_enqueued < oldest:
+            oldest = oldest_enqueued
+    return {
+        "pending": sum(by_type.values()),
+        "by_entity_type": by_type,
+        "failed": failed,
+        "oldest_enqueued_at": oldest.isoformat() if oldest else None,
+        "oldest_age_seconds": round((_utcnow() - oldest).total_seconds(), 3) if oldest else None,
+    }
@@ -2,14 +2,19 @@
 
 import uuid
 from collections import defaultdict
+from collections.abc import AsyncIterator, Sequence
 from typing import Any
 from uuid import UUID
 
 from sqlalchemy import func, select
 from sqlalchemy.dialects.postgresql import insert as postgresql_insert
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.coverage import refresh_coverage
+from app.crud.embedding_outbox import REQUIREMENT, TEST_CASE, enqueue_embedding
+from app.crud.streaming import stream_partitions
 from app.models.external_case_result import CaseStatus, ExternalCaseResult
 from app.models.external_results import ExternalRunSession
 from app.models.link import LinkSource, LinkType, RequirementTestCaseLink
@@ -105,6 +110,8 @@ async def _resolve_or_create_test_case(
     )
     db.add(test_case)
     await db.flush()
+    await enqueue_embedding(db, TEST_CASE, test_case.id)
+    await refresh_coverage(db, test_case_ids=[test_case.id])
     return test_case, True
 
 
@@ -139,6 +146,7 @@ async def _link_requirements(
             insert_stmt = sqlite_insert(RequirementTestCaseLink).values(values)
             stmt = insert_stmt.on_conflict_do_nothing(index_elements=["requirement_id", "test_case_id"])
         await db.execute(stmt)
+        await refresh_coverage(db, requirement_ids=resolvable_ids, test_case_ids=[test_case_id])
 
     return await _get_requirement_ids_for_test_case(db, test_case_id=test_case_id), unresolved_ids
 
@@ -200,6 +208,8 @@ async def _resolve_requirement_external_ids(
         )
         db.add(requirement)
         await db.flush()
+        await enqueue_embedding(db, REQUIREMENT, requirement.id)
+        await refresh_coverage(db, requirement_ids=[requirement.id])
         requirements_by_external_id[submitted_external_id] = requirement
         resolved_ids.append(requirement.id)
 
@@ -382,3 +392,22 @@ async def list_case_results_for_session(
     for row in rows:
         row.requirement_ids = requirement_ids_by_test_case_id.get(row.test_case_id, []) if row.test_case_id else []
     return list(rows), total
+
+
+def stream_case_result_rows(db: AsyncSession, *, session_id: UUID | None = None) -> AsyncIterator[Sequence[Row]]:
+    """Yield case results (optionally of one session) in batches from a server-side cursor, oldest first."""
+    stmt = select(
+        ExternalCaseResult.id,
+        ExternalCaseResult.session_id,
+        ExternalCaseResult.test_case_id,
+        ExternalCaseResult.external_id,
+        ExternalCaseResult.title,
+        ExternalCaseResult.outcome,
+        ExternalCaseResult.duration_ms,
+        ExternalCaseResult.error_message,
+        ExternalCaseResult.auto_registered,
+        ExternalCaseResult.created_at,
+    ).order_by(ExternalCaseResult.created_at, ExternalCaseResult.id)
+    if session_id is not None:
+        stmt = stmt.where(ExternalCaseResult.session_id == session_id)
+    return stream_partitions(db, stmt)
@@ -1,13 +1,18 @@
 """CRUD operations for Links and Suggestions"""
 
+from collections.abc import AsyncIterator, Sequence
 from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy import func, select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.coverage import refresh_coverage
+from app.crud.streaming import stream_partitions
+from app.crud.suggestion_rollup import adjust_suggestion_rollup
 from app.models.link import RequirementTestCaseLink
-from app.models.suggestion import LinkSuggestion
+from app.models.suggestion import LinkSuggestion, SuggestionMethod, SuggestionStatus
 from app.schemas.link import LinkCreate, SuggestionCreate, SuggestionReview
 
 
@@ -46,6 +51,8 @@ async def create_link(db: AsyncSession, link: LinkCreate) -> RequirementTestCase
     """Create a new link"""
     db_link = RequirementTestCaseLink(**link.model_dump())
     db.add(db_link)
+    await db.flush()
+    await refresh_coverage(db, requirement_ids=[db_link.requirement_id], test_case_ids=[db_link.test_case_id])
     await db.commit()
     await db.refresh(db_link)
     return db_link
@@ -58,6 +65,8 @@ async def delete_link(db: AsyncSession, link_id: UUID) -> bool:
         return False
 
     await db.delete(db_link)
+    await db.flush()
+    await refresh_coverage(db, requirement_ids=[db_link.requirement_id], test_case_ids=[db_link.test_case_id])
     await db.commit()
     return True
 
@@ -157,6 +166,8 @@ async def create_suggestion(db: AsyncSession, suggestion: SuggestionCreate) -> L
     """Create a new suggestion"""
     db_suggestion = LinkSuggestion(**suggestion.model_dump())
     db.add(db_suggestion)
+    await db.flush()
+    await adjust_suggestion_rollup(db, LinkSuggestion.id == db_suggestion.id)
     await db.commit()
     await db.refresh(db_suggestion)
     return db_suggestion
@@ -168,11 +179,14 @@ async def review_suggestion(db: AsyncSession, suggestion_id: UUID, review: Sugge
     if not db_suggestion:
         return None
 
+    await adjust_suggestion_rollup(db, LinkSuggestion.id == suggestion_id, sign=-1)
     db_suggestion.status = review.status
     db_suggestion.feedback = review.feedback
     db_suggestion.reviewed_by = review.reviewed_by
     db_suggestion.reviewed_at = datetime.utcnow()
 
+    await db.flush()
+    await adjust_suggestion_rollup(db, LinkSuggestion.id == suggestion_id)
     await db.commit()
     await db.refresh(db_suggestion)
     return db_suggestion
@@ -188,6 +202,9 @@ async def bulk_review_suggestions(
     """Review multiple suggestions at once"""
     from app.models.suggestion import SuggestionStatus
 
+    # Only the pending ones change; removing and re-adding the others nets to zero.
+    selected = LinkSuggestion.id.in_(suggestion_ids)
+    await adjust_suggestion_rollup(db, selected, sign=-1)
     stmt = (
         update(LinkSuggestion)
         .where(LinkSuggestion.id.in_(suggestion_ids))
@@ -196,5 +213,53 @@ async def bulk_review_suggestions(
     )
 
     result = await db.execute(stmt)
+    await adjust_suggestion_rollup(db, selected)
     await db.commit()
     return result.rowcount  # type: ignore[attr-defined]
+
+
+def stream_suggestion_rows(
+    db: AsyncSession,
+    *,
+    status: SuggestionStatus | None = None,
+    method: SuggestionMethod | None = None,
+    min_score: float | None = None,
+    max_score: float | None = None,
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Yield suggestions with their requirement and test case titles in batches from a server-side cursor.
+
+    Rows are ordered by creation time and carry the suggestion's column names
+    plus ``requirement_title`` and ``test_case_title``.
+    """
+    from app.models.requirement import Requirement
+    from app.models.test_case import TestCase
+
+    query = (
+        select(
+            LinkSuggestion.id,
+            LinkSuggestion.requirement_id,
+            Requirement.title.label("requirement_title"),
+            LinkSuggestion.test_case_id,
+            TestCase.title.label("test_case_title"),
+            LinkSuggestion.suggestion_method,
+            LinkSuggestion.similarity_score,
+            LinkSuggestion.status,
+            LinkSuggestion.reviewed_by,
+            LinkSuggestion.feedback,
+            LinkSuggestion.created_at,
+            LinkSuggestion.reviewed_at,
+        )
+        .join(Requirement, Requirement.id == LinkSuggestion.requirement_id)
+        .join(TestCase, TestCase.id == LinkSuggestion.test_case_id)
+        .order_by(LinkSuggestion.created_at, LinkSuggestion.id)
+    )
+    if status is not None:
+        query = query.where(LinkSuggestion.status == status)
+    if method is not None:
+        query = query.where(LinkSuggestion.suggestion_method == method)
+    if min_score is not None:
+        query = query.where(LinkSuggestion.similarity_score >= min_score)
+    if max_score is not None:
+        query = query.where(LinkSuggestion.similarity_score <= max_score)
+    return stream_partitions(db, query)
@@ -0,0 +1,72 @@
+"""CRUD operations for report export jobs"""
+
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.report_export import ReportExport, ReportExportStatus
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def get_report_export(db: AsyncSession, export_id: UUID) -> ReportExport | None:
+    """Get a report export by ID"""
+    result = await db.execute(select(ReportExport).where(ReportExport.id == export_id))
+    return result.scalar_one_or_none()
+
+
+async def get_or_create_report_export(
+    db: AsyncSession,
+    *,
+    report_type: str,
+    format: str,
+    fingerprint: str,
+    requested_by: UUID | None = None,
+) -> tuple[ReportExport, bool]:
+    """
+    Return the export for this report and data fingerprint, creating a pending one if needed.
+
+    A completed export is preferred; otherwise a pending or running export
+    started less than ``REPORT_EXPORT_STALE_SECONDS`` ago is reused.  Failed
+    and stale exports are ignored, so requesting again retries.
+
+    Returns:
+        Tuple of (export, created)
+    """
+    stale_before = _utcnow() - timedelta(seconds=settings.REPORT_EXPORT_STALE_SECONDS)
+    result = await db.execute(
+        select(ReportExport)
+        .where(
+            ReportExport.report_type == report_type,
+            ReportExport.format == format,
+            ReportExport.fingerprint == fingerprint,
+            or_(
+                ReportExport.status == ReportExportStatus.COMPLETED,
+                ReportExport.status.in_([ReportExportStatus.PENDING, ReportExportStatus.RUNNING])
+                & (ReportExport.created_at >= stale_before),
+            ),
+        )
+        # Completed first, then the most recent
+        .order_by((ReportExport.status == ReportExportStatus.COMPLETED).desc(), ReportExport.created_at.desc())
+        .limit(1)
+    )
+    export = result.scalar_one_or_none()
+    if export is not None:
+        return export, False
+
+    export = ReportExport(
+        report_type=report_type,
+        format=format,
+        fingerprint=fingerprint,
+        status=ReportExportStatus.PENDING,
+        requested_by=requested_by,
+    )
+    db.add(export)
+    await db.commit()
+    await db.refresh(export)
+    return export, True
@@ -5,7 +5,12 @@ from uuid import UUID
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.coverage import refresh_coverage
+from app.crud.embedding_outbox import REQUIREMENT, enqueue_embedding
+from app.crud.suggestion_rollup import adjust_suggestion_rollup
+from app.models.link import RequirementTestCaseLink
 from app.models.requirement import Requirement
+from app.models.suggestion import LinkSuggestion
 from app.schemas.requirement import RequirementCreate, RequirementUpdate
 
 
@@ -33,6 +38,9 @@ async def create_requirement(db: AsyncSession, requirement: RequirementCreate) -
     """Create a new requirement"""
     db_requirement = Requirement(**requirement.model_dump())
     db.add(db_requirement)
+    await db.flush()
+    await enqueue_embedding(db, REQUIREMENT, db_requirement.id)
+    await refresh_coverage(db, requirement_ids=[db_requirement.id])
     await db.commit()
     await db.refresh(db_requirement)
     return db_requirement
@@ -50,6 +58,7 @@ async def update_requirement(
     for field, value in update_data.items():
         setattr(db_requirement, field, value)
 
+    await enqueue_embedding(db, REQUIREMENT, db_requirement.id)
     await db.commit()
     await db.refresh(db_requirement)
     return db_requirement
@@ -61,6 +70,13 @@ async def delete_requirement(db: AsyncSession, requirement_id: UUID) -> bool:
     if not db_requirement:
         return False
 
+    linked = await db.execute(
+        select(RequirementTestCaseLink.test_case_id).where(RequirementTestCaseLink.requirement_id == requirement_id)
+    )
+    linked_test_case_ids = list(linked.scalars().all())
+    await adjust_suggestion_rollup(db, LinkSuggestion.requirement_id == requirement_id, sign=-1)
     await db.delete(db_requirement)
+    await db.flush()
+    await refresh_coverage(db, requirement_ids=[requirement_id], test_case_ids=linked_test_case_ids)
     await db.commit()
     return True
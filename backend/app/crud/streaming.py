@@ -0,0 +1,24 @@
+"""Batched reads from a server-side cursor, shared by the streaming exports"""
+
+from collections.abc import AsyncIterator, Sequence
+
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Rows fetched per round trip when streaming from a server-side cursor
+STREAM_BATCH_ROWS = 1000
+
+
+async def stream_partitions(db: AsyncSession, query) -> AsyncIterator[Sequence[Row]]:
+    """
+    Yield the rows of *query* in batches of :data:`STREAM_BATCH_ROWS`.
+
+    The cursor is closed when the iterator is exhausted or closed early, so a
+    client disconnecting mid-download releases it.
+    """
+    result = await db.stream(query.execution_options(yield_per=STREAM_BATCH_ROWS))
+    try:
+        async for partition in result.partitions():
+            yield partition
+    finally:
+        await result.close()
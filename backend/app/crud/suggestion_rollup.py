@@ -0,0 +1,196 @@
+"""CRUD operations for the daily suggestion rollup behind the analytics endpoints"""
+
+from collections.abc import Iterable
+from datetime import date, datetime, time, timezone
+from typing import Any
+
+from sqlalchemy import Date, and_, case, cast, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.dialect import insert_for_dialect
+from app.models.suggestion import LinkSuggestion
+from app.models.suggestion_rollup import SuggestionDailyRollup
+
+# (label, low, high): low <= score < high, the last bin also includes 1.0
+CONFIDENCE_BINS = (
+    ("0.0-0.2", 0.0, 0.2),
+    ("0.2-0.4", 0.2, 0.4),
+    ("0.4-0.6", 0.4, 0.6),
+    ("0.6-0.8", 0.6, 0.8),
+    ("0.8-1.0", 0.8, 1.0),
+)
+OUT_OF_RANGE_BUCKET = -1
+
+KEY_FIELDS = ("day", "suggestion_method", "status", "score_bucket")
+ROLLUP_FIELDS = ("suggestion_count", "score_sum", "reviewed_count", "review_hours_sum")
+_INSERT_CHUNK_SIZE = 1000
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _is_postgresql(db: AsyncSession) -> bool:
+    return bool(db.bind and db.bind.dialect.name == "postgresql")
+
+
+def score_bucket():
+    """SQL ``CASE`` mapping a suggestion's score to its confidence bin index, or -1 outside ``[0, 1]``."""
+    score = LinkSuggestion.similarity_score
+    last = len(CONFIDENCE_BINS) - 1
+    return case(
+        *(
+            (and_(score >= low, score <= high if index == last else score < high), index)
+            for index, (_, low, high) in enumerate(CONFIDENCE_BINS)
+        ),
+        else_=OUT_OF_RANGE_BUCKET,
+    )
+
+
+def review_hours(db: AsyncSession):
+    """SQL expression for the hours between a suggestion's creation and review."""
+    if _is_postgresql(db):
+        return func.extract("epoch", LinkSuggestion.reviewed_at - LinkSuggestion.created_at) / 3600.0
+    return (func.julianday(LinkSuggestion.reviewed_at) - func.julianday(LinkSuggestion.created_at)) * 24.0
+
+
+def rollup_month(db: AsyncSession):
+    """SQL expression for the YYYY-MM month of a rollup row's day."""
+    day = SuggestionDailyRollup.day
+    if _is_postgresql(db):
+        return func.to_char(day, "YYYY-MM")
+    return func.strftime("%Y-%m", day)
+
+
+def _grouped_suggestions(db: AsyncSession):
+    """``link_suggestions`` aggregated by the rollup key — the rows the rollup should hold."""
+    if _is_postgresql(db):
+        day = cast(LinkSuggestion.created_at, Date)
+    else:
+        day = func.date(LinkSuggestion.created_at, type_=Date)
+    key = (
+        day.label("day"),
+        LinkSuggestion.suggestion_method,
+        LinkSuggestion.status,
+        score_bucket().label("score_bucket"),
+    )
+    return select(
+        *key,
+        func.count().label("suggestion_count"),
+        func.sum(LinkSuggestion.similarity_score).label("score_sum"),
+        func.count().filter(LinkSuggestion.reviewed_at.is_not(None)).label("reviewed_count"),
+        func.coalesce(func.sum(review_hours(db)), 0.0).label("review_hours_sum"),
+    ).group_by(*key)
+
+
+def _rollup_values(rows, sign: int, now: datetime) -> list[dict[str, Any]]:
+    values = [
+        {
+            "day": row.day,
+            "suggestion_method": row.suggestion_method.value,
+            "status": row.status.value,
+            "score_bucket": row.score_bucket,
+            "suggestion_count": sign * row.suggestion_count,
+            "score_sum": sign * float(row.score_sum),
+            "reviewed_count": sign * row.reviewed_count,
+            "review_hours_sum": sign * float(row.review_hours_sum),
+            "updated_at": now,
+        }
+        for row in rows
+    ]
+    # Sorted, so concurrent writers lock the rollup rows in the same order.
+    return sorted(values, key=lambda value: tuple(value[field] for field in KEY_FIELDS))
+
+
+async def suggestion_rollup_deltas(db: AsyncSession, condition, *, sign: int = 1) -> list[dict[str, Any]]:
+    """
+    Rollup deltas adding (``sign=1``) or removing (``sign=-1``) the suggestions matching *condition*.
+
+    Only ``link_suggestions`` is read (removed suggestions are locked first,
+    ``SELECT ... FOR UPDATE`` on PostgreSQL); the rollup rows are untouched
+    until the deltas are passed to :func:`apply_suggestion_rollup`.
+    """
+    if sign < 0:
+        await db.execute(select(LinkSuggestion.id).where(condition).with_for_update())
+    result = await db.execute(_grouped_suggestions(db).where(condition))
+    return _rollup_values(result.all(), sign, _utcnow())
+
+
+async def apply_suggestion_rollup(db: AsyncSession, deltas: Iterable[dict[str, Any]]) -> None:
+    """
+    Add *deltas* (from :func:`suggestion_rollup_deltas`) to the rollup rows.
+
+    Deltas sharing a key are summed first, so each rollup row is written once,
+    and the rows are adjusted with one relative upsert in key order —
+    concurrent writers never overwrite each other's deltas.
+    """
+    merged: dict[tuple, dict[str, Any]] = {}
+    for delta in deltas:
+        key = tuple(delta[field] for field in KEY_FIELDS)
+        if key in merged:
+            for field in ROLLUP_FIELDS:
+                merged[key][field] += delta[field]
+        else:
+            merged[key] = dict(delta)
+    if not merged:
+        return
+    now = _utcnow()
+    values = [{**merged[key], "updated_at": now} for key in sorted(merged)]
+    table = SuggestionDailyRollup.__table__
+    insert_stmt = insert_for_dialect(db)(table).values(values)
+    await db.execute(
+        insert_stmt.on_conflict_do_update(
+            index_elements=list(KEY_FIELDS),
+            set_={
+                "updated_at": insert_stmt.excluded.updated_at,
+                **{field: table.c[field] + insert_stmt.excluded[field] for field in ROLLUP_FIELDS},
+            },
+        )
+    )
+
+
+async def adjust_suggestion_rollup(db: AsyncSession, condition, *, sign: int = 1) -> None:
+    """
+    Add (``sign=1``) or remove (``sign=-1``) the suggestions matching *condition* from the rollup.
+
+    Call it inside the writer's transaction: after the flush for suggestions
+    just created or reviewed, before the write for suggestions about to be
+    reviewed or deleted — a review removes the old state and adds the new one.
+    Writers creating suggestions in many batches collect
+    :func:`suggestion_rollup_deltas` instead and apply them once right before
+    the commit, so the rollup rows stay locked only briefly.
+    """
+    await apply_suggestion_rollup(db, await suggestion_rollup_deltas(db, condition, sign=sign))
+
+
+async def rebuild_suggestion_rollup(db: AsyncSession, *, since: date | None = None) -> dict[str, Any]:
+    """
+    Recompute the rollup from ``link_suggestions`` — the backfill.
+
+    The rollup rows (from *since* on, when given) are replaced by the true
+    aggregates.  On PostgreSQL the rollup table is locked against concurrent
+    adjustments until the caller commits.
+
+    Returns:
+        Dictionary with the rollup rows written, the days and the suggestions they cover.
+    """
+    table = SuggestionDailyRollup.__table__
+    if _is_postgresql(db):
+        await db.execute(text(f"LOCK TABLE {table.name} IN SHARE ROW EXCLUSIVE MODE"))
+    delete = table.delete()
+    query = _grouped_suggestions(db)
+    if since is not None:
+        delete = delete.where(table.c.day >= since)
+        query = query.where(LinkSuggestion.created_at >= datetime.combine(since, time.min))
+    await db.execute(delete)
+
+    result = await db.execute(query)
+    values = _rollup_values(result.all(), 1, _utcnow())
+    for start in range(0, len(values), _INSERT_CHUNK_SIZE):
+        await db.execute(table.insert().values(values[start : start + _INSERT_CHUNK_SIZE]))
+
+    return {
+        "rows": len(values),
+        "days": len({value["day"] for value in values}),
+        "suggestions": sum(value["suggestion_count"] for value in values),
+    }
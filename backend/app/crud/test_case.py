@@ -5,6 +5,11 @@ from uuid import UUID
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.coverage import refresh_coverage
+from app.crud.embedding_outbox import TEST_CASE, enqueue_embedding
+from app.crud.suggestion_rollup import adjust_suggestion_rollup
+from app.models.link import RequirementTestCaseLink
+from app.models.suggestion import LinkSuggestion
 from app.models.test_case import TestCase
 from app.schemas.test_case import TestCaseCreate, TestCaseUpdate
 
@@ -33,6 +38,9 @@ async def create_test_case(db: AsyncSession, test_case: TestCaseCreate) -> TestC
     """Create a new test case"""
     db_test_case = TestCase(**test_case.model_dump())
     db.add(db_test_case)
+    await db.flush()
+    await enqueue_embedding(db, TEST_CASE, db_test_case.id)
+    await refresh_coverage(db, test_case_ids=[db_test_case.id])
     await db.commit()
     await db.refresh(db_test_case)
     return db_test_case
@@ -48,6 +56,7 @@ async def update_test_case(db: AsyncSession, test_case_id: UUID, test_case: Test
     for field, value in update_data.items():
         setattr(db_test_case, field, value)
 
+    await enqueue_embedding(db, TEST_CASE, db_test_case.id)
     await db.commit()
     await db.refresh(db_test_case)
     return db_test_case
@@ -59,6 +68,13 @@ async def delete_test_case(db: AsyncSession, test_case_id: UUID) -> bool:
     if not db_test_case:
         return False
 
+    linked = await db.execute(
+        select(RequirementTestCaseLink.requirement_id).where(RequirementTestCaseLink.test_case_id == test_case_id)
+    )
+    linked_requirement_ids = list(linked.scalars().all())
+    await adjust_suggestion_rollup(db, LinkSuggestion.test_case_id == test_case_id, sign=-1)
     await db.delete(db_test_case)
+    await db.flush()
+    await refresh_coverage(db, requirement_ids=linked_requirement_ids, test_case_ids=[test_case_id])
     await db.commit()
     return True
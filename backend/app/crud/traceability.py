@@ -1,13 +1,24 @@
 """CRUD operations for traceability matrix and metrics"""
 
-from sqlalchemy import func, select
+import base64
+import hashlib
+import json
+from collections.abc import AsyncIterator, Sequence
+from uuid import UUID
+
+from sqlalchemy import String, and_, case, exists, func, literal_column, or_, select, true, type_coerce
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased
 
-from app.models.link import LinkSource, RequirementTestCaseLink
+from app.crud.coverage import ACCEPTED_LINK_SOURCES, COVERAGE_STATUSES, get_coverage_counters
+from app.crud.streaming import stream_partitions
+from app.models.link import LinkSource, LinkType, RequirementTestCaseLink
 from app.models.requirement import Requirement
 from app.models.suggestion import LinkSuggestion, SuggestionMethod, SuggestionStatus
 from app.models.test_case import TestCase
+from app.schemas.pagination import CursorPage
 from app.schemas.traceability import (
     AlgorithmMetrics,
     LinkedTestCase,
@@ -15,229 +26,527 @@ from app.schemas.traceability import (
     OrphanTestCase,
     RequirementCoverage,
     TraceabilityMatrixResponse,
+    TraceabilityMatrixSummary,
 )
 
 
+def link_status(link_source: LinkSource) -> str:
+    """Map a link source to the status shown in the matrix."""
+    if link_source in ACCEPTED_LINK_SOURCES:
+        return "accepted"
+    if link_source == LinkSource.AI_SUGGESTED:
+        return "pending"
+    return "unknown"
+
+
+def _linked_test_case(
+    link_id: UUID,
+    test_case_id: UUID,
+    link_type: LinkType,
+    link_source: LinkSource,
+    confidence_score: float | None,
+    test_case_title: str,
+) -> LinkedTestCase:
+    return LinkedTestCase(
+        test_case_id=test_case_id,
+        title=test_case_title,
+        link_status=link_status(link_source),
+        link_id=link_id,
+        link_type=link_type.value,
+        confidence_score=confidence_score,
+    )
+
+
+def _requirement_link_stats():
+    """Per-requirement link counts: all links and links from an accepted source."""
+    return (
+        select(
+            RequirementTestCaseLink.requirement_id,
+            func.count().label("link_count"),
+            func.count().filter(RequirementTestCaseLink.link_source.in_(ACCEPTED_LINK_SOURCES)).label("accepted_count"),
+        )
+        .group_by(RequirementTestCaseLink.requirement_id)
+        .subquery()
+    )
+
+
+def _coverage_status(link_stats):
+    """SQL expression classifying a requirement as covered, partially covered or uncovered."""
+    return case(
+        (link_stats.c.accepted_count > 0, "covered"),
+        (link_stats.c.link_count > 0, "partially_covered"),
+        else_="uncovered",
+    )
+
+
+def _orphan_test_case_filter():
+    """Anti-join condition: the test case has no link at all."""
+    return ~exists().where(RequirementTestCaseLink.test_case_id == TestCase.id)
+
+
+def _matrix_rows_query(coverage_status, link_stats=None):
+    """
+    One row per (requirement, link) in creation order, projecting only the matrix columns.
+
+    Requirements without links come back once with NULL link columns.
+    """
+    query = select(
+        Requirement.id.label("requirement_id"),
+        Requirement.title.label("requirement_title"),
+        Requirement.external_id,
+        coverage_status.label("coverage_status"),
+        RequirementTestCaseLink.id.label("link_id"),
+        RequirementTestCaseLink.test_case_id,
+        RequirementTestCaseLink.link_type,
+        RequirementTestCaseLink.link_source,
+        RequirementTestCaseLink.confidence_score,
+        TestCase.title.label("test_case_title"),
+    ).select_from(Requirement)
+    if link_stats is not None:
+        query = query.outerjoin(link_stats, link_stats.c.requirement_id == Requirement.id)
+    return (
+        query.outerjoin(RequirementTestCaseLink, RequirementTestCaseLink.requirement_id == Requirement.id)
+        .outerjoin(TestCase, TestCase.id == RequirementTestCaseLink.test_case_id)
+        .order_by(
+            Requirement.created_at,
+            Requirement.id,
+            RequirementTestCaseLink.created_at,
+            RequirementTestCaseLink.id,
+        )
+    )
+
+
+def _orphan_rows_query():
+    return (
+        select(TestCase.id.label("test_case_id"), TestCase.title, TestCase.external_id)
+        .where(_orphan_test_case_filter())
+        .order_by(TestCase.created_at, TestCase.id)
+    )
+
+
 async def get_traceability_matrix(db: AsyncSession) -> TraceabilityMatrixResponse:
     """
     Generate the complete traceability matrix with coverage analysis.
 
+    Coverage status, counts and orphans are computed in SQL (grouped link counts
+    and anti-joins); the matrix rows come from one projected join, so no ORM
+    objects are loaded.  Requirements, their links and orphans are ordered by
+    creation time.
+
     Returns:
         TraceabilityMatrixResponse with requirements, links, coverage status, and orphans
     """
-    # Get all requirements with their links
-    query = select(Requirement).options(selectinload(Requirement.links).selectinload(RequirementTestCaseLink.test_case))
-    result = await db.execute(query)
-    requirements = result.scalars().all()
-
-    # Get all test cases to identify orphans
-    test_case_query = select(TestCase).options(selectinload(TestCase.links))
-    tc_result = await db.execute(test_case_query)
-    test_cases = tc_result.scalars().all()
-
-    # Build matrix data
-    matrix = []
-    covered_count = 0
-    linked_test_case_ids = set()
-
-    for req in requirements:
-        # Filter accepted links
-        accepted_links = [
-            link
-            for link in req.links
-            if link.link_source in [LinkSource.MANUAL, LinkSource.AI_CONFIRMED, LinkSource.IMPORTED]
-        ]
-
-        # Build linked test cases
-        linked_tcs = []
-        for link in req.links:
-            linked_test_case_ids.add(link.test_case_id)
-            # Determine link status based on source
-            if link.link_source == LinkSource.MANUAL:
-                status = "accepted"
-            elif link.link_source in [LinkSource.AI_CONFIRMED, LinkSource.IMPORTED]:
-                status = "accepted"
-            elif link.link_source == LinkSource.AI_SUGGESTED:
-                status = "pending"
-            else:
-                status = "unknown"
-
-            linked_tcs.append(
-                LinkedTestCase(
-                    test_case_id=link.test_case_id,
-                    title=link.test_case.title,
-                    link_status=status,
-                    link_id=link.id,
-                    link_type=link.link_type.value,
-                    confidence_score=link.confidence_score,
+    # Totals from the same snapshot as the rows, not from the (eventually reconciled) counters
+    summary = await _aggregate_traceability_summary(db)
+    link_stats = _requirement_link_stats()
+    coverage_status = _coverage_status(link_stats)
+
+    rows = await db.execute(_matrix_rows_query(coverage_status, link_stats))
+
+    matrix: list[RequirementCoverage] = []
+    for (
+        requirement_id,
+        requirement_title,
+        external_id,
+        status,
+        link_id,
+        test_case_id,
+        link_type,
+        link_source,
+        confidence_score,
+        test_case_title,
+    ) in rows:
+        if not matrix or matrix[-1].requirement_id != requirement_id:
+            matrix.append(
+                RequirementCoverage(
+                    requirement_id=requirement_id,
+                    requirement_title=requirement_title,
+                    external_id=external_id,
+                    linked_test_cases=[],
+                    coverage_status=status,
                 )
             )
-
-        # Determine coverage status
-        if len(accepted_links) > 0:
-            coverage_status = "covered"
-            covered_count += 1
-        elif len(req.links) > 0:
-            coverage_status = "partially_covered"
-        else:
-            coverage_status = "uncovered"
-
-        matrix.append(
-            RequirementCoverage(
-                requirement_id=req.id,
-                requirement_title=req.title,
-                external_id=req.external_id,
-                linked_test_cases=linked_tcs,
-                coverage_status=coverage_status,
+        if link_id is not None:
+            matrix[-1].linked_test_cases.append(
+                _linked_test_case(link_id, test_case_id, link_type, link_source, confidence_score, test_case_title)
             )
-        )
 
-    # Find orphan test cases (no links)
-    orphans = []
-    for tc in test_cases:
-        if tc.id not in linked_test_case_ids:
-            orphans.append(OrphanTestCase(test_case_id=tc.id, title=tc.title, external_id=tc.external_id))
+    orphan_rows = await db.execute(_orphan_rows_query())
+    orphans = [
+        OrphanTestCase(test_case_id=test_case_id, title=title, external_id=external_id)
+        for test_case_id, title, external_id in orphan_rows
+    ]
 
-    # Calculate metrics
-    total_requirements = len(requirements)
-    uncovered_count = sum(1 for req_coverage in matrix if req_coverage.coverage_status == "uncovered")
+    return TraceabilityMatrixResponse(**summary.model_dump(), matrix=matrix, orphans=orphans)
+
+
+async def get_traceability_summary(db: AsyncSession) -> TraceabilityMatrixSummary:
+    """
+    Return the traceability totals and coverage percentage.
+
+    Read from the incrementally maintained coverage counters when they exist,
+    otherwise computed in a single aggregate query.
+
+    Returns:
+        TraceabilityMatrixSummary with requirement, coverage and test case counts
+    """
+    counters = await get_coverage_counters(db)
+    if counters is None:
+        return await _aggregate_traceability_summary(db)
+    total = counters.total_requirements
+    return TraceabilityMatrixSummary(
+        coverage_percentage=round(counters.covered_requirements / total * 100, 2) if total > 0 else 0.0,
+        total_requirements=total,
+        covered_requirements=counters.covered_requirements,
+        uncovered_requirements=counters.uncovered_requirements,
+        total_test_cases=counters.total_test_cases,
+        orphan_test_cases=counters.orphan_test_cases,
+    )
+
+
+async def _aggregate_traceability_summary(db: AsyncSession) -> TraceabilityMatrixSummary:
+    """Compute the traceability totals from the links in a single aggregate query."""
+    link_stats = _requirement_link_stats()
+    coverage_status = _coverage_status(link_stats)
+
+    summary = await db.execute(
+        select(
+            func.count(Requirement.id),
+            func.count().filter(coverage_status == "covered"),
+            func.count().filter(coverage_status == "uncovered"),
+            select(func.count()).select_from(TestCase).scalar_subquery(),
+            select(func.count()).select_from(TestCase).where(_orphan_test_case_filter()).scalar_subquery(),
+        )
+        .select_from(Requirement)
+        .outerjoin(link_stats, link_stats.c.requirement_id == Requirement.id)
+    )
+    total_requirements, covered_count, uncovered_count, total_test_cases, orphan_count = summary.one()
     coverage_percentage = (covered_count / total_requirements * 100) if total_requirements > 0 else 0.0
 
-    return TraceabilityMatrixResponse(
+    return TraceabilityMatrixSummary(
         coverage_percentage=round(coverage_percentage, 2),
         total_requirements=total_requirements,
         covered_requirements=covered_count,
         uncovered_requirements=uncovered_count,
-        total_test_cases=len(test_cases),
-        orphan_test_cases=len(orphans),
-        matrix=matrix,
-        orphans=orphans,
+        total_test_cases=total_test_cases,
+        orphan_test_cases=orphan_count,
     )
 
 
-async def get_metrics(db: AsyncSession) -> MetricsResponse:
+def stream_traceability_matrix_rows(db: AsyncSession) -> AsyncIterator[Sequence[Row]]:
     """
-    Generate system metrics including coverage and suggestion acceptance rates.
+    Yield the matrix's (requirement, link) rows in batches from a server-side cursor.
+
+    Rows are ordered as in :func:`get_traceability_matrix` and carry the labels
+    ``requirement_id``, ``requirement_title``, ``external_id``, ``coverage_status``,
+    ``link_id``, ``test_case_id``, ``link_type``, ``link_source``,
+    ``confidence_score`` and ``test_case_title``.  Coverage is probed per row
+    (correlated EXISTS) rather than aggregated up front, so the first batch is
+    available immediately.
+    """
+    return stream_partitions(db, _matrix_rows_query(_correlated_coverage_status()))
 
-    Returns:
-        MetricsResponse with all key metrics and algorithm breakdown
+
+def stream_orphan_test_case_rows(db: AsyncSession) -> AsyncIterator[Sequence[Row]]:
+    """Yield ``(test_case_id, title, external_id)`` rows of orphan test cases in batches."""
+    return stream_partitions(db, _orphan_rows_query())
+
+
+async def get_module_coverage_breakdown(db: AsyncSession) -> list[dict]:
+    """
+    Requirement counts per module and coverage status in one grouped aggregate.
+
+    Returns one ``{"module", "total", "covered", "partially_covered", "uncovered"}``
+    entry per module, requirements without a module first.
     """
-    # Count requirements
-    req_count_query = select(func.count()).select_from(Requirement)
-    req_result = await db.execute(req_count_query)
-    total_requirements = req_result.scalar() or 0
-
-    # Count test cases
-    tc_count_query = select(func.count()).select_from(TestCase)
-    tc_result = await db.execute(tc_count_query)
-    total_test_cases = tc_result.scalar() or 0
-
-    # Count total links
-    link_count_query = select(func.count()).select_from(RequirementTestCaseLink)
-    link_result = await db.execute(link_count_query)
-    total_links = link_result.scalar() or 0
-
-    # Count manual vs AI-suggested links
-    manual_query = (
-        select(func.count())
-        .select_from(RequirementTestCaseLink)
-        .where(RequirementTestCaseLink.link_source == LinkSource.MANUAL)
+    link_stats = _requirement_link_stats()
+    coverage_status = _coverage_status(link_stats)
+    result = await db.execute(
+        select(
+            Requirement.module,
+            func.count(Requirement.id),
+            *(func.count().filter(coverage_status == name) for name in COVERAGE_STATUSES),
+        )
+        .outerjoin(link_stats, link_stats.c.requirement_id == Requirement.id)
+        .group_by(Requirement.module)
     )
-    manual_result = await db.execute(manual_query)
-    manual_links = manual_result.scalar() or 0
+    modules = [
+        {"module": module, "total": total, **dict(zip(COVERAGE_STATUSES, counts))}
+        for module, total, *counts in result.all()
+    ]
+    # Requirements without a module first, then by name — the same on every dialect
+    modules.sort(key=lambda entry: (entry["module"] is not None, entry["module"] or ""))
+    return modules
+
 
-    ai_query = (
-        select(func.count())
-        .select_from(RequirementTestCaseLink)
-        .where(RequirementTestCaseLink.link_source.in_([LinkSource.AI_CONFIRMED, LinkSource.AI_SUGGESTED]))
+async def get_traceability_fingerprint(db: AsyncSession) -> str:
+    """
+    Fingerprint of the data the traceability matrix is built from.
+
+    Hashes row counts and latest modification times of requirements and test
+    cases, plus per source/type link counts, latest link creation or
+    confirmation and the sum of link confidence scores.  Any create, update or
+    delete that changes the matrix changes the fingerprint, so it can key cached
+    report files.
+    """
+    totals = await db.execute(
+        select(
+            select(func.count()).select_from(Requirement).scalar_subquery(),
+            select(func.max(Requirement.updated_at)).scalar_subquery(),
+            select(func.count()).select_from(TestCase).scalar_subquery(),
+            select(func.max(TestCase.updated_at)).scalar_subquery(),
+        )
     )
-    ai_result = await db.execute(ai_query)
-    ai_suggested_links = ai_result.scalar() or 0
+    links = await db.execute(
+        select(
+            RequirementTestCaseLink.link_source,
+            RequirementTestCaseLink.link_type,
+            func.count(),
+            func.max(RequirementTestCaseLink.created_at),
+            func.max(RequirementTestCaseLink.confirmed_at),
+            func.sum(RequirementTestCaseLink.confidence_score),
+        )
+        .group_by(RequirementTestCaseLink.link_source, RequirementTestCaseLink.link_type)
+        .order_by(RequirementTestCaseLink.link_source, RequirementTestCaseLink.link_type)
+    )
+    state = [tuple(totals.one())] + [tuple(row) for row in links.all()]
+    return hashlib.sha256(repr(state).encode()).hexdigest()
+
+
+def encode_cursor(external_id: str | None, row_id: UUID) -> str:
+    """Opaque keyset cursor for the row ordered by ``(coalesce(external_id, ''), id)``."""
+    payload = json.dumps([external_id or "", str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, UUID]:
+    """Inverse of :func:`encode_cursor`; raises ``ValueError`` for a malformed cursor."""
+    try:
+        external_id, row_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return str(external_id), UUID(row_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _sort_key(model):
+    # '' is rendered inline (not bound) so the expression matches the ``*_external_id_order`` indexes.
+    return func.coalesce(model.external_id, literal_column("''"))
+
 
-    # Get suggestions statistics
-    sugg_count_query = select(func.count()).select_from(LinkSuggestion)
-    sugg_result = await db.execute(sugg_count_query)
-    total_suggestions = sugg_result.scalar() or 0
+def _after_cursor(model, cursor: str | None):
+    """Keyset condition: rows strictly after *cursor* in ``(coalesce(external_id, ''), id)`` order."""
+    if cursor is None:
+        return true()
+    external_id, row_id = decode_cursor(cursor)
+    sort_key = _sort_key(model)
+    return or_(sort_key > external_id, and_(sort_key == external_id, model.id > row_id))
 
-    accepted_query = (
-        select(func.count()).select_from(LinkSuggestion).where(LinkSuggestion.status == SuggestionStatus.ACCEPTED)
+
+def _has_link(sources: Sequence[LinkSource] | None = None):
+    """Correlated EXISTS: the requirement has a link (from one of *sources*, if given)."""
+    # Aliased so the probe stays correlated even when the outer query joins the links table itself.
+    link = aliased(RequirementTestCaseLink)
+    probe = exists().where(link.requirement_id == Requirement.id)
+    if sources is not None:
+        probe = probe.where(link.link_source.in_(sources))
+    return probe.correlate(Requirement)
+
+
+def _correlated_coverage_status():
+    """Coverage status per requirement from correlated EXISTS probes, so only the fetched page is evaluated."""
+    return case(
+        (_has_link(ACCEPTED_LINK_SOURCES), "covered"),
+        (_has_link(), "partially_covered"),
+        else_="uncovered",
     )
-    accepted_result = await db.execute(accepted_query)
-    accepted_suggestions = accepted_result.scalar() or 0
 
-    rejected_query = (
-        select(func.count()).select_from(LinkSuggestion).where(LinkSuggestion.status == SuggestionStatus.REJECTED)
+
+def _has_tags(db: AsyncSession, tags: list[str]):
+    """Requirements carrying every tag in *tags* (PostgreSQL array containment, JSON array on SQLite)."""
+    if db.bind and db.bind.dialect.name == "postgresql":
+        return type_coerce(Requirement.tags, postgresql.ARRAY(String)).contains(tags)
+    conditions = []
+    for tag in tags:
+        elements = func.json_each(Requirement.tags).table_valued("value")
+        conditions.append(exists(select(elements.c.value).where(elements.c.value == tag)))
+    return and_(*conditions)
+
+
+async def get_traceability_matrix_page(
+    db: AsyncSession,
+    *,
+    limit: int = 50,
+    cursor: str | None = None,
+    coverage_status: str | None = None,
+    module: str | None = None,
+    tags: list[str] | None = None,
+    link_source: LinkSource | None = None,
+) -> CursorPage[RequirementCoverage]:
+    """
+    Return one keyset page of the traceability matrix, ordered by external ID.
+
+    Requirements without an external ID sort first; ties are broken by ``id``.
+    Filters combine with AND: ``tags`` requires every listed tag and
+    ``link_source`` keeps requirements with at least one link from that source
+    (all of their links are still returned).  Only the page's requirements and
+    links are read.
+
+    Raises:
+        ValueError: If *cursor* is malformed
+    """
+    status_expr = _correlated_coverage_status()
+    query = select(Requirement.id, Requirement.title, Requirement.external_id, status_expr).where(
+        _after_cursor(Requirement, cursor)
     )
-    rejected_result = await db.execute(rejected_query)
-    rejected_suggestions = rejected_result.scalar() or 0
+    if coverage_status is not None:
+        query = query.where(status_expr == coverage_status)
+    if module is not None:
+        query = query.where(Requirement.module == module)
+    if tags:
+        query = query.where(_has_tags(db, tags))
+    if link_source is not None:
+        query = query.where(_has_link([link_source]))
+    result = await db.execute(query.order_by(_sort_key(Requirement), Requirement.id).limit(limit + 1))
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    items = {
+        requirement_id: RequirementCoverage(
+            requirement_id=requirement_id,
+            requirement_title=title,
+            external_id=external_id,
+            linked_test_cases=[],
+            coverage_status=status,
+        )
+        for requirement_id, title, external_id, status in rows
+    }
+    if items:
+        links = await db.execute(
+            select(
+                RequirementTestCaseLink.requirement_id,
+                RequirementTestCaseLink.id,
+                RequirementTestCaseLink.test_case_id,
+                RequirementTestCaseLink.link_type,
+                RequirementTestCaseLink.link_source,
+                RequirementTestCaseLink.confidence_score,
+                TestCase.title,
+            )
+            .join(TestCase, TestCase.id == RequirementTestCaseLink.test_case_id)
+            .where(RequirementTestCaseLink.requirement_id.in_(list(items)))
+            .order_by(RequirementTestCaseLink.created_at, RequirementTestCaseLink.id)
+        )
+        for requirement_id, link_id, test_case_id, link_type, source, confidence_score, test_case_title in links:
+            items[requirement_id].linked_test_cases.append(
+                _linked_test_case(link_id, test_case_id, link_type, source, confidence_score, test_case_title)
+            )
 
-    pending_query = (
-        select(func.count()).select_from(LinkSuggestion).where(LinkSuggestion.status == SuggestionStatus.PENDING)
+    last = rows[-1] if has_more else None
+    return CursorPage[RequirementCoverage](
+        items=list(items.values()),
+        next_cursor=encode_cursor(last.external_id, last.id) if last else None,
+        limit=limit,
     )
-    pending_result = await db.execute(pending_query)
-    pending_suggestions = pending_result.scalar() or 0
 
-    # Calculate acceptance rate
-    suggestion_acceptance_rate = (accepted_suggestions / total_suggestions * 100) if total_suggestions > 0 else 0.0
 
-    # Get requirements with at least one accepted link for coverage
-    accepted_sources = [LinkSource.MANUAL, LinkSource.AI_CONFIRMED, LinkSource.IMPORTED]
-    covered_reqs_query = (
-        select(func.count(func.distinct(RequirementTestCaseLink.requirement_id)))
-        .select_from(RequirementTestCaseLink)
-        .where(RequirementTestCaseLink.link_source.in_(accepted_sources))
+async def get_orphan_test_cases_page(
+    db: AsyncSession, *, limit: int = 50, cursor: str | None = None
+) -> CursorPage[OrphanTestCase]:
+    """
+    Return one keyset page of test cases without any link, ordered by external ID.
+
+    Raises:
+        ValueError: If *cursor* is malformed
+    """
+    result = await db.execute(
+        select(TestCase.id, TestCase.title, TestCase.external_id)
+        .where(_orphan_test_case_filter(), _after_cursor(TestCase, cursor))
+        .order_by(_sort_key(TestCase), TestCase.id)
+        .limit(limit + 1)
+    )
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    last = rows[-1] if has_more else None
+    return CursorPage[OrphanTestCase](
+        items=[
+            OrphanTestCase(test_case_id=test_case_id, title=title, external_id=external_id)
+            for test_case_id, title, external_id in rows
+        ],
+        next_cursor=encode_cursor(last.external_id, last.id) if last else None,
+        limit=limit,
+    )
+
+
+async def get_metrics(db: AsyncSession) -> MetricsResponse:
+    """
+    Generate system metrics including coverage and suggestion acceptance rates.
+
+    Three round trips: the coverage counters row, one conditional aggregate
+    over the links and one ``(suggestion_method, status)`` grouped count over
+    the suggestions.  Without the counters row the requirement, test case and
+    covered totals are folded into the links aggregate.
+
+    Returns:
+        MetricsResponse with all key metrics and algorithm breakdown
+    """
+    counters = await get_coverage_counters(db)
+
+    link_source = RequirementTestCaseLink.link_source
+    link_columns = [
+        func.count(),
+        func.count().filter(link_source == LinkSource.MANUAL),
+        func.count().filter(link_source.in_([LinkSource.AI_CONFIRMED, LinkSource.AI_SUGGESTED])),
+    ]
+    if counters is None:
+        link_columns += [
+            func.count(func.distinct(RequirementTestCaseLink.requirement_id)).filter(
+                link_source.in_(ACCEPTED_LINK_SOURCES)
+            ),
+            select(func.count()).select_from(Requirement).scalar_subquery(),
+            select(func.count()).select_from(TestCase).scalar_subquery(),
+        ]
+    link_result = await db.execute(select(*link_columns).select_from(RequirementTestCaseLink))
+    total_links, manual_links, ai_suggested_links, *totals = link_result.one()
+    if counters is not None:
+        covered_requirements = counters.covered_requirements
+        total_requirements = counters.total_requirements
+        total_test_cases = counters.total_test_cases
+    else:
+        covered_requirements, total_requirements, total_test_cases = totals
+
+    suggestion_result = await db.execute(
+        select(LinkSuggestion.suggestion_method, LinkSuggestion.status, func.count()).group_by(
+            LinkSuggestion.suggestion_method, LinkSuggestion.status
+        )
     )
-    covered_result = await db.execute(covered_reqs_query)
-    covered_requirements = covered_result.scalar() or 0
+    suggestion_counts = {(method, status): count for method, status, count in suggestion_result.all()}
 
+    def _suggestions(method: SuggestionMethod | None = None, status: SuggestionStatus | None = None) -> int:
+        return sum(
+            count
+            for (row_method, row_status), count in suggestion_counts.items()
+            if (method is None or row_method == method) and (status is None or row_status == status)
+        )
+
+    total_suggestions = _suggestions()
+    accepted_suggestions = _suggestions(status=SuggestionStatus.ACCEPTED)
+    suggestion_acceptance_rate = (accepted_suggestions / total_suggestions * 100) if total_suggestions > 0 else 0.0
     coverage_percentage = (covered_requirements / total_requirements * 100) if total_requirements > 0 else 0.0
 
     # Algorithm breakdown
     algorithm_breakdown = []
     for method in SuggestionMethod:
-        # Total for this method
-        method_total_query = (
-            select(func.count()).select_from(LinkSuggestion).where(LinkSuggestion.suggestion_method == method)
-        )
-        method_total_result = await db.execute(method_total_query)
-        method_total = method_total_result.scalar() or 0
-
-        # Accepted for this method
-        method_accepted_query = (
-            select(func.count())
-            .select_from(LinkSuggestion)
-            .where(LinkSuggestion.suggestion_method == method, LinkSuggestion.status == SuggestionStatus.ACCEPTED)
-        )
-        method_accepted_result = await db.execute(method_accepted_query)
-        method_accepted = method_accepted_result.scalar() or 0
-
-        # Rejected for this method
-        method_rejected_query = (
-            select(func.count())
-            .select_from(LinkSuggestion)
-            .where(LinkSuggestion.suggestion_method == method, LinkSuggestion.status == SuggestionStatus.REJECTED)
-        )
-        method_rejected_result = await db.execute(method_rejected_query)
-        method_rejected = method_rejected_result.scalar() or 0
-
-        # Pending for this method
-        method_pending_query = (
-            select(func.count())
-            .select_from(LinkSuggestion)
-            .where(LinkSuggestion.suggestion_method == method, LinkSuggestion.status == SuggestionStatus.PENDING)
-        )
-        method_pending_result = await db.execute(method_pending_query)
-        method_pending = method_pending_result.scalar() or 0
-
+        method_total = _suggestions(method)
+        method_accepted = _suggestions(method, SuggestionStatus.ACCEPTED)
         method_acceptance_rate = (method_accepted / method_total * 100) if method_total > 0 else 0.0
-
         algorithm_breakdown.append(
             AlgorithmMetrics(
                 algorithm=method.value,
                 total_suggestions=method_total,
                 accepted_suggestions=method_accepted,
-                rejected_suggestions=method_rejected,
-                pending_suggestions=method_pending,
+                rejected_suggestions=_suggestions(method, SuggestionStatus.REJECTED),
+                pending_suggestions=_suggestions(method, SuggestionStatus.PENDING),
                 acceptance_rate=round(method_acceptance_rate, 2),
             )
         )
@@ -250,8 +559,8 @@ async def get_metrics(db: AsyncSession) -> MetricsResponse:
         total_links=total_links,
         total_suggestions=total_suggestions,
         accepted_suggestions=accepted_suggestions,
-        rejected_suggestions=rejected_suggestions,
-        pending_suggestions=pending_suggestions,
+        rejected_suggestions=_suggestions(status=SuggestionStatus.REJECTED),
+        pending_suggestions=_suggestions(status=SuggestionStatus.PENDING),
         manual_links=manual_links,
         ai_suggested_links=ai_suggested_links,
         algorithm_breakdown=algorithm_breakdown,
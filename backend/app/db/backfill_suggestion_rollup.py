@@ -0,0 +1,40 @@
+"""
+Suggestion Rollup Backfill
+==========================
+Rebuilds the daily suggestion rollup read by the analytics endpoints from
+``link_suggestions``.  The Alembic migration backfills PostgreSQL databases;
+run this for a database created with ``create_all``, after writing
+suggestions outside the CRUD layer, or with ``--since`` to recompute only the
+recent days.
+
+    python -m app.db.backfill_suggestion_rollup [--since YYYY-MM-DD]
+"""
+
+import argparse
+import asyncio
+from datetime import date
+from typing import Any
+
+from app.crud.suggestion_rollup import rebuild_suggestion_rollup
+
+
+async def backfill_suggestion_rollup(since: date | None = None) -> dict[str, Any]:
+    """Rebuild the rollup (from *since* on, when given) in its own session and commit."""
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        report = await rebuild_suggestion_rollup(session, since=since)
+        await session.commit()
+
+    print(
+        f"✅ Suggestion rollup rebuilt{f' from {since.isoformat()}' if since else ''}: "
+        f"{report['rows']} rows over {report['days']} days covering {report['suggestions']} suggestions"
+    )
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the daily suggestion rollup from link_suggestions")
+    parser.add_argument("--since", type=date.fromisoformat, help="only recompute days on or after YYYY-MM-DD")
+    args = parser.parse_args()
+    asyncio.run(backfill_suggestion_rollup(args.since))
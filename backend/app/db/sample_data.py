@@ -11,6 +11,7 @@ Sample Data:
 
 import asyncio
 
+from app.crud.coverage import reconcile_coverage
 from app.db.session import AsyncSessionLocal, init_db
 from app.models.link import LinkSource, LinkType, RequirementTestCaseLink
 from app.models.requirement import (
@@ -293,6 +294,8 @@ async def load_sample_data():
         )
 
         session.add_all([link1, link2, link3, link4, link5])
+        await session.flush()
+        await reconcile_coverage(session)
 
         await session.commit()
 
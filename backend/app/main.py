@@ -10,9 +10,11 @@ from app.api import (
     audit_log,
     auth,
     external_results,
+    internal_metrics,
     links,
     notifications,
     projects,
+    report_exports,
     requirements,
     suggestions,
     test_cases,
@@ -21,6 +23,9 @@ from app.api import (
 )
 from app.config import settings
 from app.db.session import init_db
+from app.services import report_exports as report_export_service
+from app.services import scheduler
+from app.services.operational_metrics import OperationalMetricsMiddleware
 
 app = FastAPI(title=settings.PROJECT_NAME, version=settings.VERSION, description="BGSTM AI-Powered Traceability System")
 
@@ -46,6 +51,12 @@ app.include_router(users.router, prefix=settings.API_V1_PREFIX, tags=["users"])
 app.include_router(notifications.router, prefix=settings.API_V1_PREFIX, tags=["notifications"])
 app.include_router(external_results.router, prefix=settings.API_V1_PREFIX, tags=["external_results"])
 app.include_router(projects.router, prefix=settings.API_V1_PREFIX, tags=["projects"])
+app.include_router(report_exports.router, prefix=settings.API_V1_PREFIX, tags=["report_exports"])
+
+# Operational metrics: request timing middleware and the Prometheus scrape endpoint (outside the API prefix)
+if settings.INTERNAL_METRICS_ENABLED:
+    app.add_middleware(OperationalMetricsMiddleware)
+    app.include_router(internal_metrics.router, tags=["internal"])
 
 # Dev-only static route: serve local artifact files when BGSTM_STORAGE_BACKEND=local.
 # This is intentionally NOT mounted in production (S3 or other remote backends).
@@ -84,6 +95,72 @@ async def startup_event():
             )
             await db.commit()
 
+    if settings.INCREMENTAL_SUGGESTIONS_ENABLED:
+        from app.ai_suggestions.incremental import scheduled_incremental_generation
+
+        scheduler.register_job(
+            scheduler.PeriodicJob(
+                "incremental_suggestions",
+                scheduled_incremental_generation,
+                interval_seconds=settings.INCREMENTAL_SUGGESTIONS_INTERVAL_SECONDS,
+                initial_delay_seconds=settings.INCREMENTAL_SUGGESTIONS_INTERVAL_SECONDS,
+            )
+        )
+    if settings.EMBEDDING_CACHE_COMPACTION_ENABLED:
+        from app.services.embedding_cache_compaction import scheduled_embedding_cache_compaction
+
+        scheduler.register_job(
+            scheduler.PeriodicJob(
+                "embedding_cache_compaction",
+                scheduled_embedding_cache_compaction,
+                interval_seconds=settings.EMBEDDING_CACHE_COMPACTION_INTERVAL_SECONDS,
+                initial_delay_seconds=settings.EMBEDDING_CACHE_COMPACTION_INTERVAL_SECONDS,
+            )
+        )
+    if settings.EMBEDDING_PRECOMPUTE_ENABLED:
+        from app.ai_suggestions.precompute import scheduled_embedding_precompute
+
+        scheduler.register_job(
+            scheduler.PeriodicJob(
+                "embedding_precompute",
+                scheduled_embedding_precompute,
+                interval_seconds=settings.EMBEDDING_PRECOMPUTE_INTERVAL_SECONDS,
+                initial_delay_seconds=settings.EMBEDDING_PRECOMPUTE_INTERVAL_SECONDS,
+            )
+        )
+    if settings.COVERAGE_RECONCILIATION_ENABLED:
+        from app.services.coverage_reconciliation import scheduled_coverage_reconciliation
+
+        scheduler.register_job(
+            scheduler.PeriodicJob(
+                "coverage_reconciliation",
+                scheduled_coverage_reconciliation,
+                interval_seconds=settings.COVERAGE_RECONCILIATION_INTERVAL_SECONDS,
+                # Soon after startup: a database created with create_all has no counters yet
+                initial_delay_seconds=60,
+            )
+        )
+    if settings.COVERAGE_SNAPSHOT_ENABLED:
+        from app.services.coverage_snapshots import scheduled_coverage_snapshot
+
+        scheduler.register_job(
+            scheduler.PeriodicJob(
+                "coverage_snapshot",
+                scheduled_coverage_snapshot,
+                interval_seconds=settings.COVERAGE_SNAPSHOT_INTERVAL_SECONDS,
+                # After the reconciliation job has had a chance to create the counters
+                initial_delay_seconds=120,
+            )
+        )
+    scheduler.start_all()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop periodic background jobs and report rendering processes."""
+    await scheduler.stop_all()
+    report_export_service.shutdown_executor()
+
 
 @app.get("/")
 async def root():
@@ -2,15 +2,22 @@
 
 from .audit_log import AuditLog
 from .base import Base, TimestampMixin
-from .embedding_cache import EmbeddingCache
+from .coverage import CoverageCounters, CoverageSnapshot, RequirementCoverage, TestCaseCoverage
+from .data_version import DataVersion
+from .embedding_cache import EmbeddingCache, EmbeddingCacheGeneration
+from .embedding_outbox import EmbeddingOutbox
 from .external_case_artifact import ArtifactKind, ExternalCaseArtifact
 from .external_case_result import ExternalCaseResult
+from .external_results import ExternalRunSession, RunStatus
 from .link import LinkSource, LinkType, RequirementTestCaseLink
 from .notification import Notification, NotificationType
 from .project import Project
+from .report_export import ReportExport, ReportExportStatus
 from .requirement import PriorityLevel, Requirement, RequirementStatus, RequirementType
 from .runner_token import RunnerToken
 from .suggestion import LinkSuggestion, SuggestionMethod, SuggestionStatus
+from .suggestion_rollup import SuggestionDailyRollup
+from .suggestion_watermark import SuggestionWatermark
 from .test_case import AutomationStatus, TestCase, TestCaseStatus, TestCaseType
 from .user import User, UserRole
 
@@ -18,13 +25,24 @@ __all__ = [
     "AuditLog",
     "Base",
     "TimestampMixin",
+    "CoverageCounters",
+    "CoverageSnapshot",
+    "RequirementCoverage",
+    "TestCaseCoverage",
+    "DataVersion",
     "EmbeddingCache",
+    "EmbeddingCacheGeneration",
+    "EmbeddingOutbox",
     "ArtifactKind",
     "ExternalCaseArtifact",
     "ExternalCaseResult",
+    "ExternalRunSession",
+    "RunStatus",
     "Notification",
     "NotificationType",
     "Project",
+    "ReportExport",
+    "ReportExportStatus",
     "Requirement",
     "RequirementType",
     "PriorityLevel",
@@ -40,6 +58,8 @@ __all__ = [
     "LinkSuggestion",
     "SuggestionMethod",
     "SuggestionStatus",
+    "SuggestionDailyRollup",
+    "SuggestionWatermark",
     "User",
     "UserRole",
 ]
@@ -0,0 +1,88 @@
+"""Coverage state models — incrementally maintained traceability coverage"""
+
+from sqlalchemy import Column, DateTime, Float, Integer, String
+
+from .base import Base
+from .requirement import GUID, JSON
+
+
+class RequirementCoverage(Base):
+    """
+    Link counts and coverage status of one requirement.
+
+    Refreshed in the same transaction as every link, requirement or test case
+    write (see ``app.crud.coverage``).  There is deliberately no foreign key: a
+    deleted requirement's row is removed by the refresh so the counters can be
+    adjusted, not by a cascade the session never sees.
+    """
+
+    __tablename__ = "requirement_coverage"
+
+    requirement_id = Column(GUID(), primary_key=True)
+    link_count = Column(Integer, nullable=False, default=0)
+    accepted_count = Column(Integer, nullable=False, default=0)
+    status = Column(String(20), nullable=False, index=True)  # covered / partially_covered / uncovered
+    updated_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<RequirementCoverage({self.requirement_id}, status={self.status}, links={self.link_count})>"
+
+
+class TestCaseCoverage(Base):
+    """Link count of one test case; a test case with no links is an orphan."""
+
+    __tablename__ = "test_case_coverage"
+
+    test_case_id = Column(GUID(), primary_key=True)
+    link_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<TestCaseCoverage({self.test_case_id}, links={self.link_count})>"
+
+
+class CoverageCounters(Base):
+    """Global coverage totals — a single row (``id = 1``) adjusted by the per-entity refreshes."""
+
+    __tablename__ = "coverage_counters"
+
+    id = Column(Integer, primary_key=True)
+    total_requirements = Column(Integer, nullable=False, default=0)
+    covered_requirements = Column(Integer, nullable=False, default=0)
+    partially_covered_requirements = Column(Integer, nullable=False, default=0)
+    uncovered_requirements = Column(Integer, nullable=False, default=0)
+    total_test_cases = Column(Integer, nullable=False, default=0)
+    orphan_test_cases = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return (
+            f"<CoverageCounters(requirements={self.total_requirements}, covered={self.covered_requirements}, "
+            f"test_cases={self.total_test_cases}, orphans={self.orphan_test_cases})>"
+        )
+
+
+class CoverageSnapshot(Base):
+    """
+    Coverage totals captured periodically for trend reads and coverage-drop alerts.
+
+    ``modules`` holds the per-module breakdown as a list of
+    ``{"module", "total", "covered", "partially_covered", "uncovered"}`` objects
+    (``module`` is null for requirements without one).
+    """
+
+    __tablename__ = "coverage_snapshots"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    captured_at = Column(DateTime, nullable=False, index=True)
+    total_requirements = Column(Integer, nullable=False)
+    covered_requirements = Column(Integer, nullable=False)
+    partially_covered_requirements = Column(Integer, nullable=False)
+    uncovered_requirements = Column(Integer, nullable=False)
+    total_test_cases = Column(Integer, nullable=False)
+    orphan_test_cases = Column(Integer, nullable=False)
+    coverage_percentage = Column(Float, nullable=False)
+    modules = Column(JSON(), nullable=True)
+
+    def __repr__(self):
+        return f"<CoverageSnapshot({self.captured_at}, coverage={self.coverage_percentage}%)>"
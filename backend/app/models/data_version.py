@@ -0,0 +1,25 @@
+"""DataVersion model — per-table change counters for conditional GETs"""
+
+from sqlalchemy import BigInteger, Column, DateTime, String
+
+from .base import Base
+
+
+class DataVersion(Base):
+    """
+    Monotonic change counter of one table, bumped right after every committed write to it.
+
+    Read endpoints derive their ``ETag`` from the versions of the tables they
+    aggregate, so a poll with a matching ``If-None-Match`` is answered with 304
+    without running the query.  The bump runs in its own short transaction once
+    the write has committed, so a version is never visible before its data.
+    """
+
+    __tablename__ = "data_versions"
+
+    name = Column(String(100), primary_key=True)  # table name
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<DataVersion({self.name}={self.version})>"
@@ -2,10 +2,43 @@
 
 import uuid
 
-from sqlalchemy import Column, Integer, String, UniqueConstraint
+import numpy as np
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, LargeBinary, String, UniqueConstraint, text
+from sqlalchemy.types import TypeDecorator
 
 from .base import Base, TimestampMixin
-from .requirement import GUID, JSON
+from .requirement import GUID
+
+# Embeddings are stored as packed little-endian float32 regardless of platform byte order.
+EMBEDDING_DTYPE = np.dtype("<f4")
+
+
+class Float32Vector(TypeDecorator):
+    """Binary vector type.
+
+    Stores a sequence of floats as packed little-endian float32 (BYTEA on
+    PostgreSQL, BLOB on SQLite) and loads it as a read-only numpy array that
+    shares memory with the fetched bytes.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, bytes):
+            return value
+        return np.asarray(value, dtype=EMBEDDING_DTYPE).tobytes()
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return np.frombuffer(value, dtype=EMBEDDING_DTYPE)
+
+    def compare_values(self, x, y):
+        # The default ``x == y`` is elementwise (and ambiguous) for arrays.
+        if x is None or y is None:
+            return x is y
+        return np.array_equal(np.asarray(x, dtype=EMBEDDING_DTYPE), np.asarray(y, dtype=EMBEDDING_DTYPE))
 
 
 class EmbeddingCache(Base, TimestampMixin):
@@ -15,12 +48,45 @@ class EmbeddingCache(Base, TimestampMixin):
 
     id = Column(GUID(), primary_key=True, default=uuid.uuid4)
     text_hash = Column(String(64), nullable=False, index=True)
-    embedding = Column(JSON(), nullable=False)
+    embedding = Column(Float32Vector(), nullable=False)
     model_name = Column(String(200), nullable=False)
     provider = Column(String(50), nullable=False)
     dimensions = Column(Integer, nullable=False)
+    # Refreshed in batches by ``app.crud.embedding_cache.access_tracker``; NULL means never read since written.
+    last_accessed_at = Column(DateTime, nullable=True)
+    # Generation that published the row (see ``publish_embedding_writes``); NULL until then, and again after a rewrite.
+    generation = Column(BigInteger, nullable=True)
 
-    __table_args__ = (UniqueConstraint("text_hash", "model_name", name="uq_embedding_text_model"),)
+    __table_args__ = (
+        UniqueConstraint("text_hash", "model_name", name="uq_embedding_text_model"),
+        # Matches the eviction order in ``compact_embedding_cache``, so the oldest rows are read off the index.
+        Index(
+            "ix_embedding_cache_model_last_used",
+            "model_name",
+            text("coalesce(last_accessed_at, updated_at)"),
+            "id",
+        ),
+        Index("ix_embedding_cache_model_generation", "model_name", "generation"),
+    )
 
     def __repr__(self):
         return f"<EmbeddingCache(text_hash={self.text_hash[:16]}…, model={self.model_name})>"
+
+
+class EmbeddingCacheGeneration(Base):
+    """Per-model publication counter for the embedding cache, used to validate on-disk snapshots.
+
+    ``generation`` is advanced each time the model's newly committed rows are
+    published, and those rows are stamped with it in the same transaction, so a
+    snapshot catches up by reading the rows stamped after its own generation.
+    Evictions advance it as well, so snapshots notice deleted rows.
+    """
+
+    __tablename__ = "embedding_cache_generations"
+
+    model_name = Column(String(200), primary_key=True)
+    generation = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<EmbeddingCacheGeneration(model={self.model_name}, generation={self.generation})>"
@@ -0,0 +1,29 @@
+"""EmbeddingOutbox model — requirements and test cases waiting for their embedding"""
+
+from sqlalchemy import Column, DateTime, Integer, String, Text, UniqueConstraint
+
+from .base import Base
+from .requirement import GUID
+
+
+class EmbeddingOutbox(Base):
+    """
+    One pending embedding per requirement or test case.
+
+    Rows are enqueued in the same transaction as the write that changed the entity
+    and deleted once a background worker has stored the embedding in
+    ``embedding_cache``.  Repeated writes before the drain coalesce into one row.
+    """
+
+    __tablename__ = "embedding_outbox"
+    __table_args__ = (UniqueConstraint("entity_type", "entity_id", name="uq_embedding_outbox_entity"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity_type = Column(String(20), nullable=False)  # "requirement" or "test_case"
+    entity_id = Column(GUID(), nullable=False)
+    enqueued_at = Column(DateTime, nullable=False, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<EmbeddingOutbox({self.entity_type}={self.entity_id}, attempts={self.attempts})>"
@@ -0,0 +1,53 @@
+"""ReportExport model — asynchronously rendered report files"""
+
+import enum
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Enum, Index, Integer, String, Text
+
+from .base import Base
+from .requirement import GUID, _enum_values
+
+
+class ReportExportStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+def _utcnow():
+    return datetime.now(tz=timezone.utc).replace(tzinfo=None)
+
+
+class ReportExport(Base):
+    """
+    One report rendering job and, once completed, its stored file.
+
+    ``fingerprint`` identifies the data the report was rendered from; a
+    completed export is reused for every request with the same report type,
+    format and fingerprint.
+    """
+
+    __tablename__ = "report_exports"
+    __table_args__ = (Index("ix_report_exports_lookup", "report_type", "format", "fingerprint"),)
+
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    report_type = Column(String(50), nullable=False)
+    format = Column(String(10), nullable=False)
+    fingerprint = Column(String(64), nullable=False)
+    status = Column(
+        Enum(ReportExportStatus, values_callable=_enum_values),
+        nullable=False,
+        default=ReportExportStatus.PENDING,
+    )
+    storage_key = Column(String(500), nullable=True)
+    size_bytes = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+    requested_by = Column(GUID(), nullable=True)
+    created_at = Column(DateTime, default=_utcnow, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<ReportExport(id={self.id}, {self.report_type}.{self.format}, status={self.status})>"
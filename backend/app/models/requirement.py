@@ -2,7 +2,7 @@ import enum
 import json
 import uuid
 
-from sqlalchemy import ARRAY, Column, Enum, Integer, String, Text
+from sqlalchemy import ARRAY, Column, Enum, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.types import CHAR, TypeDecorator
@@ -148,5 +148,8 @@ class Requirement(Base, TimestampMixin):
     links = relationship("RequirementTestCaseLink", back_populates="requirement", cascade="all, delete-orphan")
     suggestions = relationship("LinkSuggestion", back_populates="requirement", cascade="all, delete-orphan")
 
+    # Keyset order of the paginated traceability matrix
+    __table_args__ = (Index("ix_requirements_external_id_order", func.coalesce(external_id, ""), id),)
+
     def __repr__(self):
         return f"<Requirement(id={self.id}, external_id={self.external_id}, title={self.title[:50]})>"
@@ -0,0 +1,35 @@
+"""SuggestionDailyRollup model — per-day suggestion aggregates behind the analytics endpoints"""
+
+from sqlalchemy import Column, Date, DateTime, Float, Integer, String
+
+from .base import Base
+
+
+class SuggestionDailyRollup(Base):
+    """
+    Suggestion counts and sums for one creation day, method, status and score bucket.
+
+    Adjusted in the same transaction as every suggestion create, review or
+    delete (see ``app.crud.suggestion_rollup``) and rebuilt from
+    ``link_suggestions`` by the backfill.  ``score_bucket`` indexes the
+    confidence bins (``-1`` for scores outside ``[0, 1]``); the review sums
+    cover the suggestions with a ``reviewed_at``.
+    """
+
+    __tablename__ = "suggestion_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    suggestion_method = Column(String(50), primary_key=True)
+    status = Column(String(20), primary_key=True)
+    score_bucket = Column(Integer, primary_key=True)
+    suggestion_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Float, nullable=False, default=0.0)
+    reviewed_count = Column(Integer, nullable=False, default=0)
+    review_hours_sum = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return (
+            f"<SuggestionDailyRollup({self.day}, {self.suggestion_method}, {self.status}, "
+            f"bucket={self.score_bucket}, count={self.suggestion_count})>"
+        )
@@ -0,0 +1,20 @@
+"""SuggestionWatermark model for incremental scheduled suggestion generation"""
+
+from sqlalchemy import Column, DateTime, String
+
+from .base import Base
+from .requirement import JSON
+
+
+class SuggestionWatermark(Base):
+    """Last successful incremental generation point, stored per algorithm."""
+
+    __tablename__ = "suggestion_watermarks"
+
+    algorithm = Column(String(50), primary_key=True)
+    watermark = Column(DateTime, nullable=False)
+    last_run_at = Column(DateTime, nullable=False)
+    last_run_stats = Column(JSON(), nullable=True)
+
+    def __repr__(self):
+        return f"<SuggestionWatermark(algorithm={self.algorithm}, watermark={self.watermark})>"
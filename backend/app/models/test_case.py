@@ -1,7 +1,7 @@
 import enum
 import uuid
 
-from sqlalchemy import Boolean, Column, Enum, Integer, String, Text
+from sqlalchemy import Boolean, Column, Enum, Index, Integer, String, Text, func
 from sqlalchemy.orm import relationship
 
 from .base import Base, TimestampMixin
@@ -68,5 +68,8 @@ class TestCase(Base, TimestampMixin):
     links = relationship("RequirementTestCaseLink", back_populates="test_case", cascade="all, delete-orphan")
     suggestions = relationship("LinkSuggestion", back_populates="test_case", cascade="all, delete-orphan")
 
+    # Keyset order of the paginated orphan test case listing
+    __table_args__ = (Index("ix_test_cases_external_id_order", func.coalesce(external_id, ""), id),)
+
     def __repr__(self):
         return f"<TestCase(id={self.id}, external_id={self.external_id}, title={self.title[:50]})>"
@@ -13,3 +13,11 @@ class PaginatedResponse(BaseModel, Generic[T]):
     page: int
     page_size: int
     pages: int
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """Keyset-paginated page; pass ``next_cursor`` back as ``cursor`` to fetch the next page (``None`` on the last)."""
+
+    items: list[T]
+    next_cursor: str | None = None
+    limit: int
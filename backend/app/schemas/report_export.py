@@ -0,0 +1,25 @@
+"""Schemas for report export jobs"""
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.report_export import ReportExportStatus
+
+
+class ReportExportResponse(BaseModel):
+    """Report export job status"""
+
+    id: UUID
+    report_type: str
+    format: str
+    fingerprint: str
+    status: ReportExportStatus
+    size_bytes: int | None = None
+    error: str | None = None
+    created_at: datetime
+    completed_at: datetime | None = None
+    download_url: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,5 +1,6 @@
 """Schemas for traceability matrix and metrics"""
 
+from datetime import datetime
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict
@@ -40,8 +41,8 @@ class OrphanTestCase(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
-class TraceabilityMatrixResponse(BaseModel):
-    """Complete traceability matrix response"""
+class TraceabilityMatrixSummary(BaseModel):
+    """Traceability totals without the matrix rows"""
 
     coverage_percentage: float
     total_requirements: int
@@ -49,12 +50,52 @@ class TraceabilityMatrixResponse(BaseModel):
     uncovered_requirements: int
     total_test_cases: int
     orphan_test_cases: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TraceabilityMatrixResponse(TraceabilityMatrixSummary):
+    """Complete traceability matrix response"""
+
     matrix: list[RequirementCoverage]
     orphans: list[OrphanTestCase]
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class ModuleCoverage(BaseModel):
+    """Requirement coverage counts of one module in a snapshot"""
+
+    module: str | None = None
+    total: int
+    covered: int
+    partially_covered: int
+    uncovered: int
+
+
+class CoverageSnapshotResponse(BaseModel):
+    """Coverage totals captured at one point in time"""
+
+    captured_at: datetime
+    coverage_percentage: float
+    total_requirements: int
+    covered_requirements: int
+    partially_covered_requirements: int
+    uncovered_requirements: int
+    total_test_cases: int
+    orphan_test_cases: int
+    modules: list[ModuleCoverage] | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CoverageHistoryResponse(BaseModel):
+    """Coverage snapshots in a time window, oldest first"""
+
+    threshold: float
+    snapshots: list[CoverageSnapshotResponse]
+
+
 class AlgorithmMetrics(BaseModel):
     """Metrics for a specific suggestion algorithm"""
 
@@ -1,20 +1,22 @@
-"""Analytics service for suggestion analytics"""
+"""Analytics service for suggestion analytics
+
+Every method reads the daily suggestion rollup (``suggestion_daily_rollups``,
+maintained by ``app.crud.suggestion_rollup``), so its cost grows with the
+number of days rather than the number of suggestions.  Months are truncated
+per dialect (``to_char`` on PostgreSQL, ``strftime`` on SQLite).  The one
+exception is the median review time, which sums cannot give: it uses
+``percentile_cont`` over ``link_suggestions`` on PostgreSQL and an ordered
+``LIMIT``/``OFFSET`` lookup of the middle rows elsewhere.
+"""
 
-from collections import defaultdict
-from datetime import timedelta
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.suggestion_rollup import CONFIDENCE_BINS, review_hours, rollup_month
 from app.models.suggestion import LinkSuggestion, SuggestionMethod, SuggestionStatus
-
-_UNKNOWN_PERIOD = "unknown"
-
-
-def _score_in_bin(score: float, low: float, high: float) -> bool:
-    """Return True if score falls in [low, high] (inclusive on both ends for the last bin)."""
-    return low <= score <= high
+from app.models.suggestion_rollup import SuggestionDailyRollup as Rollup
 
 
 class SuggestionAnalytics:
@@ -23,15 +25,20 @@ class SuggestionAnalytics:
     def __init__(self, db: AsyncSession) -> None:
         self.db = db
 
-    async def _fetch_all_suggestions(self) -> list[LinkSuggestion]:
-        """Fetch all suggestions from the database"""
-        result = await self.db.execute(select(LinkSuggestion))
-        return list(result.scalars().all())
+    @property
+    def _is_postgresql(self) -> bool:
+        return bool(self.db.bind and self.db.bind.dialect.name == "postgresql")
 
     @staticmethod
-    def _period_for(s: LinkSuggestion) -> str:
-        """Return the YYYY-MM period string for a suggestion's created_at, or 'unknown'."""
-        return s.created_at.strftime("%Y-%m") if s.created_at else _UNKNOWN_PERIOD
+    def _status_counts():
+        def count_of(status: SuggestionStatus):
+            return func.coalesce(func.sum(Rollup.suggestion_count).filter(Rollup.status == status.value), 0)
+
+        return (
+            func.sum(Rollup.suggestion_count).label("total"),
+            count_of(SuggestionStatus.ACCEPTED).label("accepted"),
+            count_of(SuggestionStatus.REJECTED).label("rejected"),
+        )
 
     async def get_acceptance_rates(self) -> list[dict[str, Any]]:
         """
@@ -40,35 +47,25 @@ class SuggestionAnalytics:
         Returns a list of monthly periods with counts of accepted, rejected,
         pending suggestions and the overall acceptance rate.
         """
-        suggestions = await self._fetch_all_suggestions()
-
-        # Group by year-month of created_at
-        period_data: dict[str, dict[str, int]] = defaultdict(
-            lambda: {"accepted": 0, "rejected": 0, "pending": 0, "total": 0}
+        period = rollup_month(self.db).label("period")
+        result = await self.db.execute(
+            select(period, *self._status_counts())
+            .group_by(period)
+            .having(func.sum(Rollup.suggestion_count) > 0)
+            .order_by(period)
         )
 
-        for s in suggestions:
-            period = self._period_for(s)
-            period_data[period]["total"] += 1
-            if s.status == SuggestionStatus.ACCEPTED:
-                period_data[period]["accepted"] += 1
-            elif s.status == SuggestionStatus.REJECTED:
-                period_data[period]["rejected"] += 1
-            else:
-                period_data[period]["pending"] += 1
-
         results = []
-        for period in sorted(period_data.keys()):
-            data = period_data[period]
-            total = data["total"]
-            acceptance_rate = round(data["accepted"] / total * 100, 2) if total > 0 else 0.0
+        for row in result.all():
+            acceptance_rate = round(row.accepted / row.total * 100, 2) if row.total > 0 else 0.0
             results.append(
                 {
-                    "period": period,
-                    "accepted": data["accepted"],
-                    "rejected": data["rejected"],
-                    "pending": data["pending"],
-                    "total": total,
+                    "period": row.period,
+                    "accepted": row.accepted,
+                    "rejected": row.rejected,
+                    # Everything not yet accepted or rejected (including expired) counts as pending
+                    "pending": row.total - row.accepted - row.rejected,
+                    "total": row.total,
                     "acceptance_rate": acceptance_rate,
                 }
             )
@@ -82,28 +79,16 @@ class SuggestionAnalytics:
         Returns counts and percentages for score ranges:
         0.0–0.2, 0.2–0.4, 0.4–0.6, 0.6–0.8, 0.8–1.0
         """
-        suggestions = await self._fetch_all_suggestions()
-        total = len(suggestions)
-
-        bins = [
-            ("0.0-0.2", 0.0, 0.2),
-            ("0.2-0.4", 0.2, 0.4),
-            ("0.4-0.6", 0.4, 0.6),
-            ("0.6-0.8", 0.6, 0.8),
-            ("0.8-1.0", 0.8, 1.0),
-        ]
+        result = await self.db.execute(
+            select(Rollup.score_bucket, func.sum(Rollup.suggestion_count)).group_by(Rollup.score_bucket)
+        )
+        counts = dict(result.all())
+        # Out-of-range scores fall in no bin but still count towards the total
+        total = sum(counts.values())
 
         results = []
-        for i, (label, low, high) in enumerate(bins):
-            is_last = i == len(bins) - 1
-            count = sum(
-                1
-                for s in suggestions
-                if s.similarity_score is not None
-                and _score_in_bin(s.similarity_score, low, high)
-                # For non-last bins exclude the upper boundary to avoid double-counting
-                and (is_last or s.similarity_score < high)
-            )
+        for index, (label, _, _) in enumerate(CONFIDENCE_BINS):
+            count = counts.get(index, 0)
             percentage = round(count / total * 100, 2) if total > 0 else 0.0
             results.append({"range": label, "count": count, "percentage": percentage})
 
@@ -115,13 +100,10 @@ class SuggestionAnalytics:
 
         Returns monthly counts of suggestions created.
         """
-        suggestions = await self._fetch_all_suggestions()
-
-        period_counts: dict[str, int] = defaultdict(int)
-        for s in suggestions:
-            period_counts[self._period_for(s)] += 1
-
-        return [{"period": period, "count": count} for period, count in sorted(period_counts.items())]
+        period = rollup_month(self.db).label("period")
+        count = func.sum(Rollup.suggestion_count)
+        result = await self.db.execute(select(period, count).group_by(period).having(count > 0).order_by(period))
+        return [{"period": period, "count": count} for period, count in result.all()]
 
     async def get_review_velocity(self) -> dict[str, Any]:
         """
@@ -129,34 +111,36 @@ class SuggestionAnalytics:
 
         Returns average and median review time (in hours) for reviewed suggestions.
         """
-        suggestions = await self._fetch_all_suggestions()
+        result = await self.db.execute(select(func.sum(Rollup.reviewed_count), func.sum(Rollup.review_hours_sum)))
+        total_reviewed, hours_sum = result.one()
 
-        durations_hours: list[float] = []
-        for s in suggestions:
-            if s.reviewed_at is not None and s.created_at is not None:
-                delta: timedelta = s.reviewed_at - s.created_at
-                hours = delta.total_seconds() / 3600
-                durations_hours.append(hours)
-
-        total_reviewed = len(durations_hours)
-        if total_reviewed == 0:
+        if not total_reviewed:
             return {
                 "average_hours": 0.0,
                 "median_hours": 0.0,
                 "total_reviewed": 0,
             }
 
-        average_hours = round(sum(durations_hours) / total_reviewed, 2)
-        sorted_durations = sorted(durations_hours)
-        mid = total_reviewed // 2
-        if total_reviewed % 2 == 0:
-            median_hours = round((sorted_durations[mid - 1] + sorted_durations[mid]) / 2, 2)
+        hours = review_hours(self.db)
+        reviewed = and_(LinkSuggestion.reviewed_at.is_not(None), LinkSuggestion.created_at.is_not(None))
+        if self._is_postgresql:
+            median = await self.db.execute(select(func.percentile_cont(0.5).within_group(hours)).where(reviewed))
+            median_hours = median.scalar_one()
         else:
-            median_hours = round(sorted_durations[mid], 2)
+            # Middle one or two durations, fetched in order without loading the rest
+            middle = await self.db.execute(
+                select(hours.label("hours"))
+                .where(reviewed)
+                .order_by(hours)
+                .limit(2 - total_reviewed % 2)
+                .offset((total_reviewed - 1) // 2)
+            )
+            middle_hours = middle.scalars().all()
+            median_hours = sum(middle_hours) / len(middle_hours)
 
         return {
-            "average_hours": average_hours,
-            "median_hours": median_hours,
+            "average_hours": round(float(hours_sum) / total_reviewed, 2),
+            "median_hours": round(float(median_hours), 2),
             "total_reviewed": total_reviewed,
         }
 
@@ -166,49 +150,31 @@ class SuggestionAnalytics:
 
         Returns per-algorithm counts, acceptance rates, and average confidence scores.
         """
-        suggestions = await self._fetch_all_suggestions()
-
-        algo_data: dict[str, dict[str, Any]] = {
-            method.value: {
-                "total": 0,
-                "accepted": 0,
-                "rejected": 0,
-                "pending": 0,
-                "score_sum": 0.0,
-                "score_count": 0,
-            }
-            for method in SuggestionMethod
-        }
-
-        for s in suggestions:
-            key = s.suggestion_method.value if s.suggestion_method else None
-            if key is None or key not in algo_data:
-                continue
-            algo_data[key]["total"] += 1
-            if s.status == SuggestionStatus.ACCEPTED:
-                algo_data[key]["accepted"] += 1
-            elif s.status == SuggestionStatus.REJECTED:
-                algo_data[key]["rejected"] += 1
-            else:
-                algo_data[key]["pending"] += 1
-            if s.similarity_score is not None:
-                algo_data[key]["score_sum"] += s.similarity_score
-                algo_data[key]["score_count"] += 1
+        result = await self.db.execute(
+            select(
+                Rollup.suggestion_method,
+                *self._status_counts(),
+                func.sum(Rollup.score_sum).label("score_sum"),
+            ).group_by(Rollup.suggestion_method)
+        )
+        rows = {row.suggestion_method: row for row in result.all()}
 
         results = []
-        for algorithm, data in algo_data.items():
-            total = data["total"]
-            acceptance_rate = round(data["accepted"] / total * 100, 2) if total > 0 else 0.0
-            avg_confidence = round(data["score_sum"] / data["score_count"], 4) if data["score_count"] > 0 else 0.0
+        for method in SuggestionMethod:
+            row = rows.get(method.value)
+            total = row.total if row is not None else 0
+            accepted = row.accepted if row is not None else 0
+            rejected = row.rejected if row is not None else 0
+            avg_confidence = float(row.score_sum) / total if total > 0 else 0.0
             results.append(
                 {
-                    "algorithm": algorithm,
+                    "algorithm": method.value,
                     "total": total,
-                    "accepted": data["accepted"],
-                    "rejected": data["rejected"],
-                    "pending": data["pending"],
-                    "acceptance_rate": acceptance_rate,
-                    "avg_confidence": avg_confidence,
+                    "accepted": accepted,
+                    "rejected": rejected,
+                    "pending": total - accepted - rejected,
+                    "acceptance_rate": round(accepted / total * 100, 2) if total > 0 else 0.0,
+                    "avg_confidence": round(avg_confidence, 4),
                 }
             )
 
@@ -0,0 +1,156 @@
+"""Columnar (Arrow IPC stream / Parquet) exports written batch by batch from database cursors
+
+``pyarrow`` is an optional dependency: without it the columnar endpoints answer
+501 and every other export keeps working.  Each partition of a server-side
+cursor becomes one record batch (one row group for Parquet), so memory stays
+flat and the first bytes leave before the query has finished.  Columns keep
+their types: UUIDs use the ``arrow.uuid`` extension type, timestamps are UTC
+microseconds and enum values are dictionary-encoded strings.
+"""
+
+import io
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+
+from sqlalchemy.engine import Row
+
+# Media type and file extension per format
+COLUMNAR_FORMATS = {
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# (column, kind) — kinds map to Arrow types in _arrow_type
+TRACEABILITY_COLUMNS = (
+    ("requirement_id", "uuid"),
+    ("requirement_title", "string"),
+    ("external_id", "string"),
+    ("coverage_status", "category"),
+    ("link_id", "uuid"),
+    ("test_case_id", "uuid"),
+    ("link_type", "category"),
+    ("link_source", "category"),
+    ("confidence_score", "float"),
+    ("test_case_title", "string"),
+)
+SUGGESTION_COLUMNS = (
+    ("id", "uuid"),
+    ("requirement_id", "uuid"),
+    ("requirement_title", "string"),
+    ("test_case_id", "uuid"),
+    ("test_case_title", "string"),
+    ("suggestion_method", "category"),
+    ("similarity_score", "float"),
+    ("status", "category"),
+    ("reviewed_by", "string"),
+    ("feedback", "string"),
+    ("created_at", "timestamp"),
+    ("reviewed_at", "timestamp"),
+)
+CASE_RESULT_COLUMNS = (
+    ("id", "uuid"),
+    ("session_id", "uuid"),
+    ("test_case_id", "uuid"),
+    ("external_id", "string"),
+    ("title", "string"),
+    ("outcome", "category"),
+    ("duration_ms", "int"),
+    ("error_message", "string"),
+    ("auto_registered", "bool"),
+    ("created_at", "timestamp"),
+)
+
+
+def require_pyarrow():
+    """Import and return ``pyarrow``, raising ImportError with an install hint if it is missing."""
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("pyarrow is required for Arrow/Parquet exports. Run: pip install pyarrow")
+    return pyarrow
+
+
+def _arrow_type(pa, kind: str):
+    return {
+        "uuid": pa.uuid(),
+        "string": pa.string(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "float": pa.float64(),
+        "int": pa.int64(),
+        "bool": pa.bool_(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }[kind]
+
+
+def _python_value(value: Any, kind: str) -> Any:
+    if value is None:
+        return None
+    if kind == "uuid":
+        return value.bytes
+    if kind == "category":
+        return getattr(value, "value", value)
+    return value
+
+
+def arrow_schema(columns: Sequence[tuple[str, str]]):
+    pa = require_pyarrow()
+    return pa.schema([(name, _arrow_type(pa, kind)) for name, kind in columns])
+
+
+def record_batch(rows: Sequence[Row], columns: Sequence[tuple[str, str]], schema):
+    """Convert a partition of labeled rows into one record batch, column by column."""
+    pa = require_pyarrow()
+    arrays = [
+        pa.array([_python_value(row._mapping[name], kind) for row in rows], type=schema.field(name).type)
+        for name, kind in columns
+    ]
+    return pa.record_batch(arrays, schema=schema)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object handing back whatever the Arrow writer produced since the last drain."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+async def columnar_chunks(
+    partitions: AsyncIterator[Sequence[Row]],
+    columns: Sequence[tuple[str, str]],
+    format: str,
+) -> AsyncIterator[bytes]:
+    """Encode each cursor partition as a record batch and yield the bytes written for it."""
+    pa = require_pyarrow()
+    schema = arrow_schema(columns)
+    sink = _ChunkSink()
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    try:
+        async for rows in partitions:
+            writer.write_batch(record_batch(rows, columns, schema))
+            if chunk := sink.drain():
+                yield chunk
+    finally:
+        writer.close()
+    if chunk := sink.drain():
+        yield chunk
@@ -0,0 +1,29 @@
+"""Periodic reconciliation of the coverage state against the links table"""
+
+import logging
+import time
+from typing import Any
+
+from app.crud.coverage import reconcile_coverage
+
+logger = logging.getLogger(__name__)
+
+
+async def scheduled_coverage_reconciliation() -> dict[str, Any]:
+    """Entry point for the periodic scheduler — verifies and repairs the coverage state in its own session."""
+    from app.db.session import AsyncSessionLocal
+
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        report = await reconcile_coverage(db)
+        await db.commit()
+    report["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+    if report["repaired"]:
+        logger.warning(
+            "Coverage reconciliation repaired %d requirement rows, %d test case rows, counter drift %s",
+            report["requirement_rows"],
+            report["test_case_rows"],
+            report["counter_drift"] or "none",
+        )
+    return report
@@ -0,0 +1,55 @@
+"""Periodic coverage snapshots and coverage-drop alerts"""
+
+import logging
+from datetime import timedelta
+from typing import Any
+
+from app.config import settings
+from app.crud.coverage_history import (
+    capture_coverage_snapshot,
+    delete_coverage_snapshots_before,
+    get_latest_coverage_snapshot,
+)
+from app.services.notification_service import notify_coverage_drop
+
+logger = logging.getLogger(__name__)
+
+
+async def scheduled_coverage_snapshot() -> dict[str, Any]:
+    """
+    Entry point for the periodic scheduler — records a coverage snapshot in its own session.
+
+    Admins are notified when coverage crosses ``COVERAGE_DROP_THRESHOLD``
+    downwards between the previous snapshot and this one, so a project that
+    stays below the threshold is not re-alerted on every run.
+    """
+    from app.db.session import AsyncSessionLocal
+
+    threshold = settings.COVERAGE_DROP_THRESHOLD
+    async with AsyncSessionLocal() as db:
+        previous = await get_latest_coverage_snapshot(db)
+        snapshot = await capture_coverage_snapshot(db)
+        pruned = 0
+        if settings.COVERAGE_SNAPSHOT_RETENTION_DAYS is not None:
+            cutoff = snapshot.captured_at - timedelta(days=settings.COVERAGE_SNAPSHOT_RETENTION_DAYS)
+            pruned = await delete_coverage_snapshots_before(db, cutoff)
+        await db.commit()
+
+        previous_coverage = previous.coverage_percentage if previous is not None else None
+        alerted = previous_coverage is not None and previous_coverage >= threshold > snapshot.coverage_percentage
+        if alerted:
+            await notify_coverage_drop(db, previous_coverage, snapshot.coverage_percentage, threshold=threshold)
+
+    if alerted:
+        logger.warning(
+            "Coverage dropped from %.1f%% to %.1f%%, below the %.1f%% threshold",
+            previous_coverage,
+            snapshot.coverage_percentage,
+            threshold,
+        )
+    return {
+        "coverage_percentage": snapshot.coverage_percentage,
+        "previous_coverage_percentage": previous_coverage,
+        "alerted": alerted,
+        "snapshots_pruned": pruned,
+    }
@@ -0,0 +1,36 @@
+"""Periodic compaction of the persistent embedding cache"""
+
+import logging
+import time
+from typing import Any
+
+from app.config import settings
+from app.crud.embedding_cache import compact_embedding_cache
+
+logger = logging.getLogger(__name__)
+
+
+async def scheduled_embedding_cache_compaction() -> dict[str, Any]:
+    """Entry point for the periodic scheduler — compacts to the configured budgets in its own session."""
+    from app.db.session import AsyncSessionLocal
+
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        report = await compact_embedding_cache(
+            db,
+            max_rows_per_model=settings.EMBEDDING_CACHE_MAX_ROWS_PER_MODEL,
+            max_bytes_per_model=settings.EMBEDDING_CACHE_MAX_BYTES_PER_MODEL,
+            max_age_days=settings.EMBEDDING_CACHE_MAX_AGE_DAYS,
+        )
+        await db.commit()
+    report["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+
+    logger.info(
+        "Embedding cache compaction: %d rows deleted, %d bytes reclaimed, %d accesses flushed (%s)",
+        report["rows_deleted"],
+        report["bytes_reclaimed"],
+        report["accesses_flushed"],
+        ", ".join(f"{model}: {stats['rows_deleted']}/{stats['rows']} rows" for model, stats in report["models"].items())
+        or "empty",
+    )
+    return report
@@ -0,0 +1,367 @@
+"""Process-local operational metrics in the Prometheus text exposition format
+
+Collectors are plain in-memory counters, gauges and fixed-bucket histograms
+behind one lock each — recording a sample is a dict lookup and a few
+additions, with no dependency on ``prometheus_client``.  Sources:
+
+- ``OperationalMetricsMiddleware`` (ASGI): request latency per route template
+  and in-flight requests;
+- SQLAlchemy ``Engine`` cursor events: query counts, durations and errors;
+- explicit calls from the suggestion engine, the auto-suggestion background
+  tasks and artifact uploads;
+- scrape-time collectors: connection pool usage, embedding and result cache
+  counters and background task queues.
+
+Every worker process keeps its own values; Prometheus scrapes each worker
+(or aggregates across them) as usual.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, **labels: Any) -> None:
+        """Mirror a cumulative count maintained elsewhere (scrape-time collectors)."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down; also set wholesale by scrape-time collectors."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_in_progress(self, **labels: Any) -> Iterator[None]:
+        """Count the enclosed block as in progress while it runs."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed cumulative buckets, with their sum and count."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # per-bucket (non-cumulative) counts + the +Inf bucket, then sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        with self._lock:
+            items = [(key, (list(counts), total)) for key, (counts, total) in self._values.items()]
+        for key, (counts, total) in items:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+_REGISTRY: list[_Metric] = []
+_COLLECTORS: list[Callable[[], None]] = []
+
+
+def register_collector(collector: Callable[[], None]) -> Callable[[], None]:
+    """Register a function that refreshes gauges right before every scrape."""
+    _COLLECTORS.append(collector)
+    return collector
+
+
+def render_metrics() -> str:
+    """Run the scrape-time collectors and render every metric in the text exposition format."""
+    for collector in _COLLECTORS:
+        try:
+            collector()
+        except Exception:
+            logger.exception("Operational metrics collector %s failed", collector.__name__)
+    lines = []
+    for metric in _REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        for name, labels, value in metric.samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    """Clear every recorded value (tests)."""
+    for metric in _REGISTRY:
+        metric.clear()
+
+
+# --- HTTP ---
+
+HTTP_REQUEST_DURATION = Histogram(
+    "bgstm_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge("bgstm_http_requests_in_flight", "HTTP requests currently being served")
+
+
+class OperationalMetricsMiddleware:
+    """
+    Pure ASGI middleware timing each HTTP request until its response has been sent.
+
+    Requests are labeled by the matched route template (``scope["route"]``) so
+    path parameters never create new series; unmatched paths share ``unmatched``.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started, method=scope["method"], route=route, status=status_code
+            )
+
+
+# --- Database ---
+
+DB_QUERY_DURATION = Histogram(
+    "bgstm_db_query_duration_seconds",
+    "Database statement execution time by statement type",
+    ("operation",),
+    buckets=DB_BUCKETS,
+)
+DB_QUERY_ERRORS = Counter("bgstm_db_query_errors_total", "Database statements that raised an error", ("operation",))
+DB_POOL_CONNECTIONS = Gauge(
+    "bgstm_db_pool_connections", "Connections of the application engine's pool by state", ("state",)
+)
+DB_POOL_SIZE = Gauge("bgstm_db_pool_size", "Configured size of the application engine's pool")
+
+_QUERY_STARTS = "operational_metrics_query_starts"
+
+
+def _operation(statement: str) -> str:
+    keyword = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else ""
+    return keyword if keyword in ("select", "insert", "update", "delete", "with") else "other"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _query_started(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_QUERY_STARTS, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _query_finished(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get(_QUERY_STARTS)
+    if starts:
+        DB_QUERY_DURATION.observe(time.perf_counter() - starts.pop(), operation=_operation(statement))
+
+
+@event.listens_for(Engine, "handle_error")
+def _query_failed(exception_context) -> None:
+    connection = exception_context.connection
+    starts = connection.info.get(_QUERY_STARTS) if connection is not None else None
+    if starts:
+        starts.pop()
+    DB_QUERY_ERRORS.inc(operation=_operation(exception_context.statement or ""))
+
+
+@register_collector
+def _collect_pool() -> None:
+    from app.db.session import engine
+
+    pool = engine.sync_engine.pool
+    for state, method in (("checked_out", "checkedout"), ("idle", "checkedin"), ("overflow", "overflow")):
+        if hasattr(pool, method):
+            DB_POOL_CONNECTIONS.set(max(getattr(pool, method)(), 0), state=state)
+    if hasattr(pool, "size"):
+        DB_POOL_SIZE.set(pool.size())
+
+
+# --- Suggestion engine ---
+
+SUGGESTION_PAIRS = Counter(
+    "bgstm_suggestion_pairs_analyzed_total", "Requirement/test case pairs scored", ("algorithm",)
+)
+SUGGESTION_SCORING_SECONDS = Counter(
+    "bgstm_suggestion_scoring_seconds_total", "Wall time spent scoring pairs", ("algorithm",)
+)
+SUGGESTION_PAIRS_PER_SECOND = Gauge(
+    "bgstm_suggestion_pairs_per_second", "Scoring throughput of the last suggestion run", ("algorithm",)
+)
+
+
+def record_suggestion_run(algorithm: str, pairs_analyzed: int, scoring_seconds: float) -> None:
+    """Record one suggestion engine run; ``rate(pairs) / rate(seconds)`` gives throughput over time."""
+    SUGGESTION_PAIRS.inc(pairs_analyzed, algorithm=algorithm)
+    SUGGESTION_SCORING_SECONDS.inc(scoring_seconds, algorithm=algorithm)
+    if scoring_seconds > 0:
+        SUGGESTION_PAIRS_PER_SECOND.set(pairs_analyzed / scoring_seconds, algorithm=algorithm)
+
+
+# --- Caches ---
+
+EMBEDDING_CACHE_LOOKUPS = Counter(
+    "bgstm_embedding_cache_lookups_total", "Process-wide embedding cache lookups by result", ("result",)
+)
+EMBEDDING_CACHE_HIT_RATIO = Gauge("bgstm_embedding_cache_hit_ratio", "Embedding cache hits / lookups")
+EMBEDDING_CACHE_BYTES = Gauge("bgstm_embedding_cache_bytes", "Bytes held by the process-wide embedding cache")
+RESULT_CACHE_LOOKUPS = Counter(
+    "bgstm_result_cache_lookups_total", "Aggregate read result cache lookups by result", ("result",)
+)
+
+
+@register_collector
+def _collect_caches() -> None:
+    from app.ai_suggestions.memory_cache import get_shared_embedding_cache
+    from app.cache import get_result_cache
+
+    embedding_stats = get_shared_embedding_cache().stats()
+    # The caches keep cumulative counters; mirror them instead of double counting.
+    EMBEDDING_CACHE_LOOKUPS.set_total(embedding_stats["hits"], result="hit")
+    EMBEDDING_CACHE_LOOKUPS.set_total(embedding_stats["misses"], result="miss")
+    EMBEDDING_CACHE_HIT_RATIO.set(embedding_stats["hit_ratio"] or 0.0)
+    EMBEDDING_CACHE_BYTES.set(embedding_stats["size_bytes"])
+
+    result_stats = get_result_cache().stats()
+    for result in ("hits", "misses", "coalesced"):
+        RESULT_CACHE_LOOKUPS.set_total(result_stats[result], result=result.removesuffix("s"))
+
+
+# --- Background work ---
+
+BACKGROUND_TASKS = Gauge("bgstm_background_tasks", "Background tasks queued or running by queue", ("queue",))
+
+
+@register_collector
+def _collect_background_tasks() -> None:
+    from app.services import report_exports
+
+    for queue, depth in report_exports.queue_depth().items():
+        BACKGROUND_TASKS.set(depth, queue=queue)
+
+
+# --- Artifacts ---
+
+ARTIFACT_UPLOADS = Counter("bgstm_artifact_uploads_total", "Artifacts stored", ("kind",))
+ARTIFACT_UPLOAD_BYTES = Counter("bgstm_artifact_upload_bytes_total", "Bytes of artifacts stored", ("kind",))
+
+
+def record_artifact_upload(kind: str, size_bytes: int) -> None:
+    ARTIFACT_UPLOADS.inc(kind=kind)
+    ARTIFACT_UPLOAD_BYTES.inc(size_bytes, kind=kind)
@@ -0,0 +1,158 @@
+"""Background report exports
+
+Report files (currently the traceability matrix PDF) are rendered in a
+process pool, so reportlab's CPU-bound layout never blocks the event loop,
+and stored through the artifact storage backend under a key derived from
+the data fingerprint.  Requests for unchanged data reuse the stored file.
+"""
+
+import asyncio
+import io
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import BinaryIO
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.crud.report_export import get_or_create_report_export, get_report_export
+from app.crud.traceability import get_traceability_fingerprint, get_traceability_matrix
+from app.models.report_export import ReportExport, ReportExportStatus
+from app.services.traceability_pdf import render_traceability_pdf
+from app.storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+TRACEABILITY_MATRIX = "traceability_matrix"
+CONTENT_TYPES = {"pdf": "application/pdf"}
+
+_executor: ProcessPoolExecutor | None = None
+_background_tasks: set[asyncio.Task] = set()
+_renders_in_flight = 0  # submitted to the process pool and not finished yet
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: forking a process that runs an event loop and DB driver threads is unsafe.
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.REPORT_EXPORT_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop the rendering processes (called on application shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def queue_depth() -> dict[str, int]:
+    """Export jobs queued or running in background tasks, and renders submitted to the process pool."""
+    return {"report_exports": len(_background_tasks), "report_rendering": _renders_in_flight}
+
+
+async def _render_in_pool(matrix: dict) -> bytes:
+    global _renders_in_flight
+    _renders_in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), render_traceability_pdf, matrix)
+    finally:
+        _renders_in_flight -= 1
+
+
+def storage_key_for(export: ReportExport) -> str:
+    return f"reports/{export.report_type}/{export.fingerprint}.{export.format}"
+
+
+def filename_for(export: ReportExport) -> str:
+    return f"{export.report_type}.{export.format}"
+
+
+async def request_traceability_export(
+    db: AsyncSession, format: str, requested_by: UUID | None = None
+) -> tuple[ReportExport, bool]:
+    """Return the export job for the current matrix data, creating it if the data changed."""
+    fingerprint = await get_traceability_fingerprint(db)
+    return await get_or_create_report_export(
+        db, report_type=TRACEABILITY_MATRIX, format=format, fingerprint=fingerprint, requested_by=requested_by
+    )
+
+
+async def render_report_export(db: AsyncSession, export: ReportExport) -> ReportExport:
+    """
+    Render *export* in the process pool, store the file and mark it completed.
+
+    The matrix and its fingerprint are read in one transaction (a
+    ``REPEATABLE READ`` snapshot on PostgreSQL), and the file is stored under
+    that fingerprint: if the data changed after the export was requested, the
+    export is re-keyed to the data it actually rendered.  Failures are
+    recorded on the export (``status=failed``, ``error``) rather than raised.
+    """
+    export.status = ReportExportStatus.RUNNING
+    await db.commit()
+    try:
+        if db.bind and db.bind.dialect.name == "postgresql":
+            await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        matrix = await get_traceability_matrix(db)
+        fingerprint = await get_traceability_fingerprint(db)
+        # End the read snapshot before rendering.
+        await db.commit()
+        content = await _render_in_pool(matrix.model_dump(mode="json"))
+        export.fingerprint = fingerprint
+        result = await asyncio.to_thread(
+            get_storage().save,
+            io.BytesIO(content),
+            key=storage_key_for(export),
+            content_type=CONTENT_TYPES[export.format],
+        )
+    except Exception as exc:
+        logger.exception("Report export %s failed", export.id)
+        await db.rollback()
+        export.status = ReportExportStatus.FAILED
+        export.error = str(exc)[:1000]
+        export.completed_at = _utcnow()
+        await db.commit()
+        await db.refresh(export)
+        return export
+
+    export.status = ReportExportStatus.COMPLETED
+    export.storage_key = result.key
+    export.size_bytes = result.size_bytes
+    export.error = None
+    export.completed_at = _utcnow()
+    await db.commit()
+    return export
+
+
+async def _render_in_background(export_id: UUID) -> None:
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        export = await get_report_export(db, export_id)
+        if export is not None:
+            await render_report_export(db, export)
+
+
+def start_report_export(export_id: UUID) -> asyncio.Task:
+    """Render the export in a background task with its own DB session; poll the export for the result."""
+    task = asyncio.get_running_loop().create_task(_render_in_background(export_id))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+def open_report_file(export: ReportExport) -> BinaryIO:
+    """Open a completed export's stored file; raises ``FileNotFoundError`` if it is gone."""
+    if export.status != ReportExportStatus.COMPLETED or not export.storage_key:
+        raise FileNotFoundError(f"report export {export.id} has no file")
+    return get_storage().open(export.storage_key)
@@ -0,0 +1,93 @@
+"""Periodic in-process background jobs.
+
+Jobs are plain ``async`` callables run on a fixed interval by an asyncio task
+started from the application's startup hook.  A failing run is logged and the
+job keeps its schedule, so one bad run never stops later runs.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """Run *func* every *interval_seconds* until stopped."""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        interval_seconds: float,
+        initial_delay_seconds: float = 0.0,
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.initial_delay_seconds = initial_delay_seconds
+        self.runs = 0
+        self.failures = 0
+        self.last_result: Any = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def run_once(self) -> Any:
+        """Run the job a single time, recording the outcome."""
+        try:
+            self.last_result = await self.func()
+        except Exception:
+            self.failures += 1
+            logger.exception("Periodic job %s failed", self.name)
+            return None
+        finally:
+            self.runs += 1
+        return self.last_result
+
+    async def _loop(self) -> None:
+        if self.initial_delay_seconds > 0:
+            await asyncio.sleep(self.initial_delay_seconds)
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._loop(), name=f"periodic:{self.name}")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+_jobs: dict[str, PeriodicJob] = {}
+
+
+def register_job(job: PeriodicJob) -> PeriodicJob:
+    """Register *job* under its name, replacing any job with the same name."""
+    _jobs[job.name] = job
+    return job
+
+
+def get_jobs() -> dict[str, PeriodicJob]:
+    return dict(_jobs)
+
+
+def start_all() -> None:
+    for job in _jobs.values():
+        job.start()
+
+
+async def stop_all() -> None:
+    for job in _jobs.values():
+        await job.stop()
@@ -0,0 +1,167 @@
+"""Traceability matrix PDF rendering
+
+CPU-bound reportlab work, kept free of database and event-loop dependencies so
+it can run in a worker process (see ``app.services.report_exports``).
+"""
+
+import io
+from datetime import datetime, timezone
+from typing import Any
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from app.schemas.traceability import TraceabilityMatrixResponse
+
+
+def render_traceability_pdf(matrix: dict[str, Any]) -> bytes:
+    """
+    Render the traceability matrix report as PDF.
+
+    Args:
+        matrix: ``TraceabilityMatrixResponse`` dumped to a dict (picklable across processes)
+
+    Returns:
+        PDF file content
+    """
+    matrix_data = TraceabilityMatrixResponse.model_validate(matrix)
+
+    # Build PDF using reportlab
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.75 * inch, bottomMargin=0.75 * inch)
+    styles = getSampleStyleSheet()
+    elements = []
+
+    # Title
+    elements.append(Paragraph("BGSTM Traceability Matrix Report", styles["Title"]))
+    gen_date = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    elements.append(Paragraph(f"Generated: {gen_date}", styles["Normal"]))
+    elements.append(Spacer(1, 0.2 * inch))
+
+    # Coverage Summary
+    elements.append(Paragraph("Coverage Summary", styles["Heading2"]))
+    summary_data = [
+        ["Metric", "Value"],
+        ["Total Requirements", str(matrix_data.total_requirements)],
+        ["Covered Requirements", str(matrix_data.covered_requirements)],
+        ["Uncovered Requirements", str(matrix_data.uncovered_requirements)],
+        ["Coverage Percentage", f"{matrix_data.coverage_percentage:.1f}%"],
+        ["Total Test Cases", str(matrix_data.total_test_cases)],
+        ["Orphan Test Cases", str(matrix_data.orphan_test_cases)],
+    ]
+    summary_table = Table(summary_data, colWidths=[3 * inch, 2 * inch])
+    summary_table.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+                ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+            ]
+        )
+    )
+    elements.append(summary_table)
+    elements.append(Spacer(1, 0.2 * inch))
+
+    # Gap Analysis
+    uncovered = [r for r in matrix_data.matrix if r.coverage_status == "uncovered"]
+    elements.append(Paragraph("Gap Analysis – Uncovered Requirements", styles["Heading2"]))
+    if uncovered:
+        gap_data = [["External ID", "Requirement Title"]]
+        for r in uncovered:
+            gap_data.append([r.external_id or "", r.requirement_title])
+        gap_table = Table(gap_data, colWidths=[1.5 * inch, 5 * inch])
+        gap_table.setStyle(
+            TableStyle(
+                [
+                    ("BACKGROUND", (0, 0), (-1, 0), colors.red),
+                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                    ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+                    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+                ]
+            )
+        )
+        elements.append(gap_table)
+    else:
+        elements.append(Paragraph("No uncovered requirements.", styles["Normal"]))
+    elements.append(Spacer(1, 0.2 * inch))
+
+    # Full Matrix Table
+    elements.append(Paragraph("Requirements Coverage Matrix", styles["Heading2"]))
+    matrix_table_data = [["Req ID", "Requirement Title", "Coverage", "Test Case Title", "Link Type", "Score"]]
+    for req_coverage in matrix_data.matrix:
+        if req_coverage.linked_test_cases:
+            for i, tc in enumerate(req_coverage.linked_test_cases):
+                score = f"{tc.confidence_score:.2f}" if tc.confidence_score is not None else "—"
+                matrix_table_data.append(
+                    [
+                        req_coverage.external_id or "" if i == 0 else "",
+                        req_coverage.requirement_title if i == 0 else "",
+                        req_coverage.coverage_status.replace("_", " ").title() if i == 0 else "",
+                        tc.title,
+                        tc.link_type,
+                        score,
+                    ]
+                )
+        else:
+            matrix_table_data.append(
+                [
+                    req_coverage.external_id or "",
+                    req_coverage.requirement_title,
+                    req_coverage.coverage_status.replace("_", " ").title(),
+                    "—",
+                    "—",
+                    "—",
+                ]
+            )
+    col_widths = [1.0 * inch, 2.2 * inch, 1.1 * inch, 2.0 * inch, 0.8 * inch, 0.6 * inch]
+    matrix_pdf_table = Table(matrix_table_data, colWidths=col_widths, repeatRows=1)
+    matrix_pdf_table.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.darkblue),
+                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("FONTSIZE", (0, 0), (-1, -1), 8),
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+                ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+            ]
+        )
+    )
+    elements.append(matrix_pdf_table)
+    elements.append(Spacer(1, 0.2 * inch))
+
+    # Orphan Test Cases
+    if matrix_data.orphans:
+        elements.append(Paragraph("Orphan Test Cases (No Linked Requirements)", styles["Heading2"]))
+        orphan_data = [["External ID", "Test Case Title"]]
+        for orphan in matrix_data.orphans:
+            orphan_data.append([orphan.external_id or "", orphan.title])
+        orphan_table = Table(orphan_data, colWidths=[1.5 * inch, 5 * inch])
+        orphan_table.setStyle(
+            TableStyle(
+                [
+                    ("BACKGROUND", (0, 0), (-1, 0), colors.orange),
+                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                    ("FONTSIZE", (0, 0), (-1, -1), 8),
+                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                    ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+                    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+                ]
+            )
+        )
+        elements.append(orphan_table)
+
+    doc.build(elements)
+    return buffer.getvalue()
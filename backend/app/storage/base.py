@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import BinaryIO
 
 
 @dataclass
@@ -31,3 +32,11 @@ class StorageBackend(ABC):
     @abstractmethod
     def url_for(self, key: str) -> str:
         """Return the public download URL for *key*."""
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO:
+        """Open the object stored under *key* for binary reading.
+
+        Raises :class:`FileNotFoundError` if nothing is stored under *key*.
+        The caller closes the returned file object.
+        """
@@ -9,6 +9,7 @@ from __future__ import annotations
 import os
 import shutil
 from pathlib import Path
+from typing import BinaryIO
 
 from .base import StorageBackend, StorageResult
 
@@ -27,11 +28,15 @@ class LocalFsBackend(StorageBackend):
         self._root = Path(root)
         self._url_prefix = url_prefix.rstrip("/")
 
-    def save(self, stream, *, key: str, content_type: str) -> StorageResult:
+    def _path_for(self, key: str) -> Path:
         dest = (self._root / key).resolve()
         # Second line of defense: reject keys that escape the artifact root.
         if not dest.is_relative_to(self._root.resolve()):
             raise ValueError(f"storage key {key!r} escapes artifact root")
+        return dest
+
+    def save(self, stream, *, key: str, content_type: str) -> StorageResult:
+        dest = self._path_for(key)
         dest.parent.mkdir(parents=True, exist_ok=True)
         with dest.open("wb") as fp:
             shutil.copyfileobj(stream, fp)
@@ -46,6 +51,9 @@ class LocalFsBackend(StorageBackend):
     def url_for(self, key: str) -> str:
         return f"{self._url_prefix}/{key}"
 
+    def open(self, key: str) -> BinaryIO:
+        return self._path_for(key).open("rb")
+
     @property
     def root(self) -> Path:
         return self._root
@@ -6,6 +6,8 @@ Real implementation is out of scope for this milestone; set
 
 from __future__ import annotations
 
+from typing import BinaryIO
+
 from .base import StorageBackend, StorageResult
 
 
@@ -20,3 +22,6 @@ class S3Backend(StorageBackend):
 
     def url_for(self, key: str) -> str:
         raise NotImplementedError("S3 backend not yet implemented; set BGSTM_STORAGE_BACKEND=local")
+
+    def open(self, key: str) -> BinaryIO:
+        raise NotImplementedError("S3 backend not yet implemented; set BGSTM_STORAGE_BACKEND=local")
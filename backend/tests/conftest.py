@@ -0,0 +1,19 @@
+"""Shared test fixtures"""
+
+import pytest
+
+from app.ai_suggestions.memory_cache import get_shared_embedding_cache
+from app.cache import get_result_cache
+from app.crud.embedding_cache import access_tracker
+
+
+@pytest.fixture(autouse=True)
+def _clear_shared_embedding_cache():
+    """Keep process-wide embedding and result cache state from leaking between tests."""
+    get_shared_embedding_cache().clear()
+    get_result_cache().clear()
+    access_tracker.clear()
+    yield
+    get_shared_embedding_cache().clear()
+    get_result_cache().clear()
+    access_tracker.clear()
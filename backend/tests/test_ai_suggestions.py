@@ -16,6 +16,7 @@ from app.ai_suggestions.algorithms import (
 )
 from app.ai_suggestions.config import SuggestionConfig
 from app.ai_suggestions.engine import SuggestionEngine
+from app.ai_suggestions.memory_cache import get_shared_embedding_cache
 from app.models.base import Base
 from app.models.embedding_cache import EmbeddingCache
 from app.models.link import LinkSource, LinkType, RequirementTestCaseLink
@@ -271,8 +272,8 @@ def test_llm_get_embeddings_batch_openai():
             assert result[2] == emb_a  # duplicate resolved from cache
 
             # Cache should be populated
-            assert algo._embedding_cache["text_a"] == emb_a
-            assert algo._embedding_cache["text_b"] == emb_b
+            assert algo._embedding_cache["text_a"] == pytest.approx(emb_a)
+            assert algo._embedding_cache["text_b"] == pytest.approx(emb_b)
 
             # Only one API call (deduplication)
             assert mock_client.embeddings.create.call_count == 1
@@ -305,7 +306,7 @@ def test_llm_get_embeddings_batch_uses_cache():
             result = algo.get_embeddings_batch(["cached_text", "new_text"])
 
             # Cached text should return the cached value
-            assert result[0] == [0.9] * 1536
+            assert result[0] == pytest.approx([0.9] * 1536)
             # New text fetched from API
             assert result[1] == [0.3] * 1536
 
@@ -600,7 +601,7 @@ async def test_db_embedding_cache_save_and_retrieve():
     async with AsyncSessionLocal() as session:
         hits = await get_cached_embeddings_batch(session, [text_hash], model_name)
         assert text_hash in hits
-        assert hits[text_hash] == embedding
+        assert hits[text_hash] == pytest.approx(embedding)
 
     await engine.dispose()
 
@@ -635,7 +636,7 @@ async def test_db_embedding_cache_upsert():
 
     async with AsyncSessionLocal() as session:
         hits = await get_cached_embeddings_batch(session, [text_hash], model_name)
-        assert hits[text_hash] == [0.9, 0.8]
+        assert hits[text_hash] == pytest.approx([0.9, 0.8])
 
     await engine.dispose()
 
@@ -679,8 +680,133 @@ async def test_db_embedding_cache_different_models():
         hits_small = await get_cached_embeddings_batch(session, [text_hash], "text-embedding-3-small")
         hits_large = await get_cached_embeddings_batch(session, [text_hash], "text-embedding-3-large")
 
-    assert hits_small[text_hash] == emb_small
-    assert hits_large[text_hash] == emb_large
+    assert hits_small[text_hash] == pytest.approx(emb_small)
+    assert hits_large[text_hash] == pytest.approx(emb_large)
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_db_embedding_cache_stores_packed_float32():
+    """Embeddings are stored as 4 bytes per dimension and loaded as float32 arrays."""
+    import numpy as np
+    from sqlalchemy import text as sql_text
+
+    from app.crud.embedding_cache import get_cached_embeddings_batch, save_embeddings_batch
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    text_hash = compute_text_hash("some text")
+    embedding = np.linspace(-1.0, 1.0, 1536)
+
+    async with AsyncSessionLocal() as session:
+        await save_embeddings_batch(
+            session,
+            [{"text_hash": text_hash, "embedding": embedding, "model_name": "m", "provider": "openai"}],
+        )
+        await session.commit()
+
+    async with AsyncSessionLocal() as session:
+        raw = (await session.execute(sql_text("SELECT embedding FROM embedding_cache"))).scalar_one()
+        hits = await get_cached_embeddings_batch(session, [text_hash], "m")
+
+    assert len(raw) == 1536 * 4
+    assert hits[text_hash].dtype == np.float32
+    np.testing.assert_allclose(hits[text_hash], embedding, rtol=1e-6)
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_db_embedding_cache_skips_rows_with_wrong_dimensions():
+    """A stored vector whose length disagrees with ``dimensions`` is treated as a cache miss."""
+    from sqlalchemy import update
+
+    from app.crud.embedding_cache import get_cached_embeddings_batch, save_embeddings_batch
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    good_hash = compute_text_hash("good")
+    bad_hash = compute_text_hash("bad")
+
+    async with AsyncSessionLocal() as session:
+        await save_embeddings_batch(
+            session,
+            [
+                {"text_hash": good_hash, "embedding": [0.1, 0.2], "model_name": "m", "provider": "openai"},
+                {"text_hash": bad_hash, "embedding": [0.3, 0.4], "model_name": "m", "provider": "openai"},
+            ],
+        )
+        await session.execute(update(EmbeddingCache).where(EmbeddingCache.text_hash == bad_hash).values(dimensions=3))
+        await session.commit()
+
+    async with AsyncSessionLocal() as session:
+        hits = await get_cached_embeddings_batch(session, [good_hash, bad_hash], "m")
+
+    assert set(hits) == {good_hash}
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_db_embedding_cache_bulk_upsert_is_chunked():
+    """Large batches are written with one INSERT ... ON CONFLICT executemany per chunk and looked up in chunks."""
+    from sqlalchemy import event, func, select
+
+    from app.crud.embedding_cache import UPSERT_CHUNK_ROWS, get_cached_embeddings_batch, save_embeddings_batch
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    statements: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    n = UPSERT_CHUNK_ROWS * 2 + 500
+    hashes = [compute_text_hash(f"text {i}") for i in range(n)]
+    entries = [
+        {"text_hash": h, "embedding": [float(i), 1.0], "model_name": "m", "provider": "openai"}
+        for i, h in enumerate(hashes)
+    ]
+
+    async with AsyncSessionLocal() as session:
+        await save_embeddings_batch(session, entries)
+        # Re-saving updates in place, and duplicate keys in one batch collapse to the last entry.
+        await save_embeddings_batch(
+            session,
+            [
+                {"text_hash": hashes[0], "embedding": [5.0, 5.0], "model_name": "m", "provider": "openai"},
+                {"text_hash": hashes[0], "embedding": [7.0, 7.0], "model_name": "m", "provider": "openai"},
+            ],
+        )
+        await session.commit()
+
+    inserts = [stmt for stmt in statements if stmt.lstrip().startswith("INSERT INTO embedding_cache ")]
+    assert len(inserts) == 3 + 1
+    assert all("ON CONFLICT" in stmt for stmt in inserts)
+
+    async with AsyncSessionLocal() as session:
+        assert (await session.execute(select(func.count()).select_from(EmbeddingCache))).scalar_one() == n
+        # More hashes than SQLite's bound-parameter limit in a single lookup.
+        misses = [compute_text_hash(f"missing {i}") for i in range(40_000)]
+        hits = await get_cached_embeddings_batch(session, misses + hashes, "m")
+
+    assert len(hits) == n
+    assert hits[hashes[0]] == pytest.approx([7.0, 7.0])
+    assert hits[hashes[-1]] == pytest.approx([float(n - 1), 1.0])
 
     await engine.dispose()
 
@@ -785,8 +911,8 @@ async def test_llm_load_cached_embeddings_populates_in_memory_cache():
                 hits = await algo.load_cached_embeddings(session, [text])
 
             assert text in hits
-            assert hits[text] == stored_embedding
-            assert algo._embedding_cache[text] == stored_embedding
+            assert hits[text] == pytest.approx(stored_embedding)
+            assert algo._embedding_cache[text] == pytest.approx(stored_embedding)
 
             # precompute_embeddings should NOT call the API for the cached text
             algo.precompute_embeddings([text])
@@ -840,7 +966,7 @@ async def test_llm_save_embeddings_to_db():
                 hits = await get_cached_embeddings_batch(session, [compute_text_hash(text)], algo.model)
 
             assert compute_text_hash(text) in hits
-            assert hits[compute_text_hash(text)] == embedding
+            assert hits[compute_text_hash(text)] == pytest.approx(embedding)
 
             await engine.dispose()
         finally:
@@ -911,12 +1037,16 @@ async def test_engine_llm_uses_db_cache_on_second_run():
             api_calls_after_first_run = mock_client.embeddings.create.call_count
             assert api_calls_after_first_run >= 1
 
-            # Second run: embeddings should be loaded from DB — no new API calls
+            # Second run after a restart (empty process-wide memory cache): embeddings
+            # should be loaded from DB — no new API calls
+            get_shared_embedding_cache().clear()
             async with AsyncSessionLocal() as session:
                 sug_engine2 = SuggestionEngine(config=config)
-                await sug_engine2.generate_suggestions(session)
+                second_run = await sug_engine2.generate_suggestions(session)
 
             assert mock_client.embeddings.create.call_count == api_calls_after_first_run
+            assert second_run["embedding_cache_hit_ratio"] == 1.0
+            assert "embed" in second_run["timings"]
 
             await db_engine.dispose()
         finally:
@@ -4,8 +4,10 @@ import uuid
 from datetime import datetime
 
 import pytest
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.crud.suggestion_rollup import adjust_suggestion_rollup, rebuild_suggestion_rollup
 from app.models.base import Base
 from app.models.requirement import PriorityLevel, Requirement, RequirementStatus, RequirementType
 from app.models.suggestion import LinkSuggestion, SuggestionMethod, SuggestionStatus
@@ -116,6 +118,8 @@ async def create_analytics_sample_data(session: AsyncSession):
     )
 
     session.add_all([sugg1, sugg2, sugg3, sugg4])
+    await session.flush()
+    await rebuild_suggestion_rollup(session)
     await session.commit()
 
 
@@ -362,3 +366,50 @@ async def test_algorithm_comparison_empty():
             assert item["avg_confidence"] == 0.0
 
     await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_only_aggregate_rows_are_fetched():
+    """Bin edges, an even-count median and the absence of per-suggestion row loads"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with AsyncSessionLocal() as session:
+        await create_analytics_sample_data(session)
+        requirement_id = (await session.execute(select(Requirement.id).limit(1))).scalar_one()
+        test_case_id = (await session.execute(select(TestCase.id).limit(1))).scalar_one()
+        expired = LinkSuggestion(
+            requirement_id=requirement_id,
+            test_case_id=test_case_id,
+            similarity_score=0.2,
+            suggestion_method=SuggestionMethod.KEYWORD_MATCH,
+            status=SuggestionStatus.EXPIRED,
+            created_at=datetime(2024, 7, 1, 0, 0, 0),
+            reviewed_at=datetime(2024, 7, 1, 10, 0, 0),
+        )
+        session.add(expired)
+        await session.flush()
+        await adjust_suggestion_rollup(session, LinkSuggestion.id == expired.id)
+        await session.commit()
+
+        statements = []
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        analytics = SuggestionAnalytics(session)
+        rates = await analytics.get_acceptance_rates()
+        dist = {d["range"]: d["count"] for d in await analytics.get_confidence_distribution()}
+        velocity = await analytics.get_review_velocity()
+
+        assert [(r["period"], r["pending"]) for r in rates] == [("2024-06", 1), ("2024-07", 1)]
+        assert dist["0.2-0.4"] == 1
+        # Sorted [2, 2, 10, 24] → mean of the two middle durations
+        assert velocity["median_hours"] == pytest.approx(6.0, rel=0.01)
+        assert not any("link_suggestions.id" in statement for statement in statements)
+
+    await engine.dispose()
@@ -0,0 +1,164 @@
+"""Tests for the Arrow IPC / Parquet exports of the matrix, suggestions and case results"""
+
+import io
+import uuid
+
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api import columnar
+from app.auth.dependencies import get_current_user, get_runner_or_user_auth
+from app.db.session import get_db
+from app.main import app
+from app.models.base import Base
+from app.models.external_case_result import CaseStatus, ExternalCaseResult
+from app.models.external_results import ExternalRunSession
+from app.models.link import LinkSource, LinkType, RequirementTestCaseLink
+from app.models.requirement import PriorityLevel, Requirement, RequirementType
+from app.models.suggestion import LinkSuggestion, SuggestionMethod, SuggestionStatus
+from app.models.test_case import TestCase, TestCaseType
+from app.models.user import User, UserRole
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with factory() as session:
+            yield session
+
+    user = User(
+        id=uuid.uuid4(),
+        email="test@example.com",
+        hashed_password="hashed",
+        full_name="Test User",
+        role=UserRole.admin,
+        is_active=True,
+    )
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_runner_or_user_auth] = lambda: user
+    yield factory
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def sample(session_factory):
+    async with session_factory() as session:
+        requirement = Requirement(
+            external_id="REQ-001",
+            title="Login",
+            description="desc",
+            type=RequirementType.FUNCTIONAL,
+            priority=PriorityLevel.HIGH,
+        )
+        test_case = TestCase(
+            external_id="TC-001",
+            title="Login works",
+            description="desc",
+            type=TestCaseType.FUNCTIONAL,
+            priority=PriorityLevel.HIGH,
+        )
+        session.add_all([requirement, test_case])
+        await session.flush()
+        session.add(
+            RequirementTestCaseLink(
+                requirement_id=requirement.id,
+                test_case_id=test_case.id,
+                link_type=LinkType.COVERS,
+                link_source=LinkSource.MANUAL,
+                confidence_score=0.9,
+            )
+        )
+        for score, status in ((0.8, SuggestionStatus.ACCEPTED), (0.4, SuggestionStatus.PENDING)):
+            session.add(
+                LinkSuggestion(
+                    requirement_id=requirement.id,
+                    test_case_id=test_case.id,
+                    similarity_score=score,
+                    suggestion_method=SuggestionMethod.SEMANTIC_SIMILARITY,
+                    status=status,
+                )
+            )
+        run = ExternalRunSession(project_id=uuid.uuid4(), runner="pytest", created_by_runner_token_id=uuid.uuid4())
+        session.add(run)
+        await session.flush()
+        session.add(
+            ExternalCaseResult(
+                session_id=run.id,
+                test_case_id=test_case.id,
+                external_id="TC-001",
+                title="Login works",
+                outcome=CaseStatus.passed,
+                duration_ms=1200,
+            )
+        )
+        await session.commit()
+        return {"requirement": requirement, "test_case": test_case, "run": run}
+
+
+def test_traceability_matrix_arrow_stream_is_typed(sample):
+    response = TestClient(app).get("/api/v1/traceability-matrix/export?format=arrow")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.schema.field("requirement_id").type == pa.uuid()
+    assert table.schema.field("link_source").type == pa.dictionary(pa.int32(), pa.string())
+    assert table.schema.field("confidence_score").type == pa.float64()
+    [row] = table.to_pylist()
+    assert row["requirement_id"] == sample["requirement"].id
+    assert row["test_case_id"] == sample["test_case"].id
+    assert (row["coverage_status"], row["link_type"], row["link_source"]) == ("covered", "covers", "manual")
+
+
+def test_suggestions_parquet_honours_the_csv_filters(sample):
+    client = TestClient(app)
+    response = client.get("/api/v1/suggestions/export/parquet?status=accepted")
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == "attachment; filename=suggestions.parquet"
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.schema.field("created_at").type == pa.timestamp("us", tz="UTC")
+    assert table.column("status").to_pylist() == ["accepted"]
+    assert table.column("similarity_score").to_pylist() == [0.8]
+    assert table.column("requirement_title").to_pylist() == ["Login"]
+
+    assert client.get("/api/v1/suggestions/export/parquet?status=bogus").status_code == 400
+    assert client.get("/api/v1/suggestions/export/xlsx").status_code == 422
+
+
+def test_case_results_export_filters_by_session(sample):
+    client = TestClient(app)
+    table = pa.ipc.open_stream(
+        client.get(f"/api/v1/external-results/cases/export/arrow?session_id={sample['run'].id}").content
+    ).read_all()
+    assert table.num_rows == 1
+    assert table.column("outcome").to_pylist() == ["passed"]
+    assert table.column("duration_ms").type == pa.int64()
+
+    other = client.get(f"/api/v1/external-results/cases/export/arrow?session_id={uuid.uuid4()}")
+    empty = pa.ipc.open_stream(other.content).read_all()
+    assert empty.num_rows == 0
+    assert empty.schema.names[:3] == ["id", "session_id", "test_case_id"]
+
+
+def test_missing_pyarrow_is_reported_as_not_implemented(sample, monkeypatch):
+    def _missing():
+        raise ImportError("pyarrow is required for Arrow/Parquet exports. Run: pip install pyarrow")
+
+    monkeypatch.setattr(columnar, "require_pyarrow", _missing)
+    response = TestClient(app).get("/api/v1/traceability-matrix/export?format=parquet")
+
+    assert response.status_code == 501
+    assert "pip install pyarrow" in response.json()["detail"]
@@ -0,0 +1,162 @@
+"""Tests for data-version ETags and conditional GETs on the polled read endpoints"""
+
+import uuid
+
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.auth.dependencies import get_current_user
+from app.crud import traceability as traceability_crud
+from app.crud.data_version import LINKS, REQUIREMENTS, SUGGESTIONS, TEST_CASES, get_data_versions
+from app.db.session import get_db
+from app.main import app
+from app.models.base import Base
+from app.models.requirement import PriorityLevel, Requirement, RequirementType
+from app.models.suggestion import LinkSuggestion, SuggestionStatus
+from app.models.user import User, UserRole
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with factory() as session:
+            yield session
+
+    async def override_get_current_user():
+        return User(
+            id=uuid.uuid4(),
+            email="test@example.com",
+            hashed_password="hashed",
+            full_name="Test User",
+            role=UserRole.admin,
+            is_active=True,
+        )
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    yield factory
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+def _requirement(title: str) -> Requirement:
+    return Requirement(
+        external_id=f"REQ-{uuid.uuid4().hex[:8]}",
+        title=title,
+        description="desc",
+        type=RequirementType.FUNCTIONAL,
+        priority=PriorityLevel.HIGH,
+    )
+
+
+async def _versions(factory) -> dict[str, int]:
+    async with factory() as session:
+        return await get_data_versions(session, [REQUIREMENTS, TEST_CASES, LINKS, SUGGESTIONS])
+
+
+@pytest.mark.asyncio
+async def test_matching_etag_is_answered_without_running_the_query(session_factory, monkeypatch):
+    async with session_factory() as session:
+        session.add(_requirement("Login"))
+        await session.commit()
+
+    client = TestClient(app)
+    first = client.get("/api/v1/traceability-matrix")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    async def _must_not_run(db):
+        raise AssertionError("an unchanged poll must not compute the matrix")
+
+    monkeypatch.setattr(traceability_crud, "get_traceability_matrix", _must_not_run)
+    for if_none_match in (etag, etag.removeprefix("W/"), f'"other", {etag}', "*"):
+        cached = client.get("/api/v1/traceability-matrix", headers={"If-None-Match": if_none_match})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+
+    # Each URL has its own tag even when the versions are the same.
+    summary = client.get("/api/v1/traceability-matrix/summary", headers={"If-None-Match": etag})
+    assert summary.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_orm_writes_change_the_etag(session_factory):
+    client = TestClient(app)
+    etag = client.get("/api/v1/metrics").headers["etag"]
+
+    async with session_factory() as session:
+        requirement = _requirement("Login")
+        session.add(requirement)
+        await session.commit()
+        requirement.title = "Login v2"
+        await session.commit()
+    assert (await _versions(session_factory))[REQUIREMENTS] == 2
+
+    response = client.get("/api/v1/metrics", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_statement_writes_bump_only_their_table(session_factory):
+    async with session_factory() as session:
+        requirement = _requirement("Login")
+        session.add(requirement)
+        await session.commit()
+    client = TestClient(app)
+    matrix_etag = client.get("/api/v1/traceability-matrix").headers["etag"]
+    analytics_etag = client.get("/api/v1/analytics/acceptance-rates").headers["etag"]
+    before = await _versions(session_factory)
+
+    async with session_factory() as session:
+        await session.execute(update(LinkSuggestion).values(status=SuggestionStatus.REJECTED))
+        await session.commit()
+        # Rolled-back writes leave the versions untouched.
+        session.add(_requirement("Never committed"))
+        await session.flush()
+        await session.rollback()
+
+    after = await _versions(session_factory)
+    assert after[SUGGESTIONS] == before[SUGGESTIONS] + 1
+    assert after[REQUIREMENTS] == before[REQUIREMENTS]
+    assert client.get("/api/v1/traceability-matrix", headers={"If-None-Match": matrix_etag}).status_code == 304
+    assert (
+        client.get("/api/v1/analytics/acceptance-rates", headers={"If-None-Match": analytics_etag}).status_code == 200
+    )
+
+
+@pytest.mark.asyncio
+async def test_versions_are_bumped_after_the_commit_not_in_the_writers_transaction(session_factory):
+    before = await _versions(session_factory)
+    async with session_factory() as session:
+        statements = []
+
+        @event.listens_for(session.bind.sync_engine, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        session.add(_requirement("Login"))
+        await session.flush()
+        await session.execute(update(LinkSuggestion).values(status=SuggestionStatus.REJECTED))
+        # A long writer holds no version row lock until it commits.
+        assert not any("data_versions" in statement for statement in statements)
+        assert await _versions(session_factory) == before
+
+        await session.commit()
+        event.remove(session.bind.sync_engine, "before_cursor_execute", record)
+
+    after = await _versions(session_factory)
+    assert after[REQUIREMENTS] == before[REQUIREMENTS] + 1
+    assert after[SUGGESTIONS] == before[SUGGESTIONS] + 1
+    assert after[LINKS] == before[LINKS]
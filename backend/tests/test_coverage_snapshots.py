@@ -0,0 +1,174 @@
+"""Tests for coverage snapshots, coverage-drop alerts and the coverage history endpoint"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.auth.dependencies import get_current_user
+from app.config import settings
+from app.crud.coverage_history import capture_coverage_snapshot
+from app.crud.link import create_link, delete_link
+from app.crud.requirement import create_requirement
+from app.crud.test_case import create_test_case
+from app.db.session import get_db
+from app.main import app
+from app.models.base import Base
+from app.models.coverage import CoverageSnapshot
+from app.models.notification import Notification, NotificationType
+from app.models.requirement import PriorityLevel, RequirementType
+from app.models.test_case import TestCaseType
+from app.models.user import User, UserRole
+from app.schemas.link import LinkCreate
+from app.schemas.requirement import RequirementCreate
+from app.schemas.test_case import TestCaseCreate
+from app.services.coverage_snapshots import scheduled_coverage_snapshot
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with factory() as session:
+            yield session
+
+    async def override_get_current_user():
+        return User(
+            id=uuid.uuid4(),
+            email="test@example.com",
+            hashed_password="hashed",
+            full_name="Test User",
+            role=UserRole.admin,
+            is_active=True,
+        )
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    yield factory
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+async def _requirement(session: AsyncSession, title: str, module: str | None = None):
+    return await create_requirement(
+        session,
+        RequirementCreate(
+            title=title,
+            description=title,
+            type=RequirementType.FUNCTIONAL,
+            priority=PriorityLevel.HIGH,
+            module=module,
+        ),
+    )
+
+
+async def _test_case(session: AsyncSession, title: str):
+    return await create_test_case(
+        session,
+        TestCaseCreate(title=title, description=title, type=TestCaseType.FUNCTIONAL, priority=PriorityLevel.HIGH),
+    )
+
+
+@pytest.mark.asyncio
+async def test_snapshot_records_totals_and_module_breakdown(session_factory):
+    async with session_factory() as session:
+        login = await _requirement(session, "Login", module="auth")
+        await _requirement(session, "Logout", module="auth")
+        await _requirement(session, "Export")
+        test_case = await _test_case(session, "Login works")
+        await _test_case(session, "Unrelated")
+        await create_link(session, LinkCreate(requirement_id=login.id, test_case_id=test_case.id))
+
+        snapshot = await capture_coverage_snapshot(session)
+        await session.commit()
+
+    assert (snapshot.total_requirements, snapshot.covered_requirements, snapshot.uncovered_requirements) == (3, 1, 2)
+    assert (snapshot.total_test_cases, snapshot.orphan_test_cases) == (2, 1)
+    assert snapshot.coverage_percentage == 33.33
+    assert snapshot.modules == [
+        {"module": None, "total": 1, "covered": 0, "partially_covered": 0, "uncovered": 1},
+        {"module": "auth", "total": 2, "covered": 1, "partially_covered": 0, "uncovered": 1},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_job_alerts_admins_only_when_the_threshold_is_crossed(session_factory, monkeypatch):
+    monkeypatch.setattr("app.db.session.AsyncSessionLocal", session_factory)
+    monkeypatch.setattr(settings, "COVERAGE_DROP_THRESHOLD", 80.0)
+    async with session_factory() as session:
+        session.add(User(email="admin@example.com", hashed_password="hashed", full_name="Admin", role=UserRole.admin))
+        requirement = await _requirement(session, "Login")
+        test_case = await _test_case(session, "Login works")
+        link = await create_link(session, LinkCreate(requirement_id=requirement.id, test_case_id=test_case.id))
+
+    first = await scheduled_coverage_snapshot()
+    assert (first["coverage_percentage"], first["alerted"]) == (100.0, False)
+
+    async with session_factory() as session:
+        await delete_link(session, link.id)
+    dropped = await scheduled_coverage_snapshot()
+    assert dropped == {
+        "coverage_percentage": 0.0,
+        "previous_coverage_percentage": 100.0,
+        "alerted": True,
+        "snapshots_pruned": 0,
+    }
+
+    # Still below the threshold: no repeated alert.
+    assert (await scheduled_coverage_snapshot())["alerted"] is False
+
+    async with session_factory() as session:
+        notifications = (await session.execute(select(Notification))).scalars().all()
+        assert [notification.type for notification in notifications] == [NotificationType.COVERAGE_DROP]
+        assert notifications[0].metadata_["previous_coverage"] == 100.0
+
+
+@pytest.mark.asyncio
+async def test_job_prunes_snapshots_past_retention(session_factory, monkeypatch):
+    monkeypatch.setattr("app.db.session.AsyncSessionLocal", session_factory)
+    monkeypatch.setattr(settings, "COVERAGE_SNAPSHOT_RETENTION_DAYS", 30)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    async with session_factory() as session:
+        await capture_coverage_snapshot(session, captured_at=now - timedelta(days=31))
+        await capture_coverage_snapshot(session, captured_at=now - timedelta(days=29))
+        await session.commit()
+
+    assert (await scheduled_coverage_snapshot())["snapshots_pruned"] == 1
+    async with session_factory() as session:
+        assert len((await session.execute(select(CoverageSnapshot))).scalars().all()) == 2
+
+
+@pytest.mark.asyncio
+async def test_coverage_history_returns_the_window_oldest_first(session_factory):
+    start = datetime(2026, 1, 1)
+    async with session_factory() as session:
+        await _requirement(session, "Login", module="auth")
+        for day in range(5):
+            await capture_coverage_snapshot(session, captured_at=start + timedelta(days=day))
+        await session.commit()
+
+    client = TestClient(app)
+    response = client.get(
+        "/api/v1/traceability-matrix/coverage-history",
+        params={"since": "2026-01-02T00:00:00", "until": "2026-01-04T00:00:00+00:00"},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["threshold"] == settings.COVERAGE_DROP_THRESHOLD
+    assert [point["captured_at"] for point in body["snapshots"]] == [
+        "2026-01-02T00:00:00",
+        "2026-01-03T00:00:00",
+        "2026-01-04T00:00:00",
+    ]
+    assert body["snapshots"][0]["modules"][0]["module"] == "auth"
+
+    latest = client.get("/api/v1/traceability-matrix/coverage-history", params={"limit": 2}).json()
+    assert [point["captured_at"] for point in latest["snapshots"]] == ["2026-01-04T00:00:00", "2026-01-05T00:00:00"]
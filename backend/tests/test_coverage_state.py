@@ -0,0 +1,212 @@
+"""Tests for the incrementally maintained coverage state and its reconciliation"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.crud import external_case_results
+from app.crud.coverage import get_coverage_counters, reconcile_coverage
+from app.crud.link import create_link, delete_link
+from app.crud.requirement import create_requirement, delete_requirement
+from app.crud.test_case import create_test_case, delete_test_case
+from app.crud.traceability import get_traceability_summary
+from app.models.base import Base
+from app.models.coverage import CoverageCounters, RequirementCoverage
+from app.models.link import LinkSource
+from app.models.requirement import PriorityLevel, RequirementType
+from app.models.test_case import TestCaseType
+from app.schemas.link import LinkCreate
+from app.schemas.requirement import RequirementCreate
+from app.schemas.test_case import TestCaseCreate
+from app.services.coverage_reconciliation import scheduled_coverage_reconciliation
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _requirement(session: AsyncSession, title: str):
+    return await create_requirement(
+        session,
+        RequirementCreate(title=title, description=title, type=RequirementType.FUNCTIONAL, priority=PriorityLevel.HIGH),
+    )
+
+
+async def _test_case(session: AsyncSession, title: str):
+    return await create_test_case(
+        session,
+        TestCaseCreate(title=title, description=title, type=TestCaseType.FUNCTIONAL, priority=PriorityLevel.HIGH),
+    )
+
+
+async def _counters(session: AsyncSession) -> dict[str, int]:
+    row = await get_coverage_counters(session)
+    return {
+        "requirements": row.total_requirements,
+        "covered": row.covered_requirements,
+        "partially_covered": row.partially_covered_requirements,
+        "uncovered": row.uncovered_requirements,
+        "test_cases": row.total_test_cases,
+        "orphans": row.orphan_test_cases,
+    }
+
+
+async def _assert_consistent(session: AsyncSession) -> None:
+    report = await reconcile_coverage(session, repair=False)
+    assert report == {"requirement_rows": 0, "test_case_rows": 0, "counter_drift": {}, "repaired": False}
+
+
+@pytest.mark.asyncio
+async def test_link_writes_keep_counters_in_step(session_factory):
+    async with session_factory() as session:
+        login = await _requirement(session, "Login")
+        logout = await _requirement(session, "Logout")
+        login_test = await _test_case(session, "Login works")
+        await _test_case(session, "Unrelated")
+        assert await _counters(session) == {
+            "requirements": 2,
+            "covered": 0,
+            "partially_covered": 0,
+            "uncovered": 2,
+            "test_cases": 2,
+            "orphans": 2,
+        }
+
+        manual = await create_link(session, LinkCreate(requirement_id=login.id, test_case_id=login_test.id))
+        await create_link(
+            session,
+            LinkCreate(requirement_id=logout.id, test_case_id=login_test.id, link_source=LinkSource.AI_SUGGESTED),
+        )
+        assert await _counters(session) == {
+            "requirements": 2,
+            "covered": 1,
+            "partially_covered": 1,
+            "uncovered": 0,
+            "test_cases": 2,
+            "orphans": 1,
+        }
+        await _assert_consistent(session)
+
+        await delete_link(session, manual.id)
+        counters = await _counters(session)
+        assert (counters["covered"], counters["partially_covered"], counters["uncovered"]) == (0, 1, 1)
+        await _assert_consistent(session)
+
+
+@pytest.mark.asyncio
+async def test_entity_deletes_update_the_other_side(session_factory):
+    async with session_factory() as session:
+        requirement = await _requirement(session, "Login")
+        test_case = await _test_case(session, "Login works")
+        await create_link(session, LinkCreate(requirement_id=requirement.id, test_case_id=test_case.id))
+
+        await delete_test_case(session, test_case.id)
+        assert await _counters(session) == {
+            "requirements": 1,
+            "covered": 0,
+            "partially_covered": 0,
+            "uncovered": 1,
+            "test_cases": 0,
+            "orphans": 0,
+        }
+
+        await delete_requirement(session, requirement.id)
+        assert (await _counters(session))["requirements"] == 0
+        await _assert_consistent(session)
+
+
+@pytest.mark.asyncio
+async def test_imported_links_update_coverage(session_factory):
+    async with session_factory() as session:
+        first = await _requirement(session, "Login")
+        second = await _requirement(session, "Logout")
+        test_case = await _test_case(session, "Session works")
+
+        await external_case_results._link_requirements(
+            session, test_case_id=test_case.id, requirement_ids=[first.id, second.id]
+        )
+        # Re-importing the same links is a no-op for the counters.
+        await external_case_results._link_requirements(session, test_case_id=test_case.id, requirement_ids=[first.id])
+        await session.commit()
+
+        counters = await _counters(session)
+        assert (counters["covered"], counters["orphans"]) == (2, 0)
+        await _assert_consistent(session)
+
+
+@pytest.mark.asyncio
+async def test_summary_reads_the_counters(session_factory):
+    async with session_factory() as session:
+        requirement = await _requirement(session, "Login")
+        test_case = await _test_case(session, "Login works")
+        await create_link(session, LinkCreate(requirement_id=requirement.id, test_case_id=test_case.id))
+        await _requirement(session, "Logout")
+
+        summary = await get_traceability_summary(session)
+
+        assert summary.coverage_percentage == 50.0
+        assert (summary.covered_requirements, summary.uncovered_requirements, summary.orphan_test_cases) == (1, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_reconciliation_repairs_drift(session_factory):
+    async with session_factory() as session:
+        requirement = await _requirement(session, "Login")
+        test_case = await _test_case(session, "Login works")
+        await create_link(session, LinkCreate(requirement_id=requirement.id, test_case_id=test_case.id))
+        # Simulate drift: a lost row update and a counter off by a few.
+        await session.execute(update(RequirementCoverage).values(link_count=0, accepted_count=0, status="uncovered"))
+        await session.execute(update(CoverageCounters).values(covered_requirements=4))
+        await session.commit()
+
+        report = await reconcile_coverage(session)
+        await session.commit()
+
+        assert report["requirement_rows"] == 1
+        assert report["test_case_rows"] == 0
+        assert report["counter_drift"] == {"covered_requirements": 3}
+        assert report["repaired"] is True
+        assert (await _counters(session))["covered"] == 1
+        await _assert_consistent(session)
+
+
+@pytest.mark.asyncio
+async def test_reconciliation_locks_the_counters_before_computing_the_totals(session_factory):
+    statements = []
+    async with session_factory() as session:
+        await _requirement(session, "Login")
+
+        @event.listens_for(session.sync_session, "do_orm_execute")
+        def record(state):
+            statements.append(str(state.statement.compile(dialect=postgresql.dialect())))
+
+        await reconcile_coverage(session)
+
+    locked = next(i for i, sql in enumerate(statements) if "FROM coverage_counters" in sql and "FOR UPDATE" in sql)
+    totals = next(i for i, sql in enumerate(statements) if "count(requirements.id)" in sql)
+    assert locked < totals
+
+
+@pytest.mark.asyncio
+async def test_scheduled_reconciliation_creates_missing_counters(session_factory, monkeypatch):
+    monkeypatch.setattr("app.db.session.AsyncSessionLocal", session_factory)
+
+    report = await scheduled_coverage_reconciliation()
+
+    assert report["repaired"] is True
+    async with session_factory() as session:
+        assert await _counters(session) == {
+            "requirements": 0,
+            "covered": 0,
+            "partially_covered": 0,
+            "uncovered": 0,
+            "test_cases": 0,
+            "orphans": 0,
+        }
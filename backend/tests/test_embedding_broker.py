@@ -0,0 +1,146 @@
+"""Tests for micro-batching embedding requests across concurrent callers"""
+
+import asyncio
+import gc
+import time
+import weakref
+from unittest.mock import patch
+
+import pytest
+
+from app.ai_suggestions import embedding_broker
+from app.ai_suggestions.algorithms import LLMEmbeddingSimilarity
+from app.ai_suggestions.embedding_broker import EmbeddingBroker
+
+
+class _RecordingProvider:
+    """Fake provider batch call: records every batch and returns one vector per text."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.batches: list[list[str]] = []
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("provider unavailable")
+        return [[float(len(text))] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_deduplicated_batch():
+    provider = _RecordingProvider()
+    broker = EmbeddingBroker(provider, max_wait_seconds=0.01)
+
+    results = await asyncio.gather(*(broker.embed([f"text {i}", f"text {i + 1}", "shared"]) for i in range(20)))
+
+    assert len(provider.batches) == 1
+    assert sorted(provider.batches[0]) == sorted({f"text {i}" for i in range(21)} | {"shared"})
+    assert results[3] == [[6.0], [6.0], [6.0]]
+    stats = broker.stats()
+    assert stats["requests"] == 20
+    assert stats["texts_requested"] == 60
+    assert stats["texts_embedded"] == 22
+    assert stats["texts_deduplicated"] == 38
+
+
+@pytest.mark.asyncio
+async def test_full_batch_flushes_without_waiting_for_the_window():
+    provider = _RecordingProvider()
+    broker = EmbeddingBroker(provider, max_batch_size=4, max_wait_seconds=30)
+
+    started = time.perf_counter()
+    await asyncio.gather(broker.embed(["a", "b"]), broker.embed(["c", "d"]))
+
+    assert time.perf_counter() - started < 1
+    assert provider.batches == [["a", "b", "c", "d"]]
+
+
+@pytest.mark.asyncio
+async def test_texts_in_flight_are_not_embedded_again():
+    provider = _RecordingProvider(delay=0.05)
+    broker = EmbeddingBroker(provider, max_wait_seconds=0.001)
+
+    first = asyncio.create_task(broker.embed(["a"]))
+    await asyncio.sleep(0.02)  # the first batch is now in flight
+    second = await broker.embed(["a", "b"])
+
+    assert await first == [[1.0]]
+    assert second == [[1.0], [1.0]]
+    assert provider.batches == [["a"], ["b"]]
+
+
+@pytest.mark.asyncio
+async def test_failure_reaches_every_caller_and_is_not_cached():
+    provider = _RecordingProvider(fail=True)
+    broker = EmbeddingBroker(provider, max_wait_seconds=0.001)
+
+    results = await asyncio.gather(broker.embed(["a"]), broker.embed(["a", "b"]), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    provider.fail = False
+    assert await broker.embed(["a"]) == [[1.0]]
+    assert len(provider.batches) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_shared_batch():
+    provider = _RecordingProvider(delay=0.02)
+    broker = EmbeddingBroker(provider, max_wait_seconds=0.001)
+
+    cancelled = asyncio.create_task(broker.embed(["a"]))
+    survivor = asyncio.create_task(broker.embed(["a"]))
+    await asyncio.sleep(0.005)
+    cancelled.cancel()
+
+    assert await survivor == [[1.0]]
+
+
+@pytest.mark.asyncio
+async def test_engine_instances_share_provider_calls(monkeypatch):
+    monkeypatch.setattr(embedding_broker, "_brokers", {})
+    algorithms = [LLMEmbeddingSimilarity(provider="hashing", micro_batch_window_ms=10) for _ in range(8)]
+    calls: list[list[str]] = []
+    original = LLMEmbeddingSimilarity._embed_chunk
+
+    def _counting_embed_chunk(self, chunk):
+        calls.append(list(chunk))
+        return original(self, chunk)
+
+    with patch.object(LLMEmbeddingSimilarity, "_embed_chunk", _counting_embed_chunk):
+        results = await asyncio.gather(
+            *(algorithm.aget_embeddings_batch([f"requirement {i}", "common"]) for i, algorithm in enumerate(algorithms))
+        )
+
+    assert len(calls) == 1
+    assert len(calls[0]) == 9
+    assert all(len(vectors) == 2 for vectors in results)
+    assert embedding_broker.broker_stats()["hashing/hashing-384"]["requests"] == 8
+
+
+@pytest.mark.asyncio
+async def test_brokers_are_keyed_by_settings_and_keep_no_caller_alive(monkeypatch):
+    monkeypatch.setattr(embedding_broker, "_brokers", {})
+    small = LLMEmbeddingSimilarity(provider="hashing", batch_size=2, max_retries=0)
+    large = LLMEmbeddingSimilarity(provider="hashing", batch_size=64, max_retries=0)
+    calls: list[list[str]] = []
+    original = LLMEmbeddingSimilarity._embed_chunk
+
+    def _counting_embed_chunk(self, chunk):
+        calls.append(list(chunk))
+        return original(self, chunk)
+
+    with patch.object(LLMEmbeddingSimilarity, "_embed_chunk", _counting_embed_chunk):
+        await asyncio.gather(small.aget_embeddings_batch(["a", "b", "c"]), large.aget_embeddings_batch(["d", "e", "f"]))
+
+    # Each caller's batch size decides its own provider calls.
+    assert sorted(map(sorted, calls)) == [["a", "b"], ["c"], ["d", "e", "f"]]
+    assert len(embedding_broker._brokers) == 2
+    assert embedding_broker.broker_stats()["hashing/hashing-384"]["requests"] == 2
+
+    released = weakref.ref(small)
+    del small
+    gc.collect()
+    assert released() is None
@@ -0,0 +1,176 @@
+"""Tests for embedding cache access tracking and compaction"""
+
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.ai_suggestions.algorithms import compute_text_hash
+from app.config import settings
+from app.crud.embedding_cache import (
+    access_tracker,
+    compact_embedding_cache,
+    get_cached_embeddings_batch,
+    save_embeddings_batch,
+)
+from app.models.base import Base
+from app.models.embedding_cache import EmbeddingCache
+from app.services.embedding_cache_compaction import scheduled_embedding_cache_compaction
+
+
+@pytest_asyncio.fixture
+async def db_engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session_factory(db_engine):
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _seed(session: AsyncSession, model: str, count: int, dims: int = 4) -> list[str]:
+    """Save *count* embeddings for *model*, entry i written i days ago (entry 0 is the newest)."""
+    hashes = [compute_text_hash(f"{model} text {i}") for i in range(count)]
+    await save_embeddings_batch(
+        session,
+        [{"text_hash": h, "embedding": [0.5] * dims, "model_name": model, "provider": "openai"} for h in hashes],
+    )
+    now = datetime.utcnow()
+    for i, text_hash in enumerate(hashes):
+        await session.execute(
+            update(EmbeddingCache)
+            .where(EmbeddingCache.text_hash == text_hash, EmbeddingCache.model_name == model)
+            .values(updated_at=now - timedelta(days=i))
+        )
+    await session.commit()
+    return hashes
+
+
+async def _remaining(session: AsyncSession, model: str) -> set[str]:
+    result = await session.execute(select(EmbeddingCache.text_hash).where(EmbeddingCache.model_name == model))
+    return set(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_reads_are_recorded_in_memory_and_flushed_in_one_update(db_engine, session_factory):
+    async with session_factory() as session:
+        hashes = await _seed(session, "m", 3)
+
+    statements: list[str] = []
+
+    @event.listens_for(db_engine.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    async with session_factory() as session:
+        await get_cached_embeddings_batch(session, hashes[:2], "m")
+        assert not any(stmt.lstrip().upper().startswith("UPDATE") for stmt in statements)
+        assert access_tracker.pending == 2
+
+        flushed = await access_tracker.flush(session)
+        await session.commit()
+
+        assert flushed == 2
+        assert sum(stmt.lstrip().upper().startswith("UPDATE") for stmt in statements) == 1
+        result = await session.execute(
+            select(EmbeddingCache.text_hash).where(EmbeddingCache.last_accessed_at.is_not(None))
+        )
+        assert set(result.scalars().all()) == set(hashes[:2])
+
+
+@pytest.mark.asyncio
+async def test_row_budget_evicts_least_recently_accessed(session_factory):
+    async with session_factory() as session:
+        hashes = await _seed(session, "m", 5)
+        # The two oldest writes were read recently, so they outrank the unread newer rows.
+        access_tracker.record("m", [hashes[3], hashes[4]])
+
+        report = await compact_embedding_cache(session, max_rows_per_model=3)
+        await session.commit()
+
+        assert report["accesses_flushed"] == 2
+        assert report["rows_deleted"] == 2
+        assert report["models"]["m"]["rows"] == 5
+        assert await _remaining(session, "m") == {hashes[0], hashes[3], hashes[4]}
+
+
+@pytest.mark.asyncio
+async def test_eviction_scan_reads_the_last_used_index(db_engine, session_factory):
+    async with session_factory() as session:
+        await _seed(session, "m", 3)
+        plans = []
+
+        @event.listens_for(db_engine.sync_engine, "before_cursor_execute")
+        def explain(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().startswith("SELECT") and "ORDER BY" in statement:
+                cursor.execute("EXPLAIN QUERY PLAN " + statement, parameters)
+                plans.extend(row[-1] for row in cursor.fetchall())
+
+        await compact_embedding_cache(session, max_rows_per_model=1)
+
+    assert plans and all("ix_embedding_cache_model_last_used" in plan for plan in plans)
+    assert not any("TEMP B-TREE" in plan for plan in plans)
+
+
+@pytest.mark.asyncio
+async def test_byte_budget_is_per_model(session_factory):
+    async with session_factory() as session:
+        small = await _seed(session, "small", 4, dims=4)  # 16 bytes each
+        large = await _seed(session, "large", 2, dims=4)
+
+        report = await compact_embedding_cache(session, max_bytes_per_model=40)
+        await session.commit()
+
+        assert report["models"]["small"] == {"rows": 4, "bytes": 64, "rows_deleted": 2, "bytes_reclaimed": 32}
+        assert report["models"]["large"]["rows_deleted"] == 0
+        assert report["bytes_reclaimed"] == 32
+        assert await _remaining(session, "small") == set(small[:2])
+        assert await _remaining(session, "large") == set(large)
+
+
+@pytest.mark.asyncio
+async def test_max_age_evicts_rows_not_used_recently(session_factory):
+    async with session_factory() as session:
+        hashes = await _seed(session, "m", 5)
+        access_tracker.record("m", [hashes[4]])
+
+        report = await compact_embedding_cache(session, max_age_days=2)
+        await session.commit()
+
+        # Rows written 2+ days ago are stale, except the 4-day-old row that was just read.
+        assert report["rows_deleted"] == 2
+        assert await _remaining(session, "m") == {hashes[0], hashes[1], hashes[4]}
+
+
+@pytest.mark.asyncio
+async def test_no_limits_only_flushes_accesses(session_factory):
+    async with session_factory() as session:
+        hashes = await _seed(session, "m", 3)
+        access_tracker.record("m", hashes)
+
+        report = await compact_embedding_cache(session)
+
+        assert report["accesses_flushed"] == 3
+        assert report["rows_deleted"] == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduled_compaction_uses_settings_and_commits(session_factory, monkeypatch):
+    async with session_factory() as session:
+        await _seed(session, "m", 4)
+
+    monkeypatch.setattr("app.db.session.AsyncSessionLocal", session_factory)
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_MAX_ROWS_PER_MODEL", 1)
+
+    report = await scheduled_embedding_cache_compaction()
+
+    assert report["rows_deleted"] == 3
+    assert "duration_ms" in report
+    async with session_factory() as session:
+        assert len(await _remaining(session, "m")) == 1
@@ -0,0 +1,210 @@
+"""Tests for the process-wide in-memory embedding cache"""
+
+import sys
+import uuid
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.ai_suggestions.algorithms import LLMEmbeddingSimilarity, compute_text_hash
+from app.ai_suggestions.config import SuggestionConfig
+from app.ai_suggestions.engine import SuggestionEngine
+from app.ai_suggestions.memory_cache import ENTRY_OVERHEAD_BYTES, EmbeddingLRUCache, get_shared_embedding_cache
+from app.models.base import Base
+from app.models.requirement import PriorityLevel, Requirement, RequirementStatus, RequirementType
+from app.models.test_case import AutomationStatus, TestCase, TestCaseStatus, TestCaseType
+
+ENTRY_BYTES = 4 * 4 + ENTRY_OVERHEAD_BYTES  # a 4-dimension float32 vector
+
+
+def test_lru_evicts_least_recently_used_within_byte_budget():
+    cache = EmbeddingLRUCache(max_bytes=ENTRY_BYTES * 2)
+    cache.put("m", "a", [1.0, 0.0, 0.0, 0.0])
+    cache.put("m", "b", [0.0, 1.0, 0.0, 0.0])
+    assert cache.get("m", "a") is not None  # "a" is now the most recently used
+
+    cache.put("m", "c", [0.0, 0.0, 1.0, 0.0])
+
+    assert cache.peek("m", "b") is None
+    assert cache.peek("m", "a") is not None
+    assert cache.peek("m", "c") is not None
+    assert cache.size_bytes == ENTRY_BYTES * 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_counts_hits_and_misses_and_keys_by_model():
+    cache = EmbeddingLRUCache(max_bytes=1_000_000)
+    cache.put("model-a", "h", [0.5] * 4)
+
+    assert cache.get("model-a", "h") is not None
+    assert cache.get("model-b", "h") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_lru_stores_read_only_float32():
+    cache = EmbeddingLRUCache(max_bytes=1_000_000)
+    stored = cache.put("m", "h", [0.25, 0.5])
+
+    assert stored.dtype == np.float32
+    with pytest.raises(ValueError):
+        stored[0] = 1.0
+
+
+def test_algorithm_instances_share_the_process_cache():
+    with patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"}), patch.dict(sys.modules, {"openai": MagicMock()}):
+        first = LLMEmbeddingSimilarity(provider="openai")
+        second = LLMEmbeddingSimilarity(provider="openai")
+        other_model = LLMEmbeddingSimilarity(provider="openai", model="text-embedding-3-large")
+
+    first._embedding_cache["shared text"] = [0.1, 0.2]
+
+    assert "shared text" in second._embedding_cache
+    assert "shared text" not in other_model._embedding_cache
+    assert get_shared_embedding_cache().peek(first.model, compute_text_hash("shared text")) is not None
+
+
+@pytest.mark.asyncio
+async def test_repeated_engine_runs_are_served_from_memory():
+    """A new engine per run (as event-driven generation does) reuses embeddings without DB or API calls."""
+    with patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"}):
+        mock_openai_module = MagicMock()
+        mock_client = MagicMock()
+        mock_openai_module.OpenAI.return_value = mock_client
+        mock_client.embeddings.create.side_effect = lambda input, model: MagicMock(
+            data=[MagicMock(embedding=[0.5] * 8) for _ in input]
+        )
+
+        with patch.dict(sys.modules, {"openai": mock_openai_module}):
+            db_engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+            async with db_engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            AsyncSessionLocal = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+            async with AsyncSessionLocal() as session:
+                session.add(
+                    Requirement(
+                        id=uuid.uuid4(),
+                        external_id="REQ-MEM-01",
+                        title="Authentication requirement",
+                        description="Users must authenticate",
+                        type=RequirementType.FUNCTIONAL,
+                        priority=PriorityLevel.HIGH,
+                        status=RequirementStatus.APPROVED,
+                    )
+                )
+                session.add(
+                    TestCase(
+                        id=uuid.uuid4(),
+                        external_id="TC-MEM-01",
+                        title="Test authentication",
+                        description="Verify login flow",
+                        type=TestCaseType.FUNCTIONAL,
+                        priority=PriorityLevel.HIGH,
+                        status=TestCaseStatus.READY,
+                        automation_status=AutomationStatus.AUTOMATED,
+                    )
+                )
+                await session.commit()
+
+            config = SuggestionConfig(default_algorithm="llm", min_confidence_threshold=0.0)
+            async with AsyncSessionLocal() as session:
+                await SuggestionEngine(config=config).generate_suggestions(session)
+            api_calls_after_first_run = mock_client.embeddings.create.call_count
+
+            cache_queries: list[str] = []
+
+            @event.listens_for(db_engine.sync_engine, "before_cursor_execute")
+            def _record(conn, cursor, statement, parameters, context, executemany):
+                if "embedding_cache" in statement:
+                    cache_queries.append(statement)
+
+            async with AsyncSessionLocal() as session:
+                second_run = await SuggestionEngine(config=config).generate_suggestions(session)
+
+            await db_engine.dispose()
+
+    assert mock_client.embeddings.create.call_count == api_calls_after_first_run
+    assert cache_queries == []
+    assert second_run["embedding_cache_hit_ratio"] == 1.0
+    assert get_shared_embedding_cache().stats()["hits"] > 0
+
+
+def test_an_injected_empty_cache_is_not_replaced_by_the_shared_one():
+    injected = EmbeddingLRUCache(max_bytes=1_000_000)
+    with patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"}), patch.dict(sys.modules, {"openai": MagicMock()}):
+        algorithm = LLMEmbeddingSimilarity(provider="openai", memory_cache=injected)
+
+    algorithm._embedding_cache["private text"] = [0.1, 0.2]
+
+    assert len(injected) == 1
+    assert get_shared_embedding_cache().peek(algorithm.model, compute_text_hash("private text")) is None
+
+
+@pytest.mark.asyncio
+async def test_working_set_larger_than_the_cache_is_embedded_and_persisted_once(monkeypatch):
+    """Vectors evicted from a small LRU are scored and saved from the run, not fetched from the provider again."""
+    from sqlalchemy import func, select
+
+    from app.ai_suggestions import memory_cache
+    from app.models.embedding_cache import EmbeddingCache
+
+    monkeypatch.setattr(memory_cache, "_shared_cache", EmbeddingLRUCache(max_bytes=ENTRY_BYTES * 10))
+    embedded_texts: list[str] = []
+
+    def create(input, model):
+        texts = [input] if isinstance(input, str) else list(input)
+        embedded_texts.extend(texts)
+        return MagicMock(data=[MagicMock(embedding=[len(text) % 7 + 1.0, 1.0, 0.5, 0.25]) for text in texts])
+
+    with patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"}):
+        mock_openai_module = MagicMock()
+        mock_openai_module.OpenAI.return_value.embeddings.create.side_effect = create
+        with patch.dict(sys.modules, {"openai": mock_openai_module}):
+            db_engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+            async with db_engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            AsyncSessionLocal = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+            async with AsyncSessionLocal() as session:
+                for i in range(15):
+                    session.add(
+                        Requirement(
+                            external_id=f"REQ-WS-{i:02d}",
+                            title=f"Requirement {i}",
+                            description="x" * i,
+                            type=RequirementType.FUNCTIONAL,
+                            priority=PriorityLevel.HIGH,
+                            status=RequirementStatus.APPROVED,
+                        )
+                    )
+                    session.add(
+                        TestCase(
+                            external_id=f"TC-WS-{i:02d}",
+                            title=f"Test case {i}",
+                            description="y" * i,
+                            type=TestCaseType.FUNCTIONAL,
+                            priority=PriorityLevel.HIGH,
+                            status=TestCaseStatus.READY,
+                            automation_status=AutomationStatus.AUTOMATED,
+                        )
+                    )
+                await session.commit()
+
+            config = SuggestionConfig(default_algorithm="llm", min_confidence_threshold=0.0)
+            async with AsyncSessionLocal() as session:
+                result = await SuggestionEngine(config=config).generate_suggestions(session)
+                persisted = (await session.execute(select(func.count()).select_from(EmbeddingCache))).scalar_one()
+
+            await db_engine.dispose()
+
+    assert result["pairs_analyzed"] == 225
+    assert len(embedded_texts) == len(set(embedded_texts)) == 30
+    assert persisted == 30
+    assert memory_cache._shared_cache.stats()["evictions"] > 0
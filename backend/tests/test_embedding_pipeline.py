@@ -0,0 +1,172 @@
+"""Tests for the async embedding pipeline against a local stub embedding server"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from app.ai_suggestions.algorithms import LLMEmbeddingSimilarity
+from app.ai_suggestions.embedding_pipeline import AsyncEmbeddingPipeline, is_retryable_error
+
+
+class _StubEmbeddingServer:
+    """OpenAI-compatible ``POST /v1/embeddings`` server that records concurrency and can fail on demand."""
+
+    def __init__(self, delay: float = 0.05, fail_first: int = 0, fail_status: int = 503):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub._lock:
+                    stub.requests += 1
+                    failing = stub.requests <= stub.fail_first
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    if failing:
+                        self.send_response(stub.fail_status)
+                        self.end_headers()
+                        return
+                    texts = body["input"]
+                    data = [{"index": i, "embedding": [float(len(t)), float(i)]} for i, t in enumerate(texts)]
+                    payload = json.dumps({"data": data}).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/embeddings"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _StubAPIError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class _HttpEmbeddingsClient:
+    """Minimal stand-in for ``openai.OpenAI`` that talks to the stub server over HTTP."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.embeddings = SimpleNamespace(create=self._create)
+
+    def _create(self, input, model):
+        response = httpx.post(self.url, json={"input": input, "model": model}, timeout=5)
+        if response.status_code != 200:
+            raise _StubAPIError(response.status_code)
+        return SimpleNamespace(data=[SimpleNamespace(embedding=item["embedding"]) for item in response.json()["data"]])
+
+
+def _llm_algorithm(url: str, **kwargs) -> LLMEmbeddingSimilarity:
+    with patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"}), patch.dict(sys.modules, {"openai": MagicMock()}):
+        algo = LLMEmbeddingSimilarity(provider="openai", **kwargs)
+    algo.client = _HttpEmbeddingsClient(url)
+    return algo
+
+
+@pytest.mark.asyncio
+async def test_chunks_sent_concurrently_up_to_limit_and_order_preserved():
+    texts = [f"text {'x' * i}" for i in range(12)]
+    with _StubEmbeddingServer(delay=0.1) as server:
+        algo = _llm_algorithm(server.url, batch_size=2, max_concurrency=3)
+        embeddings = await algo.aget_embeddings_batch(texts)
+
+    assert server.requests == 6
+    assert server.max_in_flight == 3
+    assert [e[0] for e in embeddings] == [float(len(t)) for t in texts]
+    assert algo._embedding_cache[texts[5]] == pytest.approx(embeddings[5])
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried():
+    with _StubEmbeddingServer(delay=0.0, fail_first=2, fail_status=429) as server:
+        algo = _llm_algorithm(server.url, max_retries=3, retry_backoff_seconds=0.01)
+        embeddings = await algo.aget_embeddings_batch(["alpha", "beta"])
+
+    assert server.requests == 3
+    assert [e[0] for e in embeddings] == [5.0, 4.0]
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries_and_does_not_retry_client_errors():
+    with _StubEmbeddingServer(delay=0.0, fail_first=10, fail_status=500) as server:
+        algo = _llm_algorithm(server.url, max_retries=2, retry_backoff_seconds=0.0)
+        with pytest.raises(_StubAPIError):
+            await algo.aget_embeddings_batch(["alpha"])
+    assert server.requests == 3
+
+    with _StubEmbeddingServer(delay=0.0, fail_first=10, fail_status=400) as server:
+        algo = _llm_algorithm(server.url, max_retries=2, retry_backoff_seconds=0.0)
+        with pytest.raises(_StubAPIError):
+            await algo.aget_embeddings_batch(["alpha"])
+    assert server.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive_while_embedding():
+    ticks = 0
+    done = asyncio.Event()
+
+    async def _ticker():
+        nonlocal ticks
+        while not done.is_set():
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    with _StubEmbeddingServer(delay=0.2) as server:
+        algo = _llm_algorithm(server.url)
+        ticker = asyncio.create_task(_ticker())
+        await algo.aget_embeddings_batch(["alpha", "beta"])
+        done.set()
+        await ticker
+
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_pipeline_rejects_wrong_number_of_vectors():
+    pipeline = AsyncEmbeddingPipeline(lambda chunk: [[0.0]], batch_size=4)
+    with pytest.raises(ValueError):
+        await pipeline.embed(["a", "b"])
+
+
+def test_is_retryable_error():
+    assert is_retryable_error(_StubAPIError(429))
+    assert is_retryable_error(_StubAPIError(503))
+    assert is_retryable_error(ConnectionError())
+    assert not is_retryable_error(_StubAPIError(401))
+    assert not is_retryable_error(ValueError("bad input"))
@@ -0,0 +1,208 @@
+"""Tests for write-time embedding precomputation through the embedding outbox"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.ai_suggestions import engine, precompute
+from app.ai_suggestions.algorithms import compute_text_hash
+from app.ai_suggestions.precompute import drain_embedding_outbox, scheduled_embedding_precompute
+from app.config import settings
+from app.crud.embedding_outbox import get_embedding_outbox_backlog
+from app.crud.requirement import create_requirement, delete_requirement, update_requirement
+from app.crud.test_case import create_test_case
+from app.models.base import Base
+from app.models.embedding_cache import EmbeddingCache
+from app.models.embedding_outbox import EmbeddingOutbox
+from app.models.requirement import PriorityLevel, RequirementType
+from app.models.test_case import TestCaseType
+from app.schemas.requirement import RequirementCreate, RequirementUpdate
+from app.schemas.test_case import TestCaseCreate
+
+MODEL = "hashing-64"
+
+
+@pytest.fixture(autouse=True)
+def precompute_settings(monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_PRECOMPUTE_ENABLED", True)
+    monkeypatch.setattr(settings, "EMBEDDING_PRECOMPUTE_PROVIDER", "hashing")
+    monkeypatch.setattr(settings, "EMBEDDING_PRECOMPUTE_MODEL", MODEL)
+    monkeypatch.setattr(settings, "EMBEDDING_PRECOMPUTE_MAX_ATTEMPTS", 2)
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _create_requirement(session: AsyncSession, title: str):
+    return await create_requirement(
+        session,
+        RequirementCreate(
+            title=title,
+            description=f"{title} description",
+            type=RequirementType.FUNCTIONAL,
+            priority=PriorityLevel.HIGH,
+        ),
+    )
+
+
+async def _create_test_case(session: AsyncSession, title: str):
+    return await create_test_case(
+        session,
+        TestCaseCreate(
+            title=title,
+            description=f"{title} description",
+            type=TestCaseType.FUNCTIONAL,
+            priority=PriorityLevel.HIGH,
+            preconditions="user is logged in",
+        ),
+    )
+
+
+async def _outbox(session: AsyncSession) -> list[EmbeddingOutbox]:
+    return list((await session.execute(select(EmbeddingOutbox))).scalars().all())
+
+
+async def _cached_hashes(session: AsyncSession) -> set[str]:
+    result = await session.execute(select(EmbeddingCache.text_hash).where(EmbeddingCache.model_name == MODEL))
+    return set(result.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_writes_enqueue_one_entry_per_entity(session_factory):
+    async with session_factory() as session:
+        requirement = await _create_requirement(session, "Login")
+        await _create_test_case(session, "Login works")
+        await update_requirement(session, requirement.id, RequirementUpdate(description="changed"))
+
+        rows = await _outbox(session)
+        assert sorted(row.entity_type for row in rows) == ["requirement", "test_case"]
+        assert {row.attempts for row in rows} == {0}
+
+
+@pytest.mark.asyncio
+async def test_disabled_precompute_enqueues_nothing(session_factory, monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_PRECOMPUTE_ENABLED", False)
+    async with session_factory() as session:
+        await _create_requirement(session, "Login")
+        assert await _outbox(session) == []
+
+
+@pytest.mark.asyncio
+async def test_drain_caches_the_engine_text_and_empties_the_outbox(session_factory):
+    async with session_factory() as session:
+        requirement = await _create_requirement(session, "Login")
+        test_case = await _create_test_case(session, "Login works")
+
+        report = await drain_embedding_outbox(session)
+
+        assert report == {"processed": 2, "embedded": 2, "already_cached": 0, "missing_entities": 0, "failed": False}
+        assert await _outbox(session) == []
+        assert await _cached_hashes(session) == {
+            compute_text_hash(engine.requirement_text(requirement)),
+            compute_text_hash(engine.test_case_text(test_case)),
+        }
+
+
+@pytest.mark.asyncio
+async def test_drain_claims_its_batch_with_skip_locked(session_factory):
+    claims = []
+    async with session_factory() as session:
+        await _create_requirement(session, "Login")
+
+        @event.listens_for(session.sync_session, "do_orm_execute")
+        def record(orm_execute_state):
+            if (
+                orm_execute_state.is_select
+                and orm_execute_state.statement.get_final_froms()[0].name == "embedding_outbox"
+            ):
+                claims.append(orm_execute_state.statement)
+
+        await drain_embedding_outbox(session)
+
+    claim = str(claims[0].compile(dialect=postgresql.dialect()))
+    assert claim.endswith("FOR UPDATE SKIP LOCKED")
+
+
+@pytest.mark.asyncio
+async def test_cached_texts_and_deleted_entities_are_not_embedded(session_factory):
+    async with session_factory() as session:
+        requirement = await _create_requirement(session, "Login")
+        await drain_embedding_outbox(session)
+        # Re-saving unchanged text re-enqueues the entity, but its embedding is already cached.
+        await update_requirement(session, requirement.id, RequirementUpdate(title="Login"))
+        gone = await _create_requirement(session, "Logout")
+        await delete_requirement(session, gone.id)
+
+        report = await drain_embedding_outbox(session)
+
+        assert report == {"processed": 2, "embedded": 0, "already_cached": 1, "missing_entities": 1, "failed": False}
+        assert await _outbox(session) == []
+        assert len(await _cached_hashes(session)) == 1
+
+
+@pytest.mark.asyncio
+async def test_provider_failure_keeps_entries_until_max_attempts(session_factory, monkeypatch):
+    class FailingAlgorithm:
+        model = MODEL
+        provider = "hashing"
+
+        async def aget_embeddings_batch(self, texts):
+            raise RuntimeError("provider down")
+
+    monkeypatch.setattr(precompute, "precompute_algorithm", FailingAlgorithm)
+    async with session_factory() as session:
+        await _create_requirement(session, "Login")
+
+        for attempt in (1, 2):
+            report = await drain_embedding_outbox(session)
+            assert report["failed"] is True
+            [row] = await _outbox(session)
+            assert row.attempts == attempt
+            assert row.last_error == "provider down"
+
+        # Entries that used up their attempts are reported but no longer retried.
+        assert (await drain_embedding_outbox(session))["processed"] == 0
+        backlog = await get_embedding_outbox_backlog(session)
+        assert backlog["pending"] == 1
+        assert backlog["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_backlog_reports_counts_and_oldest_entry(session_factory):
+    async with session_factory() as session:
+        assert (await get_embedding_outbox_backlog(session))["oldest_enqueued_at"] is None
+        await _create_requirement(session, "Login")
+        await _create_requirement(session, "Logout")
+        await _create_test_case(session, "Login works")
+
+        backlog = await get_embedding_outbox_backlog(session)
+
+        assert backlog["pending"] == 3
+        assert backlog["by_entity_type"] == {"requirement": 2, "test_case": 1}
+        assert backlog["failed"] == 0
+        assert backlog["oldest_age_seconds"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_scheduled_precompute_drains_in_batches(session_factory, monkeypatch):
+    monkeypatch.setattr("app.db.session.AsyncSessionLocal", session_factory)
+    monkeypatch.setattr(settings, "EMBEDDING_PRECOMPUTE_BATCH_SIZE", 2)
+    async with session_factory() as session:
+        for i in range(5):
+            await _create_requirement(session, f"Requirement {i}")
+
+    totals = await scheduled_embedding_precompute()
+
+    assert totals["batches"] == 3
+    assert totals["processed"] == totals["embedded"] == 5
+    assert totals["backlog"]["pending"] == 0
+    async with session_factory() as session:
+        assert len(await _cached_hashes(session)) == 5
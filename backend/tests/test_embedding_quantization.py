@@ -0,0 +1,261 @@
+"""Tests and benchmark for quantized first-pass embedding scoring"""
+
+import sys
+import time
+import uuid
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.ai_suggestions.algorithms import QUERY_BLOCK_ROWS, LLMEmbeddingSimilarity, compute_text_hash
+from app.ai_suggestions.config import SuggestionConfig
+from app.ai_suggestions.engine import SuggestionEngine
+from app.ai_suggestions.quantization import DEFAULT_RESCORE_MARGINS, QuantizedEmbeddingMatrix
+from app.crud.embedding_cache import save_embeddings_batch
+from app.models.base import Base
+from app.models.requirement import PriorityLevel, Requirement, RequirementStatus, RequirementType
+from app.models.suggestion import LinkSuggestion
+from app.models.test_case import AutomationStatus, TestCase, TestCaseStatus, TestCaseType
+
+
+def _clustered_embeddings(rng: np.random.Generator, count: int, topics: np.ndarray) -> np.ndarray:
+    """Embedding-like vectors: a weighted topic direction plus noise, so similarities spread around the threshold."""
+    topic = rng.integers(0, len(topics), count)
+    weight = rng.uniform(0.3, 1.2, (count, 1)).astype(np.float32)
+    return topics[topic] * weight + rng.standard_normal((count, topics.shape[1])).astype(np.float32)
+
+
+def _exact_scores(queries: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    q = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    c = candidates / np.linalg.norm(candidates, axis=1, keepdims=True)
+    return (q @ c.T + 1.0) / 2.0
+
+
+def _algorithm(quantization: str) -> LLMEmbeddingSimilarity:
+    with patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"}), patch.dict(sys.modules, {"openai": MagicMock()}):
+        return LLMEmbeddingSimilarity(provider="openai", quantization=quantization)
+
+
+def test_int8_codes_approximate_cosine_closely():
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((50, 256)).astype(np.float32)
+
+    matrix = QuantizedEmbeddingMatrix(vectors, "int8")
+    approx = matrix.approximate_cosine(matrix)
+
+    assert matrix.codes.dtype == np.int8
+    assert matrix.nbytes == 50 * (256 + 4)
+    assert np.abs(approx - (_exact_scores(vectors, vectors) * 2 - 1)).max() < 0.01
+
+
+def test_binary_codes_pack_one_bit_per_dimension_and_stack():
+    rng = np.random.default_rng(2)
+    vectors = rng.standard_normal((10, 256)).astype(np.float32)
+
+    whole = QuantizedEmbeddingMatrix(vectors, "binary")
+    stacked = QuantizedEmbeddingMatrix.stack(
+        [QuantizedEmbeddingMatrix(vectors[:4], "binary"), QuantizedEmbeddingMatrix(vectors[4:], "binary")]
+    )
+
+    assert whole.nbytes == 10 * 256 // 8
+    assert np.array_equal(stacked.codes, whole.codes)
+    assert np.allclose(np.diag(whole.approximate_cosine(whole)), 1.0)
+
+
+def test_zero_vectors_score_zero():
+    matrix = QuantizedEmbeddingMatrix(np.array([[0.0, 0.0], [1.0, 1.0]]), "int8")
+    assert matrix.approximate_cosine(matrix)[0].tolist() == [0.0, 0.0]
+
+
+def test_unknown_quantization_is_rejected():
+    with pytest.raises(ValueError):
+        _algorithm("int4")
+    with pytest.raises(ValueError):
+        SuggestionConfig(llm_quantization="int4")
+
+
+async def _score_rows(algorithm, query_texts, candidate_texts, db=None) -> np.ndarray:
+    return np.array([row async for row in algorithm.aiter_score_rows(query_texts, candidate_texts, 0.7, db=db)])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("quantization", ["int8", "binary"])
+async def test_candidates_above_threshold_are_rescored_exactly(quantization):
+    rng = np.random.default_rng(3)
+    topics = rng.standard_normal((10, 128)).astype(np.float32)
+    queries = _clustered_embeddings(rng, 20, topics)
+    candidates = _clustered_embeddings(rng, 200, topics)
+    algorithm = _algorithm(quantization)
+    query_texts = [f"query {i}" for i in range(len(queries))]
+    candidate_texts = [f"candidate {i}" for i in range(len(candidates))]
+    algorithm.hold_run_embeddings(dict(zip(query_texts + candidate_texts, [*queries, *candidates])))
+
+    scores = await _score_rows(algorithm, query_texts, candidate_texts)
+
+    exact = _exact_scores(queries, candidates)
+    assert np.array_equal(scores >= 0.7, exact >= 0.7)
+    assert np.allclose(scores[exact >= 0.7], exact[exact >= 0.7], atol=1e-6)
+    stats = algorithm.last_scoring_stats
+    assert 0 < stats["pairs_rescored"] < scores.size
+    assert stats["index_bytes"] < stats["float32_bytes"]
+
+
+@pytest.mark.asyncio
+async def test_rescoring_reloads_candidate_floats_from_the_db_cache():
+    rng = np.random.default_rng(4)
+    topics = rng.standard_normal((10, 64)).astype(np.float32)
+    queries = _clustered_embeddings(rng, 40, topics)
+    candidates = _clustered_embeddings(rng, 100, topics)
+    query_texts = [f"query {i}" for i in range(len(queries))]
+    candidate_texts = [f"candidate {i}" for i in range(len(candidates))]
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    lookups = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "embedding_cache.embedding" in statement:
+            lookups.append(statement)
+
+    algorithm = _algorithm("int8")
+    run_embeddings = dict(zip(query_texts + candidate_texts, [*queries, *candidates]))
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        await save_embeddings_batch(
+            session,
+            [
+                {"text_hash": compute_text_hash(t), "embedding": v, "model_name": algorithm.model, "provider": "openai"}
+                for t, v in zip(candidate_texts, candidates)
+            ],
+        )
+        algorithm.hold_run_embeddings(run_embeddings)
+        scores = await _score_rows(algorithm, query_texts, candidate_texts, db=session)
+    await engine.dispose()
+
+    exact = _exact_scores(queries, candidates)
+    assert np.array_equal(scores >= 0.7, exact >= 0.7)
+    assert np.allclose(scores[exact >= 0.7], exact[exact >= 0.7], atol=1e-6)
+    # Encoded candidates leave the run; each query block reloads its rescored ones in one lookup.
+    assert set(run_embeddings) == set(query_texts)
+    assert len(lookups) == len(query_texts) // QUERY_BLOCK_ROWS + 1
+    algorithm.client.embeddings.create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_engine_with_int8_quantization_matches_float_scoring():
+    vectors = {
+        "Login Users sign in with a password": [1.0, 0.1, 0.0],
+        "Export Reports export to CSV": [0.0, 1.0, 0.2],
+        "Test login Verify password sign in": [0.9, 0.2, 0.0],
+        "Test export Verify CSV export": [0.1, 0.9, 0.3],
+    }
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    results = {}
+    for quantization in ("none", "int8"):
+        async with session_factory() as session:
+            for title, description in (("Login", "Users sign in with a password"), ("Export", "Reports export to CSV")):
+                session.add(
+                    Requirement(
+                        id=uuid.uuid4(),
+                        external_id=f"REQ-{quantization}-{title}",
+                        title=title,
+                        description=description,
+                        type=RequirementType.FUNCTIONAL,
+                        priority=PriorityLevel.HIGH,
+                        status=RequirementStatus.APPROVED,
+                    )
+                )
+            for title, description in (("Test login", "Verify password sign in"), ("Test export", "Verify CSV export")):
+                session.add(
+                    TestCase(
+                        id=uuid.uuid4(),
+                        external_id=f"TC-{quantization}-{title}",
+                        title=title,
+                        description=description,
+                        type=TestCaseType.FUNCTIONAL,
+                        priority=PriorityLevel.HIGH,
+                        status=TestCaseStatus.READY,
+                        automation_status=AutomationStatus.AUTOMATED,
+                    )
+                )
+            await session.commit()
+
+            config = SuggestionConfig(
+                default_algorithm="llm",
+                llm_quantization=quantization,
+                llm_db_cache_enabled=False,
+                min_confidence_threshold=0.9,
+            )
+            with (
+                patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"}),
+                patch.dict(sys.modules, {"openai": MagicMock()}),
+            ):
+                suggestion_engine = SuggestionEngine(config)
+            for text, vector in vectors.items():
+                suggestion_engine.algorithm._embedding_cache[text] = vector
+            stats = await suggestion_engine.generate_suggestions(session)
+
+            rows = await session.execute(select(LinkSuggestion.similarity_score))
+            results[quantization] = (stats, sorted(rows.scalars().all()))
+            await session.execute(LinkSuggestion.__table__.delete())
+            await session.execute(TestCase.__table__.delete())
+            await session.execute(Requirement.__table__.delete())
+            await session.commit()
+    await engine.dispose()
+
+    float_stats, float_scores = results["none"]
+    int8_stats, int8_scores = results["int8"]
+    assert float_stats["suggestions_created"] == int8_stats["suggestions_created"] == 2
+    assert int8_scores == pytest.approx(float_scores, abs=1e-6)
+    assert "quantization" not in float_stats
+    assert int8_stats["quantization"]["quantization"] == "int8"
+
+
+def test_quantization_recall_and_memory_benchmark(capsys):
+    """
+    Recall of the above-threshold pairs and index memory per mode, at 1536 dimensions.
+
+    Recall is measured before rescoring (rescoring only corrects scores, it cannot
+    recover a pair the first pass dropped). The README trade-off table comes from this run.
+    """
+    rng = np.random.default_rng(0)
+    dimensions, threshold = 1536, 0.7
+    topics = rng.standard_normal((100, dimensions)).astype(np.float32)
+    queries = _clustered_embeddings(rng, 200, topics)
+    candidates = _clustered_embeddings(rng, 2000, topics)
+    relevant = _exact_scores(queries, candidates) >= threshold
+
+    report = {"none": {"bytes_per_vector": dimensions * 4, "recall": 1.0, "rescored_share": 0.0}}
+    for mode in ("int8", "binary"):
+        started = time.perf_counter()
+        index = QuantizedEmbeddingMatrix(candidates, mode)
+        approx = (index.approximate_cosine(QuantizedEmbeddingMatrix(queries, mode)) + 1.0) / 2.0
+        candidates_kept = approx >= threshold - DEFAULT_RESCORE_MARGINS[mode]
+        report[mode] = {
+            "bytes_per_vector": index.nbytes / index.rows,
+            "recall": (candidates_kept & relevant).sum() / relevant.sum(),
+            "rescored_share": candidates_kept.mean(),
+            "first_pass_ms": (time.perf_counter() - started) * 1000,
+        }
+
+    with capsys.disabled():
+        print(f"\nquantization benchmark: {relevant.sum()} relevant of {relevant.size} pairs, threshold {threshold}")
+        for mode, row in report.items():
+            print(
+                f"  {mode:<7} {row['bytes_per_vector']:>7.0f} B/vector  recall {row['recall']:.4f}  "
+                f"rescored {row['rescored_share']:.2%}"
+            )
+
+    assert report["int8"]["bytes_per_vector"] <= dimensions * 4 / 3.9
+    assert report["binary"]["bytes_per_vector"] == dimensions / 8
+    assert report["int8"]["recall"] == 1.0
+    assert report["binary"]["recall"] >= 0.99
+    assert report["binary"]["rescored_share"] < 0.05
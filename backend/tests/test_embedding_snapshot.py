@@ -0,0 +1,206 @@
+"""Tests for the memory-mapped embedding cache snapshot"""
+
+import sys
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.ai_suggestions import embedding_snapshot
+from app.ai_suggestions.algorithms import LLMEmbeddingSimilarity, compute_text_hash
+from app.ai_suggestions.embedding_snapshot import EmbeddingSnapshot
+from app.config import settings
+from app.crud.embedding_cache import (
+    compact_embedding_cache,
+    delete_stale_embeddings,
+    get_cache_generation,
+    publish_embedding_writes,
+    save_embeddings_batch,
+)
+from app.models.base import Base
+from app.models.embedding_cache import EmbeddingCache
+
+MODEL = "text-embedding-3-small"
+
+
+@pytest_asyncio.fixture
+async def db_engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session_factory(db_engine):
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _save(session: AsyncSession, texts: list[str], value: float = 0.5, dims: int = 4) -> list[str]:
+    hashes = [compute_text_hash(t) for t in texts]
+    await save_embeddings_batch(
+        session,
+        [{"text_hash": h, "embedding": [value] * dims, "model_name": MODEL, "provider": "openai"} for h in hashes],
+    )
+    await session.commit()
+    return hashes
+
+
+def _embedding_selects(db_engine) -> list[str]:
+    statements: list[str] = []
+
+    @event.listens_for(db_engine.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "embedding_cache.embedding" in statement:
+            statements.append(statement)
+
+    return statements
+
+
+@pytest.mark.asyncio
+async def test_committed_writes_are_published_under_a_new_generation(session_factory):
+    async with session_factory() as session:
+        first = await _save(session, ["a"])
+        second = await _save(session, ["b"])
+        # Writers never touch the generation row.
+        assert await get_cache_generation(session, MODEL) == 0
+
+        assert await publish_embedding_writes(session, MODEL) == 1
+        assert await publish_embedding_writes(session, MODEL) == 1
+        await _save(session, ["a"], value=0.1)
+        assert await publish_embedding_writes(session, MODEL) == 2
+
+        result = await session.execute(select(EmbeddingCache.text_hash, EmbeddingCache.generation))
+        assert dict(result.all()) == {first[0]: 2, second[0]: 1}
+
+
+@pytest.mark.asyncio
+async def test_cold_open_reads_rows_from_memory_mapped_files(session_factory, tmp_path):
+    async with session_factory() as session:
+        hashes = await _save(session, ["a", "b"], value=0.25)
+        assert await EmbeddingSnapshot(tmp_path, MODEL).sync(session)
+
+    reopened = EmbeddingSnapshot(tmp_path, MODEL)
+    vector = reopened.get(hashes[0])
+
+    assert isinstance(vector.base, np.memmap)
+    assert vector.tolist() == [0.25] * 4
+    assert len(reopened) == 2
+    assert reopened.get(compute_text_hash("missing")) is None
+
+
+@pytest.mark.asyncio
+async def test_sync_is_a_no_op_when_generation_matches(db_engine, session_factory, tmp_path):
+    async with session_factory() as session:
+        await _save(session, ["a"])
+        await EmbeddingSnapshot(tmp_path, MODEL).sync(session)
+
+    statements = _embedding_selects(db_engine)
+    async with session_factory() as session:
+        assert await EmbeddingSnapshot(tmp_path, MODEL).sync(session)
+
+    assert statements == []
+
+
+async def _fail_rebuild(*args, **kwargs):
+    raise AssertionError("snapshot was rebuilt")
+
+
+@pytest.mark.asyncio
+async def test_new_rows_are_appended_and_capacity_grows(session_factory, tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_snapshot, "MIN_CAPACITY", 2)
+    snapshot = EmbeddingSnapshot(tmp_path, MODEL)
+    async with session_factory() as session:
+        first = await _save(session, ["a", "b"])
+        await snapshot.sync(session)
+        monkeypatch.setattr(snapshot, "_rebuild", _fail_rebuild)  # later syncs must be incremental
+        later = await _save(session, ["c", "d", "e"], value=0.75)
+        await snapshot.sync(session)
+        reader = EmbeddingSnapshot(tmp_path, MODEL)
+        mapped = reader.get(first[0])
+        await _save(session, ["a"], value=0.1)  # rewrites are appended, never overwritten
+        await snapshot.sync(session)
+        # A worker still reading the files keeps seeing the vector it mapped.
+        assert mapped.tolist() == [0.5] * 4
+
+    assert len(snapshot) == 5
+    assert snapshot._vectors.shape[0] == 8
+    assert snapshot.get(later[2]).tolist() == [0.75] * 4
+    assert snapshot.get(first[0]).tolist() == pytest.approx([0.1] * 4)
+    assert EmbeddingSnapshot(tmp_path, MODEL).get(later[0]) is not None
+
+
+@pytest.mark.asyncio
+async def test_eviction_triggers_rebuild(session_factory, tmp_path):
+    snapshot = EmbeddingSnapshot(tmp_path, MODEL)
+    async with session_factory() as session:
+        hashes = await _save(session, ["a", "b"])
+        await snapshot.sync(session)
+
+        await delete_stale_embeddings(session, older_than_days=-1)
+        await session.commit()
+        kept = await _save(session, ["c"])
+        await snapshot.sync(session)
+
+    assert len(snapshot) == 1
+    assert snapshot.get(hashes[0]) is None
+    assert snapshot.get(kept[0]) is not None
+
+
+@pytest.mark.asyncio
+async def test_compaction_alone_triggers_rebuild(session_factory, tmp_path):
+    snapshot = EmbeddingSnapshot(tmp_path, MODEL)
+    async with session_factory() as session:
+        hashes = await _save(session, ["a", "b", "c"])
+        await snapshot.sync(session)
+        generation = snapshot.generation
+
+        report = await compact_embedding_cache(session, max_rows_per_model=1)
+        await session.commit()
+        assert report["rows_deleted"] == 2
+        assert await snapshot.sync(session)
+
+    assert snapshot.generation > generation
+    assert len(snapshot) == 1
+    assert sum(snapshot.get(h) is not None for h in hashes) == 1
+
+
+@pytest.mark.asyncio
+async def test_rows_committed_long_after_they_were_written_are_appended(session_factory, tmp_path, monkeypatch):
+    snapshot = EmbeddingSnapshot(tmp_path, MODEL)
+    async with session_factory() as session:
+        await _save(session, ["a"])
+        await snapshot.sync(session)
+        monkeypatch.setattr(snapshot, "_rebuild", _fail_rebuild)
+
+        # A run that wrote its rows an hour ago and only commits now.
+        late = await _save(session, ["late"])
+        await session.execute(update(EmbeddingCache).values(updated_at=datetime.utcnow() - timedelta(hours=1)))
+        await session.commit()
+        assert await snapshot.sync(session)
+
+    assert snapshot.get(late[0]) is not None
+
+
+@pytest.mark.asyncio
+async def test_algorithm_skips_db_lookup_when_snapshot_is_current(db_engine, session_factory, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(embedding_snapshot, "_snapshots", {})
+    with patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"}), patch.dict(sys.modules, {"openai": MagicMock()}):
+        algorithm = LLMEmbeddingSimilarity(provider="openai")
+    async with session_factory() as session:
+        await _save(session, ["cached"], value=0.5)
+        await embedding_snapshot.get_embedding_snapshot(MODEL).sync(session)
+
+    statements = _embedding_selects(db_engine)
+    async with session_factory() as session:
+        loaded = await algorithm.load_cached_embeddings(session, ["cached", "never embedded"])
+
+    assert statements == []
+    assert list(loaded) == ["cached"]
+    assert algorithm._embedding_cache.peek("cached").tolist() == [0.5] * 4
@@ -221,3 +221,93 @@ async def test_scoped_dedup_checking():
         assert result["pairs_analyzed"] == 2
 
     await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_generation_stats_include_stage_timings():
+    """generate_suggestions reports wall/CPU time per stage and throughput figures"""
+    engine = await _make_db()
+    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with AsyncSessionLocal() as session:
+        session.add_all([_req(i) for i in range(3)] + [_tc(i) for i in range(3)])
+        await session.commit()
+
+        config = SuggestionConfig(default_algorithm="keyword", min_confidence_threshold=0.0)
+        result = await SuggestionEngine(config=config).generate_suggestions(session)
+
+    timings = result["timings"]
+    assert set(timings) == {"load_entities", "build_text", "score", "insert"}
+    for stage in timings.values():
+        assert stage["wall_ms"] >= 0.0
+        assert "cpu_ms" in stage
+    assert result["total_wall_ms"] == pytest.approx(sum(t["wall_ms"] for t in timings.values()), abs=0.01)
+    assert result["pairs_per_second"] > 0
+    assert result["rows_inserted_per_second"] >= 0
+    # Only the LLM algorithm has an embedding stage
+    assert result["embedding_cache_hit_ratio"] is None
+    assert "profile_path" not in result
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_generation_writes_cprofile_dump(tmp_path):
+    """A configured profile_dir receives a loadable cProfile dump of the run"""
+    import pstats
+
+    engine = await _make_db()
+    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with AsyncSessionLocal() as session:
+        session.add_all([_req(0), _tc(0)])
+        await session.commit()
+
+        config = SuggestionConfig(
+            default_algorithm="keyword", min_confidence_threshold=0.0, profile_dir=str(tmp_path / "profiles")
+        )
+        result = await SuggestionEngine(config=config).generate_suggestions(session)
+
+    profile_path = result["profile_path"]
+    assert profile_path.startswith(str(tmp_path / "profiles"))
+    assert pstats.Stats(profile_path).total_calls > 0
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_failed_run_disables_the_profiler(tmp_path, monkeypatch):
+    """An exception inside the run must not leave cProfile enabled on the event-loop thread"""
+    import sys
+
+    engine = await _make_db()
+    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    suggestion_engine = SuggestionEngine(config=SuggestionConfig(profile_dir=str(tmp_path / "profiles")))
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("provider unavailable")
+
+    monkeypatch.setattr(suggestion_engine, "_generate", fail)
+    async with AsyncSessionLocal() as session:
+        with pytest.raises(RuntimeError, match="provider unavailable"):
+            await suggestion_engine.generate_suggestions(session)
+
+    assert sys.getprofile() is None
+    assert not (tmp_path / "profiles").exists()
+
+    await engine.dispose()
+
+
+def test_stage_profiler_excludes_nested_stage_time():
+    """Time spent in a nested stage is attributed to the inner stage only"""
+    import time
+
+    from app.ai_suggestions.profiling import StageProfiler
+
+    profiler = StageProfiler()
+    with profiler.stage("outer"):
+        with profiler.stage("inner"):
+            time.sleep(0.02)
+
+    assert profiler.wall_seconds("inner") >= 0.02
+    assert profiler.wall_seconds("outer") < 0.02
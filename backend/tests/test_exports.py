@@ -8,6 +8,7 @@ from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.auth.dependencies import get_current_user
+from app.config import settings
 from app.db.session import get_db
 from app.main import app
 from app.models.base import Base
@@ -18,6 +19,13 @@ from app.models.test_case import AutomationStatus, TestCase, TestCaseStatus, Tes
 from app.models.user import User, UserRole
 
 
+@pytest.fixture(autouse=True)
+def artifacts_dir(tmp_path, monkeypatch):
+    """Store rendered report files in a temporary directory."""
+    monkeypatch.setattr(settings, "BGSTM_ARTIFACTS_DIR", str(tmp_path))
+    return tmp_path
+
+
 @pytest_asyncio.fixture
 async def db_session():
     """Provide an in-memory SQLite session and override the FastAPI dependency."""
@@ -316,3 +324,42 @@ async def test_export_metrics_csv_content_disposition(db_session):
         response = client.get("/api/v1/metrics/export/csv")
     assert response.status_code == 200
     assert "metrics.csv" in response.headers["content-disposition"]
+
+
+@pytest.mark.asyncio
+async def test_export_traceability_matrix_csv_is_streamed_in_batches(db_session, monkeypatch):
+    """CSV rows are rendered per cursor batch and include every link and the orphan section."""
+    from app.api.traceability import _traceability_matrix_csv_chunks
+    from app.crud import streaming
+
+    await _seed_data(db_session)
+    orphans = [
+        TestCase(
+            id=uuid.uuid4(),
+            external_id=f"TC-9{i:02d}",
+            title=f"Orphan {i}",
+            description="No links",
+            type=TestCaseType.FUNCTIONAL,
+            priority=PriorityLevel.LOW,
+        )
+        for i in range(3)
+    ]
+    db_session.add_all(orphans)
+    await db_session.commit()
+    monkeypatch.setattr(streaming, "STREAM_BATCH_ROWS", 2)
+
+    chunks = [chunk async for chunk in _traceability_matrix_csv_chunks(db_session)]
+
+    # Header, one matrix batch (two requirements) and the orphans in two batches
+    assert len(chunks) == 4
+    assert chunks[0].startswith("Requirement ID,")
+    lines = "".join(chunks).splitlines()
+    assert any(",REQ-001,User Authentication,covered," in line for line in lines)
+    assert any(",REQ-002,Data Export,uncovered,,,,," in line for line in lines)
+    assert "Orphan Test Cases (No Linked Requirements)" in lines
+    assert sum(",TC-9" in line for line in lines) == 3
+
+    with TestClient(app) as client:
+        response = client.get("/api/v1/traceability-matrix/export?format=csv")
+    assert response.status_code == 200
+    assert response.text == "".join(chunks)
@@ -0,0 +1,114 @@
+"""Tests for the offline feature-hashing embedding provider"""
+
+import time
+import uuid
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.ai_suggestions.algorithms import LLMEmbeddingSimilarity, get_algorithm
+from app.ai_suggestions.config import SuggestionConfig
+from app.ai_suggestions.engine import SuggestionEngine
+from app.ai_suggestions.hashing_embedder import HashingEmbedder
+from app.models.base import Base
+from app.models.embedding_cache import EmbeddingCache
+from app.models.requirement import PriorityLevel, Requirement, RequirementStatus, RequirementType
+from app.models.suggestion import LinkSuggestion
+from app.models.test_case import AutomationStatus, TestCase, TestCaseStatus, TestCaseType
+
+
+def test_embeddings_are_deterministic_normalized_and_fixed_size():
+    texts = ["User login with password", "", "Export report to CSV"]
+
+    first = HashingEmbedder().embed(texts)
+    second = HashingEmbedder().embed(list(reversed(texts)) + ["unrelated batch neighbour"])[2::-1]
+
+    assert first.shape == (3, 384)
+    assert first.dtype == np.float32
+    assert np.allclose(first, second, atol=1e-6)  # independent of batch composition and order
+    assert np.linalg.norm(first[0]) == pytest.approx(1.0)
+    assert not first[1].any()
+
+
+def test_related_texts_score_higher_than_unrelated():
+    algorithm = LLMEmbeddingSimilarity(provider="hashing")
+
+    related = algorithm.compute_similarity("User login with password", "Verify user login with a valid password")
+    unrelated = algorithm.compute_similarity("User login with password", "Export quarterly report to CSV")
+
+    assert algorithm.model == "hashing-384"
+    assert related > unrelated
+
+
+def test_model_name_sets_dimensions():
+    algorithm = get_algorithm("llm", SuggestionConfig(llm_provider="hashing", llm_model="hashing-64"))
+
+    assert algorithm.get_embeddings_batch(["some text"])[0].shape == (64,)
+    with pytest.raises(ValueError):
+        LLMEmbeddingSimilarity(provider="hashing", model="hashing")
+
+
+def test_embedding_is_fast():
+    texts = [f"Requirement {i}: the system shall validate input field {i} before saving" for i in range(2000)]
+    embedder = HashingEmbedder()
+    embedder.embed(texts[:1])  # build the projection matrix
+
+    started = time.perf_counter()
+    embedder.embed(texts)
+    per_text = (time.perf_counter() - started) / len(texts)
+
+    assert per_text < 1e-3
+
+
+@pytest.mark.asyncio
+async def test_engine_runs_end_to_end_with_db_cache_and_quantization():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session_factory() as session:
+        session.add(
+            Requirement(
+                id=uuid.uuid4(),
+                external_id="REQ-001",
+                title="User login",
+                description="Users log in with username and password",
+                type=RequirementType.FUNCTIONAL,
+                priority=PriorityLevel.HIGH,
+                status=RequirementStatus.APPROVED,
+            )
+        )
+        for external_id, title, description in (
+            ("TC-001", "User login", "Verify users log in with username and password"),
+            ("TC-002", "CSV export", "Export the quarterly report as CSV"),
+        ):
+            session.add(
+                TestCase(
+                    id=uuid.uuid4(),
+                    external_id=external_id,
+                    title=title,
+                    description=description,
+                    type=TestCaseType.FUNCTIONAL,
+                    priority=PriorityLevel.HIGH,
+                    status=TestCaseStatus.READY,
+                    automation_status=AutomationStatus.AUTOMATED,
+                )
+            )
+        await session.commit()
+
+        config = SuggestionConfig(
+            default_algorithm="llm", llm_provider="hashing", llm_quantization="int8", min_confidence_threshold=0.75
+        )
+        stats = await SuggestionEngine(config).generate_suggestions(session)
+
+        assert stats["pairs_analyzed"] == 2
+        assert stats["suggestions_created"] == 1
+        assert stats["quantization"]["quantization"] == "int8"
+        suggestion = (await session.execute(select(LinkSuggestion))).scalar_one()
+        cached_models = (await session.execute(select(EmbeddingCache.model_name))).scalars().all()
+        assert suggestion.similarity_score > 0.75
+        assert set(cached_models) == {"hashing-384"} and len(cached_models) == 3
+    await engine.dispose()
@@ -0,0 +1,202 @@
+"""Tests for incremental watermark-based suggestion generation"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.ai_suggestions.incremental import get_watermark, run_incremental_generation
+from app.models.base import Base
+from app.models.requirement import PriorityLevel, Requirement, RequirementStatus, RequirementType
+from app.models.suggestion import LinkSuggestion
+from app.models.suggestion_watermark import SuggestionWatermark
+from app.models.test_case import AutomationStatus, TestCase, TestCaseStatus, TestCaseType
+from app.services.scheduler import PeriodicJob
+
+
+@pytest_asyncio.fixture
+async def async_db():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        yield session
+    await engine.dispose()
+
+
+def _req(i: int) -> Requirement:
+    return Requirement(
+        id=uuid.uuid4(),
+        external_id=f"REQ-{i:03d}",
+        title=f"User login {i}",
+        description="Users must login with password",
+        type=RequirementType.FUNCTIONAL,
+        priority=PriorityLevel.HIGH,
+        status=RequirementStatus.APPROVED,
+    )
+
+
+def _tc(i: int) -> TestCase:
+    return TestCase(
+        id=uuid.uuid4(),
+        external_id=f"TC-{i:03d}",
+        title=f"Verify user login {i}",
+        description="Check login with password",
+        type=TestCaseType.FUNCTIONAL,
+        priority=PriorityLevel.HIGH,
+        status=TestCaseStatus.READY,
+        automation_status=AutomationStatus.AUTOMATED,
+    )
+
+
+async def _backdate_everything(session: AsyncSession, days: int = 1) -> None:
+    past = datetime.utcnow() - timedelta(days=days)
+    await session.execute(update(Requirement).values(updated_at=past))
+    await session.execute(update(TestCase).values(updated_at=past))
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_first_run_is_full_and_sets_watermark(async_db: AsyncSession):
+    async_db.add_all([_req(i) for i in range(2)] + [_tc(i) for i in range(3)])
+    await async_db.commit()
+
+    stats = await run_incremental_generation(async_db, algorithm="keyword", threshold=0.0)
+
+    assert stats["full_run"] is True
+    assert stats["pairs_analyzed"] == 6
+    assert await get_watermark(async_db, "keyword") is not None
+
+
+@pytest.mark.asyncio
+async def test_second_run_without_changes_analyzes_nothing(async_db: AsyncSession):
+    async_db.add_all([_req(0), _tc(0)])
+    await async_db.commit()
+    await run_incremental_generation(async_db, algorithm="keyword", threshold=0.0)
+    await _backdate_everything(async_db)
+
+    stats = await run_incremental_generation(async_db, algorithm="keyword", threshold=0.0)
+
+    assert stats["full_run"] is False
+    assert stats["requirements_changed"] == 0
+    assert stats["test_cases_changed"] == 0
+    assert stats["pairs_analyzed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_changed_requirement_scored_against_all_test_cases(async_db: AsyncSession):
+    reqs = [_req(i) for i in range(3)]
+    tcs = [_tc(i) for i in range(4)]
+    async_db.add_all(reqs + tcs)
+    await async_db.commit()
+    await run_incremental_generation(async_db, algorithm="keyword", threshold=0.0)
+    await _backdate_everything(async_db)
+
+    new_req = _req(99)
+    async_db.add(new_req)
+    await async_db.commit()
+
+    stats = await run_incremental_generation(async_db, algorithm="keyword", threshold=0.0)
+
+    assert stats["requirements_changed"] == 1
+    assert stats["test_cases_changed"] == 0
+    assert stats["pairs_analyzed"] == len(tcs)
+    result = await async_db.execute(select(LinkSuggestion).where(LinkSuggestion.requirement_id == new_req.id))
+    assert len(result.scalars().all()) == len(tcs)
+
+
+@pytest.mark.asyncio
+async def test_changed_test_case_scored_against_all_requirements(async_db: AsyncSession):
+    reqs = [_req(i) for i in range(3)]
+    async_db.add_all(reqs + [_tc(0)])
+    await async_db.commit()
+    await run_incremental_generation(async_db, algorithm="keyword", threshold=0.0)
+    await _backdate_everything(async_db)
+
+    async_db.add(_tc(1))
+    await async_db.commit()
+
+    stats = await run_incremental_generation(async_db, algorithm="keyword", threshold=0.0)
+
+    assert stats["test_cases_changed"] == 1
+    assert stats["pairs_analyzed"] == len(reqs)
+
+
+@pytest.mark.asyncio
+async def test_write_flushed_before_the_run_but_committed_after_is_picked_up(async_db: AsyncSession):
+    async_db.add_all([_req(0), _tc(0)])
+    await async_db.commit()
+    flushed_at = datetime.utcnow() - timedelta(seconds=1)
+    await run_incremental_generation(async_db, algorithm="keyword", threshold=0.0)
+    await _backdate_everything(async_db)
+
+    # Stamped at flush time before the run started, committed only after its change queries.
+    late = _req(99)
+    late.updated_at = flushed_at
+    async_db.add(late)
+    await async_db.commit()
+
+    stats = await run_incremental_generation(async_db, algorithm="keyword", threshold=0.0)
+
+    assert stats["requirements_changed"] == 1
+    result = await async_db.execute(select(LinkSuggestion).where(LinkSuggestion.requirement_id == late.id))
+    assert len(result.scalars().all()) == 1
+
+
+@pytest.mark.asyncio
+async def test_watermark_is_stored_per_algorithm(async_db: AsyncSession):
+    async_db.add_all([_req(0), _tc(0)])
+    await async_db.commit()
+
+    await run_incremental_generation(async_db, algorithm="keyword", threshold=0.0)
+
+    assert await get_watermark(async_db, "keyword") is not None
+    assert await get_watermark(async_db, "tfidf") is None
+
+    stats = await run_incremental_generation(async_db, algorithm="tfidf", threshold=0.0)
+    assert stats["full_run"] is True
+    rows = (await async_db.execute(select(SuggestionWatermark))).scalars().all()
+    assert {row.algorithm for row in rows} == {"keyword", "tfidf"}
+
+
+@pytest.mark.asyncio
+async def test_watermark_not_advanced_when_generation_fails(async_db: AsyncSession, monkeypatch):
+    async_db.add_all([_req(0), _tc(0)])
+    await async_db.commit()
+
+    async def _boom(*args, **kwargs):
+        raise RuntimeError("engine failed")
+
+    monkeypatch.setattr("app.ai_suggestions.engine.SuggestionEngine.generate_suggestions", _boom)
+
+    with pytest.raises(RuntimeError):
+        await run_incremental_generation(async_db, algorithm="keyword", threshold=0.0)
+    assert await get_watermark(async_db, "keyword") is None
+
+
+@pytest.mark.asyncio
+async def test_periodic_job_keeps_running_after_failure():
+    calls = []
+
+    async def _flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("first run fails")
+        return len(calls)
+
+    job = PeriodicJob("test", _flaky, interval_seconds=0.01)
+    job.start()
+    for _ in range(100):
+        if len(calls) >= 3:
+            break
+        await asyncio.sleep(0.01)
+    await job.stop()
+
+    assert job.failures == 1
+    assert job.runs >= 3
+    assert not job.running
@@ -0,0 +1,130 @@
+"""Tests for the Prometheus operational metrics endpoint and its collectors"""
+
+import uuid
+
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.auth.dependencies import get_current_user
+from app.config import settings
+from app.db.session import get_db
+from app.main import app
+from app.models.base import Base
+from app.models.user import User, UserRole
+from app.services import operational_metrics
+from app.services.operational_metrics import (
+    Histogram,
+    record_artifact_upload,
+    record_suggestion_run,
+    render_metrics,
+    reset_metrics,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_operational_metrics():
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+@pytest_asyncio.fixture
+async def client(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_METRICS_TOKEN", "scrape-secret")
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with factory() as session:
+            yield session
+
+    async def override_get_current_user():
+        return User(
+            id=uuid.uuid4(),
+            email="test@example.com",
+            hashed_password="hashed",
+            full_name="Test User",
+            role=UserRole.admin,
+            is_active=True,
+        )
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+def _samples(text: str) -> dict[str, float]:
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1].replace("+Inf", "inf"))
+        for line in text.splitlines()
+        if line and not line.startswith("#")
+    }
+
+
+def test_requests_and_queries_are_recorded_by_route_template(client):
+    for _ in range(2):
+        assert client.get(f"/api/v1/requirements/{uuid.uuid4()}").status_code == 404
+    client.get("/no-such-path")
+
+    response = client.get("/internal/metrics", headers={"Authorization": "Bearer scrape-secret"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/plain; version=0.0.4; charset=utf-8"
+    samples = _samples(response.text)
+    route = 'method="GET",route="/api/v1/requirements/{requirement_id}",status="404"'
+    assert samples[f"bgstm_http_request_duration_seconds_count{{{route}}}"] == 2
+    assert samples[f'bgstm_http_request_duration_seconds_bucket{{{route},le="+Inf"}}'] == 2
+    assert samples['bgstm_http_request_duration_seconds_count{method="GET",route="unmatched",status="404"}'] == 1
+    # The scrape itself is still in flight while it renders.
+    assert samples["bgstm_http_requests_in_flight"] == 1
+    assert samples['bgstm_db_query_duration_seconds_count{operation="select"}'] >= 2
+    assert "# TYPE bgstm_db_pool_connections gauge" in response.text
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("test_latency_seconds", "Test histogram", ("route",), buckets=(0.1, 1.0))
+    try:
+        for value in (0.05, 0.5, 0.5, 3.0):
+            histogram.observe(value, route="/x")
+        assert list(histogram.samples()) == [
+            ("test_latency_seconds_bucket", {"route": "/x", "le": "0.1"}, 1),
+            ("test_latency_seconds_bucket", {"route": "/x", "le": "1"}, 3),
+            ("test_latency_seconds_bucket", {"route": "/x", "le": "+Inf"}, 4),
+            ("test_latency_seconds_sum", {"route": "/x"}, 4.05),
+            ("test_latency_seconds_count", {"route": "/x"}, 4),
+        ]
+    finally:
+        operational_metrics._REGISTRY.remove(histogram)
+
+
+def test_engine_throughput_uploads_and_caches_are_exposed():
+    record_suggestion_run("tfidf", 1000, 0.5)
+    record_suggestion_run("tfidf", 500, 0.5)
+    record_artifact_upload("screenshot", 2048)
+
+    samples = _samples(render_metrics())
+
+    assert samples['bgstm_suggestion_pairs_analyzed_total{algorithm="tfidf"}'] == 1500
+    assert samples['bgstm_suggestion_scoring_seconds_total{algorithm="tfidf"}'] == 1.0
+    assert samples['bgstm_suggestion_pairs_per_second{algorithm="tfidf"}'] == 1000
+    assert samples['bgstm_artifact_upload_bytes_total{kind="screenshot"}'] == 2048
+    assert samples['bgstm_artifact_uploads_total{kind="screenshot"}'] == 1
+    assert samples['bgstm_embedding_cache_lookups_total{result="hit"}'] == 0
+    assert samples['bgstm_background_tasks{queue="report_exports"}'] == 0
+
+
+def test_token_is_required(client, monkeypatch):
+    assert client.get("/internal/metrics").status_code == 401
+    assert client.get("/internal/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/internal/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+
+    # Without a configured token the endpoint is not served at all.
+    monkeypatch.setattr(settings, "INTERNAL_METRICS_TOKEN", None)
+    assert client.get("/internal/metrics", headers={"Authorization": "Bearer "}).status_code == 404
+    assert client.get("/internal/metrics").status_code == 404
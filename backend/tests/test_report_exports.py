@@ -0,0 +1,217 @@
+"""Tests for background report exports and the cached traceability PDF"""
+
+import asyncio
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.auth.dependencies import get_current_user
+from app.config import settings
+from app.crud.traceability import get_traceability_fingerprint
+from app.db.session import get_db
+from app.main import app
+from app.models.base import Base
+from app.models.report_export import ReportExport, ReportExportStatus
+from app.models.requirement import PriorityLevel, Requirement, RequirementType
+from app.models.user import User, UserRole
+from app.services import report_exports
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path, monkeypatch):
+    """In-memory database shared by request sessions and background export tasks."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with factory() as session:
+            yield session
+
+    async def override_get_current_user():
+        return User(
+            id=uuid.uuid4(),
+            email="test@example.com",
+            hashed_password="hashed",
+            full_name="Test User",
+            role=UserRole.admin,
+            is_active=True,
+        )
+
+    monkeypatch.setattr(settings, "BGSTM_ARTIFACTS_DIR", str(tmp_path))
+    monkeypatch.setattr("app.db.session.AsyncSessionLocal", factory)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    yield factory
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+async def _add_requirement(factory, title: str) -> None:
+    async with factory() as session:
+        session.add(
+            Requirement(
+                external_id=f"REQ-{uuid.uuid4().hex[:8]}",
+                title=title,
+                description="desc",
+                type=RequirementType.FUNCTIONAL,
+                priority=PriorityLevel.HIGH,
+            )
+        )
+        await session.commit()
+
+
+async def _export_count(factory) -> int:
+    async with factory() as session:
+        return (await session.execute(select(func.count()).select_from(ReportExport))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_pdf_export_is_cached_per_data_fingerprint(session_factory, monkeypatch, tmp_path):
+    await _add_requirement(session_factory, "User Authentication")
+    with TestClient(app) as client:
+        first = client.get("/api/v1/traceability-matrix/export?format=pdf")
+        assert first.status_code == 200
+        assert first.content[:4] == b"%PDF"
+        assert len(list((tmp_path / "reports" / "traceability_matrix").glob("*.pdf"))) == 1
+
+        async def _no_render(db, export):
+            raise AssertionError("unchanged data must be served from the stored report")
+
+        render = report_exports.render_report_export
+        monkeypatch.setattr(report_exports, "render_report_export", _no_render)
+        second = client.get("/api/v1/traceability-matrix/export?format=pdf")
+        assert second.status_code == 200
+        assert second.content == first.content
+        monkeypatch.setattr(report_exports, "render_report_export", render)
+
+    assert await _export_count(session_factory) == 1
+
+    # Changed data has a new fingerprint, so the report is rendered again.
+    await _add_requirement(session_factory, "Data Export")
+    with TestClient(app) as client:
+        assert client.get("/api/v1/traceability-matrix/export?format=pdf").status_code == 200
+    assert await _export_count(session_factory) == 2
+
+
+@pytest.mark.asyncio
+async def test_pdf_export_returns_the_job_already_rendering(session_factory, monkeypatch):
+    await _add_requirement(session_factory, "User Authentication")
+    async with session_factory() as session:
+        export, _ = await report_exports.request_traceability_export(session, "pdf")
+        export.status = ReportExportStatus.RUNNING
+        await session.commit()
+
+    async def _no_render(db, export):
+        raise AssertionError("a report already rendering must not be rendered again")
+
+    monkeypatch.setattr(report_exports, "render_report_export", _no_render)
+    with TestClient(app) as client:
+        response = client.get("/api/v1/traceability-matrix/export?format=pdf")
+
+    assert response.status_code == 202
+    assert response.json()["id"] == str(export.id)
+    assert response.json()["status"] == "running"
+    assert await _export_count(session_factory) == 1
+
+
+@pytest.mark.asyncio
+async def test_export_job_renders_in_background_and_downloads(session_factory):
+    await _add_requirement(session_factory, "User Authentication")
+    with TestClient(app) as client:
+        created = client.post("/api/v1/traceability-matrix/export-jobs?format=pdf")
+        assert created.status_code == 202
+        job = created.json()
+        assert job["status"] in ("pending", "running", "completed")
+
+        deadline = time.monotonic() + 60
+        while job["status"] != "completed":
+            assert job["status"] != "failed", job["error"]
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+            job = client.get(f"/api/v1/report-exports/{job['id']}").json()
+
+        download = client.get(job["download_url"])
+        assert download.status_code == 200
+        assert download.headers["content-type"] == "application/pdf"
+        assert "traceability_matrix.pdf" in download.headers["content-disposition"]
+        assert download.content[:4] == b"%PDF"
+
+        # The same data returns the finished export right away.
+        repeat = client.post("/api/v1/traceability-matrix/export-jobs?format=pdf")
+        assert repeat.status_code == 200
+        assert repeat.json()["id"] == job["id"]
+
+
+@pytest.mark.asyncio
+async def test_export_is_stored_under_the_fingerprint_of_the_data_it_rendered(session_factory, monkeypatch):
+    await _add_requirement(session_factory, "User Authentication")
+    async with session_factory() as session:
+        export, _ = await report_exports.request_traceability_export(session, "pdf")
+    requested = export.fingerprint
+
+    get_matrix = report_exports.get_traceability_matrix
+
+    async def _matrix_after_a_write(db):
+        # A write lands between the request's fingerprint and the render's read.
+        await _add_requirement(session_factory, "Data Export")
+        return await get_matrix(db)
+
+    monkeypatch.setattr(report_exports, "get_traceability_matrix", _matrix_after_a_write)
+    async with session_factory() as session:
+        export = await session.get(ReportExport, export.id)
+        export = await report_exports.render_report_export(session, export)
+        current = await get_traceability_fingerprint(session)
+
+    assert export.status == ReportExportStatus.COMPLETED
+    assert export.fingerprint == current != requested
+    assert export.storage_key == f"reports/traceability_matrix/{current}.pdf"
+
+
+@pytest.mark.asyncio
+async def test_queue_depth_counts_renders_until_they_finish(session_factory, monkeypatch):
+    release = threading.Event()
+
+    def _blocking_render(matrix):
+        release.wait(10)
+        return b"%PDF-1.4"
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(report_exports, "_get_executor", lambda: executor)
+    monkeypatch.setattr(report_exports, "render_traceability_pdf", _blocking_render)
+    await _add_requirement(session_factory, "User Authentication")
+    async with session_factory() as session:
+        export, _ = await report_exports.request_traceability_export(session, "pdf")
+        task = asyncio.create_task(report_exports.render_report_export(session, export))
+        deadline = time.monotonic() + 10
+        while report_exports.queue_depth()["report_rendering"] == 0 and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+
+        assert report_exports.queue_depth()["report_rendering"] == 1
+        release.set()
+        assert (await task).status == ReportExportStatus.COMPLETED
+    assert report_exports.queue_depth()["report_rendering"] == 0
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_download_of_unfinished_or_unknown_export(session_factory):
+    async with session_factory() as session:
+        export = ReportExport(
+            report_type="traceability_matrix", format="pdf", fingerprint="f" * 64, status=ReportExportStatus.RUNNING
+        )
+        session.add(export)
+        await session.commit()
+
+    with TestClient(app) as client:
+        assert client.get(f"/api/v1/report-exports/{export.id}/download").status_code == 409
+        assert client.get(f"/api/v1/report-exports/{export.id}").json()["download_url"] is None
+        assert client.get(f"/api/v1/report-exports/{uuid.uuid4()}").status_code == 404
@@ -0,0 +1,191 @@
+"""Tests for the aggregate-read result cache: TTL, single-flight and write-triggered invalidation"""
+
+import asyncio
+import uuid
+
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.cache as cache_module
+from app.auth.dependencies import get_current_user
+from app.cache import MemoryCacheBackend, ResultCache
+from app.config import settings
+from app.crud import traceability as traceability_crud
+from app.crud.data_version import LINKS, REQUIREMENTS
+from app.db.session import get_db
+from app.main import app
+from app.models.base import Base
+from app.models.requirement import PriorityLevel, Requirement, RequirementType
+from app.models.user import User, UserRole
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with factory() as session:
+            yield session
+
+    async def override_get_current_user():
+        return User(
+            id=uuid.uuid4(),
+            email="test@example.com",
+            hashed_password="hashed",
+            full_name="Test User",
+            role=UserRole.admin,
+            is_active=True,
+        )
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    yield factory
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+def _requirement(title: str) -> Requirement:
+    return Requirement(
+        external_id=f"REQ-{uuid.uuid4().hex[:8]}",
+        title=title,
+        description="desc",
+        type=RequirementType.FUNCTIONAL,
+        priority=PriorityLevel.HIGH,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_once():
+    cache = ResultCache(MemoryCacheBackend(), ttl_seconds=60)
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": calls}
+
+    results = await asyncio.gather(*(cache.get_or_compute("key", compute, tags=[LINKS]) for _ in range(10)))
+
+    assert calls == 1
+    assert all(result == {"value": 1} for result in results)
+    assert await cache.get_or_compute("key", compute, tags=[LINKS]) == {"value": 1}
+    assert (cache.misses, cache.coalesced, cache.hits) == (1, 9, 1)
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_every_waiter_and_are_not_cached():
+    cache = ResultCache(MemoryCacheBackend(), ttl_seconds=60)
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database unavailable")
+
+    waiters = (cache.get_or_compute("key", fail, tags=[LINKS]) for _ in range(3))
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    async def succeed():
+        return [1]
+
+    assert await cache.get_or_compute("key", succeed, tags=[LINKS]) == [1]
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_and_invalidation_is_by_tag(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.cache.memory.time.monotonic", lambda: now[0])
+    cache = ResultCache(MemoryCacheBackend(), ttl_seconds=30)
+
+    async def compute():
+        return "fresh"
+
+    await cache.get_or_compute("links", compute, tags=[LINKS])
+    await cache.get_or_compute("requirements", compute, tags=[REQUIREMENTS])
+    assert cache.backend.get("links") == "fresh"
+
+    assert cache.invalidate([REQUIREMENTS]) == 1
+    assert cache.backend.get("requirements") is None
+    assert cache.backend.get("links") == "fresh"
+
+    now[0] += 31
+    assert cache.backend.get("links") is None
+
+
+@pytest.mark.asyncio
+async def test_result_computed_across_an_invalidation_is_not_stored():
+    cache = ResultCache(MemoryCacheBackend(), ttl_seconds=60)
+
+    async def compute_while_written():
+        cache.invalidate([LINKS])  # a write commits while the aggregate runs
+        return "possibly stale"
+
+    assert await cache.get_or_compute("key", compute_while_written, tags=[LINKS]) == "possibly stale"
+    assert cache.backend.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_committed_writes_invalidate_cached_metrics(session_factory, monkeypatch):
+    calls = 0
+    get_metrics = traceability_crud.get_metrics
+
+    async def counting_get_metrics(db):
+        nonlocal calls
+        calls += 1
+        return await get_metrics(db)
+
+    monkeypatch.setattr(traceability_crud, "get_metrics", counting_get_metrics)
+    client = TestClient(app)
+
+    assert client.get("/api/v1/metrics").json()["total_requirements"] == 0
+    assert client.get("/api/v1/metrics/export/csv").status_code == 200
+    assert calls == 1
+
+    async with session_factory() as session:
+        session.add(_requirement("Rolled back"))
+        await session.flush()
+        await session.rollback()
+    client.get("/api/v1/metrics")
+    assert calls == 1
+
+    async with session_factory() as session:
+        session.add(_requirement("Login"))
+        await session.commit()
+    assert client.get("/api/v1/metrics").json()["total_requirements"] == 1
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_bodies_are_keyed_by_the_versions_behind_the_etag(session_factory, monkeypatch):
+    client = TestClient(app)
+    first = client.get("/api/v1/metrics")
+    assert first.json()["total_requirements"] == 0
+
+    # Another worker committed the write, so this process never saw the invalidation.
+    monkeypatch.setattr("app.crud.data_version.invalidate_cached_results", lambda names: None)
+    async with session_factory() as session:
+        session.add(_requirement("Login"))
+        await session.commit()
+
+    second = client.get("/api/v1/metrics", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.json()["total_requirements"] == 1
+    assert client.get("/api/v1/metrics", headers={"If-None-Match": second.headers["etag"]}).status_code == 304
+
+
+def test_backend_is_selected_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "RESULT_CACHE_BACKEND", "app.cache.memory:MemoryCacheBackend")
+    assert isinstance(cache_module._build_backend(), MemoryCacheBackend)
+
+    monkeypatch.setattr(settings, "RESULT_CACHE_BACKEND", "app.cache:ResultCache")
+    with pytest.raises(ValueError, match="not a CacheBackend"):
+        cache_module._build_backend()
+
+    monkeypatch.setattr(settings, "RESULT_CACHE_BACKEND", "redis")
+    with pytest.raises(ValueError, match="expected 'memory'"):
+        cache_module._build_backend()
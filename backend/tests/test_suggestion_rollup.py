@@ -0,0 +1,189 @@
+"""Tests for the daily suggestion rollup: incremental maintenance, analytics reads and the backfill"""
+
+from datetime import date, datetime, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.ai_suggestions import engine as suggestion_engine
+from app.ai_suggestions.config import SuggestionConfig
+from app.ai_suggestions.engine import SuggestionEngine
+from app.crud.link import bulk_review_suggestions, create_suggestion, review_suggestion
+from app.crud.requirement import create_requirement, delete_requirement
+from app.crud.suggestion_rollup import rebuild_suggestion_rollup
+from app.crud.test_case import create_test_case
+from app.db.backfill_suggestion_rollup import backfill_suggestion_rollup
+from app.models.base import Base
+from app.models.requirement import PriorityLevel, RequirementType
+from app.models.suggestion import LinkSuggestion, SuggestionMethod, SuggestionStatus
+from app.models.suggestion_rollup import SuggestionDailyRollup
+from app.models.test_case import TestCaseType
+from app.schemas.link import SuggestionCreate, SuggestionReview
+from app.schemas.requirement import RequirementCreate
+from app.schemas.test_case import TestCaseCreate
+from app.services.analytics import SuggestionAnalytics
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _rollup(session: AsyncSession) -> dict[tuple, tuple]:
+    """Non-empty rollup rows keyed by (day, method, status, bucket)."""
+    result = await session.execute(select(SuggestionDailyRollup).where(SuggestionDailyRollup.suggestion_count != 0))
+    return {
+        (row.day, row.suggestion_method, row.status, row.score_bucket): (
+            row.suggestion_count,
+            round(row.score_sum, 6),
+            row.reviewed_count,
+            round(row.review_hours_sum, 6),
+        )
+        for row in result.scalars().all()
+    }
+
+
+async def _pair(session: AsyncSession, title: str):
+    requirement = await create_requirement(
+        session,
+        RequirementCreate(title=title, description=title, type=RequirementType.FUNCTIONAL, priority=PriorityLevel.HIGH),
+    )
+    test_case = await create_test_case(
+        session,
+        TestCaseCreate(title=title, description=title, type=TestCaseType.FUNCTIONAL, priority=PriorityLevel.HIGH),
+    )
+    return requirement, test_case
+
+
+async def _suggest(session: AsyncSession, requirement, test_case, score: float, method: SuggestionMethod):
+    return await create_suggestion(
+        session,
+        SuggestionCreate(
+            requirement_id=requirement.id,
+            test_case_id=test_case.id,
+            similarity_score=score,
+            suggestion_method=method,
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_writers_keep_the_rollup_equal_to_a_rebuild(session_factory):
+    async with session_factory() as session:
+        login, login_case = await _pair(session, "Login")
+        export, export_case = await _pair(session, "Export")
+        accepted = await _suggest(session, login, login_case, 0.9, SuggestionMethod.HYBRID)
+        pending = await _suggest(session, login, export_case, 0.5, SuggestionMethod.HYBRID)
+        await _suggest(session, export, export_case, 0.3, SuggestionMethod.KEYWORD_MATCH)
+        await _suggest(session, export, login_case, 0.1, SuggestionMethod.KEYWORD_MATCH)
+
+        await review_suggestion(session, accepted.id, SuggestionReview(status=SuggestionStatus.ACCEPTED))
+        # The already accepted suggestion is left alone by the bulk review.
+        await bulk_review_suggestions(session, [accepted.id, pending.id], SuggestionStatus.REJECTED)
+        incremental = await _rollup(session)
+
+        assert sum(count for count, *_ in incremental.values()) == 4
+        today = datetime.now(timezone.utc).date()
+        assert incremental[(today, "hybrid", "accepted", 4)][:3] == (1, 0.9, 1)
+        assert incremental[(today, "hybrid", "rejected", 2)][:3] == (1, 0.5, 1)
+
+        await delete_requirement(session, export.id)
+        incremental = await _rollup(session)
+        assert sum(count for count, *_ in incremental.values()) == 2
+
+        await rebuild_suggestion_rollup(session)
+        assert await _rollup(session) == incremental
+
+
+@pytest.mark.asyncio
+async def test_engine_applies_the_rollup_once_right_before_its_commit(engine, session_factory, monkeypatch):
+    monkeypatch.setattr(suggestion_engine, "BATCH_SIZE", 2)
+    async with session_factory() as session:
+        for title in ("Login", "Logout", "Export"):
+            await _pair(session, title)
+        await session.commit()
+
+        statements = []
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        config = SuggestionConfig(default_algorithm="keyword", min_confidence_threshold=0.0)
+        stats = await SuggestionEngine(config=config).generate_suggestions(session)
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+        inserts = [index for index, statement in enumerate(statements) if "INSERT INTO link_suggestions" in statement]
+        writes = [index for index, statement in enumerate(statements) if "INTO suggestion_daily_rollup" in statement]
+        assert stats["suggestions_created"] == 9 and len(inserts) >= 5
+        # The rollup rows are written (and locked) once, after every batch is inserted.
+        assert len(writes) == 1 and writes[0] > inserts[-1]
+
+        incremental = await _rollup(session)
+        assert sum(count for count, *_ in incremental.values()) == 9
+        await rebuild_suggestion_rollup(session)
+        assert await _rollup(session) == incremental
+
+
+@pytest.mark.asyncio
+async def test_analytics_read_the_rollup_not_the_suggestions(engine, session_factory):
+    async with session_factory() as session:
+        requirement, test_case = await _pair(session, "Login")
+        suggestion = await _suggest(session, requirement, test_case, 0.85, SuggestionMethod.SEMANTIC_SIMILARITY)
+        await review_suggestion(session, suggestion.id, SuggestionReview(status=SuggestionStatus.ACCEPTED))
+
+        statements = []
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        analytics = SuggestionAnalytics(session)
+        rates = await analytics.get_acceptance_rates()
+        trends = await analytics.get_generation_trends()
+        distribution = {d["range"]: d["count"] for d in await analytics.get_confidence_distribution()}
+        comparison = {item["algorithm"]: item for item in await analytics.get_algorithm_comparison()}
+
+    assert [(rate["total"], rate["accepted"], rate["acceptance_rate"]) for rate in rates] == [(1, 1, 100.0)]
+    assert [trend["count"] for trend in trends] == [1]
+    assert distribution["0.8-1.0"] == 1
+    assert comparison["semantic_similarity"]["avg_confidence"] == 0.85
+    assert statements and not any("link_suggestions" in statement for statement in statements)
+
+
+@pytest.mark.asyncio
+async def test_backfill_rebuilds_suggestions_written_outside_the_crud_layer(session_factory, monkeypatch):
+    monkeypatch.setattr("app.db.session.AsyncSessionLocal", session_factory)
+    async with session_factory() as session:
+        requirement, test_case = await _pair(session, "Login")
+        for created_at in (datetime(2024, 5, 31, 23, 0), datetime(2024, 6, 1, 8, 0), datetime(2024, 6, 1, 9, 0)):
+            session.add(
+                LinkSuggestion(
+                    requirement_id=requirement.id,
+                    test_case_id=test_case.id,
+                    similarity_score=0.7,
+                    suggestion_method=SuggestionMethod.KEYWORD_MATCH,
+                    created_at=created_at,
+                )
+            )
+        await session.commit()
+
+    recent = await backfill_suggestion_rollup(since=date(2024, 6, 1))
+    assert recent == {"rows": 1, "days": 1, "suggestions": 2}
+
+    report = await backfill_suggestion_rollup()
+    assert report == {"rows": 2, "days": 2, "suggestions": 3}
+    async with session_factory() as session:
+        trends = await SuggestionAnalytics(session).get_generation_trends()
+    assert trends == [{"period": "2024-05", "count": 1}, {"period": "2024-06", "count": 2}]
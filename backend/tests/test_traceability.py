@@ -3,9 +3,17 @@
 import uuid
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from app.crud.traceability import get_metrics, get_traceability_matrix
+from app.crud.coverage import reconcile_coverage
+from app.crud.traceability import (
+    get_metrics,
+    get_orphan_test_cases_page,
+    get_traceability_matrix,
+    get_traceability_matrix_page,
+    get_traceability_summary,
+)
 from app.models.base import Base
 from app.models.link import LinkSource, LinkType, RequirementTestCaseLink
 from app.models.requirement import (
@@ -391,6 +399,42 @@ async def test_metrics_empty_database():
     await engine.dispose()
 
 
+@pytest.mark.asyncio
+async def test_metrics_use_three_round_trips():
+    """Metrics come from the counters row and one grouped aggregate per table, with or without counters"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with AsyncSessionLocal() as session:
+        await create_sample_data(session)
+        statements: list[str] = []
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        aggregated = await get_metrics(session)
+        assert len(statements) == 3
+
+        event.remove(engine.sync_engine, "before_cursor_execute", _record)
+        await reconcile_coverage(session)
+        await session.commit()
+        event.listen(engine.sync_engine, "before_cursor_execute", _record)
+        statements.clear()
+
+        from_counters = await get_metrics(session)
+        event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+        assert len(statements) == 3
+        assert from_counters == aggregated
+        assert (aggregated.total_requirements, aggregated.total_test_cases) == (3, 4)
+
+    await engine.dispose()
+
+
 @pytest.mark.asyncio
 async def test_traceability_matrix_linked_test_case_details():
     """Test that linked test case details are correctly populated"""
@@ -423,3 +467,209 @@ async def test_traceability_matrix_linked_test_case_details():
         assert linked_tc.confidence_score == 0.85
 
     await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_traceability_matrix_query_count_is_independent_of_size():
+    """The matrix is built from a fixed number of queries and groups every link under its requirement"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with AsyncSessionLocal() as session:
+        requirements = [
+            Requirement(
+                id=uuid.uuid4(),
+                external_id=f"REQ-{i:03d}",
+                title=f"Requirement {i}",
+                description="desc",
+                type=RequirementType.FUNCTIONAL,
+                priority=PriorityLevel.MEDIUM,
+            )
+            for i in range(20)
+        ]
+        test_cases = [
+            TestCase(
+                id=uuid.uuid4(),
+                external_id=f"TC-{i:03d}",
+                title=f"Test Case {i}",
+                description="desc",
+                type=TestCaseType.FUNCTIONAL,
+                priority=PriorityLevel.MEDIUM,
+            )
+            for i in range(30)
+        ]
+        session.add_all(requirements + test_cases)
+        await session.flush()
+        # Even requirements get three links, odd ones none; test cases 20+ stay orphaned.
+        for i, req in enumerate(requirements[::2]):
+            for j in range(3):
+                session.add(
+                    RequirementTestCaseLink(
+                        requirement_id=req.id,
+                        test_case_id=test_cases[(i * 3 + j) % 20].id,
+                        link_type=LinkType.COVERS,
+                        link_source=LinkSource.AI_SUGGESTED if j else LinkSource.MANUAL,
+                    )
+                )
+        await session.commit()
+
+        statements: list[str] = []
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        matrix = await get_traceability_matrix(session)
+        event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+        assert len(statements) == 3
+        assert len(matrix.matrix) == 20
+        assert matrix.covered_requirements == 10
+        assert matrix.uncovered_requirements == 10
+        assert matrix.total_test_cases == 30
+        assert matrix.orphan_test_cases == 10
+        assert sorted(orphan.external_id for orphan in matrix.orphans) == [f"TC-{i:03d}" for i in range(20, 30)]
+        for item in matrix.matrix:
+            if int(item.external_id[4:]) % 2 == 0:
+                assert item.coverage_status == "covered"
+                assert sorted(tc.link_status for tc in item.linked_test_cases) == ["accepted", "pending", "pending"]
+            else:
+                assert item.coverage_status == "uncovered"
+                assert item.linked_test_cases == []
+
+    await engine.dispose()
+
+
+async def _create_paging_data(session: AsyncSession) -> None:
+    """Seven requirements (one without external ID) and five test cases, two of them orphaned"""
+    requirements = [
+        Requirement(
+            id=uuid.uuid4(),
+            external_id=f"REQ-{i:03d}" if i else None,
+            title=f"Requirement {i}",
+            description="desc",
+            type=RequirementType.FUNCTIONAL,
+            priority=PriorityLevel.MEDIUM,
+            module="auth" if i % 2 else "billing",
+            tags=["smoke", "ui"] if i % 3 == 0 else ["smoke"],
+        )
+        for i in range(7)
+    ]
+    test_cases = [
+        TestCase(
+            id=uuid.uuid4(),
+            external_id=f"TC-{i:03d}",
+            title=f"Test Case {i}",
+            description="desc",
+            type=TestCaseType.FUNCTIONAL,
+            priority=PriorityLevel.MEDIUM,
+        )
+        for i in range(5)
+    ]
+    session.add_all(requirements + test_cases)
+    await session.flush()
+    # REQ-001 covered (manual), REQ-002 partially covered (suggested), REQ-003 covered (imported)
+    for req, tc, source in (
+        (requirements[1], test_cases[0], LinkSource.MANUAL),
+        (requirements[1], test_cases[1], LinkSource.AI_SUGGESTED),
+        (requirements[2], test_cases[1], LinkSource.AI_SUGGESTED),
+        (requirements[3], test_cases[2], LinkSource.IMPORTED),
+    ):
+        session.add(
+            RequirementTestCaseLink(
+                requirement_id=req.id, test_case_id=tc.id, link_type=LinkType.COVERS, link_source=source
+            )
+        )
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_traceability_matrix_pages_follow_external_id_order():
+    """Keyset pages cover every requirement exactly once, ordered by external ID"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with AsyncSessionLocal() as session:
+        await _create_paging_data(session)
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            page = await get_traceability_matrix_page(session, limit=3, cursor=cursor)
+            pages += 1
+            seen.extend(page.items)
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+        assert pages == 3
+        assert [item.external_id for item in seen] == [None] + [f"REQ-{i:03d}" for i in range(1, 7)]
+        by_id = {item.external_id: item for item in seen}
+        assert by_id["REQ-001"].coverage_status == "covered"
+        assert [tc.link_status for tc in by_id["REQ-001"].linked_test_cases] == ["accepted", "pending"]
+        assert by_id["REQ-002"].coverage_status == "partially_covered"
+        assert by_id["REQ-004"].coverage_status == "uncovered"
+
+        with pytest.raises(ValueError):
+            await get_traceability_matrix_page(session, cursor="not-a-cursor")
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_traceability_matrix_page_filters():
+    """Coverage status, module, tag and link source filters combine"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def external_ids(**filters) -> list[str | None]:
+        page = await get_traceability_matrix_page(session, **filters)
+        return [item.external_id for item in page.items]
+
+    async with AsyncSessionLocal() as session:
+        await _create_paging_data(session)
+
+        assert await external_ids(coverage_status="covered") == ["REQ-001", "REQ-003"]
+        assert await external_ids(coverage_status="uncovered") == [None, "REQ-004", "REQ-005", "REQ-006"]
+        assert await external_ids(module="auth") == ["REQ-001", "REQ-003", "REQ-005"]
+        assert await external_ids(tags=["ui"]) == [None, "REQ-003", "REQ-006"]
+        assert await external_ids(tags=["ui", "smoke"], module="auth") == ["REQ-003"]
+        assert await external_ids(link_source=LinkSource.AI_SUGGESTED) == ["REQ-001", "REQ-002"]
+        assert await external_ids(link_source=LinkSource.AI_SUGGESTED, coverage_status="covered") == ["REQ-001"]
+
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_orphan_pages_and_summary():
+    """Orphans are paginated separately and the summary matches the full matrix"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with AsyncSessionLocal() as session:
+        await _create_paging_data(session)
+
+        first = await get_orphan_test_cases_page(session, limit=1)
+        second = await get_orphan_test_cases_page(session, limit=1, cursor=first.next_cursor)
+        assert [o.external_id for o in first.items + second.items] == ["TC-003", "TC-004"]
+        assert second.next_cursor is None
+
+        summary = await get_traceability_summary(session)
+        matrix = await get_traceability_matrix(session)
+        assert summary.model_dump() == matrix.model_dump(exclude={"matrix", "orphans"})
+        assert summary.covered_requirements == 2
+        assert summary.uncovered_requirements == 4
+        assert summary.orphan_test_cases == 2
+
+    await engine.dispose()